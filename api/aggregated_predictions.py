@@ -13,19 +13,36 @@ All data is read from the workspace's SQLite store via
 from __future__ import annotations
 
 import copy
+import io
+import itertools
 import math
+import queue
 import re
 import shutil
 import tempfile
+import threading
 import zipfile
 from datetime import UTC, datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
+from .chain_summary_view import get_chain_summary_view, query_chain_summary_records
+from .shared.logger import get_logger
+from .shared.sql_cursor import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    CursorNotFound,
+    Page,
+    QueryBudget,
+    iter_pages,
+    query_cursors,
+    store_database_path,
+)
 from .store_adapter import (
     _apply_synthetic_refit_fallback_inplace,
     _extract_model_params_from_expanded_config,
@@ -35,6 +52,8 @@ from .store_adapter import (
 )
 from .workspace_manager import workspace_manager
 
+logger = get_logger(__name__)
+
 STORE_AVAILABLE = True
 
 try:
@@ -48,6 +67,11 @@ except ImportError:
 
 router = APIRouter(prefix="/aggregated-predictions", tags=["aggregated-predictions"])
 
+# Rows per parquet row group in filtered exports (the streaming unit)
+EXPORT_ROW_GROUP_SIZE = 100_000
+# Written chunks buffered ahead of a slow client before the export pauses
+EXPORT_QUEUE_CHUNKS = 8
+
 CHAIN_CANONICAL_STEP_KEYS = {
     "class",
     "function",
@@ -201,6 +225,21 @@ class SQLQueryRequest(BaseModel):
     """Request model for read-only SQL query endpoint."""
 
     sql: str = Field(..., description="Read-only SQL query")
+    page_size: int | None = Field(
+        default=None, ge=1, le=MAX_PAGE_SIZE, description="Rows per page; omit to get the whole (budgeted) result"
+    )
+    max_rows: int | None = Field(default=None, ge=1, description="Row budget (capped by the server limit)")
+    timeout_seconds: float | None = Field(
+        default=None, gt=0, description="Execution time budget (capped by the server limit)"
+    )
+    format: str = Field(default="json", description="Result format: json (paged) | ndjson | arrow (streamed)")
+
+
+class SQLPageRequest(BaseModel):
+    """Request for the next page of a paged SQL query."""
+
+    page_token: str = Field(..., description="next_page_token of the previous page")
+    page_size: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Rows per page")
 
 
 class SQLQueryResponse(BaseModel):
@@ -209,6 +248,10 @@ class SQLQueryResponse(BaseModel):
     columns: list[str]
     rows: list[list[Any]]
     row_count: int
+    next_page_token: str | None = None
+    truncated: bool = False
+    timed_out: bool = False
+    elapsed_ms: float = 0.0
 
 
 # ============================================================================
@@ -694,6 +737,23 @@ def _enrich_refit_with_cv(records: list[dict], store: Any) -> list[dict]:
     return records
 
 
+def _build_chain_summary_records(store: Any, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Apply every webapp-side enrichment to raw ``v_chain_summary`` rows.
+
+    This is what the materialized chain-summary view stores; it is also used
+    directly when the view is unavailable (legacy DuckDB stores).
+    """
+    records = [_sanitize_dict(dict(row)) for row in rows]
+    _mark_refit_only_records(records)
+    _enrich_with_fold_artifacts(records, store)
+    pipeline_ids = [pid for pid in {r.get("pipeline_id") for r in records} if pid]
+    _attach_variant_params_inplace(records, _build_pipeline_metadata_map(store, pipeline_ids))
+    _enrich_refit_with_cv(records, store)
+    for record in records:
+        _apply_synthetic_refit_fallback_inplace(record)
+    return records
+
+
 def _list_array_datasets(workspace_path: Path) -> dict[str, Path]:
     """Map dataset name -> parquet file path under arrays/."""
     arrays_dir = workspace_path / "arrays"
@@ -705,6 +765,78 @@ def _list_array_datasets(workspace_path: Path) -> dict[str, Path]:
     return mapping
 
 
+class _ExportCancelled(Exception):
+    """Raised inside the parquet sink when the client stops reading."""
+
+
+class _QueueWriter(io.RawIOBase):
+    """Binary sink that hands written bytes to a bounded queue."""
+
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event):
+        super().__init__()
+        self._chunks = chunks
+        self._cancelled = cancelled
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        payload = bytes(data)
+        while True:
+            if self._cancelled.is_set():
+                raise _ExportCancelled()
+            try:
+                # Blocks while the response is EXPORT_QUEUE_CHUNKS behind
+                self._chunks.put(payload, timeout=0.5)
+                return len(payload)
+            except queue.Full:
+                continue
+
+
+def _stream_parquet(lazy_frame: Any, row_group_size: int = EXPORT_ROW_GROUP_SIZE):
+    """Yield a parquet file for ``lazy_frame`` as it is written, row group by row group.
+
+    The query runs on polars' streaming engine in a worker thread; memory stays
+    bounded by a few row groups plus the queued, not yet sent, chunks.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=EXPORT_QUEUE_CHUNKS)
+    cancelled = threading.Event()
+    done = object()
+    failure: list[BaseException] = []
+
+    def _sink() -> None:
+        try:
+            lazy_frame.sink_parquet(
+                _QueueWriter(chunks, cancelled), row_group_size=row_group_size, engine="streaming"
+            )
+        except _ExportCancelled:
+            pass
+        except BaseException as exc:
+            failure.append(exc)
+        finally:
+            while not cancelled.is_set():
+                try:
+                    chunks.put(done, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    worker = threading.Thread(target=_sink, name="parquet-export", daemon=True)
+    worker.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is done:
+                break
+            yield chunk
+        if failure:
+            logger.error("Parquet export failed: %s", failure[0])
+            raise failure[0]
+    finally:
+        cancelled.set()
+        worker.join(timeout=5.0)
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
@@ -726,20 +858,18 @@ async def get_aggregated_predictions(
     """
     store = _get_store()
     try:
-        df = store.query_chain_summaries(
-            run_id=run_id,
-            pipeline_id=pipeline_id,
-            chain_id=chain_id,
-            dataset_name=dataset_name,
-            model_class=model_class,
-            metric=metric,
-        )
-        records = [_sanitize_dict(dict(row)) for row in df.iter_rows(named=True)]
-        _mark_refit_only_records(records)
-        _enrich_with_fold_artifacts(records, store)
-        _enrich_refit_with_cv(records, store)
-        for record in records:
-            _apply_synthetic_refit_fallback_inplace(record)
+        filters = {
+            "run_id": run_id,
+            "pipeline_id": pipeline_id,
+            "chain_id": chain_id,
+            "dataset_name": dataset_name,
+            "model_class": model_class,
+            "metric": metric,
+        }
+        records = query_chain_summary_records(store, **filters)
+        if records is None:
+            df = store.query_chain_summaries(**filters)
+            records = _build_chain_summary_records(store, [dict(row) for row in df.iter_rows(named=True)])
         return ChainSummariesResponse(
             predictions=records,
             total=len(records),
@@ -766,21 +896,21 @@ async def get_top_aggregated_predictions(
     """
     store = _get_store()
     try:
-        df = store.query_top_chains(
-            metric=metric,
-            n=n,
-            score_column=score_column,
-            run_id=run_id,
-            pipeline_id=pipeline_id,
-            dataset_name=dataset_name,
-            model_class=model_class,
-        )
-        records = [_sanitize_dict(dict(row)) for row in df.iter_rows(named=True)]
-        _mark_refit_only_records(records)
-        _enrich_with_fold_artifacts(records, store)
-        _enrich_refit_with_cv(records, store)
-        for record in records:
-            _apply_synthetic_refit_fallback_inplace(record)
+        filters = {
+            "run_id": run_id,
+            "pipeline_id": pipeline_id,
+            "dataset_name": dataset_name,
+            "model_class": model_class,
+        }
+        view = get_chain_summary_view(store)
+        if view is not None:
+            try:
+                records = view.top(metric=metric, n=n, score_column=score_column, **filters)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+        else:
+            df = store.query_top_chains(metric=metric, n=n, score_column=score_column, **filters)
+            records = _build_chain_summary_records(store, [dict(row) for row in df.iter_rows(named=True)])
         return {
             "predictions": records,
             "total": len(records),
@@ -807,18 +937,14 @@ async def get_chain_detail(
     store = _get_store()
     try:
         # Get chain summary
-        agg_df = store.query_chain_summaries(
-            chain_id=chain_id,
-            metric=metric,
-            dataset_name=dataset_name,
-        )
+        filters = {"chain_id": chain_id, "metric": metric, "dataset_name": dataset_name}
+        summaries = query_chain_summary_records(store, **filters)
+        if summaries is None:
+            agg_df = store.query_chain_summaries(**filters)
+            summaries = _build_chain_summary_records(store, [dict(agg_df.row(0, named=True))]) if len(agg_df) > 0 else []
         summary = None
-        if len(agg_df) > 0:
-            summary = _sanitize_dict(dict(agg_df.row(0, named=True)))
-            _mark_refit_only_records([summary])
-            _enrich_with_fold_artifacts([summary], store)
-            _enrich_refit_with_cv([summary], store)
-            _apply_synthetic_refit_fallback_inplace(summary)
+        if summaries:
+            summary = summaries[0]
             pipeline_ids = [summary.get("pipeline_id")] if summary.get("pipeline_id") else []
             pipeline_map = _build_pipeline_metadata_map(store, pipeline_ids) if pipeline_ids else {}
             pipeline_row = pipeline_map.get(summary.get("pipeline_id") or "", {}) if pipeline_map else {}
@@ -1100,7 +1226,6 @@ async def get_prediction_arrays(prediction_id: str):
 @router.get("/export/{dataset_name}.parquet")
 async def export_dataset_parquet(
     dataset_name: str,
-    background_tasks: BackgroundTasks,
     partition: str | None = Query(None, description="Optional partition filter"),
     model_name: str | None = Query(None, description="Optional model name filter"),
 ):
@@ -1125,34 +1250,35 @@ async def export_dataset_parquet(
             detail="Polars is required for filtered parquet export",
         )
 
+    # Lazy scan: filters are pushed down to the parquet reader (row-group
+    # statistics), so only matching rows are ever decoded.
     try:
-        df = pl.read_parquet(source_file)  # type: ignore[union-attr]
+        lazy_frame = pl.scan_parquet(source_file)  # type: ignore[union-attr]
+        columns = lazy_frame.collect_schema().names()
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to read parquet: {exc}") from exc
 
     if partition is not None:
-        if "partition" not in df.columns:
+        if "partition" not in columns:
             raise HTTPException(status_code=400, detail="Parquet file does not contain 'partition' column")
-        df = df.filter(pl.col("partition") == partition)  # type: ignore[union-attr]
+        lazy_frame = lazy_frame.filter(pl.col("partition") == partition)  # type: ignore[union-attr]
 
     if model_name is not None:
-        if "model_name" not in df.columns:
+        if "model_name" not in columns:
             raise HTTPException(status_code=400, detail="Parquet file does not contain 'model_name' column")
-        df = df.filter(pl.col("model_name") == model_name)  # type: ignore[union-attr]
+        lazy_frame = lazy_frame.filter(pl.col("model_name") == model_name)  # type: ignore[union-attr]
 
-    tmp_dir = Path(tempfile.mkdtemp(prefix="n4a_export_"))
-    output_file = tmp_dir / f"{dataset_name}.parquet"
+    # Start the export before answering so early failures still map to a 500
+    stream = _stream_parquet(lazy_frame)
     try:
-        df.write_parquet(output_file)  # type: ignore[union-attr]
+        first_chunk = await run_in_threadpool(next, stream, b"")
     except Exception as exc:
-        shutil.rmtree(tmp_dir, ignore_errors=True)
         raise HTTPException(status_code=500, detail=f"Failed to write filtered parquet: {exc}") from exc
 
-    background_tasks.add_task(shutil.rmtree, str(tmp_dir), True)
-    return FileResponse(
-        path=str(output_file),
+    return StreamingResponse(
+        itertools.chain([first_chunk], stream),
         media_type="application/octet-stream",
-        filename=f"{dataset_name}.parquet",
+        headers={"Content-Disposition": f'attachment; filename="{dataset_name}.parquet"'},
     )
 
 
@@ -1212,9 +1338,140 @@ async def export_datasets(request: ExportRequest, background_tasks: BackgroundTa
     )
 
 
+def _get_store_database() -> Path:
+    """Store database of the current workspace, with the same errors as ``_get_store``."""
+    db_path = store_database_path(_get_workspace_path())
+    if db_path is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No store found in workspace. Run a pipeline first.",
+        )
+    return db_path
+
+
+def _page_response(page: Page) -> SQLQueryResponse:
+    rows = [[_sanitize_cell(value) for value in row] for row in page.rows]
+    return SQLQueryResponse(
+        columns=page.columns,
+        rows=rows,
+        row_count=len(rows),
+        next_page_token=page.next_page_token,
+        truncated=page.truncated,
+        timed_out=page.timed_out,
+        elapsed_ms=page.elapsed_seconds * 1000,
+    )
+
+
+def _fetch_all_pages(db_path: Path, sql: str, budget: QueryBudget) -> Page:
+    """The whole budgeted result of ``sql`` as a single page without a token."""
+    rows: list[tuple] = []
+    page = None
+    for page in iter_pages(db_path, sql, budget, MAX_PAGE_SIZE):
+        rows.extend(page.rows)
+    return Page(
+        columns=page.columns,
+        rows=rows,
+        next_page_token=None,
+        truncated=page.truncated,
+        timed_out=page.timed_out,
+        elapsed_seconds=page.elapsed_seconds,
+    )
+
+
+def _ndjson_stream(pages):
+    """First line: columns; then one JSON array per row; last line: status."""
+    import json
+
+    columns_sent = False
+    row_count = 0
+    page = None
+    for page in pages:
+        if not columns_sent:
+            yield json.dumps({"columns": page.columns}) + "\n"
+            columns_sent = True
+        for row in page.rows:
+            yield json.dumps([_sanitize_cell(value) for value in row], default=str) + "\n"
+        row_count += len(page.rows)
+    yield json.dumps(
+        {
+            "row_count": row_count,
+            "truncated": bool(page and page.truncated),
+            "timed_out": bool(page and page.timed_out),
+        }
+    ) + "\n"
+
+
+def _arrow_column(values: list[Any], arrow_type: Any = None) -> Any:
+    """Arrow array for one column; mixed or untyped SQLite columns become strings."""
+    import pyarrow as pa
+
+    try:
+        array = pa.array(values, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        if arrow_type is not None and arrow_type != pa.string():
+            raise
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+    if arrow_type is None and pa.types.is_null(array.type):
+        return array.cast(pa.string())
+    return array
+
+
+class _ChunkSink(io.RawIOBase):
+    """Binary sink whose written bytes are drained after each record batch."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_stream(pages):
+    """Arrow IPC stream with one record batch per page; schema from the first page."""
+    import pyarrow as pa
+
+    sink = _ChunkSink()
+    writer = None
+    schema = None
+    for page in pages:
+        columns = [[row[i] for row in page.rows] for i in range(len(page.columns))]
+        if schema is None:
+            arrays = [_arrow_column(values) for values in columns]
+            schema = pa.schema([pa.field(name, array.type) for name, array in zip(page.columns, arrays)])
+            writer = pa.ipc.new_stream(sink, schema)
+        else:
+            arrays = [_arrow_column(values, field.type) for values, field in zip(columns, schema)]
+        if page.rows:
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+        data = sink.drain()
+        if data:
+            yield data
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
 @router.post("/query", response_model=SQLQueryResponse)
 async def query_predictions_metadata(request: SQLQueryRequest):
-    """Run a read-only SQL query against prediction metadata tables."""
+    """Run a read-only SQL query against prediction metadata tables.
+
+    With ``format="json"`` the whole result is returned, up to the row
+    budget. When ``page_size`` is given, only the first page is returned,
+    with a ``next_page_token`` for ``POST /query/page``. ``ndjson`` and
+    ``arrow`` stream the whole (budgeted) result. The row and time budgets
+    are capped by the server limits; a query that runs out of time is
+    interrupted and reported with ``timed_out``.
+    """
     sql = request.sql.strip()
     if not _is_read_only_sql(sql):
         raise HTTPException(
@@ -1222,21 +1479,62 @@ async def query_predictions_metadata(request: SQLQueryRequest):
             detail="Only read-only SELECT/WITH queries are allowed",
         )
 
-    store = _get_store()
+    output_format = (request.format or "json").lower()
+    if output_format not in {"json", "ndjson", "arrow"}:
+        raise HTTPException(status_code=400, detail="format must be 'json', 'ndjson' or 'arrow'")
+
+    db_path = _get_store_database()
+    budget = QueryBudget.from_env().narrowed(request.max_rows, request.timeout_seconds)
+
+    if output_format == "json":
+        try:
+            if request.page_size is None:
+                page = await run_in_threadpool(_fetch_all_pages, db_path, sql, budget)
+            else:
+                page = await run_in_threadpool(query_cursors.open, db_path, sql, budget, request.page_size)
+        except Exception as exc:
+            raise HTTPException(status_code=400, detail=f"Failed to execute query: {exc}") from exc
+        return _page_response(page)
+
+    if output_format == "arrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="pyarrow is required for Arrow output") from None
+
+    # Execute before answering so SQL errors still map to a 400
+    pages = iter_pages(db_path, sql, budget, request.page_size or DEFAULT_PAGE_SIZE)
     try:
-        df = store._fetch_pl(sql)
-        columns = list(df.columns)
-        rows: list[list[Any]] = []
-        for row in df.iter_rows(named=False):
-            rows.append([_sanitize_cell(value) for value in row])
-        return SQLQueryResponse(
-            columns=columns,
-            rows=rows,
-            row_count=len(rows),
+        first_page = await run_in_threadpool(next, pages)
+    except Exception as exc:
+        pages.close()
+        raise HTTPException(status_code=400, detail=f"Failed to execute query: {exc}") from exc
+
+    if output_format == "ndjson":
+        return StreamingResponse(
+            _ndjson_stream(itertools.chain([first_page], pages)), media_type="application/x-ndjson"
         )
-    except HTTPException:
-        raise
+    return StreamingResponse(
+        _arrow_stream(itertools.chain([first_page], pages)),
+        media_type="application/vnd.apache.arrow.stream",
+    )
+
+
+@router.post("/query/page", response_model=SQLQueryResponse)
+async def query_predictions_metadata_page(request: SQLPageRequest):
+    """Return the next page of a paged SQL query."""
+    try:
+        page = await run_in_threadpool(query_cursors.fetch, request.page_token, request.page_size)
+    except CursorNotFound as exc:
+        raise HTTPException(status_code=410, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Failed to execute query: {exc}") from exc
-    finally:
-        store.close()
+    return _page_response(page)
+
+
+@router.delete("/query/{page_token}")
+async def close_predictions_query(page_token: str):
+    """Cancel a paged SQL query and release its cursor."""
+    if not await run_in_threadpool(query_cursors.close, page_token):
+        raise HTTPException(status_code=404, detail="Unknown or expired page token")
+    return {"success": True, "message": "Query cursor closed"}
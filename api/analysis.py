@@ -19,7 +19,9 @@ Note: For NIRS-specific feature selection (CARS, MCUVE), use those operators
 directly via nirs4all pipelines.
 """
 
+import asyncio
 import importlib.util
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -27,6 +29,9 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from .lazy_imports import get_cached, is_ml_ready
+from .shared.array_cache import array_fingerprint
+from .shared.embedding_cache import embedding_cache
+from .shared.pca_projection import pca_projection_service
 from .workspace_manager import workspace_manager
 
 SKLEARN_AVAILABLE = True
@@ -34,6 +39,12 @@ SKLEARN_AVAILABLE = True
 # Check umap availability without importing it (import takes 6+ seconds)
 UMAP_AVAILABLE = importlib.util.find_spec("umap") is not None
 
+# sklearn's minimum t-SNE iterations (also the floor for warm starts)
+TSNE_MIN_ITER = 250
+
+# Optimization epochs when UMAP starts from a previous embedding
+UMAP_WARM_START_EPOCHS = 100
+
 
 def _get_umap():
     """Lazy-load umap (6+ second import) — only when actually used."""
@@ -91,6 +102,7 @@ class TSNERequest(BaseModel):
     preprocessing_chain: list[dict[str, Any]] = Field(default=[])
     random_state: int | None = Field(42, description="Random seed")
     init: str = Field("pca", description="Initialization method: random, pca")
+    warm_start: bool = Field(False, description="Initialize from the previous embedding of the same data")
 
 
 class TSNEResult(BaseModel):
@@ -102,6 +114,8 @@ class TSNEResult(BaseModel):
     embedding: list[list[float]]  # (n_samples, n_components)
     kl_divergence: float | None = None
     n_iter: int
+    cached: bool = False
+    warm_started: bool = False
 
 
 class UMAPRequest(BaseModel):
@@ -115,6 +129,7 @@ class UMAPRequest(BaseModel):
     partition: str = Field("train", description="Dataset partition to use")
     preprocessing_chain: list[dict[str, Any]] = Field(default=[])
     random_state: int | None = Field(42, description="Random seed")
+    warm_start: bool = Field(False, description="Initialize from the previous embedding of the same data")
 
 
 class UMAPResult(BaseModel):
@@ -124,6 +139,16 @@ class UMAPResult(BaseModel):
     n_components: int
     n_samples: int
     embedding: list[list[float]]  # (n_samples, n_components)
+    cached: bool = False
+    warm_started: bool = False
+
+
+class EmbeddingJobResponse(BaseModel):
+    """Response for a submitted t-SNE / UMAP job."""
+
+    job_id: str
+    status: str
+    message: str
 
 
 class ImportanceRequest(BaseModel):
@@ -238,25 +263,15 @@ async def compute_pca(request: PCARequest):
     n_samples, n_features = X.shape
     n_components = min(request.n_components, n_samples, n_features)
 
-    # Optionally center and scale
-    X_processed = X.copy()
-    mean = None
-
-    if request.center:
-        mean = np.mean(X_processed, axis=0)
-        X_processed = X_processed - mean
-
-    if request.scale:
-        std = np.std(X_processed, axis=0)
-        std[std == 0] = 1  # Avoid division by zero
-        X_processed = X_processed / std
+    # PCA always centers; ``center`` only controls whether the mean is returned
+    mean = np.mean(X, axis=0) if request.center else None
 
-    # Compute PCA
-    pca = get_cached("PCA")(n_components=n_components)
-    scores = pca.fit_transform(X_processed)
+    # Shared fit: loadings, scree and chemometric metrics reuse it
+    pca = pca_projection_service.fit(X, n_components, scale=request.scale)
+    scores = pca.scores
 
     # Compute cumulative variance
-    cumulative = np.cumsum(pca.explained_variance_ratio_)
+    cumulative = np.cumsum(pca.explained_variance_ratio)
 
     return PCAResult(
         dataset_id=request.dataset_id,
@@ -264,9 +279,9 @@ async def compute_pca(request: PCARequest):
         n_samples=n_samples,
         n_features=n_features,
         scores=scores.tolist(),
-        loadings=pca.components_.tolist(),
-        explained_variance=pca.explained_variance_.tolist(),
-        explained_variance_ratio=pca.explained_variance_ratio_.tolist(),
+        loadings=pca.components.tolist(),
+        explained_variance=pca.explained_variance.tolist(),
+        explained_variance_ratio=pca.explained_variance_ratio.tolist(),
         cumulative_variance_ratio=cumulative.tolist(),
         wavelengths=wavelengths,
         mean=mean.tolist() if mean is not None else None,
@@ -302,18 +317,16 @@ async def get_pca_loadings(
             detail=f"Component index {component_index} out of range (max: {n_components - 1})",
         )
 
-    # Compute PCA
-    pca = get_cached("PCA")(n_components=n_components)
-    pca.fit(X)
+    pca = pca_projection_service.fit(X, n_components)
 
     # Get loadings for requested component
-    loadings = pca.components_[component_index]
+    loadings = pca.components[component_index]
 
     return {
         "dataset_id": dataset_id,
         "component_index": component_index,
         "n_components": n_components,
-        "explained_variance_ratio": float(pca.explained_variance_ratio_[component_index]),
+        "explained_variance_ratio": float(pca.explained_variance_ratio[component_index]),
         "wavelengths": wavelengths,
         "loadings": loadings.tolist(),
     }
@@ -342,15 +355,13 @@ async def get_scree_data(
     n_samples, n_features = X.shape
     n_components = min(max_components, n_samples, n_features)
 
-    # Compute PCA
-    pca = get_cached("PCA")(n_components=n_components)
-    pca.fit(X)
+    pca = pca_projection_service.fit(X, n_components)
 
     # Build scree data
     components = list(range(1, n_components + 1))
-    explained_variance = pca.explained_variance_.tolist()
-    explained_variance_ratio = pca.explained_variance_ratio_.tolist()
-    cumulative_variance_ratio = np.cumsum(pca.explained_variance_ratio_).tolist()
+    explained_variance = pca.explained_variance.tolist()
+    explained_variance_ratio = pca.explained_variance_ratio.tolist()
+    cumulative_variance_ratio = np.cumsum(pca.explained_variance_ratio).tolist()
 
     return {
         "dataset_id": dataset_id,
@@ -362,56 +373,92 @@ async def get_scree_data(
     }
 
 
-@router.post("/analysis/tsne", response_model=TSNEResult)
-async def compute_tsne(request: TSNERequest):
-    """
-    Compute t-SNE embedding on dataset spectra.
+def _run_tsne(
+    request: TSNERequest,
+    progress_callback: Callable[[float, str], bool],
+) -> TSNEResult | None:
+    """Compute (or fetch from the embedding cache) a t-SNE embedding.
 
-    t-SNE is useful for visualizing high-dimensional data in 2D or 3D.
+    Shared by the synchronous endpoint and the background job. Returns
+    None when cancelled.
     """
-    if not SKLEARN_AVAILABLE:
-        raise HTTPException(
-            status_code=501, detail="sklearn not available for t-SNE computation"
-        )
+    import numpy as np
 
     # Load dataset
     dataset, X, wavelengths = _load_analysis_data(
         request.dataset_id, request.partition, request.preprocessing_chain
     )
+    if not progress_callback(20, "Data loaded"):
+        return None
 
     n_samples = X.shape[0]
 
     # Adjust perplexity if needed
     perplexity = min(request.perplexity, (n_samples - 1) / 3)
+    params = {
+        "n_components": request.n_components,
+        "perplexity": perplexity,
+        "learning_rate": request.learning_rate,
+        "max_iter": request.n_iter,
+        "init": request.init if request.init in ("random", "pca") else "pca",
+        "random_state": request.random_state,
+    }
 
-    # Compute t-SNE
-    tsne = get_cached("TSNE")(
-        n_components=request.n_components,
-        perplexity=perplexity,
-        learning_rate=request.learning_rate,
-        max_iter=request.n_iter,
-        init=request.init if request.init in ("random", "pca") else "pca",
-        random_state=request.random_state,
-    )
+    fingerprint = array_fingerprint(X)
+    cached = embedding_cache.get("tsne", fingerprint, params)
+    if cached is not None:
+        embedding, info = cached
+        return TSNEResult(
+            dataset_id=request.dataset_id,
+            n_components=request.n_components,
+            n_samples=n_samples,
+            embedding=embedding.tolist(),
+            kl_divergence=info.get("kl_divergence"),
+            n_iter=info.get("n_iter", request.n_iter),
+            cached=True,
+        )
 
+    tsne_params = dict(params)
+    previous = embedding_cache.latest("tsne", fingerprint, request.n_components) if request.warm_start else None
+    if previous is not None and previous.shape[0] == n_samples:
+        # Same scale as sklearn's PCA initialization; the previous layout
+        # already has the global structure early exaggeration would build.
+        tsne_params["init"] = previous / np.std(previous[:, 0]) * 1e-4
+        tsne_params["early_exaggeration"] = 1.0
+        tsne_params["max_iter"] = max(TSNE_MIN_ITER, request.n_iter // 2)
+    else:
+        previous = None
+
+    if not progress_callback(30, "Computing t-SNE embedding..."):
+        return None
+    tsne = get_cached("TSNE")(**tsne_params)
     embedding = tsne.fit_transform(X)
 
+    kl_divergence = float(tsne.kl_divergence_) if hasattr(tsne, "kl_divergence_") else None
+    embedding_cache.put(
+        "tsne", fingerprint, params, embedding,
+        {"kl_divergence": kl_divergence, "n_iter": int(tsne.n_iter_)},
+    )
+
     return TSNEResult(
         dataset_id=request.dataset_id,
         n_components=request.n_components,
         n_samples=n_samples,
         embedding=embedding.tolist(),
-        kl_divergence=float(tsne.kl_divergence_) if hasattr(tsne, "kl_divergence_") else None,
+        kl_divergence=kl_divergence,
         n_iter=tsne.n_iter_,
+        warm_started=previous is not None,
     )
 
 
-@router.post("/analysis/umap", response_model=UMAPResult)
-async def compute_umap_endpoint(request: UMAPRequest):
-    """
-    Compute UMAP embedding on dataset spectra.
+def _run_umap(
+    request: UMAPRequest,
+    progress_callback: Callable[[float, str], bool],
+) -> UMAPResult | None:
+    """Compute (or fetch from the embedding cache) a UMAP embedding.
 
-    UMAP preserves both local and global structure better than t-SNE.
+    Shared by the synchronous endpoint and the background job. Returns
+    None when cancelled.
     """
     umap_mod = _get_umap()
     if umap_mod is None:
@@ -420,40 +467,173 @@ async def compute_umap_endpoint(request: UMAPRequest):
             detail="UMAP not available. Install umap-learn in Settings > Dependencies.",
         )
 
-    import numpy as np
-
     # Load dataset
     dataset, X, wavelengths = _load_analysis_data(
         request.dataset_id, request.partition, request.preprocessing_chain
     )
+    if not progress_callback(20, "Data loaded"):
+        return None
 
     n_samples = X.shape[0]
 
     # Adjust n_neighbors if needed
     n_neighbors = min(request.n_neighbors, n_samples - 1)
+    params = {
+        "n_components": request.n_components,
+        "n_neighbors": n_neighbors,
+        "min_dist": request.min_dist,
+        "metric": request.metric,
+        "random_state": request.random_state,
+    }
 
-    # Compute UMAP
-    try:
-        reducer = umap_mod.UMAP(
+    fingerprint = array_fingerprint(X)
+    cached = embedding_cache.get("umap", fingerprint, params)
+    if cached is not None:
+        return UMAPResult(
+            dataset_id=request.dataset_id,
             n_components=request.n_components,
-            n_neighbors=n_neighbors,
-            min_dist=request.min_dist,
-            metric=request.metric,
-            random_state=request.random_state,
-            n_jobs=-1,
+            n_samples=n_samples,
+            embedding=cached[0].tolist(),
+            cached=True,
         )
+
+    umap_params = dict(params)
+    previous = embedding_cache.latest("umap", fingerprint, request.n_components) if request.warm_start else None
+    if previous is not None and previous.shape[0] == n_samples:
+        umap_params["init"] = previous
+        umap_params["n_epochs"] = UMAP_WARM_START_EPOCHS
+    else:
+        previous = None
+
+    if not progress_callback(30, "Computing UMAP embedding..."):
+        return None
+    try:
+        reducer = umap_mod.UMAP(**umap_params, n_jobs=-1)
         embedding = reducer.fit_transform(X)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"UMAP computation failed: {e}")
 
+    embedding_cache.put("umap", fingerprint, params, embedding)
+
     return UMAPResult(
         dataset_id=request.dataset_id,
         n_components=request.n_components,
         n_samples=n_samples,
         embedding=embedding.tolist(),
+        warm_started=previous is not None,
     )
 
 
+def _run_embedding_task(job: Any, progress_callback: Callable[[float, str], bool]) -> dict[str, Any] | None:
+    """Background job wrapper around :func:`_run_tsne` / :func:`_run_umap`."""
+    config = dict(job.config)
+    if config.pop("method") == "tsne":
+        result = _run_tsne(TSNERequest.model_validate(config), progress_callback)
+    else:
+        result = _run_umap(UMAPRequest.model_validate(config), progress_callback)
+    return result.model_dump() if result is not None else None
+
+
+def _submit_embedding_job(method: str, request: BaseModel) -> EmbeddingJobResponse:
+    from .jobs import JobType, job_manager
+
+    job = job_manager.create_job(JobType.ANALYSIS, {"method": method, **request.model_dump()})
+    job_manager.submit_job(job, _run_embedding_task)
+    return EmbeddingJobResponse(job_id=job.id, status="running", message=f"{method.upper()} embedding started")
+
+
+@router.post("/analysis/tsne", response_model=TSNEResult)
+async def compute_tsne(request: TSNERequest):
+    """
+    Compute t-SNE embedding on dataset spectra.
+
+    t-SNE is useful for visualizing high-dimensional data in 2D or 3D.
+    Results are cached per (data, parameters); large datasets should use
+    ``POST /analysis/tsne/job`` instead.
+    """
+    if not SKLEARN_AVAILABLE:
+        raise HTTPException(
+            status_code=501, detail="sklearn not available for t-SNE computation"
+        )
+
+    return await asyncio.to_thread(_run_tsne, request, lambda _p, _m="": True)
+
+
+@router.post("/analysis/tsne/job", response_model=EmbeddingJobResponse)
+async def submit_tsne_job(request: TSNERequest):
+    """Start a t-SNE embedding as a background job.
+
+    Poll ``GET /analysis/embedding/jobs/{job_id}``; the result has the same
+    shape as ``POST /analysis/tsne``.
+    """
+    if not SKLEARN_AVAILABLE:
+        raise HTTPException(
+            status_code=501, detail="sklearn not available for t-SNE computation"
+        )
+
+    return _submit_embedding_job("tsne", request)
+
+
+@router.post("/analysis/umap", response_model=UMAPResult)
+async def compute_umap_endpoint(request: UMAPRequest):
+    """
+    Compute UMAP embedding on dataset spectra.
+
+    UMAP preserves both local and global structure better than t-SNE.
+    Results are cached per (data, parameters); large datasets should use
+    ``POST /analysis/umap/job`` instead.
+    """
+    return await asyncio.to_thread(_run_umap, request, lambda _p, _m="": True)
+
+
+@router.post("/analysis/umap/job", response_model=EmbeddingJobResponse)
+async def submit_umap_job(request: UMAPRequest):
+    """Start a UMAP embedding as a background job.
+
+    Poll ``GET /analysis/embedding/jobs/{job_id}``; the result has the same
+    shape as ``POST /analysis/umap``.
+    """
+    if not UMAP_AVAILABLE:
+        raise HTTPException(
+            status_code=501,
+            detail="UMAP not available. Install umap-learn in Settings > Dependencies.",
+        )
+
+    return _submit_embedding_job("umap", request)
+
+
+@router.get("/analysis/embedding/jobs/{job_id}")
+async def get_embedding_job(job_id: str):
+    """Get status, progress and result of a t-SNE / UMAP job."""
+    from .jobs import job_manager
+
+    job = job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job.to_dict()
+
+
+@router.post("/analysis/embedding/jobs/{job_id}/cancel")
+async def cancel_embedding_job(job_id: str):
+    """Request cancellation of a t-SNE / UMAP job.
+
+    Cancellation takes effect between stages; a running fit completes but
+    its result is discarded.
+    """
+    from .jobs import JobStatus, job_manager
+
+    job = job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if job.status not in (JobStatus.PENDING, JobStatus.RUNNING):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Job '{job_id}' is not running (status: {job.status.value})",
+        )
+    job_manager.cancel_job(job_id)
+    return {"success": True, "job_id": job_id, "status": job.status.value}
+
+
 @router.post("/analysis/importance", response_model=ImportanceResult)
 async def feature_importance(request: ImportanceRequest):
     """
@@ -933,7 +1113,7 @@ def _load_analysis_data(
     Returns:
         Tuple of (dataset, X, wavelengths)
     """
-    from .spectra import _apply_preprocessing_chain, _load_dataset
+    from .spectra import _apply_preprocessing_chain, _dataset_data_key, _load_dataset
 
     dataset = _load_dataset(dataset_id)
     if not dataset:
@@ -962,6 +1142,6 @@ def _load_analysis_data(
 
     # Apply preprocessing
     if preprocessing_chain:
-        X = _apply_preprocessing_chain(X, preprocessing_chain)
+        X = _apply_preprocessing_chain(X, preprocessing_chain, _dataset_data_key(dataset, partition, "2d"))
 
     return dataset, X, wavelengths
@@ -10,13 +10,15 @@ Phase 6 Implementation:
 - Best model selection
 - Search space configuration
 
-Refactored to use nirs4all pipeline generators (_or_, _range_, _log_range_)
-instead of manual random search. Uses nirs4all.run() for training and
-RunResult.export() for model saving.
+Trials are sampled from the search space and evaluated as parallel units
+(see shared.automl_search), with successive halving over CV folds and
+per-trial streaming. The best configuration is refit with nirs4all.run()
+and saved with RunResult.export().
 """
 
 from __future__ import annotations
 
+import os
 import time
 from collections.abc import Callable
 from datetime import datetime
@@ -27,6 +29,12 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
 from .jobs import Job, JobStatus, JobType, job_manager
+from .shared.automl_search import (
+    DEFAULT_HALVING_FACTOR,
+    SuccessiveHalvingSearch,
+    TrialCandidate,
+    sample_candidates,
+)
 from .shared.logger import get_logger
 from .workspace_manager import workspace_manager
 
@@ -36,6 +44,9 @@ from .lazy_imports import get_cached, is_ml_ready, require_ml_ready
 
 NIRS4ALL_AVAILABLE = True
 
+# Trials evaluated concurrently within one search (unless requested otherwise)
+DEFAULT_PARALLEL_TRIALS = min(4, os.cpu_count() or 1)
+
 
 router = APIRouter()
 
@@ -88,6 +99,15 @@ class AutoMLRequest(BaseModel):
     include_preprocessing_search: bool = Field(
         False, description="Include preprocessing in search"
     )
+    early_stopping: bool = Field(
+        True, description="Prune weak trials early (successive halving over CV folds)"
+    )
+    halving_factor: int = Field(
+        DEFAULT_HALVING_FACTOR, ge=2, le=5, description="Fraction of trials kept per rung (1/factor)"
+    )
+    n_parallel: int | None = Field(
+        None, ge=1, le=32, description="Trials evaluated concurrently (defaults to min(4, CPU count))"
+    )
 
 
 class TrialResult(BaseModel):
@@ -98,6 +118,7 @@ class TrialResult(BaseModel):
     params: dict[str, Any]
     score: float
     std: float | None = None
+    folds_evaluated: int | None = None
     duration_seconds: float
     status: str  # "completed", "failed", "pruned"
     error: str | None = None
@@ -308,6 +329,9 @@ async def start_automl(request: AutoMLRequest):
         "preprocessing_chain": request.preprocessing_chain,
         "models": enabled_models,
         "include_preprocessing_search": request.include_preprocessing_search,
+        "early_stopping": request.early_stopping,
+        "halving_factor": request.halving_factor,
+        "n_parallel": request.n_parallel,
         "workspace_path": workspace.path,
     }
 
@@ -418,7 +442,8 @@ async def get_automl_results(job_id: str):
         )
 
     result = job.result or {}
-    trials = result.get("trials", [])
+    # A stopped search has no result; its trials were streamed to the history
+    trials = result.get("trials", job.history)
 
     return AutoMLResults(
         job_id=job.id,
@@ -433,6 +458,7 @@ async def get_automl_results(job_id: str):
                 params=t.get("params", {}),
                 score=t.get("score", 0.0),
                 std=t.get("std"),
+                folds_evaluated=t.get("folds_evaluated"),
                 duration_seconds=t.get("duration_seconds", 0.0),
                 status=t.get("status", "unknown"),
                 error=t.get("error"),
@@ -538,77 +564,7 @@ async def list_available_models(task_type: str = "regression"):
     }
 
 
-# ============= Pipeline Generator Helpers =============
-
-
-def _build_model_generator_step(models_config: list[dict[str, Any]], n_trials: int) -> dict[str, Any]:
-    """
-    Build a pipeline model step using nirs4all generator syntax.
-
-    Converts AutoML search space configuration to nirs4all's _or_ and _range_/_log_range_
-    generator keywords for automated hyperparameter search.
-
-    Args:
-        models_config: List of model configurations with search spaces
-        n_trials: Maximum number of trials (used for count limiting)
-
-    Returns:
-        Pipeline step dict using generator syntax
-    """
-    model_choices = []
-
-    for model_config in models_config:
-        model_name = model_config["model_name"]
-        params = model_config.get("params", [])
-
-        # Build the model class reference
-        model_class = _get_model_class(model_name)
-        if model_class is None:
-            continue
-
-        if not params:
-            # No hyperparameters to tune - use model directly
-            model_choices.append(model_class)
-        else:
-            # Build parameter generators using nirs4all syntax
-            param_generators = {}
-            for p in params:
-                param_name = p.get("name")
-                p_type = p.get("type", "float")
-
-                if p_type == "categorical":
-                    choices = p.get("choices", [])
-                    if choices:
-                        param_generators[param_name] = {"_or_": choices}
-
-                elif p_type == "int":
-                    low = int(p.get("low", 1))
-                    high = int(p.get("high", 100))
-                    if p.get("log", False):
-                        # Use log range for log-scale parameters
-                        param_generators[param_name] = {"_log_range_": [low, high, 10]}
-                    else:
-                        # Use range with step calculated for reasonable coverage
-                        step = max(1, (high - low) // 10)
-                        param_generators[param_name] = {"_range_": [low, high, step]}
-
-                elif p_type == "float":
-                    low = float(p.get("low", 0.0))
-                    high = float(p.get("high", 1.0))
-                    if p.get("log", False):
-                        # Use log range for log-scale parameters
-                        param_generators[param_name] = {"_log_range_": [low, high, 10]}
-                    else:
-                        # Use range with 10 steps
-                        step = (high - low) / 10
-                        param_generators[param_name] = {"_range_": [low, high, step]}
-
-            # Create model config dict with parameter generators
-            model_step = {"class": model_class, **param_generators}
-            model_choices.append(model_step)
-
-    # Wrap in _or_ generator with count limit
-    return {"model": {"_or_": model_choices}, "count": n_trials}
+# ============= Search Helpers =============
 
 
 def _get_model_class(model_name: str):
@@ -654,22 +610,117 @@ def _get_model_class(model_name: str):
 # ============= AutoML Task Implementation =============
 
 
+def _build_preprocessing_steps(preprocessing_chain: list[dict[str, Any]] | None) -> list[Any]:
+    """Instantiate the fixed preprocessing chain (unknown steps are skipped)."""
+    steps = []
+    for step in preprocessing_chain or []:
+        transformer_class = _get_transformer_class(step.get("name", ""))
+        if transformer_class:
+            steps.append(transformer_class(**step.get("params", {})))
+    return steps
+
+
+def _make_estimator_builder(preprocessing_steps: list[Any]) -> Callable[[TrialCandidate], Any]:
+    """Build a fresh preprocessing + model pipeline for each trial fold."""
+    from sklearn.base import clone
+    from sklearn.pipeline import make_pipeline
+
+    model_classes: dict[str, Any] = {}
+
+    def build(candidate: TrialCandidate) -> Any:
+        if candidate.model_name not in model_classes:
+            model_classes[candidate.model_name] = _get_model_class(candidate.model_name)
+        model_class = model_classes[candidate.model_name]
+        if model_class is None:
+            raise ValueError(f"Unknown model '{candidate.model_name}'")
+        return make_pipeline(*(clone(step) for step in preprocessing_steps), model_class(**candidate.params))
+
+    return build
+
+
+def _load_training_data(dataset: Any, partition: str) -> tuple[Any, Any]:
+    """Spectra and targets of a dataset partition as numpy arrays.
+
+    The sources of a multi-source dataset are concatenated along the
+    feature axis, as nirs4all does for 2D models.
+    """
+    import numpy as np
+
+    selector = {"partition": partition}
+    X = dataset.x(selector, layout="2d")
+    if isinstance(X, list):
+        X = np.concatenate([np.asarray(source) for source in X], axis=1)
+    y = dataset.y(selector)
+    if y is None:
+        raise ValueError("Dataset has no target values for AutoML")
+    y = np.asarray(y)
+    if y.ndim > 1:
+        y = y[:, 0]
+    return np.asarray(X), y
+
+
+def _export_best_model(
+    job: Job,
+    dataset: Any,
+    best: TrialCandidate,
+    preprocessing_steps: list[Any],
+    config: dict[str, Any],
+) -> str | None:
+    """Refit the best configuration with nirs4all and export it as a bundle."""
+    workspace_path = config.get("workspace_path")
+    model_class = _get_model_class(best.model_name)
+    if not workspace_path or model_class is None:
+        return None
+
+    from sklearn.model_selection import KFold
+
+    random_state = config.get("random_state", 42)
+    pipeline_steps = [
+        *preprocessing_steps,
+        KFold(n_splits=config.get("cv_folds", 5), shuffle=True, random_state=random_state),
+        {"model": model_class(**best.params)},
+    ]
+    try:
+        result = get_cached("nirs4all").run(
+            pipeline=pipeline_steps,
+            dataset=dataset,
+            verbose=0,
+            save_artifacts=True,
+            random_state=random_state,
+            workspace_path=workspace_path,
+        )
+        models_dir = Path(workspace_path) / "models"
+        models_dir.mkdir(exist_ok=True)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        export_path = models_dir / f"automl_{best.model_name}_{job.id}_{timestamp}.n4a"
+        result.export(str(export_path))
+        return str(export_path)
+    except Exception as e:
+        logger.error("Error exporting AutoML model: %s", e)
+        return None
+
+
 def _run_automl_task(
     job: Job,
     progress_callback: Callable[[float, str], bool],
-) -> dict[str, Any]:
+) -> dict[str, Any] | None:
     """
-    Execute the AutoML search task using nirs4all.run() with generator pipelines.
+    Execute the AutoML search task trial by trial.
 
-    This function runs in a background thread and performs hyperparameter
-    optimization using nirs4all's built-in generator expansion and cross-validation.
+    Candidates are evaluated as independent units on a small thread pool,
+    with successive halving over the CV folds when early stopping is on.
+    Every finished trial (completed, pruned or failed) is recorded in the
+    job history and streamed over WebSocket right away. Cancellation is
+    honoured between trials. The best configuration is then refit with
+    nirs4all.run() and exported with RunResult.export().
 
     Args:
         job: The job instance
         progress_callback: Callback to report progress
 
     Returns:
-        AutoML result dictionary
+        AutoML result dictionary, or None when the job was cancelled
     """
     config = job.config
     start_time = time.time()
@@ -681,126 +732,79 @@ def _run_automl_task(
     if not dataset:
         raise ValueError(f"Dataset '{config['dataset_id']}' not found")
 
-    # Get configuration
     n_trials = config.get("n_trials", 50)
-    cv_folds = config.get("cv_folds", 5)
     random_state = config.get("random_state", 42)
-    models_config = config.get("models", [])
-    preprocessing_chain = config.get("preprocessing_chain")
-    workspace_path = config.get("workspace_path")
-
-    progress_callback(5.0, "Building pipeline with generators...")
-
-    # Build pipeline using generator syntax
-    pipeline_steps = []
-
-    # Add preprocessing if specified
-    if preprocessing_chain:
-        for step in preprocessing_chain:
-            step_name = step.get("name", "")
-            step_params = step.get("params", {})
-            transformer_class = _get_transformer_class(step_name)
-            if transformer_class:
-                pipeline_steps.append(transformer_class(**step_params))
-
-    # Add cross-validation splitter
-    from sklearn.model_selection import KFold
-    pipeline_steps.append(KFold(n_splits=cv_folds, shuffle=True, random_state=random_state))
 
-    # Build model generator step
-    model_step = _build_model_generator_step(models_config, n_trials)
-    pipeline_steps.append(model_step)
+    progress_callback(2.0, "Preparing search...")
+
+    X, y = _load_training_data(dataset, config.get("partition", "train"))
+    preprocessing_steps = _build_preprocessing_steps(config.get("preprocessing_chain"))
+    known_models = [m for m in config.get("models", []) if _get_model_class(m["model_name"]) is not None]
+    candidates = sample_candidates(known_models, n_trials, random_state)
+    if not candidates:
+        raise ValueError("No valid models to search")
+
+    search = SuccessiveHalvingSearch(
+        X,
+        y,
+        _make_estimator_builder(preprocessing_steps),
+        metric=config.get("metric", "r2"),
+        task_type=config.get("task_type", "regression"),
+        cv_folds=config.get("cv_folds", 5),
+        random_state=random_state,
+        n_workers=config.get("n_parallel") or DEFAULT_PARALLEL_TRIALS,
+        early_stopping=config.get("early_stopping", True),
+        halving_factor=config.get("halving_factor", DEFAULT_HALVING_FACTOR),
+        timeout_seconds=config.get("timeout_seconds"),
+    )
 
-    progress_callback(10.0, f"Running {n_trials} trial configurations...")
+    finished: list[TrialCandidate] = []
 
-    # Run pipeline using nirs4all.run()
-    try:
-        result = get_cached("nirs4all").run(
-            pipeline=pipeline_steps,
-            dataset=dataset,
-            verbose=0,
-            save_artifacts=True,
-            random_state=random_state,
-            max_generation_count=n_trials,
-            workspace_path=workspace_path,
+    def on_trial(candidate: TrialCandidate) -> None:
+        finished.append(candidate)
+        trial = candidate.to_dict()
+        best = search.best(finished)
+        job_manager.append_history(job.id, trial)
+        job_manager.update_job_metrics(
+            job.id,
+            {
+                "trials_completed": len(finished),
+                "best_score": best.score if best else None,
+                "best_model": best.model_name if best else None,
+            },
+            append_history=False,
         )
-    except Exception as e:
-        raise ValueError(f"Pipeline execution failed: {e}")
-
-    progress_callback(90.0, "Processing results...")
-
-    # Extract trials from predictions
-    trials = []
-    all_predictions = result.predictions.top(n=n_trials * 10)  # Get all predictions
-
-    for idx, pred in enumerate(all_predictions):
-        model_name = pred.get("model_name", "Unknown")
-        params = pred.get("model_params", {})
-        test_score = pred.get("test_score", 0.0)
-        scores = pred.get("scores", {})
-        test_scores = scores.get("test", {}) if isinstance(scores, dict) else {}
-
-        trials.append({
-            "trial_id": idx,
-            "model_name": model_name,
-            "params": params,
-            "score": float(test_score) if test_score else 0.0,
-            "std": None,  # CV std not directly available from predictions
-            "duration_seconds": 0.0,  # Timing not tracked per-trial in batch mode
-            "status": "completed",
-            "error": None,
-        })
-
-        # Update job metrics periodically
-        if idx % 10 == 0:
-            job_manager.update_job_metrics(
-                job.id,
-                {
-                    "trials_completed": idx + 1,
-                    "best_score": result.best_score if result.best else None,
-                    "best_model": result.best.get("model_name") if result.best else None,
-                },
-            )
-            progress = 10.0 + (idx / len(all_predictions)) * 80.0
-            if not progress_callback(progress, f"Processed {idx + 1} trials..."):
-                break
-
-    # Get best result
-    best = result.best
-    best_score = result.best_score if best else 0.0
-    best_model_name = best.get("model_name", "Unknown") if best else "Unknown"
-    best_params = best.get("model_params", {}) if best else {}
+        _send_trial_notification(job.id, trial, len(finished), len(candidates))
 
-    # Export best model using RunResult.export()
-    model_path = None
-    if best and workspace_path:
-        try:
-            models_dir = Path(workspace_path) / "models"
-            models_dir.mkdir(exist_ok=True)
+    def should_continue(progress: float, message: str) -> bool:
+        return progress_callback(5.0 + 0.85 * progress, message)
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            model_filename = f"automl_{best_model_name}_{job.id}_{timestamp}.n4a"
-            export_path = models_dir / model_filename
+    search.run(candidates, on_trial, should_continue)
+    if search.cancelled:
+        return None
 
-            result.export(str(export_path))
-            model_path = str(export_path)
-        except Exception as e:
-            logger.error("Error exporting AutoML model: %s", e)
+    best = search.best(candidates)
+    model_path = None
+    if best is not None:
+        progress_callback(92.0, f"Exporting best model ({best.model_name})...")
+        model_path = _export_best_model(job, dataset, best, preprocessing_steps, config)
 
     progress_callback(100.0, "AutoML search complete")
 
-    # Sort trials by score
+    trials = [c.to_dict() for c in search.ranked(candidates)]
     completed_trials = [t for t in trials if t["status"] == "completed"]
-    completed_trials.sort(key=lambda t: t["score"], reverse=True)
 
     return {
-        "best_score": float(best_score) if best_score else 0.0,
-        "best_model": best_model_name,
-        "best_params": best_params,
-        "trials": completed_trials,
+        "best_score": float(best.score) if best else 0.0,
+        "best_model": best.model_name if best else "Unknown",
+        "best_params": best.params if best else {},
+        "trials": trials,
         "model_path": model_path,
         "total_trials": len(trials),
         "completed_trials": len(completed_trials),
+        "pruned_trials": sum(t["status"] == "pruned" for t in trials),
+        "failed_trials": sum(t["status"] == "failed" for t in trials),
+        "timed_out": search.timed_out,
         "search_duration_seconds": time.time() - start_time,
     }
 
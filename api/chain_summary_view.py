@@ -0,0 +1,555 @@
+"""
+Materialized chain-summary view for the Results and Inspector pages.
+
+``v_chain_summary`` rows need several webapp-side enrichments before they are
+served (refit-only marking, fold artifacts, CV inheritance for refit chains,
+synthetic refit fallback, pipeline-derived variant params). Doing that per
+request costs O(chains x datasets) Python work. This module persists the
+enriched rows once into a small SQLite database next to the workspace store
+(``<workspace>/.nirs4all/chain_summary_view.sqlite``) with indexed filter and
+score columns, so result pages read it with an indexed scan.
+
+The view is maintained incrementally per run:
+
+- a cheap file signature of ``store.sqlite`` (and its WAL) tells whether
+  anything changed since the last sync;
+- if it did, one aggregate query returns a signature per run, and only runs
+  whose signature changed (or disappeared) are re-materialized.
+
+Run completion and prediction/run deletion call :func:`sync_chain_summary_view`
+so the next page load is already fresh; the signature check on read is the
+correctness backstop. Legacy DuckDB stores are not materialized and callers
+fall back to querying the store directly.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from .shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+VIEW_FILENAME = "chain_summary_view.sqlite"
+
+_FORMAT_VERSION = 2
+
+# Runs re-materialized per store query (keeps IN (...) lists bounded)
+_RUN_BATCH_SIZE = 200
+
+FILTER_COLUMNS = ("run_id", "pipeline_id", "chain_id", "dataset_name", "model_class", "metric", "task_type")
+
+# Filter columns stored next to the chain_id primary key
+_ROW_COLUMNS = (*(col for col in FILTER_COLUMNS if col != "chain_id"), "preprocessings")
+SCORE_COLUMNS = ("cv_val_score", "cv_test_score", "cv_train_score", "final_test_score", "final_train_score")
+
+# Columns the Inspector chain list can be sorted by
+SORT_COLUMNS = (*FILTER_COLUMNS, "preprocessings", *SCORE_COLUMNS)
+
+# Facet name -> column for the Inspector filter dropdowns
+FACET_COLUMNS = {"metrics": "metric", "models": "model_class", "datasets": "dataset_name", "runs": "run_id"}
+
+# Deprecated ranking aliases accepted by WorkspaceStore.query_top_chains
+_SCORE_COLUMN_ALIASES = {
+    "avg_val_score": "cv_val_score",
+    "avg_test_score": "cv_test_score",
+    "avg_train_score": "cv_train_score",
+    "min_val_score": "cv_val_score",
+    "max_val_score": "cv_val_score",
+    "min_test_score": "cv_test_score",
+    "max_test_score": "cv_test_score",
+    "min_train_score": "cv_train_score",
+    "max_train_score": "cv_train_score",
+}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS run_signatures (
+    run_id TEXT PRIMARY KEY,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chain_summary (
+    chain_id TEXT PRIMARY KEY,
+    run_id TEXT,
+    pipeline_id TEXT,
+    dataset_name TEXT,
+    model_class TEXT,
+    metric TEXT,
+    task_type TEXT,
+    preprocessings TEXT,
+    {", ".join(f"{col} REAL" for col in SCORE_COLUMNS)},
+    aggregated TEXT NOT NULL,
+    inspector TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chain_preprocessing_steps (
+    chain_id TEXT NOT NULL,
+    step TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cs_run ON chain_summary(run_id);
+CREATE INDEX IF NOT EXISTS idx_cs_pipeline ON chain_summary(pipeline_id);
+CREATE INDEX IF NOT EXISTS idx_cs_dataset ON chain_summary(dataset_name);
+CREATE INDEX IF NOT EXISTS idx_cs_model ON chain_summary(model_class);
+CREATE INDEX IF NOT EXISTS idx_cs_metric ON chain_summary(metric);
+CREATE INDEX IF NOT EXISTS idx_cps_chain ON chain_preprocessing_steps(chain_id);
+CREATE INDEX IF NOT EXISTS idx_cps_step ON chain_preprocessing_steps(step);
+"""
+
+# One row per run; any change to a run's chains, scores, fold artifacts or
+# pipeline status changes its signature. Mirrors the v_chain_summary filter.
+_RUN_SIGNATURE_SQL = """
+SELECT
+    pl.run_id AS run_id,
+    COUNT(*) AS n_chains,
+    SUM(LENGTH(c.chain_id)) AS id_len,
+    COALESCE(SUM(c.cv_val_score), 0) AS cv_val,
+    COALESCE(SUM(c.cv_test_score), 0) AS cv_test,
+    COALESCE(SUM(c.cv_train_score), 0) AS cv_train,
+    COALESCE(SUM(c.cv_fold_count), 0) AS cv_folds,
+    COALESCE(SUM(c.final_test_score), 0) AS final_test,
+    COALESCE(SUM(c.final_train_score), 0) AS final_train,
+    COALESCE(SUM(LENGTH(c.cv_scores)), 0) AS cv_scores_len,
+    COALESCE(SUM(LENGTH(c.final_scores)), 0) AS final_scores_len,
+    COALESCE(SUM(LENGTH(c.fold_artifacts)), 0) AS artifacts_len,
+    COALESCE(SUM(LENGTH(c.best_params)), 0) AS params_len,
+    COALESCE(SUM(LENGTH(pl.status)), 0) AS status_len,
+    COALESCE(SUM(LENGTH(pl.name)), 0) AS name_len
+FROM chains c
+JOIN pipelines pl ON c.pipeline_id = pl.pipeline_id
+WHERE EXISTS (SELECT 1 FROM predictions p WHERE p.chain_id = c.chain_id)
+GROUP BY pl.run_id
+"""
+
+
+def store_file_signature(workspace_path: Path) -> str | None:
+    """Return a cheap signature of the SQLite store files, or None."""
+    parts = []
+    for name in ("store.sqlite", "store.sqlite-wal"):
+        try:
+            st = (workspace_path / name).stat()
+        except OSError:
+            if name == "store.sqlite":
+                return None
+            continue
+        parts.append(f"{name}:{st.st_mtime_ns}:{st.st_size}")
+    return "|".join(parts)
+
+
+def _json_dumps(value: Any) -> str:
+    return json.dumps(value, default=str, separators=(",", ":"))
+
+
+def _append_filter(conditions: list[str], params: list[Any], column: str, value: Any) -> None:
+    """Same semantics as the store filters: lists -> IN, '%' -> LIKE, else =."""
+    if value is None:
+        return
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return
+        if len(value) == 1:
+            conditions.append(f"{column} = ?")
+            params.append(value[0])
+        else:
+            conditions.append(f"{column} IN ({', '.join('?' for _ in value)})")
+            params.extend(value)
+    elif isinstance(value, str) and "%" in value:
+        conditions.append(f"{column} LIKE ?")
+        params.append(value)
+    else:
+        conditions.append(f"{column} = ?")
+        params.append(value)
+
+
+class ChainSummaryView:
+    """Materialized, incrementally maintained chain summaries of one workspace."""
+
+    def __init__(self, workspace_path: Path):
+        self.workspace_path = Path(workspace_path)
+        self.db_path = self.workspace_path / ".nirs4all" / VIEW_FILENAME
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        # (store generation, facets) of the last facets() call
+        self._facets: tuple[str | None, dict[str, list[str]]] | None = None
+
+    # ----------------------------------------------------------------- storage
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        ready = self._schema_ready and self.db_path.exists()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if ready:
+            return conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        row = conn.execute("SELECT value FROM meta WHERE key = 'format_version'").fetchone()
+        if row is None or row[0] != str(_FORMAT_VERSION):
+            # Layout changed: rebuild from scratch on the next sync
+            with conn:
+                for table in ("chain_summary", "chain_preprocessing_steps", "run_signatures", "meta"):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.executescript(_SCHEMA)
+            with conn:
+                conn.execute("INSERT INTO meta(key, value) VALUES ('format_version', ?)", (str(_FORMAT_VERSION),))
+        self._schema_ready = True
+        return conn
+
+    def _stored_store_signature(self, conn: sqlite3.Connection) -> str | None:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'store_signature'").fetchone()
+        return row[0] if row else None
+
+    # -------------------------------------------------------------------- sync
+
+    def sync(self, store: Any, *, force: bool = False) -> int:
+        """Bring the view up to date with ``store``.
+
+        Returns the number of runs re-materialized (0 when already fresh).
+        """
+        with self._lock:
+            conn = self._connect()
+            try:
+                current = store_file_signature(self.workspace_path)
+                if not force and current is not None and current == self._stored_store_signature(conn):
+                    return 0
+
+                run_signatures = self._fetch_run_signatures(store)
+                stored = dict(conn.execute("SELECT run_id, signature FROM run_signatures").fetchall())
+                changed = [run_id for run_id, sig in run_signatures.items() if force or stored.get(run_id) != sig]
+                removed = [run_id for run_id in stored if run_id not in run_signatures]
+
+                for start in range(0, len(changed), _RUN_BATCH_SIZE):
+                    batch = changed[start:start + _RUN_BATCH_SIZE]
+                    aggregated, inspector = _materialize_runs(store, batch)
+                    self._replace_runs(conn, batch, aggregated, inspector, run_signatures)
+                if removed:
+                    self._replace_runs(conn, removed, [], [], {})
+
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta(key, value) VALUES ('store_signature', ?)",
+                        (current,),
+                    )
+                if changed or removed:
+                    self._facets = None
+                    logger.debug(
+                        "Chain summary view synced for %s: %d run(s) refreshed, %d removed",
+                        self.workspace_path, len(changed), len(removed),
+                    )
+                return len(changed) + len(removed)
+            finally:
+                conn.close()
+
+    @staticmethod
+    def _fetch_run_signatures(store: Any) -> dict[str, str]:
+        df = store._fetch_pl(_RUN_SIGNATURE_SQL)
+        signatures: dict[str, str] = {}
+        for row in df.iter_rows(named=True):
+            run_id = row.pop("run_id")
+            if run_id:
+                signatures[str(run_id)] = _json_dumps(row)
+        return signatures
+
+    @staticmethod
+    def _replace_runs(
+        conn: sqlite3.Connection,
+        run_ids: list[str],
+        aggregated: list[dict[str, Any]],
+        inspector: list[dict[str, Any]],
+        run_signatures: dict[str, str],
+    ) -> None:
+        placeholders = ", ".join("?" for _ in run_ids)
+        inspector_by_chain = {record.get("chain_id"): record for record in inspector}
+        with conn:
+            conn.execute(
+                "DELETE FROM chain_preprocessing_steps WHERE chain_id IN "
+                f"(SELECT chain_id FROM chain_summary WHERE run_id IN ({placeholders}))",
+                run_ids,
+            )
+            conn.execute(f"DELETE FROM chain_summary WHERE run_id IN ({placeholders})", run_ids)
+            conn.execute(f"DELETE FROM run_signatures WHERE run_id IN ({placeholders})", run_ids)
+
+            rows = []
+            step_rows = []
+            for record in aggregated:
+                chain_id = record.get("chain_id")
+                if not chain_id:
+                    continue
+                inspector_record = inspector_by_chain.get(chain_id, record)
+                raw_scores = record.get("_raw_scores") or {}
+                rows.append((
+                    chain_id,
+                    *(record.get(col) for col in _ROW_COLUMNS),
+                    *(raw_scores.get(col) for col in SCORE_COLUMNS),
+                    _json_dumps({k: v for k, v in record.items() if k != "_raw_scores"}),
+                    _json_dumps(inspector_record),
+                ))
+                for step in inspector_record.get("preprocessing_steps") or []:
+                    step_rows.append((chain_id, str(step)))
+
+            columns = ("chain_id", *_ROW_COLUMNS, *SCORE_COLUMNS, "aggregated", "inspector")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO chain_summary({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                rows,
+            )
+            conn.executemany("INSERT INTO chain_preprocessing_steps(chain_id, step) VALUES (?, ?)", step_rows)
+            conn.executemany(
+                "INSERT OR REPLACE INTO run_signatures(run_id, signature) VALUES (?, ?)",
+                [(run_id, run_signatures[run_id]) for run_id in run_ids if run_id in run_signatures],
+            )
+
+    # ------------------------------------------------------------------- reads
+
+    def query(self, *, kind: str = "aggregated", **filters: Any) -> list[dict[str, Any]]:
+        """Return enriched records matching ``filters`` ordered by chain_id.
+
+        ``kind`` selects the record flavour: ``"aggregated"`` (Results pages)
+        or ``"inspector"`` (Inspector normalization).
+        """
+        payload_column = "inspector" if kind == "inspector" else "aggregated"
+        conditions: list[str] = []
+        params: list[Any] = []
+        for column in FILTER_COLUMNS:
+            _append_filter(conditions, params, column, filters.get(column))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT {payload_column} FROM chain_summary{where} ORDER BY chain_id ASC"
+        conn = self._connect()
+        try:
+            return [json.loads(row[0]) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def top(
+        self,
+        *,
+        metric: str | None,
+        n: int,
+        score_column: str = "cv_val_score",
+        ascending: bool | None = None,
+        **filters: Any,
+    ) -> list[dict[str, Any]]:
+        """Rank aggregated records by a raw score column (store semantics)."""
+        resolved = _SCORE_COLUMN_ALIASES.get(score_column, score_column)
+        if resolved not in SCORE_COLUMNS:
+            raise ValueError(f"Invalid score column: {score_column!r}")
+        if ascending is None:
+            ascending = _infer_ascending(metric)
+
+        conditions: list[str] = []
+        params: list[Any] = []
+        if metric is not None:
+            conditions.append("metric = ?")
+            params.append(metric)
+        for column in ("run_id", "pipeline_id", "dataset_name", "model_class"):
+            _append_filter(conditions, params, column, filters.get(column))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        direction = "ASC" if ascending else "DESC"
+        sql = (
+            f"SELECT aggregated FROM chain_summary{where} "
+            f"ORDER BY ({resolved} IS NULL), {resolved} {direction}, chain_id ASC LIMIT ?"
+        )
+        conn = self._connect()
+        try:
+            return [json.loads(row[0]) for row in conn.execute(sql, [*params, int(n)])]
+        finally:
+            conn.close()
+
+    def page(
+        self,
+        *,
+        kind: str = "inspector",
+        task_type: str | None = None,
+        preprocessings: list[str] | None = None,
+        sort_by: str | None = None,
+        descending: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        **filters: Any,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Return one sorted page of records plus the total match count.
+
+        ``task_type`` uses the Inspector's broad matching ("classification"
+        matches every classification variant) and ``preprocessings`` keeps
+        chains whose preprocessing string contains, or whose split steps
+        include, any of the given values. Nulls sort last; ties are broken
+        by chain_id.
+        """
+        sort_column = sort_by or "chain_id"
+        if sort_column not in SORT_COLUMNS:
+            raise ValueError(f"Invalid sort column: {sort_by!r}")
+        payload_column = "inspector" if kind == "inspector" else "aggregated"
+
+        conditions: list[str] = []
+        params: list[Any] = []
+        for column in FILTER_COLUMNS:
+            if column != "task_type":
+                _append_filter(conditions, params, column, filters.get(column))
+        if task_type:
+            expected = task_type.strip().lower()
+            conditions.append("TRIM(COALESCE(task_type, '')) != ''")
+            if expected in ("classification", "regression"):
+                conditions.append("INSTR(LOWER(task_type), ?) > 0")
+            else:
+                conditions.append("LOWER(TRIM(task_type)) = ?")
+            params.append(expected)
+        if preprocessings:
+            placeholders = ", ".join("?" for _ in preprocessings)
+            substring = " OR ".join("INSTR(COALESCE(preprocessings, ''), ?) > 0" for _ in preprocessings)
+            conditions.append(
+                f"({substring} OR chain_id IN "
+                f"(SELECT chain_id FROM chain_preprocessing_steps WHERE step IN ({placeholders})))"
+            )
+            params.extend(str(p) for p in preprocessings)
+            params.extend(str(p) for p in preprocessings)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        direction = "DESC" if descending else "ASC"
+        sql = (
+            f"SELECT {payload_column} FROM chain_summary{where} "
+            f"ORDER BY ({sort_column} IS NULL), {sort_column} {direction}, chain_id ASC"
+        )
+        page_params = list(params)
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            page_params.extend([int(limit), int(offset)])
+        elif offset:
+            sql += " LIMIT -1 OFFSET ?"
+            page_params.append(int(offset))
+
+        conn = self._connect()
+        try:
+            records = [json.loads(row[0]) for row in conn.execute(sql, page_params)]
+            if limit is None and not offset:
+                total = len(records)
+            else:
+                total = conn.execute(f"SELECT COUNT(*) FROM chain_summary{where}", params).fetchone()[0]
+            return records, int(total)
+        finally:
+            conn.close()
+
+    def facets(self) -> dict[str, list[str]]:
+        """Distinct filter values of the whole workspace, cached per store generation."""
+        conn = self._connect()
+        try:
+            generation = self._stored_store_signature(conn)
+            cached = self._facets
+            if cached is not None and cached[0] == generation:
+                return cached[1]
+            facets = {name: self._distinct(conn, column) for name, column in FACET_COLUMNS.items()}
+            facets["preprocessings"] = [
+                row[0] for row in conn.execute("SELECT DISTINCT step FROM chain_preprocessing_steps ORDER BY step")
+            ]
+        finally:
+            conn.close()
+        self._facets = (generation, facets)
+        return facets
+
+    @staticmethod
+    def _distinct(conn: sqlite3.Connection, column: str) -> list[str]:
+        rows = conn.execute(
+            f"SELECT DISTINCT {column} FROM chain_summary "
+            f"WHERE {column} IS NOT NULL AND {column} != '' ORDER BY {column}"
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def distinct_values(self, column: str) -> list[str]:
+        """Sorted distinct non-empty values of a filter column."""
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Unknown chain summary column: {column!r}")
+        conn = self._connect()
+        try:
+            return self._distinct(conn, column)
+        finally:
+            conn.close()
+
+    def distinct_preprocessing_steps(self) -> list[str]:
+        conn = self._connect()
+        try:
+            return [row[0] for row in conn.execute("SELECT DISTINCT step FROM chain_preprocessing_steps ORDER BY step")]
+        finally:
+            conn.close()
+
+
+def _infer_ascending(metric: str | None) -> bool:
+    if not metric:
+        return True
+    try:
+        from nirs4all.core.metrics import infer_ascending
+
+        return bool(infer_ascending(metric))
+    except Exception:
+        return True
+
+
+def _materialize_runs(store: Any, run_ids: list[str]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Compute aggregated and inspector records for every chain of ``run_ids``."""
+    from .aggregated_predictions import _build_chain_summary_records
+    from .inspector import _normalize_raw_chain_rows
+
+    df = store.query_chain_summaries(run_id=list(run_ids))
+    raw_rows = [dict(row) for row in df.iter_rows(named=True)]
+    if not raw_rows:
+        return [], []
+
+    aggregated = _build_chain_summary_records(store, raw_rows)
+    raw_by_chain = {row.get("chain_id"): row for row in raw_rows}
+    for record in aggregated:
+        raw = raw_by_chain.get(record.get("chain_id"), {})
+        record["_raw_scores"] = {col: raw.get(col) for col in SCORE_COLUMNS}
+    inspector = _normalize_raw_chain_rows(store, raw_rows)
+    return aggregated, inspector
+
+
+_views: dict[str, ChainSummaryView] = {}
+_views_lock = threading.Lock()
+
+
+def get_chain_summary_view(store: Any, *, sync: bool = True) -> ChainSummaryView | None:
+    """Return the (synced) view for ``store``'s workspace.
+
+    Returns None when the store is not a SQLite-backed WorkspaceStore (legacy
+    DuckDB stores, test doubles) or the view cannot be maintained; callers
+    then query the store directly.
+    """
+    workspace_path = getattr(store, "workspace_path", None)
+    if not isinstance(workspace_path, (str, Path)):
+        return None
+    workspace_path = Path(workspace_path)
+    if not (workspace_path / "store.sqlite").exists():
+        return None
+
+    key = str(workspace_path.resolve())
+    with _views_lock:
+        view = _views.get(key)
+        if view is None:
+            view = _views[key] = ChainSummaryView(workspace_path)
+
+    if sync:
+        try:
+            view.sync(store)
+        except Exception as e:
+            logger.warning("Chain summary view unavailable for %s: %s", workspace_path, e)
+            return None
+    return view
+
+
+def sync_chain_summary_view(store: Any) -> None:
+    """Refresh the view after a run completed or rows were deleted."""
+    try:
+        get_chain_summary_view(store)
+    except Exception as e:
+        logger.debug("Chain summary view refresh failed: %s", e)
+
+
+def query_chain_summary_records(store: Any, *, kind: str = "aggregated", **filters: Any) -> list[dict[str, Any]] | None:
+    """Read records from the materialized view, or None to fall back to the store."""
+    view = get_chain_summary_view(store)
+    if view is None:
+        return None
+    return view.query(kind=kind, **filters)
+
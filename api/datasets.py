@@ -20,6 +20,7 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 
+from .shared.file_detection import file_detection_cache
 from .shared.logger import get_logger
 from .workspace_manager import workspace_manager
 
@@ -505,7 +506,7 @@ async def detect_unified(request: DetectFilesRequest):
                 first_x_path = Path(x_files[0].path)
                 if _is_detectable_format(first_x_path):
                     try:
-                        detection_result = get_cached("detect_file_parameters")(str(first_x_path))
+                        detection_result = file_detection_cache.detect(first_x_path)
                         parsing_options = {
                             "delimiter": detection_result.delimiter,
                             "decimal_separator": detection_result.decimal_separator,
@@ -541,22 +542,19 @@ async def detect_unified(request: DetectFilesRequest):
     except Exception as e:
         warnings.append(f"Detection error: {e}")
 
-    for f in files:
-        if not _is_detectable_format(Path(f.path)):
-            continue
-        try:
-            file_detection = get_cached("detect_file_parameters")(
-                f.path,
-                known_params={
-                    "delimiter": parsing_options.get("delimiter"),
-                    "decimal_separator": parsing_options.get("decimal_separator"),
-                    "has_header": parsing_options.get("has_header"),
-                }
-            )
+    detectable = [f for f in files if _is_detectable_format(Path(f.path))]
+    outcomes = file_detection_cache.detect_many(
+        [f.path for f in detectable],
+        known_params={
+            "delimiter": parsing_options.get("delimiter"),
+            "decimal_separator": parsing_options.get("decimal_separator"),
+            "has_header": parsing_options.get("has_header"),
+        },
+    )
+    for f, (file_detection, error) in zip(detectable, outcomes):
+        if error is None:
             f.num_rows = file_detection.n_rows
             f.num_columns = file_detection.n_columns
-        except Exception:
-            pass
 
     has_x = any(f.type == "X" for f in files)
     has_train = any(f.split == "train" for f in files)
@@ -671,7 +669,7 @@ async def detect_files_list(request: DetectFilesListRequest):
         num_columns = None
         if _is_detectable_format(file_path):
             try:
-                det = get_cached("detect_file_parameters")(str(file_path))
+                det = file_detection_cache.detect(file_path)
                 num_rows = det.n_rows
                 num_columns = det.n_columns
             except Exception:
@@ -696,7 +694,7 @@ async def detect_files_list(request: DetectFilesListRequest):
         first_x_path = Path(x_files[0].path)
         if _is_detectable_format(first_x_path):
             try:
-                detection_result = get_cached("detect_file_parameters")(str(first_x_path))
+                detection_result = file_detection_cache.detect(first_x_path)
                 parsing_options = {
                     "delimiter": detection_result.delimiter,
                     "decimal_separator": detection_result.decimal_separator,
@@ -764,7 +762,7 @@ async def auto_detect_file(request: AutoDetectRequest):
         raise HTTPException(status_code=400, detail="Path is not a file")
 
     try:
-        detection_result = get_cached("detect_file_parameters")(str(file_path))
+        detection_result = file_detection_cache.detect(file_path)
         return {
             "success": True,
             "delimiter": detection_result.delimiter,
@@ -797,7 +795,7 @@ async def detect_format(request: DetectFormatRequest):
 
     try:
         file_format = _get_file_format(file_path)
-        detection_result = get_cached("detect_file_parameters")(str(file_path))
+        detection_result = file_detection_cache.detect(file_path)
 
         response = {
             "format": file_format,
@@ -1601,28 +1599,21 @@ async def load_dataset(dataset_id: str):
 @router.get("/datasets/{dataset_id}/stats")
 async def get_dataset_stats(dataset_id: str, partition: str = "train"):
     """Get statistics for a dataset."""
-    import numpy as np
     if not NIRS4ALL_AVAILABLE:
         raise HTTPException(status_code=501, detail="nirs4all library not available")
 
     try:
-        from .spectra import _load_dataset
+        from .spectra import _get_partition_statistics, _load_dataset
         dataset = _load_dataset(dataset_id)
         if not dataset:
             raise HTTPException(status_code=404, detail="Dataset not found")
 
-        X = dataset.x({"partition": partition}, layout="2d")
-        if isinstance(X, list):
-            X = X[0]
-
-        global_stats = {
-            "num_samples": X.shape[0],
-            "num_features": X.shape[1],
-            "global_mean": float(np.mean(X)),
-            "global_std": float(np.std(X)),
-            "global_min": float(np.min(X)),
-            "global_max": float(np.max(X)),
-        }
+        # Reuse the cached spectral statistics of the first source (the one
+        # the dataset listing describes) instead of rescanning the matrix.
+        stats = _get_partition_statistics(dataset_id, dataset, partition, source=0)
+        if stats is None:
+            raise HTTPException(status_code=404, detail=f"No samples for partition '{partition}'")
+        global_stats = stats.global_summary()
 
         target_stats = None
         try:
@@ -1809,6 +1800,7 @@ async def scan_folder(request: ScanFolderRequest):
     FolderParser = get_cached("FolderParser")
     parser = FolderParser()
     datasets: list[ScannedDataset] = []
+    found: list[tuple[Path, list[str], Any]] = []
     scanned_count = 0
     scan_warnings: list[str] = []
 
@@ -1822,8 +1814,21 @@ async def scan_folder(request: ScanFolderRequest):
         "folds": ("folds", "train"),
     }
 
-    def _build_detected_files(config: dict, folder: Path) -> tuple:
-        """Build DetectedFile list from FolderParser config."""
+    def _config_files(config: dict):
+        """Yield (path, type, split) of the existing files in a FolderParser config."""
+        for key, (file_type, split) in key_to_type_split.items():
+            value = config.get(key)
+            if value is None:
+                continue
+
+            paths_list = value if isinstance(value, list) else [value]
+            for fp_str in paths_list:
+                fp = Path(fp_str)
+                if fp.exists():
+                    yield fp, file_type, split
+
+    def _build_detected_files(config: dict, folder: Path, detections: dict[str, tuple]) -> tuple:
+        """Build DetectedFile list from FolderParser config and batch detection results."""
         files: list[DetectedFile] = []
         has_fold = False
         fold_path: str | None = None
@@ -1832,43 +1837,31 @@ async def scan_folder(request: ScanFolderRequest):
         conf: dict[str, float] = {}
         meta_cols: list[str] = []
 
-        for key, (file_type, split) in key_to_type_split.items():
-            value = config.get(key)
-            if value is None:
+        for fp, file_type, split in _config_files(config):
+            if file_type == "folds":
+                has_fold = True
+                fold_path = str(fp)
                 continue
 
-            paths_list = value if isinstance(value, list) else [value]
-            for fp_str in paths_list:
-                fp = Path(fp_str)
-                if not fp.exists():
-                    continue
-
-                if file_type == "folds":
-                    has_fold = True
-                    fold_path = str(fp)
-                    continue
+            num_rows = None
+            num_columns = None
+            det, error = detections.get(str(fp), (None, None))
+            if det is not None and error is None:
+                num_rows = det.n_rows
+                num_columns = det.n_columns
 
-                num_rows = None
-                num_columns = None
-                try:
-                    det = get_cached("detect_file_parameters")(str(fp))
-                    num_rows = det.n_rows
-                    num_columns = det.n_columns
-                except Exception:
-                    pass
-
-                files.append(DetectedFile(
-                    path=str(fp),
-                    filename=fp.name,
-                    type=file_type,
-                    split=split,
-                    source=1 if file_type == "X" else None,
-                    format=_get_file_format(fp),
-                    size_bytes=fp.stat().st_size if fp.exists() else 0,
-                    confidence=0.9,
-                    num_rows=num_rows,
-                    num_columns=num_columns,
-                ))
+            files.append(DetectedFile(
+                path=str(fp),
+                filename=fp.name,
+                type=file_type,
+                split=split,
+                source=1 if file_type == "X" else None,
+                format=_get_file_format(fp),
+                size_bytes=fp.stat().st_size if fp.exists() else 0,
+                confidence=0.9,
+                num_rows=num_rows,
+                num_columns=num_columns,
+            ))
 
         # Get parsing options from first X file
         x_files = [f for f in files if f.type == "X"]
@@ -1876,7 +1869,11 @@ async def scan_folder(request: ScanFolderRequest):
             first_x = Path(x_files[0].path)
             if first_x.suffix.lower() in (".csv", ".gz", ".zip"):
                 try:
-                    det_result = get_cached("detect_file_parameters")(str(first_x))
+                    det_result, error = detections.get(str(first_x), (None, None))
+                    if error is not None:
+                        raise error
+                    if det_result is None:
+                        det_result = file_detection_cache.detect(first_x)
                     parsing_opts = {
                         "delimiter": det_result.delimiter,
                         "decimal_separator": det_result.decimal_separator,
@@ -1920,21 +1917,7 @@ async def scan_folder(request: ScanFolderRequest):
 
         if result.success and result.config:
             # This folder IS a dataset — stop recursion
-            files, parsing_opts, conf, has_fold, fold_path, meta_cols, ds_warnings = \
-                _build_detected_files(result.config, folder)
-
-            datasets.append(ScannedDataset(
-                folder_path=str(folder),
-                folder_name=folder.name,
-                groups=parent_groups,
-                files=files,
-                parsing_options=parsing_opts,
-                confidence=conf,
-                has_fold_file=has_fold,
-                fold_file_path=fold_path,
-                metadata_columns=meta_cols,
-                warnings=ds_warnings + (result.warnings or []),
-            ))
+            found.append((folder, parent_groups, result))
         else:
             # Not a dataset — recurse into subdirectories
             try:
@@ -1952,6 +1935,28 @@ async def scan_folder(request: ScanFolderRequest):
     except PermissionError:
         scan_warnings.append(f"Permission denied: {root}")
 
+    # Detect the files of every dataset found in one cached, parallel batch
+    all_paths = [str(fp) for _, _, result in found for fp, file_type, _ in _config_files(result.config)
+                 if file_type != "folds"]
+    detections = dict(zip(all_paths, file_detection_cache.detect_many(all_paths)))
+
+    for folder, parent_groups, result in found:
+        files, parsing_opts, conf, has_fold, fold_path, meta_cols, ds_warnings = \
+            _build_detected_files(result.config, folder, detections)
+
+        datasets.append(ScannedDataset(
+            folder_path=str(folder),
+            folder_name=folder.name,
+            groups=parent_groups,
+            files=files,
+            parsing_options=parsing_opts,
+            confidence=conf,
+            has_fold_file=has_fold,
+            fold_file_path=fold_path,
+            metadata_columns=meta_cols,
+            warnings=ds_warnings + (result.warnings or []),
+        ))
+
     # Ensure all datasets have at least one group (root folder name)
     # so that direct children of root aren't left ungrouped
     for ds in datasets:
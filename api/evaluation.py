@@ -183,7 +183,7 @@ async def evaluate_model(request: EvaluateRequest):
         )
 
     # Load dataset
-    from .spectra import _apply_preprocessing_chain, _load_dataset
+    from .spectra import _apply_preprocessing_chain, _dataset_data_key, _load_dataset
 
     dataset = _load_dataset(request.dataset_id)
     if not dataset:
@@ -211,7 +211,8 @@ async def evaluate_model(request: EvaluateRequest):
 
     # Apply preprocessing
     if request.preprocessing_chain:
-        X = _apply_preprocessing_chain(X, request.preprocessing_chain)
+        data_key = _dataset_data_key(dataset, request.partition, "2d")
+        X = _apply_preprocessing_chain(X, request.preprocessing_chain, data_key)
 
     # Make predictions
     y_pred = model.predict(X)
@@ -383,7 +384,7 @@ async def cross_validate(request: CrossValRequest):
         )
 
     # Load dataset
-    from .spectra import _apply_preprocessing_chain, _load_dataset
+    from .spectra import _apply_preprocessing_chain, _dataset_data_key, _load_dataset
 
     dataset = _load_dataset(request.dataset_id)
     if not dataset:
@@ -411,7 +412,8 @@ async def cross_validate(request: CrossValRequest):
 
     # Apply preprocessing
     if request.preprocessing_chain:
-        X = _apply_preprocessing_chain(X, request.preprocessing_chain)
+        data_key = _dataset_data_key(dataset, request.partition, "2d")
+        X = _apply_preprocessing_chain(X, request.preprocessing_chain, data_key)
 
     # Build model from pipeline
     model = _build_model_from_pipeline(pipeline_config)
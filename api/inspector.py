@@ -25,6 +25,7 @@ from __future__ import annotations
 
 import json
 import math
+from collections import Counter
 from datetime import UTC, datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -32,6 +33,12 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from .chain_summary_view import (
+    FACET_COLUMNS,
+    SORT_COLUMNS,
+    get_chain_summary_view,
+    query_chain_summary_records,
+)
 from .lazy_imports import get_cached, is_ml_ready
 from .workspace_manager import workspace_manager
 
@@ -78,6 +85,8 @@ class InspectorDataResponse(BaseModel):
 
     chains: list[dict[str, Any]]
     total: int
+    offset: int = 0
+    limit: int | None = None
     available_metrics: list[str]
     available_models: list[str]
     available_datasets: list[str]
@@ -405,7 +414,11 @@ def _normalize_chain_rows(df: Any) -> list[dict[str, Any]]:
 
 def _normalize_chain_records(store: Any, df: Any) -> list[dict[str, Any]]:
     """Normalize chain rows and enrich them with pipeline-derived metadata."""
-    rows = [dict(row) for row in df.iter_rows(named=True)]
+    return _normalize_raw_chain_rows(store, [dict(row) for row in df.iter_rows(named=True)])
+
+
+def _normalize_raw_chain_rows(store: Any, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Normalize raw ``v_chain_summary`` row dicts with pipeline-derived metadata."""
     pipeline_map = _load_pipeline_metadata_map(
         store,
         [str(row.get("pipeline_id") or "") for row in rows],
@@ -413,6 +426,18 @@ def _normalize_chain_records(store: Any, df: Any) -> list[dict[str, Any]]:
     return [_normalize_chain_record(row, pipeline_map) for row in rows]
 
 
+def _load_chain_records(store: Any, **filters: Any) -> list[dict[str, Any]]:
+    """Return normalized chain records matching ``filters``.
+
+    Reads from the materialized chain-summary view when the workspace has
+    one, otherwise normalizes ``store.query_chain_summaries`` directly.
+    """
+    records = query_chain_summary_records(store, kind="inspector", **filters)
+    if records is None:
+        records = _normalize_chain_records(store, store.query_chain_summaries(**filters))
+    return records
+
+
 def _matches_task_type_filter(raw_task_type: Any, expected: str | None) -> bool:
     """Match broad frontend task filters against backend task variants."""
     if not expected:
@@ -430,6 +455,52 @@ def _matches_task_type_filter(raw_task_type: Any, expected: str | None) -> bool:
     return actual == expected_norm
 
 
+def _filter_chain_records(
+    records: list[dict[str, Any]],
+    task_type: str | None,
+    preprocessings: list[str] | None,
+) -> list[dict[str, Any]]:
+    """Apply the Inspector task-type and preprocessing filters in Python."""
+    if task_type:
+        records = [
+            record for record in records
+            if _matches_task_type_filter(record.get("task_type"), task_type)
+        ]
+
+    # Preprocessing filter: substring of the chain string or exact split step
+    if preprocessings:
+        filtered = []
+        for r in records:
+            preps = r.get("preprocessings") or ""
+            steps = {str(step) for step in (r.get("preprocessing_steps") or [])}
+            if any(p in preps or p in steps for p in preprocessings):
+                filtered.append(r)
+        records = filtered
+    return records
+
+
+def _sort_chain_records(records: list[dict[str, Any]], sort_by: str, descending: bool) -> list[dict[str, Any]]:
+    """Sort records like the chain-summary view: nulls last, ties by chain_id."""
+    by_chain = sorted(records, key=lambda r: str(r.get("chain_id") or ""))
+    present = [r for r in by_chain if r.get(sort_by) is not None]
+    missing = [r for r in by_chain if r.get(sort_by) is None]
+    return sorted(present, key=lambda r: r[sort_by], reverse=descending) + missing
+
+
+def _chain_record_facets(records: list[dict[str, Any]]) -> dict[str, list[str]]:
+    """Filter-dropdown values of a set of normalized chain records."""
+    facets = {
+        name: sorted({r.get(column) for r in records if r.get(column)})
+        for name, column in FACET_COLUMNS.items()
+    }
+    facets["preprocessings"] = sorted({
+        str(step)
+        for r in records
+        for step in (r.get("preprocessing_steps") or [])
+    })
+    return facets
+
+
 def _is_classification_task(task_type: Any) -> bool:
     """Return True for classification-like task types."""
     return "classification" in str(task_type or "").strip().lower()
@@ -486,6 +557,144 @@ def _get_arrays(store: Any, prediction_id: str) -> dict[str, Any] | None:
     return prediction
 
 
+# Columns of the bulk fold-level prediction frame (name -> polars dtype)
+_FOLD_FRAME_COLUMNS = {
+    "prediction_id": "Utf8",
+    "chain_id": "Utf8",
+    "dataset_name": "Utf8",
+    "model_class": "Utf8",
+    "model_name": "Utf8",
+    "preprocessings": "Utf8",
+    "fold_id": "Utf8",
+    "partition": "Utf8",
+    "val_score": "Float64",
+    "test_score": "Float64",
+    "train_score": "Float64",
+}
+
+# Chains per ``predictions`` query (keeps the IN (...) list bounded)
+_FOLD_QUERY_CHUNK = 500
+
+_PARTITION_SCORE_FIELDS = {"val": "val_score", "test": "test_score", "train": "train_score"}
+
+
+def _has_sql_store(store: Any) -> bool:
+    """True for real WorkspaceStores (test doubles expose no workspace path)."""
+    return isinstance(getattr(store, "workspace_path", None), (str, Path)) and callable(
+        getattr(store, "_fetch_pl", None)
+    )
+
+
+def _load_fold_predictions(
+    store: Any,
+    chain_ids: list[str],
+    partitions: list[str] | None = None,
+) -> Any:
+    """Load the fold-level prediction rows of many chains as one polars frame.
+
+    Real stores answer with one ``predictions`` query per chunk of chains;
+    other stores fall back to per-chain ``get_chain_predictions``. Rows keep
+    the ``get_chain_predictions`` order within each chain and ``fold_index``
+    numbers them per (chain, partition).
+    """
+    import polars as pl
+
+    schema = {name: getattr(pl, dtype) for name, dtype in _FOLD_FRAME_COLUMNS.items()}
+    unique_ids = list(dict.fromkeys(str(chain_id) for chain_id in chain_ids if chain_id))
+    frames: list[Any] = []
+
+    if unique_ids and _has_sql_store(store):
+        columns = ", ".join(schema)
+        for start in range(0, len(unique_ids), _FOLD_QUERY_CHUNK):
+            chunk = unique_ids[start:start + _FOLD_QUERY_CHUNK]
+            sql = f"SELECT {columns} FROM predictions WHERE chain_id IN ({', '.join('?' for _ in chunk)})"
+            params: list[Any] = list(chunk)
+            if partitions:
+                sql += f" AND partition IN ({', '.join('?' for _ in partitions)})"
+                params.extend(partitions)
+            sql += " ORDER BY chain_id, partition, fold_id"
+            chunk_df = store._fetch_pl(sql, params)
+            frames.append(chunk_df.select([pl.col(name).cast(dtype) for name, dtype in schema.items()]))
+    elif unique_ids:
+        rows: list[dict[str, Any]] = []
+        for chain_id in unique_ids:
+            for partition in partitions or [None]:
+                pred_df = store.get_chain_predictions(chain_id=chain_id, partition=partition)
+                for row in pred_df.iter_rows(named=True):
+                    entry: dict[str, Any] = {}
+                    for name, dtype in _FOLD_FRAME_COLUMNS.items():
+                        value = row.get(name)
+                        if value is not None:
+                            value = str(value) if dtype == "Utf8" else _sanitize_float(float(value))
+                        entry[name] = value
+                    entry["chain_id"] = entry["chain_id"] or chain_id
+                    rows.append(entry)
+        if rows:
+            frames.append(pl.DataFrame(rows, schema=schema))
+
+    frame = pl.concat(frames) if frames else pl.DataFrame(schema=schema)
+    return frame.with_columns(
+        pl.int_range(pl.len()).over(["chain_id", "partition"]).cast(pl.Int64).alias("fold_index")
+    )
+
+
+def _load_prediction_arrays(store: Any, frame: Any) -> dict[str, dict[str, Any]]:
+    """Load the arrays of every prediction in ``frame``, batched per dataset."""
+    ids_by_dataset: dict[str | None, list[str]] = {}
+    for prediction_id, dataset_name in zip(frame["prediction_id"].to_list(), frame["dataset_name"].to_list()):
+        if prediction_id:
+            ids_by_dataset.setdefault(dataset_name, []).append(prediction_id)
+
+    arrays: dict[str, dict[str, Any]] = {}
+    load_batch = None
+    if _has_sql_store(store) and not callable(getattr(store, "get_prediction_arrays", None)):
+        load_batch = getattr(getattr(store, "array_store", None), "load_batch", None)
+
+    for dataset_name, prediction_ids in ids_by_dataset.items():
+        if callable(load_batch):
+            try:
+                arrays.update(load_batch(prediction_ids, dataset_name=dataset_name))
+                continue
+            except Exception:
+                pass
+        for prediction_id in prediction_ids:
+            loaded = _get_arrays(store, prediction_id)
+            if loaded is not None:
+                arrays[prediction_id] = loaded
+    return arrays
+
+
+def _finite_pairs(arrays: dict[str, Any] | None) -> tuple[Any, Any, Any, Any] | None:
+    """Return the finite ``(y_true, y_pred)`` pairs of a prediction as numpy arrays.
+
+    Also returns the stored sample index of each kept pair (-1 past the end
+    of the stored indices, or None when there are none) and its position in
+    the original arrays.
+    """
+    import numpy as np
+
+    if arrays is None:
+        return None
+    y_true_values = _coerce_numeric_vector(arrays.get("y_true"))
+    y_pred_values = _coerce_numeric_vector(arrays.get("y_pred"))
+    if not y_true_values or not y_pred_values:
+        return None
+
+    pair_count = min(len(y_true_values), len(y_pred_values))
+    y_true = np.asarray(y_true_values[:pair_count], dtype=float)
+    y_pred = np.asarray(y_pred_values[:pair_count], dtype=float)
+    mask = np.isfinite(y_true) & np.isfinite(y_pred)
+
+    indices = _coerce_index_vector(arrays.get("sample_indices"))
+    sample_indices = None
+    if indices is not None:
+        padded = np.full(pair_count, -1, dtype=np.int64)
+        usable = min(pair_count, len(indices))
+        padded[:usable] = indices[:usable]
+        sample_indices = padded[mask]
+    return y_true[mask], y_pred[mask], sample_indices, np.flatnonzero(mask)
+
+
 def _coerce_vector(values: Any) -> list[Any] | None:
     """Coerce a scalar, list, or ndarray into a flat Python list."""
     if values is None:
@@ -556,67 +765,72 @@ async def get_inspector_data(
     preprocessings: list[str] | None = Query(None, description="Filter by preprocessing step(s)"),
     task_type: str | None = Query(None, description="Filter by task type"),
     metric: str | None = Query(None, description="Filter by metric"),
+    sort_by: str | None = Query(None, description="Column to sort chains by (default: chain_id)"),
+    sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Sort direction"),
+    limit: int | None = Query(None, ge=1, description="Page size (default: all chains)"),
+    offset: int = Query(0, ge=0, description="Number of chains to skip"),
 ):
     """Load chain summaries and metadata for the Inspector.
 
-    Returns all matching chains plus lists of unique values for
-    populating filter bar dropdowns (metrics, models, datasets, runs, preprocessings).
-    Supports multi-value filters via repeated query params.
+    Returns the matching chains (optionally one sorted page of them) plus
+    lists of unique values for populating filter bar dropdowns (metrics,
+    models, datasets, runs, preprocessings). Supports multi-value filters
+    via repeated query params. ``total`` is the number of matching chains
+    before pagination.
     """
+    if sort_by is not None and sort_by not in SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort column: {sort_by}")
+    descending = sort_order == "desc"
+
     store = _get_store()
     try:
         # Normalize single-element lists to single values for backward compat
         _run_id = run_id if run_id and len(run_id) > 1 else (run_id[0] if run_id else None)
         _dataset_name = dataset_name if dataset_name and len(dataset_name) > 1 else (dataset_name[0] if dataset_name else None)
         _model_class = model_class if model_class and len(model_class) > 1 else (model_class[0] if model_class else None)
+        filters = {
+            "run_id": _run_id,
+            "dataset_name": _dataset_name,
+            "model_class": _model_class,
+            "metric": metric,
+        }
 
-        df = store.query_chain_summaries(
-            run_id=_run_id,
-            dataset_name=_dataset_name,
-            model_class=_model_class,
-            metric=metric,
-        )
-        records = _normalize_chain_records(store, df)
-
-        if task_type:
-            records = [
-                record for record in records
-                if _matches_task_type_filter(record.get("task_type"), task_type)
-            ]
-
-        # Post-filter by preprocessing steps (substring match)
-        if preprocessings:
-            filtered = []
-            for r in records:
-                preps = r.get("preprocessings") or ""
-                steps = {str(step) for step in (r.get("preprocessing_steps") or [])}
-                if any(p in preps or p in steps for p in preprocessings):
-                    filtered.append(r)
-            records = filtered
-
-        # Facet lists for filter bar dropdowns must reflect the *unfiltered* chain pool,
-        # otherwise selecting one value collapses the dropdown to just that value and the
-        # user cannot add a second selection.
-        facet_df = store.query_chain_summaries()
-        facet_records = _normalize_chain_records(store, facet_df)
-        metrics_set = sorted({r.get("metric") for r in facet_records if r.get("metric")})
-        models = sorted({r.get("model_class") for r in facet_records if r.get("model_class")})
-        datasets = sorted({r.get("dataset_name") for r in facet_records if r.get("dataset_name")})
-        runs = sorted({r.get("run_id") for r in facet_records if r.get("run_id")})
-
-        prep_steps: set[str] = set()
-        for r in facet_records:
-            for step in (r.get("preprocessing_steps") or []):
-                prep_steps.add(str(step))
+        view = get_chain_summary_view(store)
+        if view is not None:
+            # Filters, sorting, paging and facets all run as indexed SQL
+            records, total = view.page(
+                task_type=task_type,
+                preprocessings=preprocessings,
+                sort_by=sort_by,
+                descending=descending,
+                limit=limit,
+                offset=offset,
+                **filters,
+            )
+            facets = view.facets()
+        else:
+            records = _normalize_chain_records(store, store.query_chain_summaries(**filters))
+            records = _filter_chain_records(records, task_type, preprocessings)
+            total = len(records)
+            records = _sort_chain_records(records, sort_by or "chain_id", descending)
+            records = records[offset:offset + limit] if limit is not None else records[offset:]
+            # Facet lists for filter bar dropdowns must reflect the *unfiltered* chain pool,
+            # otherwise selecting one value collapses the dropdown to just that value and the
+            # user cannot add a second selection.
+            facets = _chain_record_facets(
+                _normalize_chain_records(store, store.query_chain_summaries())
+            )
 
         return InspectorDataResponse(
             chains=records,
-            total=len(records),
-            available_metrics=metrics_set,
-            available_models=models,
-            available_datasets=datasets,
-            available_runs=runs,
-            available_preprocessings=sorted(prep_steps),
+            total=total,
+            offset=offset,
+            limit=limit,
+            available_metrics=facets["metrics"],
+            available_models=facets["models"],
+            available_datasets=facets["datasets"],
+            available_runs=facets["runs"],
+            available_preprocessings=facets["preprocessings"],
             generated_at=datetime.now(UTC).isoformat(),
         )
     finally:
@@ -635,64 +849,52 @@ async def get_scatter_data(request: ScatterRequest):
 
     store = _get_store()
     try:
+        import numpy as np
+
         points: list[dict] = []
         total_samples = 0
-        score_field = {
-            "val": "val_score",
-            "test": "test_score",
-            "train": "train_score",
-        }.get(request.partition, "val_score")
+        score_field = _PARTITION_SCORE_FIELDS.get(request.partition, "val_score")
+
+        frame = _load_fold_predictions(store, request.chain_ids, [request.partition])
+        arrays_by_id = _load_prediction_arrays(store, frame)
+        rows_by_chain: dict[str, list[dict[str, Any]]] = {}
+        for row in frame.iter_rows(named=True):
+            rows_by_chain.setdefault(row["chain_id"], []).append(row)
 
         for chain_id in request.chain_ids:
-            pred_df = store.get_chain_predictions(
-                chain_id=chain_id,
-                partition=request.partition,
-            )
-            if len(pred_df) == 0:
+            rows = rows_by_chain.get(chain_id)
+            if not rows:
                 continue
 
-            # Get chain metadata from first prediction
-            first_row = dict(pred_df.row(0, named=True))
-
-            # Collect arrays across all folds for this partition
-            all_y_true: list[float] = []
-            all_y_pred: list[float] = []
-            all_indices: list[int] = []
+            # Chain metadata from the first prediction
+            first_row = rows[0]
             score = _sanitize_float(first_row.get(score_field))
 
-            for row in pred_df.iter_rows(named=True):
-                row_dict = dict(row)
-                prediction_id = row_dict.get("prediction_id")
-                if not prediction_id:
-                    continue
-
-                arrays = _get_arrays(store, prediction_id)
-                if arrays is None:
+            # Collect arrays across all folds for this partition
+            y_true_parts: list[Any] = []
+            y_pred_parts: list[Any] = []
+            index_parts: list[Any] = []
+            for row in rows:
+                if not row["prediction_id"]:
                     continue
-
-                y_true_values = _coerce_numeric_vector(arrays.get("y_true"))
-                y_pred_values = _coerce_numeric_vector(arrays.get("y_pred"))
-                if not y_true_values or not y_pred_values:
+                pairs = _finite_pairs(arrays_by_id.get(row["prediction_id"]))
+                if pairs is None:
                     continue
+                y_true, y_pred, sample_indices, _positions = pairs
+                y_true_parts.append(y_true)
+                y_pred_parts.append(y_pred)
+                if sample_indices is not None:
+                    index_parts.append(sample_indices[sample_indices >= 0])
 
-                sample_indices = _coerce_index_vector(arrays.get("sample_indices"))
-                pair_count = min(len(y_true_values), len(y_pred_values))
-                for index in range(pair_count):
-                    yt = y_true_values[index]
-                    yp = y_pred_values[index]
-                    if math.isnan(yt) or math.isnan(yp) or math.isinf(yt) or math.isinf(yp):
-                        continue
-
-                    all_y_true.append(yt)
-                    all_y_pred.append(yp)
-                    if sample_indices is not None and index < len(sample_indices):
-                        all_indices.append(sample_indices[index])
+            all_y_true = np.concatenate(y_true_parts).tolist() if y_true_parts else []
+            all_y_pred = np.concatenate(y_pred_parts).tolist() if y_pred_parts else []
+            all_indices = np.concatenate(index_parts).tolist() if index_parts else []
 
             if all_y_true and all_y_pred:
                 total_samples += len(all_y_true)
                 points.append(ScatterPoint(
                     chain_id=chain_id,
-                    model_class=first_row.get("model_class", ""),
+                    model_class=first_row.get("model_class") or "",
                     model_name=first_row.get("model_name"),
                     preprocessings=first_row.get("preprocessings"),
                     y_true=all_y_true,
@@ -726,11 +928,11 @@ async def get_histogram_data(
     import numpy as np
     store = _get_store()
     try:
-        df = store.query_chain_summaries(
+        records = _load_chain_records(
+            store,
             run_id=run_id or None,
             dataset_name=dataset_name or None,
         )
-        records = _normalize_chain_records(store, df)
 
         # Extract scores and chain_ids
         scores: list[float] = []
@@ -797,11 +999,11 @@ async def get_rankings_data(
     """
     store = _get_store()
     try:
-        df = store.query_chain_summaries(
+        records = _load_chain_records(
+            store,
             run_id=run_id or None,
             dataset_name=dataset_name or None,
         )
-        records = _normalize_chain_records(store, df)
 
         # Auto-detect sort direction from metric if not specified
         if sort_ascending is None:
@@ -865,11 +1067,11 @@ async def get_heatmap_data(request: HeatmapRequest):
     import numpy as np
     store = _get_store()
     try:
-        df = store.query_chain_summaries(
+        records = _load_chain_records(
+            store,
             run_id=request.run_id,
             dataset_name=request.dataset_name,
         )
-        records = _normalize_chain_records(store, df)
 
         # Group by (x_variable, y_variable)
         grid: dict[tuple[str, str], list[dict]] = {}
@@ -948,11 +1150,11 @@ async def get_candlestick_data(request: CandlestickRequest):
     import numpy as np
     store = _get_store()
     try:
-        df = store.query_chain_summaries(
+        records = _load_chain_records(
+            store,
             run_id=request.run_id,
             dataset_name=request.dataset_name,
         )
-        records = _normalize_chain_records(store, df)
 
         # Group by category_variable
         buckets: dict[str, list[dict]] = {}
@@ -1117,11 +1319,11 @@ async def get_branch_comparison(request: BranchComparisonRequest):
     import numpy as np
     store = _get_store()
     try:
-        df = store.query_chain_summaries(
+        records = _load_chain_records(
+            store,
             run_id=request.run_id,
             dataset_name=request.dataset_name,
         )
-        records = _normalize_chain_records(store, df)
 
         # Group by branch_path
         buckets: dict[str, list[dict]] = {}
@@ -1218,8 +1420,7 @@ async def get_branch_topology(
                 max_depth = topology.max_stacking_depth
 
                 # Get chain summaries for metrics lookup
-                df = store.query_chain_summaries(pipeline_id=pipeline_id)
-                chain_records = _normalize_chain_records(store, df)
+                chain_records = _load_chain_records(store, pipeline_id=pipeline_id)
 
                 # Build flat node list from model_nodes
                 for i, mn in enumerate(topology.model_nodes):
@@ -1258,8 +1459,7 @@ async def get_branch_topology(
 
         # Fallback: if no topology analysis, build minimal from chain summaries
         if not nodes:
-            df = store.query_chain_summaries(pipeline_id=pipeline_id)
-            chain_records = _normalize_chain_records(store, df)
+            chain_records = _load_chain_records(store, pipeline_id=pipeline_id)
 
             # Group by model_class to create simple nodes
             model_groups: dict[str, list[dict]] = {}
@@ -1307,7 +1507,6 @@ async def get_fold_stability(request: FoldStabilityRequest):
     For each chain, retrieves fold-level predictions and extracts
     the score for the requested partition.
     """
-    import numpy as np
     if not request.chain_ids:
         return FoldStabilityResponse(
             entries=[], fold_ids=[], score_column=request.score_column, total_chains=0
@@ -1315,55 +1514,35 @@ async def get_fold_stability(request: FoldStabilityRequest):
 
     store = _get_store()
     try:
-        entries: list[dict] = []
-        all_fold_ids: set[str] = set()
-
-        # Map partition to score field
-        score_field_map = {
-            "val": "val_score",
-            "test": "test_score",
-            "train": "train_score",
-        }
-        score_field = score_field_map.get(request.partition, "val_score")
-
-        for chain_id in request.chain_ids:
-            pred_df = store.get_chain_predictions(
-                chain_id=chain_id,
-                partition=request.partition,
+        import polars as pl
+
+        score_field = _PARTITION_SCORE_FIELDS.get(request.partition, "val_score")
+        frame = _load_fold_predictions(store, request.chain_ids, [request.partition])
+        # Chain metadata comes from each chain's first prediction row
+        frame = (
+            frame.with_columns(
+                pl.col("model_class").first().over("chain_id").fill_null(""),
+                pl.col("preprocessings").first().over("chain_id"),
+                pl.col("fold_id").fill_null(pl.col("fold_index").cast(pl.Utf8)),
             )
-            if len(pred_df) == 0:
-                continue
-
-            first_row = dict(pred_df.row(0, named=True))
-            model_class = first_row.get("model_class", "")
-            preprocessings = first_row.get("preprocessings")
-
-            for fold_idx, row in enumerate(pred_df.iter_rows(named=True)):
-                row_dict = dict(row)
-                fold_id = str(row_dict.get("fold_id", fold_idx))
-                score = row_dict.get(score_field)
-
-                if score is None:
-                    continue
-
-                score = _sanitize_float(float(score))
-                if score is None:
-                    continue
-
-                all_fold_ids.add(fold_id)
-                entries.append(
-                    FoldScoreEntry(
-                        chain_id=chain_id,
-                        model_class=model_class,
-                        preprocessings=preprocessings,
-                        fold_id=fold_id,
-                        fold_index=fold_idx,
-                        score=round(score, 6),
-                    ).model_dump()
-                )
+            .filter(pl.col(score_field).is_not_null() & pl.col(score_field).is_finite())
+            .sort(["chain_id", "fold_index"])
+        )
 
-        # Sort entries by (chain_id, fold_index)
-        entries.sort(key=lambda e: (e.get("chain_id", ""), e.get("fold_index", 0)))
+        entries = [
+            {
+                "chain_id": chain_id,
+                "model_class": model_class,
+                "preprocessings": preprocessings,
+                "fold_id": fold_id,
+                "fold_index": fold_index,
+                "score": round(score, 6),
+            }
+            for chain_id, model_class, preprocessings, fold_id, fold_index, score in frame.select(
+                ["chain_id", "model_class", "preprocessings", "fold_id", "fold_index", score_field]
+            ).iter_rows()
+        ]
+        all_fold_ids = set(frame["fold_id"].to_list())
 
         return FoldStabilityResponse(
             entries=entries,
@@ -1486,10 +1665,9 @@ async def get_confusion_matrix(request: ConfusionMatrixRequest):
 
     store = _get_store()
     try:
-        df = store.query_chain_summaries()
         chain_records = {
             record["chain_id"]: record
-            for record in _normalize_chain_records(store, df)
+            for record in _load_chain_records(store)
         }
         eligible_chain_ids = [
             chain_id
@@ -1510,36 +1688,27 @@ async def get_confusion_matrix(request: ConfusionMatrixRequest):
         all_y_true: list[Any] = []
         all_y_pred: list[Any] = []
 
-        for chain_id in eligible_chain_ids:
-            pred_df = store.get_chain_predictions(
-                chain_id=chain_id,
-                partition=request.partition,
-            )
-            if len(pred_df) == 0:
+        frame = _load_fold_predictions(store, eligible_chain_ids, [request.partition])
+        arrays_by_id = _load_prediction_arrays(store, frame)
+        for prediction_id in frame["prediction_id"].to_list():
+            if not prediction_id:
+                continue
+            arrays = arrays_by_id.get(prediction_id)
+            if arrays is None:
                 continue
 
-            for row in pred_df.iter_rows(named=True):
-                row_dict = dict(row)
-                prediction_id = row_dict.get("prediction_id")
-                if not prediction_id:
-                    continue
+            y_true_values = _coerce_vector(arrays.get("y_true"))
+            y_pred_values = _coerce_vector(arrays.get("y_pred"))
+            if not y_true_values or not y_pred_values:
+                continue
 
-                arrays = _get_arrays(store, prediction_id)
-                if arrays is None:
+            for yt, yp in zip(y_true_values, y_pred_values):
+                if isinstance(yt, float) and (math.isnan(yt) or math.isinf(yt)):
                     continue
-
-                y_true_values = _coerce_vector(arrays.get("y_true"))
-                y_pred_values = _coerce_vector(arrays.get("y_pred"))
-                if not y_true_values or not y_pred_values:
+                if isinstance(yp, float) and (math.isnan(yp) or math.isinf(yp)):
                     continue
-
-                for yt, yp in zip(y_true_values, y_pred_values):
-                    if isinstance(yt, float) and (math.isnan(yt) or math.isinf(yt)):
-                        continue
-                    if isinstance(yp, float) and (math.isnan(yp) or math.isinf(yp)):
-                        continue
-                    all_y_true.append(yt)
-                    all_y_pred.append(yp)
+                all_y_true.append(yt)
+                all_y_pred.append(yp)
 
         if not all_y_true or not all_y_pred:
             return ConfusionMatrixResponse(
@@ -1566,9 +1735,7 @@ async def get_confusion_matrix(request: ConfusionMatrixRequest):
             )
 
         # Build raw counts matrix
-        counts: dict[tuple[str, str], int] = {}
-        for yt, yp in zip(y_true_labels, y_pred_labels):
-            counts[(yt, yp)] = counts.get((yt, yp), 0) + 1
+        counts = Counter(zip(y_true_labels, y_pred_labels))
 
         total_samples = len(y_true_labels)
 
@@ -1624,7 +1791,7 @@ async def get_robustness_data(request: RobustnessRequest):
 
     Each axis is normalized 0–1 across all requested chains (higher = more robust).
     """
-    import numpy as np
+    import polars as pl
     if not request.chain_ids:
         return RobustnessResponse(
             entries=[], axis_names=[], score_column=request.score_column,
@@ -1633,17 +1800,26 @@ async def get_robustness_data(request: RobustnessRequest):
     store = _get_store()
     try:
         # Get chain summaries
-        df = store.query_chain_summaries()
-        all_records = _normalize_chain_records(store, df)
+        all_records = _load_chain_records(store)
         chain_map = {r["chain_id"]: r for r in all_records}
 
-        # Score field mapping
-        score_field_map = {
-            "val": "val_score",
-            "test": "test_score",
-            "train": "train_score",
+        score_field = _PARTITION_SCORE_FIELDS.get(request.partition, "val_score")
+
+        # CV stability: sample std of each chain's fold scores (lower = more stable)
+        frame = _load_fold_predictions(
+            store,
+            [chain_id for chain_id in request.chain_ids if chain_id in chain_map],
+            [request.partition],
+        )
+        fold_stats = (
+            frame.filter(pl.col(score_field).is_not_null() & pl.col(score_field).is_finite())
+            .group_by("chain_id")
+            .agg(pl.col(score_field).std(ddof=1).alias("std"), pl.len().alias("n"))
+        )
+        fold_std = {
+            chain_id: float(std) if n > 1 and std is not None else 0.0
+            for chain_id, std, n in fold_stats.iter_rows()
         }
-        score_field = score_field_map.get(request.partition, "val_score")
 
         # Collect per-chain raw values
         raw_data: list[dict] = []
@@ -1653,27 +1829,11 @@ async def get_robustness_data(request: RobustnessRequest):
             if not chain:
                 continue
 
-            # Get fold-level scores for CV stability
-            pred_df = store.get_chain_predictions(
-                chain_id=chain_id,
-                partition=request.partition,
-            )
-            fold_scores: list[float] = []
-            if len(pred_df) > 0:
-                for row in pred_df.iter_rows(named=True):
-                    row_dict = dict(row)
-                    score = row_dict.get(score_field)
-                    if score is not None:
-                        s = _sanitize_float(float(score))
-                        if s is not None:
-                            fold_scores.append(s)
-
             val_score = chain.get("cv_val_score")
             train_score = chain.get("cv_train_score")
             main_score = chain.get(request.score_column)
 
-            # CV stability: std of fold scores (lower = more stable)
-            cv_std = float(np.std(fold_scores, ddof=1)) if len(fold_scores) > 1 else 0.0
+            cv_std = fold_std.get(chain_id, 0.0)
 
             # Train-test gap
             gap = abs(train_score - val_score) if train_score is not None and val_score is not None else 0.0
@@ -1786,11 +1946,11 @@ async def get_metric_correlation(request: MetricCorrelationRequest):
     import numpy as np
     store = _get_store()
     try:
-        df = store.query_chain_summaries(
+        records = _load_chain_records(
+            store,
             run_id=request.run_id,
             dataset_name=request.dataset_name,
         )
-        records = _normalize_chain_records(store, df)
 
         if not records:
             return MetricCorrelationResponse(
@@ -2006,11 +2166,11 @@ async def get_preprocessing_impact(request: PreprocessingImpactRequest):
     import numpy as np
     store = _get_store()
     try:
-        df = store.query_chain_summaries(
+        records = _load_chain_records(
+            store,
             run_id=request.run_id,
             dataset_name=request.dataset_name,
         )
-        records = _normalize_chain_records(store, df)
 
         if not records:
             return PreprocessingImpactResponse(
@@ -2084,11 +2244,11 @@ async def get_hyperparameter_data(request: HyperparameterRequest):
     """
     store = _get_store()
     try:
-        df = store.query_chain_summaries(
+        records = _load_chain_records(
+            store,
             run_id=request.run_id,
             dataset_name=request.dataset_name,
         )
-        records = _normalize_chain_records(store, df)
 
         if not records:
             return HyperparameterResponse(
@@ -2166,6 +2326,7 @@ async def get_bias_variance(request: BiasVarianceRequest):
     Aggregated per group: mean_bias², mean_variance, total_error.
     """
     import numpy as np
+    import polars as pl
     if not request.chain_ids:
         return BiasVarianceResponse(
             entries=[], score_column=request.score_column, group_by=request.group_by,
@@ -2175,10 +2336,9 @@ async def get_bias_variance(request: BiasVarianceRequest):
     store = _get_store()
     try:
         # Get chain summaries for grouping
-        df = store.query_chain_summaries()
         records = {
             record["chain_id"]: record
-            for record in _normalize_chain_records(store, df)
+            for record in _load_chain_records(store)
         }
 
         # Group chains by the requested field
@@ -2198,63 +2358,70 @@ async def get_bias_variance(request: BiasVarianceRequest):
                 reason="No eligible chains were found for the requested comparison.",
             )
 
+        frame = _load_fold_predictions(
+            store,
+            [chain_id for chain_ids in groups.values() for chain_id in chain_ids],
+            ["val"],
+        )
+        arrays_by_id = _load_prediction_arrays(store, frame)
+        prediction_ids_by_chain: dict[str, list[str | None]] = {}
+        for chain_id, prediction_id in frame.select(["chain_id", "prediction_id"]).iter_rows():
+            prediction_ids_by_chain.setdefault(chain_id, []).append(prediction_id)
+
         entries: list[dict] = []
 
         for label, chain_ids in groups.items():
-            # Collect fold-level predictions: (dataset, sample_idx) → list of (y_true, y_pred)
-            sample_preds: dict[tuple[str, int], list[tuple[float, float]]] = {}
+            # Fold-level (dataset, sample_idx, y_true, y_pred) columns of the group
+            datasets: list[str] = []
+            sample_parts: list[Any] = []
+            y_true_parts: list[Any] = []
+            y_pred_parts: list[Any] = []
             total_folds = 0
 
             for cid in chain_ids:
                 record = records.get(cid, {})
                 dataset_name = str(record.get("dataset_name") or "unknown")
-                pred_df = store.get_chain_predictions(chain_id=cid, partition="val")
-                if len(pred_df) == 0:
-                    continue
-
-                for row in pred_df.iter_rows(named=True):
-                    row_dict = dict(row)
-                    pid = row_dict.get("prediction_id")
+                for pid in prediction_ids_by_chain.get(cid, []):
                     if not pid:
                         continue
                     total_folds += 1
 
-                    arrays = _get_arrays(store, pid)
-                    if arrays is None:
-                        continue
-                    y_true_values = _coerce_numeric_vector(arrays.get("y_true"))
-                    y_pred_values = _coerce_numeric_vector(arrays.get("y_pred"))
-                    if not y_true_values or not y_pred_values:
+                    pairs = _finite_pairs(arrays_by_id.get(pid))
+                    if pairs is None:
                         continue
+                    y_true, y_pred, sample_indices, positions = pairs
+                    if sample_indices is not None:
+                        positions = np.where(sample_indices >= 0, sample_indices, positions)
+                    datasets.extend([dataset_name] * len(positions))
+                    sample_parts.append(positions)
+                    y_true_parts.append(y_true)
+                    y_pred_parts.append(y_pred)
+
+            if not sample_parts:
+                continue
 
-                    indices = _coerce_index_vector(arrays.get("sample_indices"))
-                    pair_count = min(len(y_true_values), len(y_pred_values))
-                    for j in range(pair_count):
-                        yt = y_true_values[j]
-                        yp = y_pred_values[j]
-                        if math.isnan(yt) or math.isnan(yp) or math.isinf(yt) or math.isinf(yp):
-                            continue
-                        sample_idx = indices[j] if indices is not None and j < len(indices) else j
-                        sample_key = (dataset_name, int(sample_idx))
-                        sample_preds.setdefault(sample_key, []).append((yt, yp))
-
-            # Compute bias² and variance per sample with 2+ predictions
-            biases_sq: list[float] = []
-            variances: list[float] = []
-            for _sample_key, pairs in sample_preds.items():
-                if len(pairs) < 2:
-                    continue
-                y_true_val = pairs[0][0]  # All should be the same y_true
-                preds = [p[1] for p in pairs]
-                mean_pred = float(np.mean(preds))
-                bias_sq = (mean_pred - y_true_val) ** 2
-                var = float(np.var(preds))
-                biases_sq.append(bias_sq)
-                variances.append(var)
-
-            if biases_sq:
-                mean_bias_sq = float(np.mean(biases_sq))
-                mean_var = float(np.mean(variances))
+            # bias² and variance per sample predicted 2+ times
+            per_sample = (
+                pl.DataFrame({
+                    "dataset": datasets,
+                    "sample": np.concatenate(sample_parts).astype(np.int64),
+                    "y_true": np.concatenate(y_true_parts),
+                    "y_pred": np.concatenate(y_pred_parts),
+                })
+                .group_by(["dataset", "sample"], maintain_order=True)
+                .agg(
+                    pl.len().alias("n"),
+                    pl.col("y_true").first().alias("y_true"),
+                    pl.col("y_pred").mean().alias("mean_pred"),
+                    pl.col("y_pred").var(ddof=0).alias("variance"),
+                )
+                .filter(pl.col("n") >= 2)
+                .with_columns(((pl.col("mean_pred") - pl.col("y_true")) ** 2).alias("bias_sq"))
+            )
+
+            if len(per_sample) > 0:
+                mean_bias_sq = float(per_sample["bias_sq"].mean())
+                mean_var = float(per_sample["variance"].mean())
                 entries.append(BiasVarianceEntry(
                     group_label=label,
                     bias_squared=_sanitize_float(round(mean_bias_sq, 6)),
@@ -2262,7 +2429,7 @@ async def get_bias_variance(request: BiasVarianceRequest):
                     total_error=_sanitize_float(round(mean_bias_sq + mean_var, 6)),
                     n_chains=len(chain_ids),
                     n_folds=total_folds,
-                    n_samples=len(biases_sq),
+                    n_samples=len(per_sample),
                     chain_ids=chain_ids,
                 ).model_dump())
 
@@ -2291,13 +2458,15 @@ async def get_learning_curve(request: LearningCurveRequest):
     prediction array lengths), computing mean/std of train and val scores.
     """
     import numpy as np
+    import polars as pl
+
     store = _get_store()
     try:
-        df = store.query_chain_summaries(
+        records = _load_chain_records(
+            store,
             run_id=request.run_id,
             dataset_name=request.dataset_name,
         )
-        records = _normalize_chain_records(store, df)
 
         if request.model_class:
             records = [r for r in records if r.get("model_class") == request.model_class]
@@ -2307,57 +2476,42 @@ async def get_learning_curve(request: LearningCurveRequest):
                 points=[], score_column=request.score_column, has_multiple_sizes=False,
             )
 
-        # Determine training set size per chain from predictions
-        size_scores: dict[int, list[dict]] = {}  # train_size → list of {train, val}
+        scored = [
+            r for r in records
+            if r.get("cv_train_score") is not None or r.get(request.score_column) is not None
+        ]
 
-        for r in records:
-            cid = r["chain_id"]
-            train_score = r.get("cv_train_score")
-            val_score = r.get(request.score_column)
+        # Training set size comes from each chain's first train prediction,
+        # falling back to an estimate from its first val prediction
+        frame = _load_fold_predictions(store, [r["chain_id"] for r in scored], ["train", "val"])
+        first_rows = frame.filter(pl.col("fold_index") == 0)
+        arrays_by_id = _load_prediction_arrays(store, first_rows)
+        first_lengths: dict[tuple[str, str], int] = {}
+        for chain_id, partition, prediction_id in first_rows.select(["chain_id", "partition", "prediction_id"]).iter_rows():
+            arrays = arrays_by_id.get(prediction_id) if prediction_id else None
+            y_true_values = _coerce_vector(arrays.get("y_true")) if arrays else None
+            if y_true_values:
+                first_lengths[(chain_id, partition)] = len(y_true_values)
 
-            if train_score is None and val_score is None:
-                continue
+        size_scores: dict[int, list[dict]] = {}  # train_size → list of {train, val}
 
-            # Infer training size from fold predictions
-            train_size = 0
-            try:
-                pred_df = store.get_chain_predictions(chain_id=cid, partition="train")
-                if len(pred_df) > 0:
-                    first_row = dict(pred_df.row(0, named=True))
-                    pid = first_row.get("prediction_id")
-                    if pid:
-                        arrays = _get_arrays(store, pid)
-                        y_true_values = _coerce_vector(arrays.get("y_true")) if arrays else None
-                        if y_true_values:
-                            train_size = len(y_true_values)
-            except Exception:
-                pass
+        for r in scored:
+            cid = r["chain_id"]
+            train_size = first_lengths.get((cid, "train"), 0)
 
-            if train_size == 0:
-                # Fallback: try val partition to estimate total, then approximate
-                try:
-                    pred_df = store.get_chain_predictions(chain_id=cid, partition="val")
-                    if len(pred_df) > 0:
-                        first_row = dict(pred_df.row(0, named=True))
-                        pid = first_row.get("prediction_id")
-                        if pid:
-                            arrays = _get_arrays(store, pid)
-                            y_true_values = _coerce_vector(arrays.get("y_true")) if arrays else None
-                            if y_true_values:
-                                val_size = len(y_true_values)
-                                fold_count = r.get("cv_fold_count", 5) or 5
-                                # Approximate: train_size ≈ total - val_size
-                                total_approx = int(val_size * fold_count / max(1, fold_count - 1))
-                                train_size = total_approx - val_size
-                except Exception:
-                    pass
+            if train_size == 0 and (cid, "val") in first_lengths:
+                val_size = first_lengths[(cid, "val")]
+                fold_count = r.get("cv_fold_count", 5) or 5
+                # Approximate: train_size ≈ total - val_size
+                total_approx = int(val_size * fold_count / max(1, fold_count - 1))
+                train_size = total_approx - val_size
 
             if train_size <= 0:
                 continue
 
             size_scores.setdefault(train_size, []).append({
-                "train": train_score,
-                "val": val_score,
+                "train": r.get("cv_train_score"),
+                "val": r.get(request.score_column),
             })
 
         # Build learning curve points
@@ -6,5 +6,6 @@ evaluation, and AutoML searches.
 """
 
 from .manager import Job, JobStatus, JobType, job_manager
+from .registry import JobRegistry
 
-__all__ = ["job_manager", "Job", "JobStatus", "JobType"]
+__all__ = ["job_manager", "Job", "JobRegistry", "JobStatus", "JobType"]
@@ -9,16 +9,18 @@ Phase 5: WebSocket integration for real-time updates.
 
 import asyncio
 import threading
+import time
 import traceback
 import uuid
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, field
-from datetime import datetime
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
 from ..shared.logger import get_logger
+from .registry import JobRegistry
+from .scheduler import PROCESS_ISOLATION, JobScheduler, PoolConfig, default_pools, run_isolated
 
 logger = get_logger(__name__)
 
@@ -56,6 +58,37 @@ class JobType(StrEnum):
     VENV_INSTALL = "venv_install"
 
 
+# Job priorities (higher starts first within a pool)
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+# Resource pool and default priority of each job type
+JOB_POOLS: dict[JobType, str] = {
+    JobType.TRAINING: "compute",
+    JobType.AUTOML: "compute",
+    # Short, user-facing runs: never queued behind training or AutoML
+    JobType.EVALUATION: "interactive",
+    JobType.PREDICTION: "interactive",
+    JobType.ANALYSIS: "interactive",
+    JobType.EXPORT: "interactive",
+    JobType.UPDATE_DOWNLOAD: "io",
+    JobType.UPDATE_APPLY: "io",
+    JobType.VENV_CREATE: "io",
+    JobType.VENV_INSTALL: "io",
+    JobType.MAINTENANCE: "maintenance",
+}
+
+JOB_PRIORITIES: dict[JobType, int] = {
+    JobType.PREDICTION: PRIORITY_HIGH,
+    JobType.EVALUATION: PRIORITY_HIGH,
+    JobType.ANALYSIS: PRIORITY_HIGH,
+    JobType.UPDATE_APPLY: PRIORITY_HIGH,
+    JobType.AUTOML: PRIORITY_LOW,
+    JobType.MAINTENANCE: PRIORITY_LOW,
+}
+
+
 @dataclass
 class Job:
     """Represents a background job."""
@@ -75,6 +108,9 @@ class Job:
     metrics: dict[str, Any] = field(default_factory=dict)
     history: list[dict[str, Any]] = field(default_factory=list)
     cancellation_requested: bool = False
+    pool: str | None = None
+    priority: int = PRIORITY_NORMAL
+    queue_position: int | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert job to dictionary for JSON serialization."""
@@ -92,6 +128,9 @@ class Job:
             "error": self.error,
             "metrics": self.metrics,
             "duration_seconds": self._get_duration(),
+            "pool": self.pool,
+            "priority": self.priority,
+            "queue_position": self.queue_position,
         }
 
     def _get_duration(self) -> float | None:
@@ -103,24 +142,113 @@ class Job:
         return (end_time - self.started_at).total_seconds()
 
 
+# Finished jobs kept in memory when a registry holds the rest
+DEFAULT_MAX_RESIDENT_FINISHED = 50
+
+# Minimum seconds between registry writes for progress/metrics updates
+PERSIST_INTERVAL_SECONDS = 2.0
+
+_FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
 class JobManager:
     """
     Manages background jobs for the nirs4all webapp.
 
     Provides methods to create, track, update, and cancel jobs.
-    Uses a thread pool for executing long-running tasks.
+    Jobs run in per-class resource pools (see ``JOB_POOLS``) with their
+    own concurrency limits, started by priority within each pool.
+
+    With a ``JobRegistry``, every job is also persisted (status row,
+    spilled result and history), so jobs survive a backend restart. Only
+    active jobs and the most recent finished ones stay in memory; older
+    ones are reloaded from the registry on demand.
     """
 
-    def __init__(self, max_workers: int | None = None):
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        registry: JobRegistry | None = None,
+        max_resident_finished: int = DEFAULT_MAX_RESIDENT_FINISHED,
+        pools: dict[str, PoolConfig] | None = None,
+    ):
         """Initialize the job manager.
 
         Args:
-            max_workers: Maximum number of concurrent jobs (defaults to CPU count)
+            max_workers: Upper bound on concurrent jobs per pool
+            registry: Persistent job registry (in-memory only when None)
+            max_resident_finished: Finished jobs kept in memory when persisted
+            pools: Resource pool layout (defaults to ``default_pools()``)
         """
+        pools = pools or default_pools()
+        if max_workers is not None:
+            pools = {
+                name: replace(config, max_concurrent=max(1, min(config.max_concurrent, max_workers)))
+                for name, config in pools.items()
+            }
         self._jobs: dict[str, Job] = {}
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._scheduler = JobScheduler(pools, on_queue_change=self._update_queue_positions)
         self._lock = threading.Lock()
         self._callbacks: dict[str, list[Callable[[Job], None]]] = {}
+        self._registry = registry
+        self._max_resident_finished = max_resident_finished
+        self._last_persisted: dict[str, float] = {}
+
+    # ----- Persistence -----
+
+    def _persist(self, job: Job, *, throttled: bool = False) -> None:
+        """Write the job's status row (rate-limited for progress updates)."""
+        if self._registry is None:
+            return
+        now = time.monotonic()
+        if throttled and now - self._last_persisted.get(job.id, 0.0) < PERSIST_INTERVAL_SECONDS:
+            return
+        self._last_persisted[job.id] = now
+        self._registry.save(job)
+
+    def _job_from_row(self, row: dict[str, Any], *, with_payload: bool) -> Job | None:
+        """Rebuild a job from a registry row (result/history only if requested)."""
+        try:
+            job_type = JobType(row["type"])
+            status = JobStatus(row["status"])
+        except ValueError:
+            return None
+        return Job(
+            id=row["id"],
+            type=job_type,
+            status=status,
+            created_at=_parse_datetime(row["created_at"]),
+            started_at=_parse_datetime(row["started_at"]),
+            completed_at=_parse_datetime(row["completed_at"]),
+            progress=row["progress"],
+            progress_message=row["progress_message"],
+            config=row["config"],
+            result=self._registry.load_result(row["id"]) if with_payload else None,
+            error=row["error"],
+            metrics=row["metrics"],
+            history=self._registry.load_history(row["id"]) if with_payload else [],
+            pool=JOB_POOLS.get(job_type),
+            priority=JOB_PRIORITIES.get(job_type, PRIORITY_NORMAL),
+        )
+
+    def _enforce_retention(self) -> None:
+        """Drop the oldest finished jobs from memory (they stay in the registry)."""
+        if self._registry is None:
+            return
+        with self._lock:
+            finished = [j for j in self._jobs.values() if j.status in _FINISHED_STATUSES]
+            excess = len(finished) - self._max_resident_finished
+            if excess <= 0:
+                return
+            finished.sort(key=lambda j: j.completed_at or j.created_at)
+            for job in finished[:excess]:
+                del self._jobs[job.id]
+                self._callbacks.pop(job.id, None)
+                self._last_persisted.pop(job.id, None)
 
     def create_job(
         self,
@@ -144,10 +272,13 @@ class JobManager:
             status=JobStatus.PENDING,
             created_at=datetime.now(),
             config=config,
+            pool=JOB_POOLS.get(job_type, "compute"),
+            priority=JOB_PRIORITIES.get(job_type, PRIORITY_NORMAL),
         )
 
         with self._lock:
             self._jobs[job_id] = job
+        self._persist(job)
 
         return job
 
@@ -155,36 +286,74 @@ class JobManager:
         self,
         job: Job,
         task_fn: Callable[[Job, Callable[[float, str], None]], Any],
+        priority: int | None = None,
+        isolate: bool | None = None,
     ) -> Job:
         """Submit a job for execution.
 
+        The job waits in its pool's queue (``job.queue_position``) until a
+        slot is free.
+
         Args:
             job: The job to execute
             task_fn: Function to execute, receives (job, progress_callback)
+            priority: Overrides the job type's default priority
+            isolate: Run in a separate process (defaults to the pool's
+                isolation mode); ``task_fn`` must then be a module-level
+                function and can only report through progress_callback
 
         Returns:
             The job instance
         """
+        if priority is not None:
+            job.priority = priority
+        if isolate is None:
+            isolate = self._scheduler.pool_config(job.pool).isolation == PROCESS_ISOLATION
 
         def run_task():
-            self._execute_job(job, task_fn)
+            if job.status != JobStatus.PENDING:
+                return
+            self._execute_job(job, task_fn, isolate)
 
-        self._executor.submit(run_task)
+        self._scheduler.submit(job.pool, job.id, job.priority, run_task)
         return job
 
+    def _update_queue_positions(self, pool: str, queued_ids: list[str]) -> None:
+        """Refresh queue positions after a pool's queue changed."""
+        positions = {job_id: index + 1 for index, job_id in enumerate(queued_ids)}
+        with self._lock:
+            jobs = [j for j in self._jobs.values() if j.pool == pool and j.status == JobStatus.PENDING]
+        for job in jobs:
+            position = positions.get(job.id)
+            if job.queue_position != position:
+                job.queue_position = position
+                self._notify_callbacks(job)
+
+    def queue_position(self, job_id: str) -> int | None:
+        """1-based position of a pending job in its pool's queue."""
+        return self._scheduler.queue_position(job_id)
+
+    def scheduler_stats(self) -> dict[str, Any]:
+        """Per-pool limits, running/queued jobs and wait/run-time histograms."""
+        return self._scheduler.stats()
+
     def _execute_job(
         self,
         job: Job,
         task_fn: Callable[[Job, Callable[[float, str], None]], Any],
+        isolate: bool = False,
     ) -> None:
-        """Execute a job in the thread pool.
+        """Execute a job in a pool worker thread.
 
         Args:
             job: The job to execute
             task_fn: Function to execute
+            isolate: Run ``task_fn`` in a separate process
         """
         job.status = JobStatus.RUNNING
         job.started_at = datetime.now()
+        job.queue_position = None
+        self._persist(job)
         self._notify_callbacks(job)
 
         def progress_callback(progress: float, message: str = "") -> bool:
@@ -195,11 +364,16 @@ class JobManager:
             """
             job.progress = min(max(progress, 0.0), 100.0)
             job.progress_message = message
+            self._persist(job, throttled=True)
             self._notify_callbacks(job)
             return not job.cancellation_requested
 
         try:
-            result = task_fn(job, progress_callback)
+            if isolate:
+                snapshot = replace(job, result=None, history=[], metrics=dict(job.metrics))
+                result = run_isolated(task_fn, snapshot, progress_callback, lambda: job.cancellation_requested)
+            else:
+                result = task_fn(job, progress_callback)
 
             if job.cancellation_requested:
                 job.status = JobStatus.CANCELLED
@@ -212,11 +386,15 @@ class JobManager:
         except Exception as e:
             job.status = JobStatus.FAILED
             job.error = str(e)
-            job.error_traceback = traceback.format_exc()
+            job.error_traceback = getattr(e, "child_traceback", None) or traceback.format_exc()
 
         finally:
             job.completed_at = datetime.now()
+            if self._registry is not None:
+                self._registry.save_result(job.id, job.result)
+            self._persist(job)
             self._notify_callbacks(job)
+            self._enforce_retention()
 
     def get_job(self, job_id: str) -> Job | None:
         """Get a job by ID.
@@ -228,7 +406,12 @@ class JobManager:
             Job instance or None if not found
         """
         with self._lock:
-            return self._jobs.get(job_id)
+            job = self._jobs.get(job_id)
+        if job is None and self._registry is not None:
+            row = self._registry.get(job_id)
+            if row is not None:
+                job = self._job_from_row(row, with_payload=True)
+        return job
 
     def list_jobs(
         self,
@@ -244,7 +427,8 @@ class JobManager:
             limit: Maximum number of jobs to return
 
         Returns:
-            List of matching jobs
+            List of matching jobs (jobs loaded from the registry carry no
+            result or history; use ``get_job`` for those)
         """
         with self._lock:
             jobs = list(self._jobs.values())
@@ -255,6 +439,15 @@ class JobManager:
         if status:
             jobs = [j for j in jobs if j.status == status]
 
+        if self._registry is not None:
+            rows = self._registry.list(
+                job_type=job_type.value if job_type else None,
+                status=status.value if status else None,
+                limit=limit,
+                exclude=[j.id for j in jobs],
+            )
+            jobs.extend(j for j in (self._job_from_row(row, with_payload=False) for row in rows) if j)
+
         # Sort by created_at descending
         jobs.sort(key=lambda j: j.created_at, reverse=True)
 
@@ -281,10 +474,32 @@ class JobManager:
         if job.status == JobStatus.PENDING:
             job.status = JobStatus.CANCELLED
             job.completed_at = datetime.now()
+            job.queue_position = None
+            self._scheduler.remove(job.id)
+            self._persist(job)
             self._notify_callbacks(job)
 
         return True
 
+    def append_history(self, job_id: str, entry: dict[str, Any]) -> bool:
+        """Append an entry (e.g. a finished trial) to a job's history.
+
+        Args:
+            job_id: Job ID
+            entry: History entry, stored as given
+
+        Returns:
+            True if appended, False if job not found
+        """
+        job = self.get_job(job_id)
+        if not job:
+            return False
+
+        job.history.append(entry)
+        if self._registry is not None:
+            self._registry.append_history(job.id, entry)
+        return True
+
     def update_job_metrics(
         self,
         job_id: str,
@@ -313,7 +528,10 @@ class JobManager:
                 **metrics,
             }
             job.history.append(history_entry)
+            if self._registry is not None:
+                self._registry.append_history(job.id, history_entry)
 
+        self._persist(job, throttled=True)
         self._notify_callbacks(job)
         return True
 
@@ -425,7 +643,7 @@ class JobManager:
             logger.error("Error dispatching WebSocket notification: %s", e)
 
     def cleanup_old_jobs(self, max_age_hours: int = 24) -> int:
-        """Remove old completed/failed jobs.
+        """Remove old completed/failed jobs (from memory and the registry).
 
         Args:
             max_age_hours: Maximum age in hours for jobs to keep
@@ -449,18 +667,25 @@ class JobManager:
                 del self._jobs[job_id]
                 if job_id in self._callbacks:
                     del self._callbacks[job_id]
+                self._last_persisted.pop(job_id, None)
                 removed += 1
 
+        if self._registry is not None:
+            deleted = self._registry.delete_finished_before(cutoff - timedelta(hours=max_age_hours))
+            removed += len(set(deleted) - set(job_ids_to_remove))
+
         return removed
 
     def shutdown(self, wait: bool = True) -> None:
         """Shutdown the job manager.
 
         Args:
-            wait: Whether to wait for pending jobs to complete
+            wait: Whether to wait for running jobs to complete (queued
+                jobs that have not started are dropped)
         """
-        self._executor.shutdown(wait=wait)
+        self._scheduler.shutdown(wait=wait)
 
 
-# Global job manager instance
-job_manager = JobManager()
+# Global job manager instance (persisted under the app data directory)
+job_registry = JobRegistry()
+job_manager = JobManager(registry=job_registry)
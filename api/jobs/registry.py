@@ -0,0 +1,341 @@
+"""
+Persistent job registry for the JobManager.
+
+Each job has one compact status row in ``jobs.sqlite`` (type, status,
+timestamps, progress, config and metrics). Large payloads are spilled to
+files next to it: ``<job_id>.result.json`` once the job finishes, and
+``<job_id>.history.jsonl``, which grows by one line per history entry while
+the job runs. A crash therefore loses at most the last in-flight update.
+
+Rows record the pid of the backend that owns the job. When a registry is
+opened, pending or running rows whose owner process is gone are marked as
+failed, so an interrupted AutoML search still shows up (with the trials
+recorded so far) after a restart.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from ..shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+REGISTRY_FILENAME = "jobs.sqlite"
+
+INTERRUPTED_ERROR = "Job was interrupted by a backend restart"
+
+_ACTIVE_STATUSES = ("pending", "running")
+
+_COLUMNS = (
+    "id",
+    "type",
+    "status",
+    "created_at",
+    "started_at",
+    "completed_at",
+    "progress",
+    "progress_message",
+    "config",
+    "error",
+    "metrics",
+    "owner_pid",
+)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process with this pid is still running."""
+    if pid <= 0:
+        return False
+    if sys.platform == "win32":
+        import ctypes
+
+        process_query_limited_information = 0x1000
+        still_active = 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(process_query_limited_information, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return False
+            return exit_code.value == still_active
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class JobRegistry:
+    """SQLite status rows plus spilled result/history files for jobs."""
+
+    def __init__(self, root: Path | None = None):
+        self._root = root
+        self._resolved: Path | None = None
+        self._lock = threading.Lock()
+        self._ready = False
+        self._disabled = False
+
+    def set_root(self, root: Path | None) -> None:
+        """Move the registry to ``root`` (``<app config dir>/jobs`` when None); reopened on next use."""
+        with self._lock:
+            self._root = root
+            self._resolved = None
+            self._ready = False
+            self._disabled = False
+
+    def _resolve_dir(self) -> Path | None:
+        if self._root is not None:
+            return self._root
+        try:
+            from ..app_config import app_config
+
+            return Path(app_config.config_dir) / "jobs"
+        except Exception:
+            return None
+
+    def _ensure_ready(self) -> bool:
+        """Create the registry and recover stale jobs on first use."""
+        if self._disabled:
+            return False
+        if not self._ready:
+            with self._lock:
+                if not self._ready and not self._disabled:
+                    try:
+                        self._initialize()
+                        self._ready = True
+                    except Exception as e:
+                        logger.warning("Job registry unavailable, jobs will not persist: %s", e)
+                        self._disabled = True
+        return self._ready
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if not self._ensure_ready():
+            return None
+        conn = sqlite3.connect(self._resolved / REGISTRY_FILENAME, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize(self) -> None:
+        root = self._resolve_dir()
+        if root is None:
+            raise RuntimeError("no app data directory")
+        root.mkdir(parents=True, exist_ok=True)
+        self._resolved = root
+        conn = sqlite3.connect(root / REGISTRY_FILENAME, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    completed_at TEXT,
+                    progress REAL NOT NULL DEFAULT 0,
+                    progress_message TEXT NOT NULL DEFAULT '',
+                    config TEXT NOT NULL DEFAULT '{}',
+                    error TEXT,
+                    metrics TEXT NOT NULL DEFAULT '{}',
+                    owner_pid INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at)")
+            recovered = self._recover_interrupted(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        if recovered:
+            logger.info("Marked %d interrupted job(s) from a previous backend as failed", recovered)
+
+    def _recover_interrupted(self, conn: sqlite3.Connection) -> int:
+        placeholders = ",".join("?" * len(_ACTIVE_STATUSES))
+        rows = conn.execute(
+            f"SELECT id, owner_pid FROM jobs WHERE status IN ({placeholders})", _ACTIVE_STATUSES
+        ).fetchall()
+        stale = [job_id for job_id, pid in rows if pid != os.getpid() and not _pid_alive(pid)]
+        now = datetime.now().isoformat()
+        conn.executemany(
+            "UPDATE jobs SET status = 'failed', error = ?, completed_at = COALESCE(completed_at, ?) WHERE id = ?",
+            [(INTERRUPTED_ERROR, now, job_id) for job_id in stale],
+        )
+        return len(stale)
+
+    # ----- Rows -----
+
+    def save(self, job: Any) -> None:
+        """Insert or update the compact status row of ``job``."""
+        conn = self._connect()
+        if conn is None:
+            return
+        row = (
+            job.id,
+            job.type.value,
+            job.status.value,
+            job.created_at.isoformat(),
+            job.started_at.isoformat() if job.started_at else None,
+            job.completed_at.isoformat() if job.completed_at else None,
+            float(job.progress),
+            job.progress_message or "",
+            json.dumps(job.config, default=str),
+            job.error,
+            json.dumps(job.metrics, default=str),
+            os.getpid(),
+        )
+        try:
+            with conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    row,
+                )
+        except Exception as e:
+            logger.debug("Could not persist job %s: %s", job.id, e)
+        finally:
+            conn.close()
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return self._decode(row) if row is not None else None
+
+    def list(
+        self,
+        job_type: str | None = None,
+        status: str | None = None,
+        limit: int = 50,
+        exclude: Iterable[str] = (),
+    ) -> list[dict[str, Any]]:
+        """Newest rows first, optionally filtered, skipping ``exclude`` ids."""
+        conn = self._connect()
+        if conn is None:
+            return []
+        clauses, params = [], []
+        if job_type:
+            clauses.append("type = ?")
+            params.append(job_type)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        excluded = list(exclude)
+        if excluded:
+            clauses.append(f"id NOT IN ({','.join('?' * len(excluded))})")
+            params.extend(excluded)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        try:
+            rows = conn.execute(
+                f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._decode(row) for row in rows]
+
+    def delete_finished_before(self, cutoff: datetime) -> list[str]:
+        """Remove finished jobs completed before ``cutoff`` (rows and files)."""
+        conn = self._connect()
+        if conn is None:
+            return []
+        placeholders = ",".join("?" * len(_ACTIVE_STATUSES))
+        try:
+            with conn:
+                ids = [
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT id FROM jobs WHERE status NOT IN ({placeholders}) AND completed_at < ?",
+                        (*_ACTIVE_STATUSES, cutoff.isoformat()),
+                    )
+                ]
+                conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in ids])
+        finally:
+            conn.close()
+        for job_id in ids:
+            for path in (self._result_path(job_id), self._history_path(job_id)):
+                if path is not None:
+                    path.unlink(missing_ok=True)
+        return ids
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> dict[str, Any]:
+        data = dict(row)
+        data["config"] = json.loads(data["config"] or "{}")
+        data["metrics"] = json.loads(data["metrics"] or "{}")
+        return data
+
+    # ----- Spilled payloads -----
+
+    def _result_path(self, job_id: str) -> Path | None:
+        return self._resolved / f"{job_id}.result.json" if self._resolved is not None else None
+
+    def _history_path(self, job_id: str) -> Path | None:
+        return self._resolved / f"{job_id}.history.jsonl" if self._resolved is not None else None
+
+    def save_result(self, job_id: str, result: dict[str, Any] | None) -> None:
+        if result is None or not self._ensure_ready():
+            return
+        path = self._result_path(job_id)
+        try:
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(result, default=str), encoding="utf-8")
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.debug("Could not spill result of job %s: %s", job_id, e)
+
+    def load_result(self, job_id: str) -> dict[str, Any] | None:
+        if not self._ensure_ready():
+            return None
+        path = self._result_path(job_id)
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug("Could not read result of job %s: %s", job_id, e)
+            return None
+
+    def append_history(self, job_id: str, entry: dict[str, Any]) -> None:
+        if not self._ensure_ready():
+            return
+        try:
+            with open(self._history_path(job_id), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+        except Exception as e:
+            logger.debug("Could not append history of job %s: %s", job_id, e)
+
+    def load_history(self, job_id: str) -> list[dict[str, Any]]:
+        if not self._ensure_ready():
+            return []
+        history = []
+        try:
+            with open(self._history_path(job_id), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        history.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # Torn last line after a crash
+                        break
+        except FileNotFoundError:
+            pass
+        return history
@@ -0,0 +1,295 @@
+"""
+Resource-class scheduling for background jobs.
+
+Jobs are routed to named pools (compute, interactive, io, maintenance),
+each with its own concurrency limit and worker threads, so a long AutoML
+sweep cannot starve a quick SHAP request or an update download, and
+CPU-bound jobs do not oversubscribe the cores nirs4all already
+parallelizes. Within a pool, queued jobs start by priority (higher
+first), then in submission order.
+
+Each pool records queue-wait and run-time histograms. Pools can also be
+configured to run tasks in a separate process (see ``run_isolated``),
+which gives CPU-heavy jobs their own interpreter and makes cancellation
+immediate.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import queue
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..shared.histogram import Histogram
+from ..shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds an isolated task gets to honour a cancellation before it is terminated
+ISOLATED_CANCEL_GRACE_SECONDS = 5.0
+
+THREAD_ISOLATION = "thread"
+PROCESS_ISOLATION = "process"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def _env_isolation(name: str) -> str:
+    value = os.environ.get(name, "").strip().lower()
+    return PROCESS_ISOLATION if value == PROCESS_ISOLATION else THREAD_ISOLATION
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Concurrency limit and isolation mode of a resource pool."""
+
+    name: str
+    max_concurrent: int
+    isolation: str = THREAD_ISOLATION
+
+
+def default_pools() -> dict[str, PoolConfig]:
+    """Pool layout, overridable with NIRS4ALL_<POOL>_JOBS / NIRS4ALL_<POOL>_ISOLATION."""
+    cpu_count = os.cpu_count() or 1
+    defaults = {
+        # nirs4all parallelizes training internally, so heavy jobs are few;
+        # two slots keep a long AutoML sweep from blocking every training run
+        "compute": 2,
+        "interactive": min(4, cpu_count),
+        "io": 2,
+        "maintenance": 1,
+    }
+    return {
+        name: PoolConfig(
+            name=name,
+            max_concurrent=_env_int(f"NIRS4ALL_{name.upper()}_JOBS", limit),
+            isolation=_env_isolation(f"NIRS4ALL_{name.upper()}_ISOLATION"),
+        )
+        for name, limit in defaults.items()
+    }
+
+
+@dataclass(order=True)
+class _QueuedJob:
+    sort_key: tuple[int, int]
+    job_id: str = field(compare=False)
+    run: Callable[[], None] = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+class _PoolState:
+    def __init__(self, config: PoolConfig):
+        self.config = config
+        self.executor = ThreadPoolExecutor(
+            max_workers=config.max_concurrent, thread_name_prefix=f"jobs-{config.name}"
+        )
+        self.queue: list[_QueuedJob] = []
+        self.running: set[str] = set()
+        self.queue_wait = Histogram()
+        self.run_time = Histogram()
+
+    def ordered_queue(self) -> list[str]:
+        return [entry.job_id for entry in sorted(self.queue)]
+
+
+class JobScheduler:
+    """Priority queues in front of one bounded thread pool per resource class."""
+
+    def __init__(
+        self,
+        pools: dict[str, PoolConfig],
+        on_queue_change: Callable[[str, list[str]], None] | None = None,
+    ):
+        self._pools = {name: _PoolState(config) for name, config in pools.items()}
+        self._on_queue_change = on_queue_change
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def pool_config(self, pool: str) -> PoolConfig:
+        return self._pools[pool].config
+
+    def submit(self, pool: str, job_id: str, priority: int, run: Callable[[], None]) -> None:
+        """Queue ``run`` in ``pool``; it starts as soon as a slot is free."""
+        state = self._pools[pool]
+        entry = _QueuedJob((-priority, next(self._sequence)), job_id, run, time.monotonic())
+        with self._lock:
+            heapq.heappush(state.queue, entry)
+        self._dispatch(state)
+
+    def remove(self, job_id: str) -> bool:
+        """Drop a job that has not started yet."""
+        for state in self._pools.values():
+            with self._lock:
+                entries = [entry for entry in state.queue if entry.job_id != job_id]
+                if len(entries) == len(state.queue):
+                    continue
+                state.queue = entries
+                heapq.heapify(state.queue)
+                ordered = state.ordered_queue()
+            self._queue_changed(state, ordered)
+            return True
+        return False
+
+    def queue_position(self, job_id: str) -> int | None:
+        """1-based position of a queued job within its pool."""
+        with self._lock:
+            for state in self._pools.values():
+                ordered = state.ordered_queue()
+                if job_id in ordered:
+                    return ordered.index(job_id) + 1
+        return None
+
+    def _dispatch(self, state: _PoolState) -> None:
+        started = False
+        with self._lock:
+            while state.queue and len(state.running) < state.config.max_concurrent:
+                entry = heapq.heappop(state.queue)
+                state.running.add(entry.job_id)
+                state.queue_wait.observe(time.monotonic() - entry.enqueued_at)
+                state.executor.submit(self._run_entry, state, entry)
+                started = True
+            ordered = state.ordered_queue()
+        if started or ordered:
+            self._queue_changed(state, ordered)
+
+    def _run_entry(self, state: _PoolState, entry: _QueuedJob) -> None:
+        started_at = time.monotonic()
+        try:
+            entry.run()
+        except Exception as e:
+            logger.error("Unhandled error in %s job %s: %s", state.config.name, entry.job_id, e)
+        finally:
+            with self._lock:
+                state.running.discard(entry.job_id)
+            state.run_time.observe(time.monotonic() - started_at)
+            self._dispatch(state)
+
+    def _queue_changed(self, state: _PoolState, ordered: list[str]) -> None:
+        if self._on_queue_change is None:
+            return
+        try:
+            self._on_queue_change(state.config.name, ordered)
+        except Exception as e:
+            logger.debug("Queue change callback failed: %s", e)
+
+    def stats(self) -> dict[str, Any]:
+        """Limits, occupancy, queued jobs and duration histograms per pool."""
+        pools = {}
+        for name, state in self._pools.items():
+            with self._lock:
+                running = sorted(state.running)
+                queued = state.ordered_queue()
+            pools[name] = {
+                "max_concurrent": state.config.max_concurrent,
+                "isolation": state.config.isolation,
+                "running": running,
+                "queued": queued,
+                "queue_wait_seconds": state.queue_wait.snapshot(),
+                "run_time_seconds": state.run_time.snapshot(),
+            }
+        return {"pools": pools}
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            for state in self._pools.values():
+                state.queue.clear()
+        for state in self._pools.values():
+            state.executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+# ----- Process isolation -----
+
+
+def _isolated_entry(task_fn: Callable, job: Any, updates: Any, cancel: Any) -> None:
+    """Child-process side: run the task and stream progress/result back."""
+
+    def progress_callback(progress: float, message: str = "") -> bool:
+        updates.put(("progress", (progress, message)))
+        return not cancel.is_set()
+
+    try:
+        updates.put(("result", task_fn(job, progress_callback)))
+    except BaseException as e:
+        updates.put(("error", (str(e), traceback.format_exc())))
+
+
+class IsolatedTaskError(RuntimeError):
+    """An isolated task raised; carries the child's traceback."""
+
+    def __init__(self, message: str, child_traceback: str = ""):
+        super().__init__(message)
+        self.child_traceback = child_traceback
+
+
+def run_isolated(
+    task_fn: Callable[[Any, Callable[[float, str], bool]], Any],
+    job: Any,
+    progress_callback: Callable[[float, str], bool],
+    is_cancelled: Callable[[], bool],
+) -> Any:
+    """Run ``task_fn(job, progress_callback)`` in a spawned process.
+
+    ``task_fn`` must be a picklable module-level function. Progress is
+    relayed to ``progress_callback``; a requested cancellation is signalled
+    to the child and, if it does not return within the grace period, the
+    process is terminated and None is returned.
+    """
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("spawn")
+    updates = ctx.Queue()
+    cancel = ctx.Event()
+    process = ctx.Process(target=_isolated_entry, args=(task_fn, job, updates, cancel), daemon=True)
+    process.start()
+    cancel_deadline: float | None = None
+    try:
+        while True:
+            try:
+                kind, payload = updates.get(timeout=0.2)
+            except queue.Empty:
+                if not process.is_alive():
+                    try:
+                        kind, payload = updates.get(timeout=1.0)
+                    except queue.Empty:
+                        if cancel.is_set():
+                            return None
+                        raise IsolatedTaskError(
+                            f"Job process exited unexpectedly (exit code {process.exitcode})"
+                        ) from None
+                else:
+                    if is_cancelled() and not cancel.is_set():
+                        cancel.set()
+                    if cancel.is_set():
+                        cancel_deadline = cancel_deadline or time.monotonic() + ISOLATED_CANCEL_GRACE_SECONDS
+                        if time.monotonic() > cancel_deadline:
+                            process.terminate()
+                            return None
+                    continue
+
+            if kind == "progress":
+                if not progress_callback(*payload):
+                    cancel.set()
+            elif kind == "result":
+                return payload
+            else:
+                message, child_traceback = payload
+                raise IsolatedTaskError(message, child_traceback)
+    finally:
+        process.join(timeout=ISOLATED_CANCEL_GRACE_SECONDS)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        updates.close()
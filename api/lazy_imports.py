@@ -2,7 +2,8 @@
 
 Provides two-phase startup:
 - Phase 1 (core_ready): FastAPI running, workspace restored, basic endpoints work.
-  All routers are registered but nirs4all imports are deferred.
+  First-screen routers are registered (others mount on first use, see
+  lazy_routers) and nirs4all imports are deferred.
 - Phase 2 (ml_ready): All nirs4all dependencies loaded in background thread.
   Heavy pages (Playground, PipelineEditor, Training, etc.) now functional.
 """
@@ -334,7 +335,19 @@ def _do_load_ml_deps():
         logger.error("Failed to load ML dependencies: %s", e, exc_info=True)
 
 
+def _load_ml_deps_and_prewarm():
+    """Load ML dependencies, then warm the operator-discovery cache."""
+    _do_load_ml_deps()
+    if not _ml_ready:
+        return
+    try:
+        from .shared.operator_cache import prewarm_operator_discovery
+        prewarm_operator_discovery()
+    except Exception as e:
+        logger.warning("Operator discovery pre-warm failed: %s", e)
+
+
 def start_ml_loading():
     """Start loading ML dependencies in a background thread."""
-    thread = threading.Thread(target=_do_load_ml_deps, name="ml-loader", daemon=True)
+    thread = threading.Thread(target=_load_ml_deps_and_prewarm, name="ml-loader", daemon=True)
     thread.start()
@@ -0,0 +1,149 @@
+"""Deferred router registration for fast backend startup.
+
+Importing every router module before uvicorn accepts its first request
+makes a cold desktop launch wait for analysis, SHAP, AutoML, inspector and
+friends, while the first screen only needs workspace and settings. Routers
+registered here are imported on the first request under their URL prefix
+(or by ``preload()`` once startup is over) and then mounted at the position
+they would have had if included eagerly, so they still take precedence over
+the SPA catch-all route.
+
+Set ``NIRS4ALL_LAZY_ROUTERS=0`` to import everything at startup instead.
+"""
+
+import asyncio
+import importlib
+import os
+import time
+from dataclasses import dataclass, field
+
+from .shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Paths that need every router mounted (API schema and docs)
+_SCHEMA_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+
+@dataclass
+class LazyRouter:
+    """A router module mounted under ``api_prefix + prefix`` on first use."""
+
+    module: str
+    prefix: str
+    tags: list[str] = field(default_factory=list)
+    loaded: bool = False
+    route_count: int = 0
+
+    def matches(self, path: str, api_prefix: str) -> bool:
+        full_prefix = api_prefix + self.prefix
+        return path == full_prefix or path.startswith(full_prefix + "/")
+
+
+def lazy_routers_enabled() -> bool:
+    return os.environ.get("NIRS4ALL_LAZY_ROUTERS", "1").strip().lower() not in ("0", "false", "no")
+
+
+class LazyRouterRegistry:
+    """Routers imported and mounted on the first request under their prefix."""
+
+    def __init__(self, app, api_prefix: str = "/api"):
+        self._app = app
+        self._api_prefix = api_prefix
+        self._entries: list[LazyRouter] = []
+        self._anchor: int | None = None
+        self._lock: asyncio.Lock | None = None
+        self.import_times: dict[str, float] = {}
+
+    def add(self, module: str, prefix: str, tags: list[str] | None = None) -> None:
+        """Register ``module.router`` for ``api_prefix + prefix`` (e.g. "/analysis")."""
+        self._entries.append(LazyRouter(module=module, prefix=prefix, tags=list(tags or [])))
+
+    def install(self) -> None:
+        """Anchor lazy routes at the current end of the route table and start intercepting."""
+        self._anchor = len(self._app.router.routes)
+        if lazy_routers_enabled():
+            self._app.add_middleware(LazyRouterMiddleware, registry=self)
+        else:
+            self.load_all()
+
+    @property
+    def pending(self) -> list[str]:
+        return [entry.module for entry in self._entries if not entry.loaded]
+
+    def _needed_for(self, path: str) -> list[LazyRouter]:
+        if path in _SCHEMA_PATHS:
+            return [entry for entry in self._entries if not entry.loaded]
+        return [entry for entry in self._entries if not entry.loaded and entry.matches(path, self._api_prefix)]
+
+    def _import(self, entry: LazyRouter):
+        started = time.perf_counter()
+        module = importlib.import_module(entry.module)
+        self.import_times[entry.module] = time.perf_counter() - started
+        logger.info("Lazy router %s imported in %.2fs", entry.module, self.import_times[entry.module])
+        return module
+
+    def _mount(self, entry: LazyRouter, module) -> None:
+        """Include the module's router and move its routes to their eager position."""
+        routes = self._app.router.routes
+        before = len(routes)
+        self._app.include_router(module.router, prefix=self._api_prefix, tags=entry.tags or None)
+        added = routes[before:]
+        del routes[before:]
+
+        position = self._anchor
+        for other in self._entries:
+            if other is entry:
+                break
+            if other.loaded:
+                position += other.route_count
+        routes[position:position] = added
+
+        entry.route_count = len(added)
+        entry.loaded = True
+        self._app.openapi_schema = None
+        # FastAPI versions that cache resolved routes track a routes version
+        mark_changed = getattr(self._app.router, "_mark_routes_changed", None)
+        if mark_changed is not None:
+            mark_changed()
+
+    def load_all(self) -> None:
+        """Import and mount every pending router synchronously."""
+        for entry in self._entries:
+            if not entry.loaded:
+                self._mount(entry, self._import(entry))
+
+    async def ensure_loaded(self, path: str) -> None:
+        """Mount the routers serving ``path`` (importing off the event loop)."""
+        if not self._needed_for(path):
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Registration order keeps the eager route precedence
+            for entry in self._needed_for(path):
+                module = await asyncio.to_thread(self._import, entry)
+                self._mount(entry, module)
+
+    async def preload(self) -> None:
+        """Mount the remaining routers one by one in the background."""
+        for entry in list(self._entries):
+            if entry.loaded:
+                continue
+            try:
+                await self.ensure_loaded(self._api_prefix + entry.prefix)
+            except Exception as e:
+                logger.warning("Could not preload router %s: %s", entry.module, e)
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that mounts lazy routers before the request is routed."""
+
+    def __init__(self, app, registry: LazyRouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            await self.registry.ensure_loaded(scope["path"])
+        await self.app(scope, receive, send)
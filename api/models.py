@@ -17,6 +17,7 @@ from typing import Any, Dict, List, Optional, get_type_hints
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from .shared.bundle_index import get_bundle_index
 from .shared.logger import get_logger
 from .workspace_manager import workspace_manager
 
@@ -518,47 +519,24 @@ async def list_trained_models():
         return {"models": [], "total": 0}
 
     models = []
-    for n4a_file in exports_dir.rglob("*.n4a"):
-        try:
-            stat = n4a_file.stat()
-
-            # Extract dataset name from parent directory
-            dataset_name = n4a_file.parent.name if n4a_file.parent != exports_dir else None
-
-            # Try to load bundle metadata using BundleLoader
-            pipeline_uid = None
-            nirs4all_version = None
-            preprocessing_chain = None
-
-            BundleLoader = get_cached("BundleLoader")
-            if BundleLoader is not None:
-                try:
-                    loader = BundleLoader(str(n4a_file))
-                    if loader.metadata:
-                        pipeline_uid = loader.metadata.pipeline_uid
-                        nirs4all_version = loader.metadata.nirs4all_version
-                        preprocessing_chain = loader.metadata.preprocessing_chain
-                except Exception:
-                    pass
-
-            models.append(
-                TrainedModelInfo(
-                    id=n4a_file.stem,
-                    name=n4a_file.name,
-                    path=str(n4a_file),
-                    model_type="n4a_bundle",
-                    created_at=datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    file_size=stat.st_size,
-                    dataset_name=dataset_name,
-                    pipeline_uid=pipeline_uid,
-                    nirs4all_version=nirs4all_version,
-                    preprocessing_chain=preprocessing_chain,
-                )
+    for bundle in get_bundle_index(workspace.path).scan(get_cached("BundleLoader")):
+        n4a_file = bundle.path
+        # Extract dataset name from parent directory
+        dataset_name = n4a_file.parent.name if n4a_file.parent != exports_dir else None
+        models.append(
+            TrainedModelInfo(
+                id=n4a_file.stem,
+                name=n4a_file.name,
+                path=str(n4a_file),
+                model_type="n4a_bundle",
+                created_at=datetime.fromtimestamp(bundle.mtime).isoformat(),
+                file_size=bundle.size,
+                dataset_name=dataset_name,
+                pipeline_uid=bundle.fields.get("pipeline_uid"),
+                nirs4all_version=bundle.fields.get("nirs4all_version"),
+                preprocessing_chain=bundle.fields.get("preprocessing_chain"),
             )
-
-        except Exception as e:
-            logger.error("Error reading bundle %s: %s", n4a_file, e)
-            continue
+        )
 
     # Sort by creation date
     models.sort(key=lambda m: m.created_at, reverse=True)
@@ -584,49 +562,26 @@ async def list_available_models():
     # 1. Scan .n4a bundles from exports/
     exports_dir = Path(workspace.path) / "workspace" / "exports"
     if exports_dir.exists():
-        BundleLoader = get_cached("BundleLoader")
-        for n4a_file in exports_dir.rglob("*.n4a"):
-            try:
-                stat = n4a_file.stat()
-                dataset_name = n4a_file.parent.name if n4a_file.parent != exports_dir else None
-                preprocessing_chain = None
-                pipeline_uid = None
-                model_class = n4a_file.stem
-
-                if BundleLoader is not None:
-                    try:
-                        loader = BundleLoader(str(n4a_file))
-                        if loader.metadata:
-                            preprocessing_chain = loader.metadata.preprocessing_chain
-                            pipeline_uid = loader.metadata.pipeline_uid
-                            # Extract model class from preprocessing chain or stem
-                            if hasattr(loader, "get_step_info"):
-                                steps = loader.get_step_info()
-                                for s in steps:
-                                    if s.get("is_model"):
-                                        model_class = s.get("class_name", model_class)
-                                        break
-                    except Exception:
-                        pass
-
-                if pipeline_uid:
-                    seen_pipeline_uids.add(pipeline_uid)
-
-                models.append(AvailableModel(
-                    id=n4a_file.stem,
-                    name=n4a_file.stem,
-                    source="bundle",
-                    model_class=model_class,
-                    dataset_name=dataset_name,
-                    metric=None,
-                    best_score=None,
-                    created_at=datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    file_size=stat.st_size,
-                    preprocessing=preprocessing_chain,
-                    bundle_path=str(n4a_file),
-                ).model_dump())
-            except Exception as e:
-                logger.error("Error reading bundle %s: %s", n4a_file, e)
+        for bundle in get_bundle_index(workspace.path).scan(get_cached("BundleLoader")):
+            n4a_file = bundle.path
+            dataset_name = n4a_file.parent.name if n4a_file.parent != exports_dir else None
+            pipeline_uid = bundle.fields.get("pipeline_uid")
+            if pipeline_uid:
+                seen_pipeline_uids.add(pipeline_uid)
+
+            models.append(AvailableModel(
+                id=n4a_file.stem,
+                name=n4a_file.stem,
+                source="bundle",
+                model_class=bundle.fields.get("model_class") or n4a_file.stem,
+                dataset_name=dataset_name,
+                metric=None,
+                best_score=None,
+                created_at=datetime.fromtimestamp(bundle.mtime).isoformat(),
+                file_size=bundle.size,
+                preprocessing=bundle.fields.get("preprocessing_chain"),
+                bundle_path=str(n4a_file),
+            ).model_dump())
 
     # 2. Query chain summaries from WorkspaceStore — only chains with saved artifacts
     workspace_path = Path(workspace.path)
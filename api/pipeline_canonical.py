@@ -1,9 +1,23 @@
-"""Backend-authoritative canonical <-> editor pipeline conversion."""
+"""Backend-authoritative canonical <-> editor pipeline conversion.
+
+The public conversions (``editor_to_canonical``, ``canonical_to_editor``,
+``validate_canonical``) run on every save, preview, variant count and run
+launch, usually on the same pipeline JSON. They are pure functions of their
+input (the node registry they consult is loaded once), so their results are
+memoized in a bounded LRU keyed by a hash of the input's JSON form. Cached
+results are copied on return, and editor step ids are renewed so that two
+imports of the same payload never share ids.
+"""
 
 from __future__ import annotations
 
 import copy
+import hashlib
 import json
+import os
+import re
+import threading
+from collections import OrderedDict
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
@@ -109,14 +123,146 @@ KNOWN_FINETUNE_KEYS = {
 }
 
 
+# Maximum number of memoized conversion results
+CONVERSION_CACHE_MAX_ENTRIES = 256
+
+_generated_ids = threading.local()
+_STEP_ID_PATTERN = re.compile(r'"(step-[0-9a-f]{12})"')
+
+
 def _step_id() -> str:
-    return f"step-{uuid4().hex[:12]}"
+    step_id = f"step-{uuid4().hex[:12]}"
+    recorded = getattr(_generated_ids, "ids", None)
+    if recorded is not None:
+        recorded.add(step_id)
+    return step_id
+
+
+def _fresh_step_ids(count: int) -> list[str]:
+    """``count`` new step ids at once (same format as ``_step_id``)."""
+    token = os.urandom(6 * count).hex()
+    step_ids = [f"step-{token[i:i + 12]}" for i in range(0, 12 * count, 12)]
+    recorded = getattr(_generated_ids, "ids", None)
+    if recorded is not None:
+        recorded.update(step_ids)
+    return step_ids
 
 
 def clone_value(value: Any) -> Any:
     return copy.deepcopy(value)
 
 
+def _copy_json(value: Any, renamed_ids: dict[str, str] | None = None) -> Any:
+    """Copy a JSON-like structure, replacing the step ids listed in ``renamed_ids``.
+
+    Like the substitution on cached JSON text, every string equal to a
+    listed id is replaced, wherever it appears (values, list items, keys).
+    Much cheaper than ``copy.deepcopy`` on plain dicts and lists; any other
+    container falls back to it.
+    """
+    if isinstance(value, str):
+        return renamed_ids.get(value, value) if renamed_ids else value
+    if isinstance(value, dict):
+        return {
+            _copy_json(key, renamed_ids): _copy_json(child, renamed_ids)
+            for key, child in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return type(value)(_copy_json(child, renamed_ids) for child in value)
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    return copy.deepcopy(value)
+
+
+class ConversionCache:
+    """LRU of conversion results keyed by function and input hash.
+
+    Results are stored as JSON text when they survive a JSON round trip
+    unchanged (the usual case): decoding it is the cheapest deep copy, and
+    renewing step ids is a substitution on the text.
+    """
+
+    def __init__(self, max_entries: int = CONVERSION_CACHE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        # key -> (JSON text or None, result when it has no exact JSON form, generated step ids)
+        self._entries: OrderedDict[tuple, tuple[str | None, Any, frozenset[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def input_hash(payload: Any) -> str | None:
+        """Hash of the payload's JSON form, or None when it has no JSON form.
+
+        Key order is part of the hash: conversions preserve it in their output.
+        """
+        try:
+            encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _freeze(result: Any) -> tuple[str | None, Any]:
+        try:
+            encoded = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+            # Tuples and non-string keys do not survive the round trip
+            if json.loads(encoded) == result:
+                return encoded, None
+        except (TypeError, ValueError):
+            pass
+        return None, _copy_json(result)
+
+    @staticmethod
+    def _thaw(encoded: str | None, result: Any, step_ids: frozenset[str]) -> Any:
+        renamed = dict(zip(step_ids, _fresh_step_ids(len(step_ids)))) if step_ids else None
+        if encoded is None:
+            return _copy_json(result, renamed)
+        if renamed:
+            encoded = _STEP_ID_PATTERN.sub(lambda match: f'"{renamed.get(match.group(1), match.group(1))}"', encoded)
+        return json.loads(encoded)
+
+    def call(self, fn: Any, payload: Any) -> Any:
+        """Return ``fn(payload)``, memoized; the result is the caller's to mutate."""
+        digest = self.input_hash(payload)
+        if digest is None:
+            return fn(payload)
+        key = (fn.__name__, digest)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            return self._thaw(*entry)
+
+        outer = getattr(_generated_ids, "ids", None)
+        _generated_ids.ids = set()
+        try:
+            result = fn(payload)
+            step_ids = frozenset(_generated_ids.ids)
+        finally:
+            if outer is not None:
+                outer |= _generated_ids.ids
+            _generated_ids.ids = outer
+        encoded, frozen = self._freeze(result)
+        with self._lock:
+            self._entries[key] = (encoded, frozen, step_ids)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+conversion_cache = ConversionCache()
+
+
 def filter_comments(payload: Any) -> Any:
     """Remove explicit ``_comment`` metadata recursively."""
     if isinstance(payload, list):
@@ -1480,6 +1626,10 @@ def _convert_step_to_editor(step: Any) -> dict[str, Any]:
 
 def canonical_to_editor(payload: Any) -> list[dict[str, Any]]:
     """Convert canonical nirs4all JSON/YAML payload into editor steps."""
+    return conversion_cache.call(_canonical_to_editor, payload)
+
+
+def _canonical_to_editor(payload: Any) -> list[dict[str, Any]]:
     _, _, steps = unwrap_canonical_payload(payload)
     return [_convert_step_to_editor(step) for step in steps]
 
@@ -2059,7 +2209,7 @@ def editor_to_canonical(
     include_wrapper: bool = False,
 ) -> list[Any] | dict[str, Any]:
     """Convert editor steps back into canonical nirs4all JSON/YAML format."""
-    canonical_steps = _serialize_editor_steps(hydrate_editor_steps(steps))
+    canonical_steps = conversion_cache.call(_editor_to_canonical, steps)
     if include_wrapper:
         return {
             "name": name or "pipeline",
@@ -2069,8 +2219,16 @@ def editor_to_canonical(
     return canonical_steps
 
 
+def _editor_to_canonical(steps: list[dict[str, Any]]) -> list[Any]:
+    return _serialize_editor_steps(hydrate_editor_steps(steps))
+
+
 def validate_canonical(payload: Any) -> dict[str, Any]:
     """Validate canonical payload using nirs4all's pipeline semantics."""
+    return conversion_cache.call(_validate_canonical, payload)
+
+
+def _validate_canonical(payload: Any) -> dict[str, Any]:
     from nirs4all.pipeline.config.pipeline_config import PipelineConfigs
 
     name, description, steps = unwrap_canonical_payload(payload)
@@ -13,6 +13,7 @@ Phase 2 Implementation:
 
 from __future__ import annotations
 
+import asyncio
 import inspect
 import json
 from datetime import datetime
@@ -36,10 +37,12 @@ from .pipeline_canonical import (
 )
 from .preset_loader import list_presets, load_preset
 from .shared.logger import get_logger
+from .shared.operator_cache import operator_discovery_cache
 from .shared.runtime_grouping import (
     normalize_split_group_by_mapping,
     prepare_pipeline_steps_with_runtime_grouping,
 )
+from .shared.variant_counter import VariantCountSuperseded, variant_counter
 from .workspace_manager import workspace_manager
 
 logger = get_logger(__name__)
@@ -88,6 +91,8 @@ class PipelineValidateRequest(BaseModel):
 class PipelineCountRequest(BaseModel):
     """Request model for counting pipeline variants."""
     steps: list[dict[str, Any]]
+    client_id: str | None = None  # Editor instance issuing the request
+    sequence: int | None = None  # Monotonic per client; newer requests supersede older ones
 
 
 class PipelineExecuteRequest(BaseModel):
@@ -1208,13 +1213,8 @@ def _discover_sklearn_operators() -> dict[str, list[dict[str, Any]]]:
     return result
 
 
-@router.get("/pipelines/operators/discover")
-async def discover_operators():
-    """
-    Dynamically discover all operators from nirs4all and sklearn modules.
-
-    Uses introspection to extract parameters and documentation.
-    """
+def _compute_operator_discovery() -> dict[str, Any]:
+    """Introspect nirs4all and sklearn for the operator discovery payload."""
     discovered = {
         "preprocessing": _discover_transform_operators(),
         "splitting": _discover_splitter_operators(),
@@ -1242,6 +1242,17 @@ async def discover_operators():
     }
 
 
+@router.get("/pipelines/operators/discover")
+async def discover_operators():
+    """
+    Dynamically discover all operators from nirs4all and sklearn modules.
+
+    Uses introspection to extract parameters and documentation. Results are
+    cached per installed package versions (see ``shared.operator_cache``).
+    """
+    return operator_discovery_cache.get_or_compute("pipelines", _compute_operator_discovery)
+
+
 @router.get("/pipelines/operators/{operator_name}")
 async def get_operator_details(operator_name: str):
     """
@@ -1448,20 +1459,27 @@ async def _count_variants_impl(request: PipelineCountRequest):
             "breakdown": {}
         }
 
-    try:
-        # Convert frontend/editor steps to canonical nirs4all format
-        nirs4all_steps = filter_canonical_comments(editor_to_canonical(request.steps))
+    def count_single_step(step: dict[str, Any]) -> int:
+        single_step = filter_canonical_comments(editor_to_canonical([step]))
+        return _count_combinations(single_step) if single_step else 1
 
-        # Count combinations using nirs4all
-        total_count = _count_combinations(nirs4all_steps)
+    variant_counter.begin(request.client_id, request.sequence)
+    try:
+        # Steps serialize independently and a step list counts as the product
+        # of its elements, so the total is the product of memoized step counts.
+        total_count, step_counts = await asyncio.to_thread(
+            variant_counter.count_pipeline,
+            request.steps,
+            count_single_step,
+            client_id=request.client_id,
+            sequence=request.sequence,
+        )
 
-        # Calculate per-step breakdown
+        # Per-step breakdown
         breakdown = {}
-        for i, step in enumerate(request.steps):
+        for i, (step, step_count) in enumerate(zip(request.steps, step_counts)):
             step_name = step.get("name", f"step_{i}")
             step_id = step.get("id", str(i))
-            single_step = filter_canonical_comments(editor_to_canonical([step]))
-            step_count = _count_combinations(single_step) if single_step else 1
             breakdown[step_id] = {"name": step_name, "count": step_count}
 
         # Warning for large search spaces
@@ -1477,6 +1495,8 @@ async def _count_variants_impl(request: PipelineCountRequest):
             "warning": warning,
         }
 
+    except VariantCountSuperseded:
+        return {"count": 1, "breakdown": {}, "superseded": True}
     except Exception as e:
         return {"count": 1, "error": str(e), "breakdown": {}}
 
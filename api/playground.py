@@ -39,7 +39,9 @@ try:
 except ImportError:
     MSGPACK_AVAILABLE = False
 
-from .shared.decimation import decimate_wavelengths
+from .shared.array_cache import array_fingerprint
+from .shared.decimation import DECIMATION_MODES, decimate_wavelengths
+from .shared.embedding_cache import embedding_cache
 from .shared.filter_operators import (
     get_filter_methods,
     instantiate_filter,
@@ -51,6 +53,8 @@ from .shared.metrics_computer import (
     MetricsComputer,
     get_available_metrics,
 )
+from .shared.operator_cache import operator_discovery_cache
+from .shared.pca_projection import pca_projection_service
 from .shared.pipeline_service import (
     convert_frontend_step,
     get_augmentation_methods,
@@ -109,7 +113,7 @@ class ExecuteRequest(BaseModel):
     sampling: SamplingOptions | None = Field(None, description="Sampling options for large datasets")
     options: dict[str, Any] = Field(
         default_factory=dict,
-        description="Additional options: compute_pca, compute_statistics, max_wavelengths_returned, split_index"
+        description="Additional options: compute_pca, compute_statistics, max_wavelengths_returned, decimation_mode, split_index"
     )
 
 
@@ -127,7 +131,7 @@ class ExecuteDatasetRequest(BaseModel):
     sampling: SamplingOptions | None = Field(None, description="Sampling options for large datasets")
     options: dict[str, Any] = Field(
         default_factory=dict,
-        description="Additional options: compute_pca, compute_statistics, max_wavelengths_returned, split_index"
+        description="Additional options: compute_pca, compute_statistics, max_wavelengths_returned, decimation_mode, split_index"
     )
 
 
@@ -775,9 +779,13 @@ class PlaygroundExecutor:
         X_processed_out = X_processed
 
         if max_wavelengths and max_wavelengths > 0 and len(wavelengths) > max_wavelengths:
-            # Use LTTB on the processed mean spectrum for feature-preserving decimation
+            # LTTB-based feature-preserving decimation; the mode chooses which
+            # curves (mean, min/max envelope or quantiles) drive the selection
             wl_array = np.asarray(wavelengths, dtype=np.float64)
-            indices = decimate_wavelengths(wl_array, X_processed, max_wavelengths)
+            decimation_mode = options.get("decimation_mode", "mean")
+            if decimation_mode not in DECIMATION_MODES:
+                decimation_mode = "mean"
+            indices = decimate_wavelengths(wl_array, X_processed, max_wavelengths, mode=decimation_mode)
             wavelengths_out = [wavelengths[i] for i in indices]
             X_sampled_out = X_sampled[:, indices]
             X_processed_out = X_processed[:, indices]
@@ -1301,8 +1309,10 @@ class PlaygroundExecutor:
     ) -> dict[str, Any]:
         """Compute PCA projection for visualization.
 
-        Delegates to nirs4all.analysis.compute_pca_projection for the actual
-        computation, then adds UI-specific coloring data (y values, fold labels).
+        Uses the shared PCA projection service (same output as
+        nirs4all.analysis.compute_pca_projection), so the decomposition is
+        reused by the chemometric metrics and by repeated executions on the
+        same data. Adds UI-specific coloring data (y values, fold labels).
 
         Args:
             X: Processed data
@@ -1312,18 +1322,22 @@ class PlaygroundExecutor:
         Returns:
             PCA result dict
         """
+        import numpy as np
+
         try:
-            from nirs4all.analysis import compute_pca_projection
-            pca_data = compute_pca_projection(X, max_components=10, variance_threshold=0.999)
+            pca = pca_projection_service.fit(X, 10)
         except Exception as e:
             return {"error": str(e)}
 
+        cumulative_variance = np.cumsum(pca.explained_variance_ratio)
+        n_components_999 = int(np.searchsorted(cumulative_variance, 0.999) + 1)
+
         result = {
-            "coordinates": pca_data["coordinates"],
-            "explained_variance_ratio": pca_data["explained_variance_ratio"],
-            "explained_variance": pca_data["explained_variance"],
-            "n_components": pca_data["n_components"],
-            "n_components_999": pca_data["n_components_threshold"],
+            "coordinates": pca.scores.tolist(),
+            "explained_variance_ratio": pca.explained_variance_ratio.tolist(),
+            "explained_variance": pca.explained_variance.tolist(),
+            "n_components": pca.n_components,
+            "n_components_999": min(max(n_components_999, 3), pca.n_components),
         }
 
         # Add target values for coloring
@@ -1380,16 +1394,24 @@ class PlaygroundExecutor:
         n_neighbors = min(max(2, n_neighbors), n_samples - 1)
         n_components = min(max(2, n_components), 3)
 
+        params = {
+            "n_components": n_components,
+            "n_neighbors": n_neighbors,
+            "min_dist": min_dist,
+            "metric": "euclidean",
+            "random_state": 42,
+        }
         try:
-            import umap as _umap
-            reducer = _umap.UMAP(
-                n_components=n_components,
-                n_neighbors=n_neighbors,
-                min_dist=min_dist,
-                random_state=42,
-                n_jobs=-1,
-            )
-            X_umap = reducer.fit_transform(X)
+            # Shared with /analysis/umap: re-executing on the same data is free
+            fingerprint = array_fingerprint(X)
+            cached = embedding_cache.get("umap", fingerprint, params)
+            if cached is not None:
+                X_umap = cached[0]
+            else:
+                import umap as _umap
+                reducer = _umap.UMAP(**params, n_jobs=-1)
+                X_umap = reducer.fit_transform(X)
+                embedding_cache.put("umap", fingerprint, params, X_umap)
         except Exception as e:
             return {
                 "error": str(e),
@@ -2660,8 +2682,14 @@ async def list_operators():
     """List all available operators for the playground.
 
     Returns preprocessing, augmentation, splitting, and filter operators with their
-    metadata, parameters, and categories.
+    metadata, parameters, and categories. Results are cached per installed
+    package versions (see ``shared.operator_cache``).
     """
+    return operator_discovery_cache.get_or_compute("playground", _compute_playground_operators)
+
+
+def _compute_playground_operators() -> dict[str, Any]:
+    """Introspect operators for the playground operator listing."""
     if not NIRS4ALL_AVAILABLE:
         return {
             "preprocessing": [],
@@ -13,6 +13,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
 from .shared.logger import get_logger
+from .shared.operator_cache import operator_discovery_cache
 
 logger = get_logger(__name__)
 
@@ -472,8 +473,14 @@ async def discover_preprocessing_methods():
     Dynamically discover preprocessing methods from nirs4all.
 
     Introspects the nirs4all.operators.transforms module to find
-    all available preprocessing transformers.
+    all available preprocessing transformers. Results are cached per
+    installed package versions (see ``shared.operator_cache``).
     """
+    return operator_discovery_cache.get_or_compute("preprocessing", _compute_preprocessing_discovery)
+
+
+def _compute_preprocessing_discovery() -> dict[str, Any]:
+    """Introspect nirs4all transforms for the preprocessing discovery payload."""
     if not NIRS4ALL_AVAILABLE:
         return {
             "methods": list(PREPROCESSING_METHODS.values()),
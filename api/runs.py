@@ -27,6 +27,7 @@ from typing import Any, Dict, List, Literal, Optional, Union
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
+from .chain_summary_view import sync_chain_summary_view
 from .pipeline_canonical import (
     contains_generators,
     count_runtime_variants,
@@ -737,6 +738,21 @@ def _create_mock_run(config: ExperimentConfig) -> Run:
     return run
 
 
+def _refresh_chain_summary_view(workspace_path: str) -> None:
+    """Bring the workspace chain-summary view up to date after a run."""
+    try:
+        from nirs4all.pipeline.storage import WorkspaceStore
+
+        store = WorkspaceStore(Path(workspace_path))
+    except Exception as e:
+        logger.debug("Skipping chain summary view refresh: %s", e)
+        return
+    try:
+        sync_chain_summary_view(store)
+    finally:
+        store.close()
+
+
 async def _execute_run(run_id: str):
     """
     Background task to execute a run.
@@ -956,6 +972,10 @@ async def _execute_run(run_id: str):
                 "duration": run.duration,
             })
 
+        # Materialize the new chains so the Results pages open instantly
+        if shared_store_run_id and run.workspace_path:
+            await asyncio.to_thread(_refresh_chain_summary_view, run.workspace_path)
+
     except Exception as e:
         run.status = "failed"
         run.completed_at = datetime.now().isoformat()
@@ -20,6 +20,7 @@ from typing import Any, Dict, List, Literal, Optional, Tuple
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from .shared.decimation import as_numeric_axis, union_lttb
 from .shared.logger import get_logger
 from .workspace_manager import workspace_manager
 
@@ -330,22 +331,33 @@ async def get_shap_results(job_id: str):
 
 
 @router.get("/analysis/shap/results/{job_id}/spectral", response_model=SpectralImportanceData)
-async def get_spectral_importance(job_id: str):
-    """Get spectral importance data for visualization."""
+async def get_spectral_importance(job_id: str, max_points: int | None = Query(None, ge=3)):
+    """Get spectral importance data for visualization.
+
+    With max_points, wavelengths are decimated so that both the mean
+    spectrum and the mean |SHAP| curve keep their peaks.
+    """
     if job_id not in _shap_results_cache:
         raise HTTPException(status_code=404, detail=f"SHAP results not found for job_id: {job_id}")
 
     r = _shap_results_cache[job_id]
+    wavelengths, mean_spectrum, mean_abs_shap = _decimate_importance_curves(
+        r["wavelengths"], r["mean_spectrum"], r["mean_abs_shap"], max_points,
+    )
     return SpectralImportanceData(
-        wavelengths=r["wavelengths"],
-        mean_spectrum=r["mean_spectrum"],
-        mean_abs_shap=r["mean_abs_shap"],
+        wavelengths=wavelengths,
+        mean_spectrum=mean_spectrum,
+        mean_abs_shap=mean_abs_shap,
         binned_importance=r["binned_importance"]
     )
 
 
 @router.get("/analysis/shap/results/{job_id}/spectral-detail")
-async def get_spectral_detail(job_id: str, sample_indices: str | None = Query(None)):
+async def get_spectral_detail(
+    job_id: str,
+    sample_indices: str | None = Query(None),
+    max_points: int | None = Query(None, ge=3),
+):
     """Get spectral data filtered to specific samples.
 
     When sample_indices is provided (comma-separated), returns SHAP
@@ -373,10 +385,13 @@ async def get_spectral_detail(job_id: str, sample_indices: str | None = Query(No
         shap_subset = shap_values
         X_subset = X
 
+    wavelengths, mean_spectrum, mean_abs_shap = _decimate_importance_curves(
+        r["wavelengths"], X_subset.mean(axis=0), np.abs(shap_subset).mean(axis=0), max_points,
+    )
     return {
-        "wavelengths": r["wavelengths"],
-        "mean_spectrum": X_subset.mean(axis=0).tolist(),
-        "mean_abs_shap": np.abs(shap_subset).mean(axis=0).tolist(),
+        "wavelengths": wavelengths,
+        "mean_spectrum": mean_spectrum,
+        "mean_abs_shap": mean_abs_shap,
         "n_samples": len(shap_subset),
     }
 
@@ -921,6 +936,26 @@ def _compute_binned_importance(
     )
 
 
+def _decimate_importance_curves(wavelengths, mean_spectrum, mean_abs_shap, max_points: int | None):
+    """Decimate the spectrum and |SHAP| curves onto one shared wavelength subset."""
+    import numpy as np
+    mean_spectrum = np.asarray(mean_spectrum, dtype=np.float64)
+    mean_abs_shap = np.asarray(mean_abs_shap, dtype=np.float64)
+    if not max_points or len(wavelengths) <= max_points:
+        return list(wavelengths), mean_spectrum.tolist(), mean_abs_shap.tolist()
+
+    indices = union_lttb(
+        as_numeric_axis(wavelengths, len(wavelengths)),
+        np.vstack([mean_spectrum, mean_abs_shap]),
+        max_points,
+    )
+    return (
+        [wavelengths[i] for i in indices],
+        mean_spectrum[indices].tolist(),
+        mean_abs_shap[indices].tolist(),
+    )
+
+
 def _process_shap_results(
     results: dict[str, Any], job_id: str, model_id: str, dataset_id: str,
     wavelengths: list[float], sample_indices: list[int], X,
@@ -0,0 +1,107 @@
+"""
+Byte-budgeted LRU cache for transformed spectral matrices.
+
+Analysis endpoints repeatedly apply the same preprocessing to the same
+dataset while only downstream parameters (PCA components, neighbours, ...)
+change. ``ArrayCache`` keeps the transformed arrays in memory under a total
+byte budget and evicts the least recently used entries first.
+
+Keys are tuples built by the caller; ``array_fingerprint`` gives a stable
+content hash for an input matrix so that identical data maps to the same
+key regardless of where it was loaded from.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Default memory budget for cached arrays (bytes)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def array_fingerprint(X: Any) -> str:
+    """Content hash of an array (shape, dtype and raw bytes)."""
+    import numpy as np
+
+    arr = np.ascontiguousarray(X)
+    digest = hashlib.sha1()
+    digest.update(str(arr.shape).encode("ascii"))
+    digest.update(arr.dtype.str.encode("ascii"))
+    digest.update(memoryview(arr).cast("B"))
+    return digest.hexdigest()
+
+
+def _nbytes(value: Any) -> int:
+    return int(getattr(value, "nbytes", 0))
+
+
+class ArrayCache:
+    """Thread-safe LRU cache of arrays bounded by their total ``nbytes``."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached array for ``key`` (marking it recently used)."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store ``value``; arrays larger than the whole budget are not cached."""
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            logger.debug("Array of %d bytes exceeds cache budget, not cached", size)
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= _nbytes(previous)
+            self._entries[key] = value
+            self._size += size
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= _nbytes(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
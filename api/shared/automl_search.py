@@ -0,0 +1,319 @@
+"""
+Trial-level AutoML search engine.
+
+Candidates (model + sampled hyperparameters) are evaluated as independent
+units on a thread pool, each with its own timing, and reported through a
+callback as soon as they finish. With early stopping the search runs
+successive halving over cross-validation folds: every candidate is first
+scored on one fold, only the best 1/eta move on to more folds, and only the
+finalists are scored on all of them. Cancellation and the time limit are
+checked before each unit is started, so a stop request takes effect after
+the trials already running.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_HALVING_FACTOR = 3
+
+# Attempts per requested trial before giving up on finding new configurations
+_SAMPLING_ATTEMPTS_FACTOR = 20
+
+
+@dataclass
+class TrialCandidate:
+    """One model configuration and its evaluation state."""
+
+    trial_id: int
+    model_name: str
+    params: dict[str, Any]
+    fold_scores: list[float] = field(default_factory=list)
+    duration_seconds: float = 0.0
+    status: str = "pending"
+    error: str | None = None
+
+    @property
+    def score(self) -> float | None:
+        return sum(self.fold_scores) / len(self.fold_scores) if self.fold_scores else None
+
+    @property
+    def std(self) -> float | None:
+        if len(self.fold_scores) < 2:
+            return None
+        mean = self.score
+        return math.sqrt(sum((s - mean) ** 2 for s in self.fold_scores) / (len(self.fold_scores) - 1))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trial_id": self.trial_id,
+            "model_name": self.model_name,
+            "params": self.params,
+            "score": float(self.score) if self.score is not None else 0.0,
+            "std": self.std,
+            "folds_evaluated": len(self.fold_scores),
+            "duration_seconds": self.duration_seconds,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+# ----- Metrics -----
+
+
+def _rmse(y_true, y_pred) -> float:
+    import numpy as np
+
+    return float(np.sqrt(np.mean((np.asarray(y_true, dtype=float) - np.asarray(y_pred, dtype=float)) ** 2)))
+
+
+def get_metric(name: str) -> tuple[Callable[[Any, Any], float], bool]:
+    """Return ``(score_fn, greater_is_better)`` for a metric name."""
+    from sklearn import metrics
+
+    table: dict[str, tuple[Callable[[Any, Any], float], bool]] = {
+        "r2": (metrics.r2_score, True),
+        "rmse": (_rmse, False),
+        "mse": (metrics.mean_squared_error, False),
+        "mae": (metrics.mean_absolute_error, False),
+        "accuracy": (metrics.accuracy_score, True),
+        "balanced_accuracy": (metrics.balanced_accuracy_score, True),
+        "f1": (lambda y, p: metrics.f1_score(y, p, average="weighted"), True),
+    }
+    try:
+        return table[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported metric '{name}'. Supported: {sorted(table)}") from None
+
+
+# ----- Sampling -----
+
+
+def _sample_param(spec: dict[str, Any], rng: Any) -> Any:
+    p_type = spec.get("type", "float")
+    if p_type == "categorical":
+        choices = spec.get("choices") or []
+        return choices[int(rng.integers(len(choices)))] if choices else None
+
+    low = float(spec.get("low", 0.0 if p_type == "float" else 1))
+    high = float(spec.get("high", 1.0 if p_type == "float" else 100))
+    if spec.get("log", False) and low > 0:
+        value = math.exp(rng.uniform(math.log(low), math.log(high)))
+    else:
+        value = rng.uniform(low, high)
+    if p_type == "int":
+        return int(min(max(round(value), low), high))
+    return float(value)
+
+
+def sample_candidates(
+    models_config: list[dict[str, Any]],
+    n_trials: int,
+    random_state: int | None = None,
+) -> list[TrialCandidate]:
+    """Draw up to ``n_trials`` distinct configurations, spread evenly over models."""
+    import numpy as np
+
+    rng = np.random.default_rng(random_state)
+    candidates: list[TrialCandidate] = []
+    seen: set[str] = set()
+    if not models_config:
+        return candidates
+
+    order = list(range(len(models_config)))
+    attempts = 0
+    while len(candidates) < n_trials and attempts < n_trials * _SAMPLING_ATTEMPTS_FACTOR:
+        if attempts % len(order) == 0:
+            rng.shuffle(order)
+        model_config = models_config[order[attempts % len(order)]]
+        attempts += 1
+        params = {
+            spec["name"]: _sample_param(spec, rng)
+            for spec in model_config.get("params", [])
+            if spec.get("name")
+        }
+        key = repr((model_config["model_name"], sorted(params.items(), key=lambda kv: kv[0])))
+        if key in seen:
+            continue
+        seen.add(key)
+        candidates.append(TrialCandidate(len(candidates), model_config["model_name"], params))
+    return candidates
+
+
+def fold_budgets(n_folds: int, eta: int, early_stopping: bool) -> list[int]:
+    """Cumulative fold counts per rung, e.g. 5 folds with eta=3 -> [1, 3, 5]."""
+    if not early_stopping or n_folds <= 1:
+        return [n_folds]
+    budgets = []
+    budget = 1
+    while budget < n_folds:
+        budgets.append(budget)
+        budget *= eta
+    # Skip a rung that would be almost the full budget anyway
+    if budgets and budgets[-1] > 0.75 * n_folds:
+        budgets.pop()
+    return [*budgets, n_folds]
+
+
+# ----- Search -----
+
+
+class SuccessiveHalvingSearch:
+    """Evaluate candidates in parallel, pruning the weakest after each rung."""
+
+    def __init__(
+        self,
+        X: Any,
+        y: Any,
+        build_estimator: Callable[[TrialCandidate], Any],
+        metric: str = "r2",
+        task_type: str = "regression",
+        cv_folds: int = 5,
+        random_state: int | None = None,
+        n_workers: int = 1,
+        early_stopping: bool = True,
+        halving_factor: int = DEFAULT_HALVING_FACTOR,
+        timeout_seconds: float | None = None,
+    ):
+        self.X = X
+        self.y = y
+        self.build_estimator = build_estimator
+        self.score_fn, self.greater_is_better = get_metric(metric)
+        self.task_type = task_type
+        self.cv_folds = cv_folds
+        self.random_state = random_state
+        self.n_workers = max(1, n_workers)
+        self.budgets = fold_budgets(cv_folds, max(2, halving_factor), early_stopping)
+        self.halving_factor = max(2, halving_factor)
+        self.timeout_seconds = timeout_seconds
+        self.cancelled = False
+        self.timed_out = False
+
+    def _splits(self) -> list[tuple[Any, Any]]:
+        from sklearn.model_selection import KFold, StratifiedKFold
+
+        splitter_cls = StratifiedKFold if self.task_type == "classification" else KFold
+        splitter = splitter_cls(n_splits=self.cv_folds, shuffle=True, random_state=self.random_state)
+        return list(splitter.split(self.X, self.y))
+
+    def _rank_key(self, candidate: TrialCandidate) -> float:
+        score = candidate.score
+        if score is None or not math.isfinite(score):
+            return -math.inf
+        return score if self.greater_is_better else -score
+
+    def _evaluate(self, candidate: TrialCandidate, splits: list[tuple[Any, Any]]) -> None:
+        """Score ``candidate`` on the given folds (one parallel unit)."""
+        started = time.perf_counter()
+        try:
+            for train_idx, test_idx in splits:
+                estimator = self.build_estimator(candidate)
+                estimator.fit(self.X[train_idx], self.y[train_idx])
+                predictions = estimator.predict(self.X[test_idx])
+                candidate.fold_scores.append(float(self.score_fn(self.y[test_idx], predictions)))
+        except Exception as e:
+            candidate.status = "failed"
+            candidate.error = str(e)
+        finally:
+            candidate.duration_seconds += time.perf_counter() - started
+
+    def run(
+        self,
+        candidates: list[TrialCandidate],
+        on_trial: Callable[[TrialCandidate], None],
+        should_continue: Callable[[float, str], bool],
+    ) -> list[TrialCandidate]:
+        """Run the search; ``on_trial`` receives each candidate once it is final.
+
+        ``should_continue(progress, message)`` is called before every unit;
+        returning False stops the search after the running units.
+        """
+        splits = self._splits()
+        started = time.monotonic()
+        survivors = list(candidates)
+        total_units = self._planned_units(len(candidates))
+        done_units = 0
+        previous_budget = 0
+
+        with ThreadPoolExecutor(max_workers=self.n_workers, thread_name_prefix="automl-trial") as executor:
+            for rung, budget in enumerate(self.budgets):
+                final_rung = rung == len(self.budgets) - 1
+                rung_splits = splits[previous_budget:budget]
+                pending = list(survivors)
+                running: dict[Future, TrialCandidate] = {}
+
+                while pending or running:
+                    while pending and len(running) < self.n_workers and not self._stopped(started):
+                        message = f"Rung {rung + 1}/{len(self.budgets)}: {len(pending)} trials waiting"
+                        if not should_continue(100.0 * done_units / max(total_units, 1), message):
+                            self.cancelled = True
+                            break
+                        candidate = pending.pop(0)
+                        candidate.status = "running"
+                        running[executor.submit(self._evaluate, candidate, rung_splits)] = candidate
+                    if not running:
+                        break
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        candidate = running.pop(future)
+                        done_units += 1
+                        if candidate.status == "failed":
+                            on_trial(candidate)
+                        elif final_rung:
+                            candidate.status = "completed"
+                            on_trial(candidate)
+
+                if self.cancelled:
+                    break
+
+                evaluated = [c for c in survivors if c.status == "running"]
+                if self.timed_out:
+                    for candidate in evaluated:
+                        candidate.status = "pruned"
+                        candidate.error = "Search time limit reached"
+                        on_trial(candidate)
+                    break
+                if final_rung:
+                    break
+
+                evaluated.sort(key=self._rank_key, reverse=True)
+                n_keep = max(1, math.ceil(len(evaluated) / self.halving_factor))
+                survivors = evaluated[:n_keep]
+                for candidate in evaluated[n_keep:]:
+                    candidate.status = "pruned"
+                    on_trial(candidate)
+                total_units = done_units + self._planned_units(len(survivors), rung + 1)
+                previous_budget = budget
+
+        return candidates
+
+    def _planned_units(self, n_candidates: int, first_rung: int = 0) -> int:
+        units = 0
+        for _ in self.budgets[first_rung:]:
+            units += n_candidates
+            n_candidates = max(1, math.ceil(n_candidates / self.halving_factor))
+        return units
+
+    def _stopped(self, started: float) -> bool:
+        if self.timeout_seconds is not None and time.monotonic() - started > self.timeout_seconds:
+            self.timed_out = True
+        return self.timed_out
+
+    def best(self, candidates: list[TrialCandidate]) -> TrialCandidate | None:
+        completed = [c for c in candidates if c.status == "completed"]
+        return max(completed, key=self._rank_key) if completed else None
+
+    def ranked(self, candidates: list[TrialCandidate]) -> list[TrialCandidate]:
+        """Completed candidates first (best first), then pruned, then failed."""
+        order = {"completed": 0, "pruned": 1, "failed": 2}
+        finished = [c for c in candidates if c.status in order]
+        return sorted(finished, key=lambda c: (order[c.status], -self._rank_key(c)))
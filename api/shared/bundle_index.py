@@ -0,0 +1,175 @@
+"""
+Metadata index for exported model bundles.
+
+Listing trained models used to open every ``.n4a`` archive under
+``workspace/exports`` with ``BundleLoader`` just to read a few manifest
+fields. The index keeps those fields keyed by relative path and validated
+against the file's mtime and size, so a listing only reopens bundles that
+are new or have changed. It is persisted as
+``<workspace>/.nirs4all/bundle_index.json``; entries for deleted bundles are
+dropped on the next scan.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_FORMAT_VERSION = 1
+
+INDEX_FILENAME = "bundle_index.json"
+BUNDLE_SUFFIX = ".n4a"
+
+
+@dataclass
+class BundleEntry:
+    """A bundle on disk and its cached manifest fields."""
+
+    path: Path
+    mtime: float
+    size: int
+    fields: dict[str, Any]
+
+
+def read_bundle_fields(bundle_path: Path, bundle_loader_cls: Any) -> dict[str, Any]:
+    """Open a bundle once and extract the fields shown in model listings."""
+    fields: dict[str, Any] = {
+        "pipeline_uid": None,
+        "nirs4all_version": None,
+        "preprocessing_chain": None,
+        "model_class": None,
+    }
+    try:
+        loader = bundle_loader_cls(str(bundle_path))
+        if loader.metadata:
+            fields["pipeline_uid"] = loader.metadata.pipeline_uid
+            fields["nirs4all_version"] = loader.metadata.nirs4all_version
+            fields["preprocessing_chain"] = loader.metadata.preprocessing_chain
+        if hasattr(loader, "get_step_info"):
+            for step in loader.get_step_info():
+                if step.get("is_model"):
+                    fields["model_class"] = step.get("class_name")
+                    break
+    except Exception as e:
+        logger.debug("Could not read bundle metadata from %s: %s", bundle_path, e)
+    return fields
+
+
+def _iter_bundles(root: Path):
+    """Yield ``os.DirEntry`` objects for every bundle below ``root``."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif entry.name.endswith(BUNDLE_SUFFIX) and entry.is_file():
+                        yield entry
+        except OSError as e:
+            logger.debug("Cannot scan %s: %s", directory, e)
+
+
+class BundleIndex:
+    """Manifest fields of the bundles under one exports directory."""
+
+    def __init__(self, exports_dir: Path, index_file: Path | None = None):
+        self.exports_dir = Path(exports_dir)
+        self._index_file = index_file
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        if self._index_file is None or not self._index_file.exists():
+            return self._entries
+        try:
+            with open(self._index_file, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == _FORMAT_VERSION:
+                self._entries = dict(data.get("entries", {}))
+        except Exception as e:
+            logger.debug("Ignoring unreadable bundle index %s: %s", self._index_file, e)
+        return self._entries
+
+    def _save(self) -> None:
+        if self._index_file is None:
+            return
+        try:
+            self._index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._index_file.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": _FORMAT_VERSION, "entries": self._entries}, f)
+            tmp_path.replace(self._index_file)
+        except Exception as e:
+            logger.debug("Could not persist bundle index to %s: %s", self._index_file, e)
+
+    def scan(self, bundle_loader_cls: Any = None) -> list[BundleEntry]:
+        """List the bundles, reopening only those that are new or changed.
+
+        Without a ``bundle_loader_cls`` (ML dependencies not loaded yet),
+        unindexed bundles are listed with empty fields and left for a later
+        scan to fill in.
+        """
+        with self._lock:
+            entries = self._load()
+            seen: set[str] = set()
+            result: list[BundleEntry] = []
+            changed = False
+
+            for dir_entry in _iter_bundles(self.exports_dir):
+                try:
+                    stat = dir_entry.stat()
+                except OSError:
+                    continue
+                path = Path(dir_entry.path)
+                key = path.relative_to(self.exports_dir).as_posix()
+                seen.add(key)
+
+                cached = entries.get(key)
+                if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                    fields = cached["fields"]
+                elif bundle_loader_cls is not None:
+                    fields = read_bundle_fields(path, bundle_loader_cls)
+                    entries[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "fields": fields}
+                    changed = True
+                else:
+                    fields = {}
+                result.append(BundleEntry(path=path, mtime=stat.st_mtime, size=stat.st_size, fields=fields))
+
+            for key in set(entries) - seen:
+                del entries[key]
+                changed = True
+            if changed:
+                self._save()
+        return result
+
+
+_indexes: dict[str, BundleIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_bundle_index(workspace_path: str | Path) -> BundleIndex:
+    """Process-wide index for a workspace's ``workspace/exports`` directory."""
+    workspace_path = Path(workspace_path)
+    key = str(workspace_path.resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = BundleIndex(
+                workspace_path / "workspace" / "exports",
+                index_file=workspace_path / ".nirs4all" / INDEX_FILENAME,
+            )
+            _indexes[key] = index
+        return index
@@ -3,10 +3,163 @@ Wavelength decimation utilities for spectral data visualization.
 
 Provides LTTB (Largest-Triangle-Three-Buckets) downsampling that preserves
 spectral features (peaks, valleys) better than uniform subsampling.
+
+Bucket boundaries and averages are computed with prefix sums, and several
+series can be decimated in one call. Narrow buckets are resolved through a
+vectorized per-anchor transition table, so the sequential part of LTTB is
+reduced to integer look-ups while staying exact.
+
+On top of the single-series primitive, :func:`decimate_wavelengths` offers
+several strategies for choosing one shared index set for many spectra:
+
+- ``"mean"``: LTTB on the mean spectrum (historic behaviour).
+- ``"envelope"``: per-bucket argmin of the lower envelope and argmax of the
+  upper envelope, so the extremes of every spectrum survive.
+- ``"quantiles"``: LTTB on several per-wavelength quantile curves, merged
+  into one index set, so spectra that differ from the mean keep their shape.
 """
 
 from __future__ import annotations
 
+DECIMATION_MODES = ("mean", "envelope", "quantiles")
+
+# Quantile curves used by the "quantiles" decimation mode
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+# Above this bucket width the per-anchor transition table costs more than
+# a scalar walk over the buckets.
+_TABLE_MAX_BUCKET = 16
+
+# Element budget for one block of the transition table
+_TABLE_BLOCK_ELEMENTS = 4_000_000
+
+
+def _lttb_buckets(n: int, target_points: int):
+    """Return bucket and next-bucket boundaries matching the classic LTTB layout."""
+    import numpy as np
+
+    bucket_size = (n - 2) / (target_points - 2)
+    i = np.arange(1, target_points - 1, dtype=np.float64)
+    starts = (1 + (i - 1) * bucket_size).astype(np.intp)
+    ends = np.minimum((1 + i * bucket_size).astype(np.intp), n - 1)
+    next_starts = ends
+    next_ends = np.minimum((1 + (i + 1) * bucket_size).astype(np.intp), n - 1)
+    empty = next_starts >= next_ends
+    next_ends[empty] = np.minimum(next_starts[empty] + 1, n)
+    return starts, ends, next_starts, next_ends
+
+
+def _walk_buckets(x, y, starts, ends, avg_x, avg_y):
+    """Classic sequential LTTB selection with precomputed bucket averages."""
+    import numpy as np
+
+    xs, ys = x.tolist(), y.tolist()
+    selected = np.empty(len(starts), dtype=np.intp)
+    a_idx = 0
+    for b, (start, end, ax, ay) in enumerate(zip(starts.tolist(), ends.tolist(), avg_x.tolist(), avg_y.tolist())):
+        xa, ya = xs[a_idx], ys[a_idx]
+        u, v = xa - ax, ay - ya
+        # |u*(y_j - y_a) - (x_a - x_j)*v| rewritten as |u*y_j + v*x_j + c|
+        areas = np.abs(u * y[start:end] + v * x[start:end] - (u * ya + v * xa))
+        a_idx = start + int(areas.argmax())
+        selected[b] = a_idx
+    return selected
+
+
+def _table_select(x, Y, cand, valid, avg_x, avg_y):
+    """Vectorized LTTB selection through a per-anchor transition table.
+
+    For every bucket ``b`` and every candidate ``k`` of bucket ``b-1`` taken
+    as anchor, the best candidate of bucket ``b`` is precomputed in one
+    array operation. The sequential dependency then reduces to integer
+    look-ups, which stay exact with respect to the classic algorithm.
+    """
+    import numpy as np
+
+    n_series = len(Y)
+    n_buckets, width = cand.shape
+    cand_x = x[cand]
+    cand_y = Y[:, cand]
+
+    local = np.empty((n_series, n_buckets), dtype=np.intp)
+    # First bucket is anchored on index 0
+    u0 = x[0] - avg_x[0]
+    v0 = avg_y[:, 0] - Y[:, 0]
+    areas0 = np.abs(u0 * cand_y[:, 0, :] + v0[:, None] * cand_x[0][None, :] - (u0 * Y[:, 0] + v0 * x[0])[:, None])
+    local[:, 0] = np.where(valid[0][None, :], areas0, -1.0).argmax(axis=1)
+    if n_buckets == 1:
+        return local
+
+    block = max(_TABLE_BLOCK_ELEMENTS // max(n_series * width * width, 1), 1)
+    rows = np.arange(n_series)
+    for lo in range(1, n_buckets, block):
+        hi = min(lo + block, n_buckets)
+        xa = cand_x[lo - 1:hi - 1]
+        ya = cand_y[:, lo - 1:hi - 1]
+        u = xa - avg_x[lo:hi, None]
+        v = avg_y[:, lo:hi, None] - ya
+        areas = np.abs(
+            u[None, :, :, None] * cand_y[:, lo:hi, None, :]
+            + v[..., None] * cand_x[None, lo:hi, None, :]
+            - (u[None] * ya + v * xa[None])[..., None]
+        )
+        table = np.where(valid[None, lo:hi, None, :], areas, -1.0).argmax(axis=3)
+        for b in range(lo, hi):
+            local[:, b] = table[rows, b - lo, local[:, b - 1]]
+    return local
+
+
+def lttb_decimate_batch(x, Y, target_points: int):
+    """Downsample several series sharing the same x axis with LTTB.
+
+    Bucket boundaries and next-bucket averages are computed once with prefix
+    sums. Narrow buckets go through a vectorized transition table; wide
+    buckets (few of them) use a lean scalar walk. Both paths select exactly
+    the points the classic sequential LTTB would.
+
+    Args:
+        x: X-axis values (e.g., wavelengths). Shape (n,).
+        Y: Series values. Shape (n_series, n).
+        target_points: Number of points to keep per series.
+
+    Returns:
+        Array of selected indices per series, shape (n_series, target_points)
+        (or (n_series, n) when no decimation is needed), sorted along axis 1.
+    """
+    import numpy as np
+
+    x = np.asarray(x, dtype=np.float64)
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    n_series, n = Y.shape
+    if n <= target_points or target_points < 3:
+        return np.tile(np.arange(n), (n_series, 1))
+
+    starts, ends, next_starts, next_ends = _lttb_buckets(n, target_points)
+
+    # Next-bucket averages via prefix sums
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([np.zeros((n_series, 1)), np.cumsum(Y, axis=1)], axis=1)
+    widths = (next_ends - next_starts).astype(np.float64)
+    avg_x = (cx[next_ends] - cx[next_starts]) / widths
+    avg_y = (cy[:, next_ends] - cy[:, next_starts]) / widths
+
+    indices = np.empty((n_series, target_points), dtype=np.intp)
+    indices[:, 0] = 0
+    indices[:, -1] = n - 1
+
+    lengths = ends - starts
+    width = int(lengths.max())
+    if width <= _TABLE_MAX_BUCKET:
+        offsets = np.arange(width)
+        valid = offsets[None, :] < lengths[:, None]
+        cand = np.where(valid, starts[:, None] + offsets[None, :], starts[:, None])
+        local = _table_select(x, Y, cand, valid, avg_x, avg_y)
+        indices[:, 1:-1] = cand[np.arange(len(starts))[None, :], local]
+    else:
+        for s in range(n_series):
+            indices[s, 1:-1] = _walk_buckets(x, Y[s], starts, ends, avg_x, avg_y[s])
+    return indices
+
 
 def lttb_decimate(x, y, target_points: int):
     """Downsample using Largest-Triangle-Three-Buckets (LTTB) algorithm.
@@ -24,80 +177,178 @@ def lttb_decimate(x, y, target_points: int):
         Array of selected indices, sorted in ascending order. Shape (target_points,).
     """
     import numpy as np
-    n = len(x)
-    if n <= target_points or target_points < 3:
+
+    return lttb_decimate_batch(x, np.asarray(y)[None, :], target_points)[0]
+
+
+def minmax_decimate(lower, upper, target_points: int):
+    """Select indices preserving a min/max envelope.
+
+    Splits the axis into ``target_points // 2`` buckets and keeps, per
+    bucket, the argmin of ``lower`` and the argmax of ``upper``, plus the
+    first and last point.
+
+    Args:
+        lower: Lower envelope (e.g., per-wavelength minimum). Shape (n,).
+        upper: Upper envelope (e.g., per-wavelength maximum). Shape (n,).
+        target_points: Maximum number of points to keep.
+
+    Returns:
+        Sorted array of unique selected indices.
+    """
+    import numpy as np
+
+    lower = np.asarray(lower, dtype=np.float64)
+    upper = np.asarray(upper, dtype=np.float64)
+    n = len(lower)
+    if n <= target_points or target_points < 4:
         return np.arange(n)
 
-    # Always keep first and last point
-    indices = np.empty(target_points, dtype=np.intp)
-    indices[0] = 0
-    indices[-1] = n - 1
+    n_buckets = max((target_points - 2) // 2, 1)
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.intp)
+    edges = np.unique(edges)
+    lengths = np.diff(edges)
+    offsets = np.arange(int(lengths.max()))
+    cand = edges[:-1, None] + offsets[None, :]
+    valid = offsets[None, :] < lengths[:, None]
+    cand = np.where(valid, cand, edges[:-1, None])
 
-    bucket_size = (n - 2) / (target_points - 2)
+    lo = np.where(valid, lower[cand], np.inf)
+    hi = np.where(valid, upper[cand], -np.inf)
+    picks = np.concatenate([
+        [0, n - 1],
+        np.take_along_axis(cand, np.argmin(lo, axis=1)[:, None], axis=1)[:, 0],
+        np.take_along_axis(cand, np.argmax(hi, axis=1)[:, None], axis=1)[:, 0],
+    ])
+    return np.unique(picks)
 
-    a_idx = 0  # Previously selected point index
-
-    for i in range(1, target_points - 1):
-        # Current bucket range
-        bucket_start = int(1 + (i - 1) * bucket_size)
-        bucket_end = int(1 + i * bucket_size)
-        if bucket_end > n - 1:
-            bucket_end = n - 1
-
-        # Next bucket range (for computing average)
-        next_start = bucket_end
-        next_end = int(1 + (i + 1) * bucket_size)
-        if next_end > n - 1:
-            next_end = n - 1
-        # Ensure at least one point in next bucket
-        if next_start >= next_end:
-            next_end = next_start + 1
-            if next_end > n:
-                next_end = n
-
-        # Average of next bucket
-        avg_x = np.mean(x[next_start:next_end])
-        avg_y = np.mean(y[next_start:next_end])
-
-        # Vectorized triangle area computation for current bucket
-        # Area = |( (x[a] - avg_x) * (y[j] - y[a]) ) - ( (x[a] - x[j]) * (avg_y - y[a]) )|
-        x_a = x[a_idx]
-        y_a = y[a_idx]
-
-        bucket_x = x[bucket_start:bucket_end]
-        bucket_y = y[bucket_start:bucket_end]
 
-        areas = np.abs(
-            (x_a - avg_x) * (bucket_y - y_a) - (x_a - bucket_x) * (avg_y - y_a)
-        )
+def union_lttb(x, Y, target_points: int):
+    """Shared index set preserving the LTTB shape of every row of ``Y``.
 
-        max_idx = bucket_start + np.argmax(areas)
-        indices[i] = max_idx
-        a_idx = max_idx
+    Each row gets an equal share of the point budget and the resulting index
+    sets are merged, so the output never exceeds ``target_points``. When the
+    budget leaves fewer than 3 points per row, LTTB runs on the mean of the
+    rows instead.
 
-    return indices
+    Args:
+        x: X-axis values. Shape (n,).
+        Y: Series to preserve. Shape (n_series, n).
+        target_points: Maximum number of points to keep.
+
+    Returns:
+        Sorted array of unique selected indices.
+    """
+    import numpy as np
+
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    n = Y.shape[1]
+    if n <= target_points:
+        return np.arange(n)
+    per_series = target_points // len(Y)
+    if per_series < 3:
+        return lttb_decimate(x, Y.mean(axis=0), target_points)
+    return np.unique(lttb_decimate_batch(x, Y, per_series))
+
+
+def _quantile_curves(spectra, quantiles):
+    """Per-wavelength quantiles (linear interpolation) from a single sort.
+
+    Sorting along the sample axis once is much cheaper than
+    ``np.quantile`` for a handful of quantiles over wide spectra.
+    """
+    import numpy as np
+
+    ordered = np.sort(spectra, axis=0)
+    positions = np.asarray(quantiles, dtype=np.float64) * (len(ordered) - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, len(ordered) - 1)
+    frac = (positions - lower)[:, None]
+    return ordered[lower] * (1.0 - frac) + ordered[upper] * frac
 
 
 def decimate_wavelengths(
     wavelengths,
     spectra,
     target_points: int,
+    mode: str = "mean",
+    quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
 ):
-    """Select wavelength indices using LTTB on the mean spectrum.
-
-    Computes the mean spectrum across all samples, then applies LTTB to
-    determine which wavelength indices best preserve the visual shape.
-    The same indices are then applied to all spectra uniformly.
+    """Select one shared set of wavelength indices for a block of spectra.
 
     Args:
         wavelengths: Wavelength values. Length must match spectra columns.
         spectra: Spectral data, shape (n_samples, n_wavelengths).
-        target_points: Number of wavelengths to keep.
+        target_points: Number of wavelengths to keep (upper bound).
+        mode: One of :data:`DECIMATION_MODES` (see module docstring).
+        quantiles: Quantile curves used by the ``"quantiles"`` mode.
 
     Returns:
         Sorted array of selected wavelength indices.
     """
     import numpy as np
+
+    if mode not in DECIMATION_MODES:
+        raise ValueError(f"Unknown decimation mode '{mode}'. Expected one of {DECIMATION_MODES}")
+
+    spectra = np.atleast_2d(np.asarray(spectra, dtype=np.float64))
+    if spectra.shape[1] <= target_points:
+        return np.arange(spectra.shape[1])
+
+    if mode == "envelope":
+        return decimate_summary(wavelengths, target_points, mode, lower=spectra.min(axis=0), upper=spectra.max(axis=0))
+    if mode == "quantiles" and len(spectra) > 1:
+        return decimate_summary(wavelengths, target_points, mode, quantile_curves=_quantile_curves(spectra, quantiles))
+    return decimate_summary(wavelengths, target_points, "mean", mean=spectra.mean(axis=0))
+
+
+def decimate_summary(
+    wavelengths,
+    target_points: int,
+    mode: str = "mean",
+    *,
+    mean=None,
+    lower=None,
+    upper=None,
+    quantile_curves=None,
+):
+    """Like :func:`decimate_wavelengths`, from per-wavelength summary curves.
+
+    Lets callers decimate from statistics of a whole partition, so every
+    page of that partition gets the same wavelength subset. Only the curves
+    of the requested mode are needed: ``mean`` ("mean"), ``lower``/``upper``
+    ("envelope") or ``quantile_curves`` of shape (n_quantiles, n) ("quantiles").
+
+    Returns:
+        Sorted array of selected wavelength indices.
+    """
+    import numpy as np
+
+    if mode not in DECIMATION_MODES:
+        raise ValueError(f"Unknown decimation mode '{mode}'. Expected one of {DECIMATION_MODES}")
+
     wl = np.asarray(wavelengths, dtype=np.float64)
-    mean_spectrum = np.mean(spectra, axis=0)
-    return lttb_decimate(wl, mean_spectrum, target_points)
+    if len(wl) <= target_points:
+        return np.arange(len(wl))
+    if mode == "envelope":
+        return minmax_decimate(lower, upper, target_points)
+    if mode == "quantiles":
+        return union_lttb(wl, quantile_curves, target_points)
+    return lttb_decimate(wl, mean, target_points)
+
+
+def as_numeric_axis(values, n: int):
+    """Return ``values`` as a float axis, falling back to ``arange(n)``.
+
+    Wavelength headers can be non-numeric labels; LTTB only needs a
+    monotonic x axis, so positions are used in that case.
+    """
+    import numpy as np
+
+    try:
+        axis = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.arange(n, dtype=np.float64)
+    if axis.shape != (n,) or not np.all(np.isfinite(axis)):
+        return np.arange(n, dtype=np.float64)
+    return axis
@@ -0,0 +1,137 @@
+"""
+Persistent cache for t-SNE and UMAP embeddings.
+
+Embeddings are expensive (minutes for t-SNE on 10k samples) and fully
+determined by the input matrix and the method parameters. Entries are
+keyed by (method, data fingerprint, canonical params) and persisted as
+``.npz`` files under the app cache directory, so a result survives page
+navigation and backend restarts.
+
+The cache also remembers the latest embedding of each (method, data,
+n_components). Parameter tweaks can use it to warm-start the next fit
+instead of starting from a fresh initialization.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# In-memory entries kept in addition to the on-disk files
+DEFAULT_MAX_MEMORY_ENTRIES = 32
+
+
+def _digest(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Embeddings by (method, data fingerprint, params), in memory and on disk."""
+
+    def __init__(self, cache_dir: Path | None = None, max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES):
+        self._cache_dir = cache_dir
+        self._max_memory_entries = max_memory_entries
+        self._entries: OrderedDict[str, tuple[Any, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set_cache_dir(self, cache_dir: Path | None) -> None:
+        """Persist to ``cache_dir`` (``<app config dir>/cache/embeddings`` when None) and drop memory entries."""
+        with self._lock:
+            self._cache_dir = cache_dir
+            self._entries.clear()
+
+    def _resolve_dir(self) -> Path | None:
+        if self._cache_dir is not None:
+            return self._cache_dir
+        try:
+            from ..app_config import app_config
+
+            return Path(app_config.config_dir) / "cache" / "embeddings"
+        except Exception:
+            return None
+
+    def _path_for(self, digest: str) -> Path | None:
+        cache_dir = self._resolve_dir()
+        return cache_dir / f"{digest}.npz" if cache_dir is not None else None
+
+    def _remember(self, digest: str, embedding: Any, info: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[digest] = (embedding, info)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self._max_memory_entries:
+                self._entries.popitem(last=False)
+
+    def _read(self, digest: str) -> tuple[Any, dict[str, Any]] | None:
+        import numpy as np
+
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                return entry
+
+        path = self._path_for(digest)
+        if path is None or not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                embedding = data["embedding"]
+                info = json.loads(str(data["info"]))
+        except Exception as e:
+            logger.debug("Discarding unreadable embedding cache file %s: %s", path, e)
+            return None
+        self._remember(digest, embedding, info)
+        return embedding, info
+
+    def _write(self, digest: str, embedding: Any, info: dict[str, Any]) -> None:
+        import numpy as np
+
+        self._remember(digest, embedding, info)
+        path = self._path_for(digest)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp.npz")
+            np.savez(tmp_path, embedding=embedding, info=np.array(json.dumps(info)))
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.debug("Could not persist embedding to %s: %s", path, e)
+
+    def get(self, method: str, fingerprint: str, params: dict[str, Any]) -> tuple[Any, dict[str, Any]] | None:
+        """Return ``(embedding, info)`` for an exact (method, data, params) match."""
+        return self._read(_digest(method, fingerprint, params))
+
+    def put(
+        self,
+        method: str,
+        fingerprint: str,
+        params: dict[str, Any],
+        embedding: Any,
+        info: dict[str, Any] | None = None,
+    ) -> None:
+        """Store an embedding and make it the warm-start source for its data."""
+        info = dict(info or {})
+        self._write(_digest(method, fingerprint, params), embedding, info)
+        self._write(_digest(method, fingerprint, "latest", int(embedding.shape[1])), embedding, {"params": params})
+
+    def latest(self, method: str, fingerprint: str, n_components: int) -> Any | None:
+        """Most recent embedding of the same data and dimensionality, if any."""
+        entry = self._read(_digest(method, fingerprint, "latest", n_components))
+        return entry[0] if entry is not None else None
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,151 @@
+"""
+Cached, parallel CSV parameter detection for the dataset wizard.
+
+``detect_file_parameters`` sniffs a file's delimiter, decimal separator,
+header and shape by reading it. The detection endpoints (``detect-unified``,
+``scan-folder``) used to run it on every file, one after the other, on
+every request, so re-opening the wizard on a folder of a few hundred CSVs
+re-read all of them.
+
+Results are cached per (resolved path, size, mtime, known parameters): a
+file that is rewritten or touched gets a new key and is detected again.
+Uncached files of a batch are detected in a bounded thread pool (the work
+is mostly file I/O and C-level parsing), and results are always returned
+in the order the paths were given. Failed detections are not cached.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bound on concurrent detections of one batch
+DETECTION_WORKERS = min(8, os.cpu_count() or 1)
+
+# Maximum number of cached detection results
+DEFAULT_MAX_ENTRIES = 4096
+
+
+def _default_detector() -> Callable[..., Any]:
+    from ..lazy_imports import get_cached
+
+    return get_cached("detect_file_parameters")
+
+
+class FileDetectionCache:
+    """LRU of detection results keyed by file identity and known parameters."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, detector: Callable[..., Any] | None = None):
+        self._max_entries = max_entries
+        self._detector = detector
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(path: str | Path, known_params: dict[str, Any] | None) -> tuple:
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+        params = tuple(sorted((known_params or {}).items()))
+        return (str(resolved), stat.st_size, stat.st_mtime_ns, params)
+
+    def _run_detector(self, path: str, known_params: dict[str, Any] | None) -> Any:
+        detector = self._detector or _default_detector()
+        if known_params is None:
+            return detector(path)
+        return detector(path, known_params=known_params)
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def _store(self, key: Hashable, result: Any) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def detect(self, path: str | Path, known_params: dict[str, Any] | None = None) -> Any:
+        """Detection result for one file; raises what the detector raises."""
+        key = self._key(path, known_params)
+        found, result = self._lookup(key)
+        if found:
+            return result
+        result = self._run_detector(str(path), known_params)
+        self._store(key, result)
+        return result
+
+    def detect_many(
+        self,
+        paths: Iterable[str | Path],
+        known_params: dict[str, Any] | None = None,
+        max_workers: int | None = None,
+    ) -> list[tuple[Any, Exception | None]]:
+        """Detect a batch of files, returning ``(result, error)`` per path, in input order.
+
+        Cached files are answered directly; the others are detected on up to
+        ``max_workers`` threads (``DETECTION_WORKERS`` by default, 1 runs
+        them serially). The same file listed twice is detected once.
+        """
+        paths = [str(p) for p in paths]
+        outcomes: list[tuple[Any, Exception | None]] = [(None, None)] * len(paths)
+        pending: dict[Hashable, list[int]] = {}
+        for i, path in enumerate(paths):
+            try:
+                key = self._key(path, known_params)
+            except OSError as e:
+                outcomes[i] = (None, e)
+                continue
+            if key in pending:
+                pending[key].append(i)
+                continue
+            found, result = self._lookup(key)
+            if found:
+                outcomes[i] = (result, None)
+            else:
+                pending[key] = [i]
+
+        def run(key: Hashable) -> tuple[Any, Exception | None]:
+            try:
+                result = self._run_detector(paths[pending[key][0]], known_params)
+            except Exception as e:
+                return None, e
+            self._store(key, result)
+            return result, None
+
+        workers = max(1, min(max_workers or DETECTION_WORKERS, len(pending)))
+        if workers == 1:
+            results = [run(key) for key in pending]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file-detect") as executor:
+                # map() yields in submission order, whatever order detections finish in
+                results = list(executor.map(run, pending))
+        for key, outcome in zip(pending, results):
+            for i in pending[key]:
+                outcomes[i] = outcome
+        if pending:
+            logger.debug("Detected %d of %d file(s) on %d thread(s)", len(pending), len(paths), workers)
+        return outcomes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+file_detection_cache = FileDetectionCache()
@@ -0,0 +1,78 @@
+"""
+Fixed-bucket duration histograms.
+
+Used to expose latency distributions (job queue wait, job run time, ...)
+without keeping every sample. Buckets are cumulative upper bounds in
+seconds, as in Prometheus histograms; quantiles are estimated by linear
+interpolation inside the bucket that contains them.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+# Upper bounds (seconds) suited to background jobs: sub-second to hours
+JOB_DURATION_BUCKETS: tuple[float, ...] = (
+    0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 1800.0, 3600.0, 14400.0,
+)
+
+
+class Histogram:
+    """Thread-safe histogram of non-negative values (durations in seconds by default)."""
+
+    def __init__(self, buckets: Sequence[float] = JOB_DURATION_BUCKETS):
+        self._bounds = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        value = max(float(value), 0.0)
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            self._max = max(self._max, value)
+
+    def _quantile(self, q: float, counts: list[int], total: int, maximum: float) -> float | None:
+        if total == 0:
+            return None
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if count and cumulative + count >= rank:
+                lower = self._bounds[index - 1] if index > 0 else 0.0
+                upper = self._bounds[index] if index < len(self._bounds) else maximum
+                upper = min(upper, maximum)
+                lower = min(lower, upper)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return maximum
+
+    def snapshot(self) -> dict[str, Any]:
+        """Count, sum, mean, max, estimated p50/p95 and cumulative buckets."""
+        with self._lock:
+            counts = list(self._counts)
+            total, total_sum, maximum = self._count, self._sum, self._max
+
+        buckets = []
+        cumulative = 0
+        for bound, count in zip((*self._bounds, float("inf")), counts):
+            cumulative += count
+            buckets.append({"le": "+Inf" if bound == float("inf") else bound, "count": cumulative})
+
+        return {
+            "count": total,
+            "sum": total_sum,
+            "mean": total_sum / total if total else None,
+            "max": maximum if total else None,
+            "p50": self._quantile(0.5, counts, total, maximum),
+            "p95": self._quantile(0.95, counts, total, maximum),
+            "buckets": buckets,
+        }
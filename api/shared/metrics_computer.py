@@ -14,12 +14,16 @@ Metric Categories:
 - Quality: nan_count, inf_count, saturation_count, zero_count
 - Chemometric (requires PCA): hotelling_t2, q_residual, leverage, distance_to_centroid, lof_score
 
-Note: Chemometric metrics are delegated to nirs4all.operators.filters for computation.
+Note: Chemometric metrics are delegated to nirs4all.operators.filters for computation,
+except Hotelling's T² and Q residuals, which reuse the shared PCA projection service.
 """
 
 from typing import Any, Dict, List, Optional, Tuple
 
+from .array_cache import ArrayCache, array_fingerprint
 from .logger import get_logger
+from .neighbor_index import neighbor_index_cache, neighbor_index_for
+from .pca_projection import pca_projection_service
 
 logger = get_logger(__name__)
 
@@ -28,6 +32,9 @@ from ..lazy_imports import get_cached, is_ml_ready
 SCIPY_AVAILABLE = True
 NIRS4ALL_FILTERS_AVAILABLE = True
 
+# Fitted distance models (e.g. Ledoit-Wolf precision matrices) by data fingerprint
+_distance_models = ArrayCache(max_bytes=256 * 1024 * 1024)
+
 
 # ============= Metric Categories =============
 
@@ -86,8 +93,9 @@ class MetricsComputer:
     This class provides methods to compute various metrics for spectral data,
     organized by category. Metrics can be computed individually or in batches.
 
-    Chemometric metrics (hotelling_t2, q_residual, leverage, lof_score, distance_to_centroid)
-    are delegated to nirs4all.operators.filters for computation.
+    Chemometric metrics (leverage, lof_score, distance_to_centroid) are delegated
+    to nirs4all.operators.filters; hotelling_t2 and q_residual use the shared
+    PCA projection service.
 
     Attributes:
         saturation_threshold: Threshold value for saturation detection
@@ -290,10 +298,10 @@ class MetricsComputer:
 
         # ======== Chemometric Metrics (delegated to nirs4all filters) ========
         elif metric == 'hotelling_t2':
-            return self._compute_chemometric_via_filter(X, 'pca_leverage')
+            return self._compute_pca_statistic(X, 'hotelling_t2')
 
         elif metric == 'q_residual':
-            return self._compute_chemometric_via_filter(X, 'pca_residual')
+            return self._compute_pca_statistic(X, 'q_residual')
 
         elif metric == 'leverage':
             return self._compute_leverage_via_filter(X)
@@ -307,6 +315,37 @@ class MetricsComputer:
         else:
             return None
 
+    def _compute_pca_statistic(self, X, statistic: str):
+        """Compute Hotelling's T² or Q residuals from the shared PCA fit.
+
+        Same statistics as nirs4all's XOutlierFilter (pca_leverage /
+        pca_residual), but the decomposition comes from the PCA projection
+        service, so the playground projection and both metrics share a fit.
+
+        Args:
+            X: Feature matrix
+            statistic: 'hotelling_t2' or 'q_residual'
+
+        Returns:
+            Array of metric values, or None if computation failed
+        """
+        import numpy as np
+
+        n_samples = X.shape[0]
+        if n_samples < 2:
+            return None
+
+        try:
+            X_clean = np.nan_to_num(X, nan=0)
+            pca = pca_projection_service.fit(
+                X_clean, min(self.n_pca_components, n_samples - 1, X.shape[1]),
+            )
+            if statistic == 'hotelling_t2':
+                return pca.hotelling_t2()
+            return pca.q_residuals(X_clean)
+        except Exception:
+            return None
+
     def _compute_chemometric_via_filter(
         self,
         X,
@@ -411,6 +450,60 @@ class MetricsComputer:
             'p95': float(np.percentile(valid_values, 95)),
         }
 
+    def get_outlier_mask(
+        self,
+        X,
+        method: str = 'hotelling_t2',
+        threshold: float = 0.95,
+        pca_result: dict[str, Any] | None = None,
+    ):
+        """Flag samples whose outlier score is above a quantile of all scores.
+
+        This is a UI-specific feature for highlighting atypical spectra.
+
+        Args:
+            X: Feature matrix
+            method: Score used for detection:
+                - 'hotelling_t2': Hotelling's T² from the shared PCA fit
+                - 'q_residual': Q residuals from the shared PCA fit
+                - 'lof': Local Outlier Factor from the cached neighbour index
+                - 'distance': Euclidean distance to the mean spectrum
+            threshold: Quantile of the scores above which a sample is an outlier
+            pca_result: Unused; the decomposition comes from the PCA projection
+                service (kept for API compatibility)
+
+        Returns:
+            Tuple of (inlier mask, info dict with method, cutoff and scores)
+        """
+        import numpy as np
+
+        n_samples = X.shape[0]
+        X_clean = np.nan_to_num(X, nan=0)
+
+        if method in ('hotelling_t2', 'q_residual'):
+            scores = self._compute_pca_statistic(X_clean, method)
+        elif method == 'lof':
+            scores = None
+            if n_samples > 2:
+                index = neighbor_index_cache.get(X_clean, 'euclidean')
+                scores = index.local_outlier_factor(self.lof_n_neighbors)
+        elif method == 'distance':
+            scores = np.linalg.norm(X_clean - X_clean.mean(axis=0), axis=1)
+        else:
+            raise ValueError(f"Unknown outlier method: {method}")
+
+        if scores is None:
+            raise ValueError(f"Cannot compute '{method}' scores for {n_samples} samples")
+
+        cutoff = float(np.quantile(scores, threshold))
+        inlier_mask = scores <= cutoff
+        return inlier_mask, {
+            'method': method,
+            'threshold': threshold,
+            'cutoff': cutoff,
+            'scores': [float(v) for v in scores],
+        }
+
     def get_similar_samples(
         self,
         X,
@@ -434,6 +527,15 @@ class MetricsComputer:
             Tuple of (indices of similar samples, distances)
         """
         import numpy as np
+
+        if top_k is not None or threshold is not None:
+            # Cached per data fingerprint, so repeated clicks skip the full scan
+            index = neighbor_index_for(X, metric)
+            if index is not None:
+                if top_k is not None:
+                    return index.query(reference_idx, top_k)
+                return index.query_radius(reference_idx, threshold)
+
         reference = X[reference_idx]
         n_samples = X.shape[0]
 
@@ -545,15 +647,20 @@ class MetricsComputer:
                     return np.linalg.norm(X_ref - X_final, axis=1)
 
                 X_combined = np.vstack([X_ref, X_final])
-                # Use LedoitWolf for more stable covariance estimation (shrinkage)
-                cov = LedoitWolf().fit(X_combined)
+                # Use LedoitWolf for more stable covariance estimation (shrinkage),
+                # fitted once per (reference, final) pair
+                precision_key = ("ledoit_wolf_precision", array_fingerprint(X_combined))
+                precision = _distance_models.get(precision_key)
+                if precision is None:
+                    precision = LedoitWolf().fit(X_combined).precision_
+                    _distance_models.put(precision_key, precision)
                 diff = X_ref - X_final
 
                 # Check if precision matrix is valid
-                if not np.all(np.isfinite(cov.precision_)):
+                if not np.all(np.isfinite(precision)):
                     return np.linalg.norm(X_ref - X_final, axis=1)
 
-                distances = np.sqrt(np.sum(diff @ cov.precision_ * diff, axis=1))
+                distances = np.sqrt(np.sum(diff @ precision * diff, axis=1))
 
                 # Replace any NaN/Inf with euclidean fallback
                 euclidean = np.linalg.norm(X_ref - X_final, axis=1)
@@ -569,15 +676,14 @@ class MetricsComputer:
         elif metric == 'pca_distance':
             # Distance in PCA score space (first n_components)
             try:
-                from sklearn.decomposition import PCA
                 n_components = min(10, X_ref.shape[1], n_samples - 1)
                 if n_components < 1:
                     return np.linalg.norm(X_ref - X_final, axis=1)
 
-                pca = PCA(n_components=n_components)
-                pca.fit(np.vstack([X_ref, X_final]))
-                scores_ref = pca.transform(X_ref)
-                scores_final = pca.transform(X_final)
+                # Shared PCA fit, cached by the content of the stacked pair
+                pca = pca_projection_service.fit(np.vstack([X_ref, X_final]), n_components)
+                scores_ref = pca.scores[:n_samples]
+                scores_final = pca.scores[n_samples:]
                 return np.linalg.norm(scores_ref - scores_final, axis=1)
             except Exception:
                 return np.linalg.norm(X_ref - X_final, axis=1)
@@ -0,0 +1,250 @@
+"""
+Nearest-neighbour index for playground sample similarity.
+
+Clicking a spectrum in the playground asks for its most similar samples.
+A brute-force scan subtracts the reference from the whole matrix on every
+click, which at 10k samples x 2k wavelengths means a few hundred MB of
+temporaries per query. ``NeighborIndex`` is built once per data
+fingerprint and metric, and answers queries with a filter-and-refine
+search:
+
+- rows are mapped to a space where the metric is Euclidean (unit rows for
+  cosine, centered unit rows for correlation);
+- a KD-tree over the first PCA scores of that space gives lower bounds of
+  the true distances (an orthogonal projection never lengthens a vector);
+- candidates are taken from the tree in order of their lower bound and
+  re-ranked with exact distances, widening the candidate set until no
+  unseen sample can beat the current k-th neighbour.
+
+Results are exact. Indexes are looked up by a digest of the row and
+column sums (see ``data_key``) and every hit is checked against the
+matrix the index was built from, so changes that keep the sums still get
+a new index. Hashing every byte instead would cost several full scans
+per click. Stale indexes simply age out of the small LRU cache. Local
+outlier factors reuse the same tree.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from .logger import get_logger
+from .pca_projection import fit_decomposition
+
+logger = get_logger(__name__)
+
+INDEXED_METRICS = ("euclidean", "cosine", "correlation")
+
+# Below this many samples a brute-force scan is as fast as the index
+INDEX_MIN_SAMPLES = 500
+
+# PCA dimensions of the KD-tree that produces candidate lower bounds
+INDEX_COMPONENTS = 16
+
+# Maximum number of cached indexes (one per data fingerprint and metric)
+DEFAULT_MAX_ENTRIES = 4
+
+
+class NeighborIndex:
+    """Exact k-nearest-neighbour and radius queries for one matrix and metric."""
+
+    def __init__(self, X, metric: str = "euclidean", n_components: int = INDEX_COMPONENTS):
+        import numpy as np
+        from sklearn.neighbors import KDTree
+
+        if metric not in INDEXED_METRICS:
+            raise ValueError(f"Unsupported metric for neighbour index: {metric}")
+        # Own copy: the index outlives the request that built it
+        X = np.array(X, dtype=float)
+        self.metric = metric
+        self.n_samples = X.shape[0]
+        self._data = X
+
+        if metric == "euclidean":
+            vectors = X
+        else:
+            vectors = X - X.mean(axis=1, keepdims=True) if metric == "correlation" else X.copy()
+            norms = np.linalg.norm(vectors, axis=1)
+            if np.any(norms == 0):
+                raise ValueError("Rows with zero norm have no direction")
+            vectors /= norms[:, None]
+        self._vectors = np.ascontiguousarray(vectors)
+
+        n_comp = max(1, min(n_components, self.n_samples - 1, X.shape[1]))
+        self._pca = fit_decomposition(self._vectors, n_comp)
+        self._tree = KDTree(self._pca.scores)
+
+    @classmethod
+    def supports(cls, X, metric: str, check_finite: bool = True) -> bool:
+        """Whether queries on ``X`` can be answered by an index with the same results."""
+        import numpy as np
+
+        if metric not in INDEXED_METRICS or X.ndim != 2 or X.shape[0] < 2:
+            return False
+        if check_finite and not np.all(np.isfinite(X)):
+            return False
+        # Zero-norm rows get distance 1 from everything in a brute-force scan
+        if metric == "cosine" and not np.all(X.any(axis=1)):
+            return False
+        return not (metric == "correlation" and np.any(np.ptp(X, axis=1) == 0))
+
+    @property
+    def nbytes(self) -> int:
+        data = 0 if self._data is self._vectors else self._data.nbytes
+        return int(data + self._vectors.nbytes + self._pca.scores.nbytes)
+
+    def matches(self, X) -> bool:
+        """Whether the index was built from exactly the values of ``X``."""
+        import numpy as np
+
+        return X.shape == self._data.shape and bool(np.array_equal(X, self._data))
+
+    # ----- distances -----
+
+    def _euclidean(self, reference_idx: int, indices):
+        import numpy as np
+
+        diff = self._vectors[indices] - self._vectors[reference_idx]
+        return np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+    def _to_metric(self, euclidean):
+        """Convert distances in index space to the requested metric."""
+        if self.metric == "euclidean":
+            return euclidean
+        # For unit vectors 1 - cos(u, v) = |u - v|^2 / 2
+        return euclidean**2 / 2
+
+    def _to_euclidean(self, distance: float) -> float:
+        if self.metric == "euclidean":
+            return distance
+        return float(max(2 * distance, 0.0) ** 0.5)
+
+    # ----- queries -----
+
+    def query(self, reference_idx: int, top_k: int):
+        """The ``top_k`` nearest samples to ``reference_idx`` (itself excluded)."""
+        import numpy as np
+
+        k = min(top_k, self.n_samples - 1)
+        if k <= 0:
+            return np.array([], dtype=int), np.array([], dtype=float)
+
+        point = self._pca.scores[reference_idx : reference_idx + 1]
+        n_candidates = min(self.n_samples, max(4 * (k + 1), 64))
+        while True:
+            bounds, candidates = self._tree.query(point, k=n_candidates)
+            bounds, candidates = bounds[0], candidates[0]
+            candidates = candidates[candidates != reference_idx]
+            exact = self._euclidean(reference_idx, candidates)
+            order = np.lexsort((candidates, exact))[:k]
+            # Every sample outside the candidates is at least bounds[-1] away
+            if n_candidates >= self.n_samples or bounds[-1] >= exact[order[-1]]:
+                break
+            n_candidates = min(self.n_samples, n_candidates * 4)
+        return candidates[order], self._to_metric(exact[order])
+
+    def query_radius(self, reference_idx: int, threshold: float):
+        """Samples within ``threshold`` of ``reference_idx`` (itself excluded), by index."""
+        import numpy as np
+
+        radius = self._to_euclidean(threshold)
+        point = self._pca.scores[reference_idx : reference_idx + 1]
+        candidates = np.sort(self._tree.query_radius(point, r=radius)[0])
+        candidates = candidates[candidates != reference_idx]
+        distances = self._to_metric(self._euclidean(reference_idx, candidates))
+        keep = distances <= threshold
+        return candidates[keep], distances[keep]
+
+    def local_outlier_factor(self, n_neighbors: int):
+        """LOF of every sample, from neighbourhoods in the index's PCA space."""
+        import numpy as np
+
+        k = max(1, min(n_neighbors, self.n_samples - 1))
+        distances, neighbors = self._tree.query(self._pca.scores, k=k + 1)
+        # Drop each sample itself (first column, distance 0)
+        distances, neighbors = distances[:, 1:], neighbors[:, 1:]
+        k_distance = distances[:, -1]
+        reach = np.maximum(distances, k_distance[neighbors])
+        lrd = 1.0 / np.maximum(reach.mean(axis=1), 1e-12)
+        return lrd[neighbors].mean(axis=1) / lrd
+
+
+class NeighborIndexCache:
+    """LRU of neighbour indexes keyed by ``data_key`` and metric, verified on every hit."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, NeighborIndex] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, X, metric: str, key: Hashable | None = None) -> NeighborIndex:
+        """Index for ``X`` under ``metric``, built on first use.
+
+        ``key`` is ``data_key(X)`` when not given. A cached index under the
+        same key is only reused if it was built from the same values.
+        """
+        cache_key = (key if key is not None else data_key(X), metric)
+        with self._lock:
+            index = self._entries.get(cache_key)
+        if index is not None and index.matches(X):
+            with self._lock:
+                if cache_key in self._entries:
+                    self._entries.move_to_end(cache_key)
+                self.hits += 1
+            return index
+        with self._lock:
+            self.misses += 1
+
+        index = NeighborIndex(X, metric)
+        logger.debug("Built %s neighbour index on %dx%d matrix", metric, *X.shape)
+        with self._lock:
+            self._entries[cache_key] = index
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+neighbor_index_cache = NeighborIndexCache()
+
+
+def data_key(X, row_sums=None) -> tuple:
+    """Cheap lookup key of a matrix: digest of its shape, dtype, row and column sums.
+
+    Two vectorized passes instead of hashing every byte; different data may
+    share a key, which ``NeighborIndexCache.get`` detects.
+    """
+    import hashlib
+
+    import numpy as np
+
+    row_sums = X.sum(axis=1) if row_sums is None else row_sums
+    digest = hashlib.sha1(np.ascontiguousarray(row_sums).tobytes())
+    digest.update(np.ascontiguousarray(X.sum(axis=0)).tobytes())
+    return ("sums", X.shape, X.dtype.str, digest.hexdigest())
+
+
+def neighbor_index_for(X, metric: str) -> Any | None:
+    """Cached index for ``X``, or None when a brute-force scan should be used."""
+    import numpy as np
+
+    if X.ndim != 2 or X.shape[0] < INDEX_MIN_SAMPLES or metric not in INDEXED_METRICS:
+        return None
+    row_sums = X.sum(axis=1)
+    # A NaN or inf anywhere makes its row sum non-finite
+    if not np.all(np.isfinite(row_sums)) or not NeighborIndex.supports(X, metric, check_finite=False):
+        return None
+    try:
+        return neighbor_index_cache.get(X, metric, key=data_key(X, row_sums))
+    except Exception as e:
+        logger.debug("Neighbour index unavailable, using brute force: %s", e)
+        return None
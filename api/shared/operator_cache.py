@@ -0,0 +1,241 @@
+"""
+Operator-discovery cache.
+
+Operator discovery (``/pipelines/operators/discover``, ``/playground/operators``,
+``/preprocessing/discover``) introspects every exported nirs4all and sklearn
+class with ``inspect``. The result only changes when the installed packages,
+the webapp code or the workspace custom nodes change, so it is cached per
+namespace under a fingerprint of those inputs and persisted to the app config
+folder. The background ML loader pre-warms the cache, and venv mutations
+(package install/uninstall) invalidate it.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_FORMAT_VERSION = 1
+
+# Distributions whose versions determine the discovered operator set
+FINGERPRINT_PACKAGES = ("nirs4all", "scikit-learn")
+
+# Webapp modules that shape the discovery payloads
+_DISCOVERY_MODULES = (
+    "pipelines.py",
+    "playground.py",
+    "preprocessing.py",
+    "shared/pipeline_service.py",
+    "shared/filter_operators.py",
+)
+
+
+def _package_version(name: str) -> str | None:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:  # pragma: no cover
+        return None
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+    except Exception:
+        return None
+
+
+def _custom_nodes_mtime() -> int | None:
+    """Return the mtime of the active workspace custom-nodes file, if any."""
+    try:
+        from ..workspace_manager import workspace_manager
+
+        ws_path = workspace_manager.get_active_workspace_path()
+    except Exception:
+        return None
+    if not ws_path:
+        return None
+    try:
+        return (Path(ws_path) / ".nirs4all" / "custom_nodes.json").stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _code_signature() -> str:
+    api_dir = Path(__file__).resolve().parent.parent
+    parts = []
+    for rel in _DISCOVERY_MODULES:
+        try:
+            parts.append(f"{rel}:{(api_dir / rel).stat().st_mtime_ns}")
+        except OSError:
+            continue
+    return "|".join(parts)
+
+
+class OperatorDiscoveryCache:
+    """Process-wide discovery cache with on-disk persistence.
+
+    Entries are keyed by namespace (one per endpoint) and validated against a
+    fingerprint of the interpreter prefix, the versions of
+    :data:`FINGERPRINT_PACKAGES`, the webapp discovery modules and the
+    custom-nodes file mtime. Payloads are normalized to their JSON form
+    before caching so memory and disk hits return identical data.
+    """
+
+    def __init__(self, cache_file: Path | None = None):
+        self._cache_file = cache_file
+        self._entries: dict[str, tuple[str, Any]] = {}
+        self._static_fingerprint: dict[str, Any] | None = None
+        self._disk_loaded = False
+        self._lock = threading.Lock()
+
+    def set_cache_file(self, cache_file: Path | None) -> None:
+        """Persist to ``cache_file`` (``<app config dir>/cache/operator_discovery.json`` when None).
+
+        Memory entries are dropped; the new file is read on next use.
+        """
+        with self._lock:
+            self._cache_file = cache_file
+            self._entries.clear()
+            self._disk_loaded = False
+
+    def _resolve_file(self) -> Path | None:
+        if self._cache_file is not None:
+            return self._cache_file
+        try:
+            from ..app_config import app_config
+
+            return Path(app_config.config_dir) / "cache" / "operator_discovery.json"
+        except Exception:
+            return None
+
+    def fingerprint(self) -> str:
+        """Return the current fingerprint of the discovery inputs.
+
+        Package versions and the code signature are resolved once per
+        process (until :meth:`invalidate`); the custom-nodes mtime is
+        re-checked on every call.
+        """
+        with self._lock:
+            if self._static_fingerprint is None:
+                self._static_fingerprint = {
+                    "format": _FORMAT_VERSION,
+                    "prefix": sys.prefix,
+                    "python": sys.version.split()[0],
+                    "packages": {name: _package_version(name) for name in FINGERPRINT_PACKAGES},
+                    "code": _code_signature(),
+                }
+            static = self._static_fingerprint
+        return json.dumps({**static, "custom_nodes": _custom_nodes_mtime()}, sort_keys=True)
+
+    def _load_disk(self) -> None:
+        if self._disk_loaded:
+            return
+        self._disk_loaded = True
+        path = self._resolve_file()
+        if path is None or not path.exists():
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            for namespace, entry in data.get("entries", {}).items():
+                self._entries.setdefault(namespace, (entry["fingerprint"], entry["payload"]))
+        except Exception as e:
+            logger.debug("Ignoring unreadable operator discovery cache %s: %s", path, e)
+
+    def _save_disk(self) -> None:
+        path = self._resolve_file()
+        if path is None:
+            return
+        data = {
+            "version": _FORMAT_VERSION,
+            "entries": {
+                namespace: {"fingerprint": fp, "payload": payload}
+                for namespace, (fp, payload) in self._entries.items()
+            },
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.debug("Could not persist operator discovery cache to %s: %s", path, e)
+
+    def get_or_compute(self, namespace: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached payload for ``namespace``, computing it on a miss.
+
+        Nothing is cached until ML dependencies are loaded, since discovery
+        before that point only sees a partial operator set.
+        """
+        from ..lazy_imports import is_ml_ready
+
+        if not is_ml_ready():
+            return compute()
+
+        fingerprint = self.fingerprint()
+        with self._lock:
+            self._load_disk()
+            entry = self._entries.get(namespace)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+
+        payload = compute()
+        try:
+            from fastapi.encoders import jsonable_encoder
+
+            payload = json.loads(json.dumps(jsonable_encoder(payload), allow_nan=True))
+        except Exception as e:
+            # Not JSON-representable: serve it uncached rather than persist a lossy copy
+            logger.debug("Operator discovery payload '%s' not cacheable: %s", namespace, e)
+            return payload
+
+        with self._lock:
+            self._entries[namespace] = (fingerprint, payload)
+            self._save_disk()
+        return payload
+
+    def invalidate(self) -> None:
+        """Drop all entries (memory and disk) and re-resolve the fingerprint."""
+        with self._lock:
+            self._entries.clear()
+            self._static_fingerprint = None
+            self._disk_loaded = True
+            path = self._resolve_file()
+            if path is not None:
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError as e:
+                    logger.debug("Could not remove operator discovery cache %s: %s", path, e)
+
+
+operator_discovery_cache = OperatorDiscoveryCache()
+
+
+def prewarm_operator_discovery() -> None:
+    """Populate the discovery cache for every discovery endpoint.
+
+    Intended to run in the background ML loader thread once nirs4all is
+    imported, so the first pipeline-editor open is served from cache.
+    """
+    import time
+
+    start = time.time()
+    try:
+        from ..pipelines import _compute_operator_discovery
+        from ..playground import _compute_playground_operators
+        from ..preprocessing import _compute_preprocessing_discovery
+
+        operator_discovery_cache.get_or_compute("pipelines", _compute_operator_discovery)
+        operator_discovery_cache.get_or_compute("playground", _compute_playground_operators)
+        operator_discovery_cache.get_or_compute("preprocessing", _compute_preprocessing_discovery)
+    except Exception as e:
+        logger.warning("Operator discovery pre-warm failed: %s", e)
+        return
+    logger.info("Operator discovery cache warmed in %.2fs", time.time() - start)
@@ -0,0 +1,266 @@
+"""
+Shared PCA projection service.
+
+The PCA analysis endpoints (scores, loadings, scree), the playground
+projection and the chemometric sample metrics all decompose the same
+matrices. ``PCAProjectionService`` fits once per data key and serves
+every consumer from that one decomposition: a later request for fewer
+components is answered by slicing the cached fit.
+
+The solver is picked from the matrix size:
+
+- exact SVD (``full``) for small matrices;
+- randomized SVD above ``RANDOMIZED_MIN_ELEMENTS``;
+- ``IncrementalPCA`` in row batches above ``INCREMENTAL_MIN_ELEMENTS``,
+  which avoids a full centered copy of the data.
+
+Component signs follow scikit-learn's PCA convention, so that results
+stay comparable across solvers.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from .array_cache import array_fingerprint
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Matrices with more elements than this use randomized SVD
+RANDOMIZED_MIN_ELEMENTS = 2_000_000
+
+# Matrices with more elements than this are decomposed incrementally
+INCREMENTAL_MIN_ELEMENTS = 50_000_000
+
+# Rows per IncrementalPCA batch (raised to n_components when smaller)
+INCREMENTAL_BATCH_ROWS = 5_000
+
+# Maximum number of cached decompositions
+DEFAULT_MAX_ENTRIES = 16
+
+
+@dataclass
+class PCADecomposition:
+    """A fitted PCA: model parameters plus the scores of the fitted data."""
+
+    mean: Any  # (n_features,)
+    scale: Any | None  # (n_features,) when the data was scaled to unit variance
+    components: Any  # (n_components, n_features)
+    explained_variance: Any  # (n_components,)
+    explained_variance_ratio: Any  # (n_components,)
+    scores: Any  # (n_samples, n_components)
+    solver: str
+
+    @property
+    def n_components(self) -> int:
+        return int(self.components.shape[0])
+
+    def truncated(self, n_components: int) -> PCADecomposition:
+        """View of the first ``n_components`` components."""
+        if n_components >= self.n_components:
+            return self
+        return PCADecomposition(
+            mean=self.mean,
+            scale=self.scale,
+            components=self.components[:n_components],
+            explained_variance=self.explained_variance[:n_components],
+            explained_variance_ratio=self.explained_variance_ratio[:n_components],
+            scores=self.scores[:, :n_components],
+            solver=self.solver,
+        )
+
+    def _standardize(self, X):
+        import numpy as np
+
+        Z = np.asarray(X, dtype=float) - self.mean
+        if self.scale is not None:
+            Z /= self.scale
+        return Z
+
+    def transform(self, X):
+        """Project new samples onto the components."""
+        return self._standardize(X) @ self.components.T
+
+    def hotelling_t2(self):
+        """Hotelling's T² of the fitted samples."""
+        import numpy as np
+
+        return np.sum(self.scores**2 / self.explained_variance, axis=1)
+
+    def q_residuals(self, X):
+        """Q statistic (squared reconstruction error) of the samples in ``X``."""
+        import numpy as np
+
+        Z = self._standardize(X)
+        residuals = Z - (Z @ self.components.T) @ self.components
+        return np.sum(residuals**2, axis=1)
+
+
+def _choose_solver(n_samples: int, n_features: int) -> str:
+    elements = n_samples * n_features
+    if elements > INCREMENTAL_MIN_ELEMENTS:
+        return "incremental"
+    if elements > RANDOMIZED_MIN_ELEMENTS:
+        return "randomized"
+    return "full"
+
+
+def fit_decomposition(X, n_components: int, *, scale: bool = False, solver: str | None = None) -> PCADecomposition:
+    """Fit PCA on ``X`` (centered, optionally scaled to unit variance).
+
+    Args:
+        X: 2D array (n_samples, n_features) with at least 2 samples.
+        n_components: Requested components, capped by the matrix shape.
+        scale: Divide each feature by its standard deviation.
+        solver: ``full``, ``randomized`` or ``incremental``; chosen from the
+            matrix size when None.
+
+    Raises:
+        ValueError: If X has fewer than 2 samples or no features.
+    """
+    import numpy as np
+
+    X = np.asarray(X, dtype=float)
+    n_samples, n_features = X.shape
+    if n_samples < 2:
+        raise ValueError(f"PCA requires at least 2 samples, got {n_samples}")
+    if n_features == 0:
+        raise ValueError("PCA requires at least 1 feature")
+
+    n_comp = max(1, min(n_components, n_samples, n_features))
+    solver = solver or _choose_solver(n_samples, n_features)
+
+    mean = X.mean(axis=0)
+    std = None
+    if scale:
+        std = X.std(axis=0)
+        std[std == 0] = 1
+
+    if solver == "incremental":
+        return _fit_incremental(X, n_comp, mean, std)
+
+    from sklearn.utils.extmath import randomized_svd, svd_flip
+
+    Z = X - mean
+    if std is not None:
+        Z /= std
+
+    if solver == "randomized":
+        U, S, Vt = randomized_svd(Z, n_comp, flip_sign=False, random_state=0)
+        total_variance = float(np.sum(Z**2)) / (n_samples - 1)
+    else:
+        U, S, Vt = np.linalg.svd(Z, full_matrices=False)
+        total_variance = float(np.sum(S**2)) / (n_samples - 1)
+    U, Vt = svd_flip(U, Vt, u_based_decision=False)
+
+    explained_variance = S[:n_comp] ** 2 / (n_samples - 1)
+    return PCADecomposition(
+        mean=mean,
+        scale=std,
+        components=Vt[:n_comp],
+        explained_variance=explained_variance,
+        explained_variance_ratio=explained_variance / total_variance if total_variance > 0 else np.zeros(n_comp),
+        scores=U[:, :n_comp] * S[:n_comp],
+        solver=solver,
+    )
+
+
+def _fit_incremental(X, n_comp: int, mean, std) -> PCADecomposition:
+    import numpy as np
+    from sklearn.decomposition import IncrementalPCA
+
+    n_samples = X.shape[0]
+    batch_rows = max(INCREMENTAL_BATCH_ROWS, n_comp)
+
+    bounds = [*range(0, n_samples, batch_rows), n_samples]
+    if len(bounds) > 2 and bounds[-1] - bounds[-2] < n_comp:
+        # partial_fit needs at least n_components rows per batch
+        del bounds[-2]
+
+    def batches():
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            Z = X[start:stop] - mean
+            if std is not None:
+                Z /= std
+            yield Z
+
+    ipca = IncrementalPCA(n_components=n_comp)
+    for Z in batches():
+        ipca.partial_fit(Z)
+    scores = np.vstack([ipca.transform(Z) for Z in batches()])
+
+    return PCADecomposition(
+        mean=mean,
+        scale=std,
+        components=ipca.components_,
+        explained_variance=ipca.explained_variance_,
+        explained_variance_ratio=ipca.explained_variance_ratio_,
+        scores=scores,
+        solver="incremental",
+    )
+
+
+class PCAProjectionService:
+    """Fits PCA once per data key and serves slices of the cached fit."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, PCADecomposition] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fit(
+        self,
+        X,
+        n_components: int,
+        *,
+        scale: bool = False,
+        key: Hashable | None = None,
+    ) -> PCADecomposition:
+        """Decomposition of ``X`` with (at most) ``n_components`` components.
+
+        ``key`` identifies the data; by default it is the content
+        fingerprint of ``X``, which covers the dataset, partition and
+        preprocessing that produced it.
+        """
+        cache_key = (key if key is not None else array_fingerprint(X), scale)
+        n_comp = max(1, min(n_components, *X.shape))
+
+        with self._lock:
+            cached = self._entries.get(cache_key)
+            if cached is not None and cached.n_components >= n_comp:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return cached.truncated(n_comp)
+            self.misses += 1
+
+        decomposition = fit_decomposition(X, n_comp, scale=scale)
+        logger.debug(
+            "Fitted PCA (%s solver, %d components) on %dx%d matrix",
+            decomposition.solver, decomposition.n_components, *X.shape,
+        )
+
+        with self._lock:
+            current = self._entries.get(cache_key)
+            if current is None or current.n_components < decomposition.n_components:
+                self._entries[cache_key] = decomposition
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return decomposition
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Module-level singleton shared by the analysis routes and the playground
+pca_projection_service = PCAProjectionService()
@@ -0,0 +1,110 @@
+"""
+Process-wide cache of preprocessing-chain results.
+
+The Analysis page, evaluation and prediction endpoints all apply the same
+preprocessing chains (e.g. SNV -> SG -> detrend) to the same dataset
+partitions. ``PreprocessingCache`` memoizes the output of every chain
+prefix under (data fingerprint, prefix hash). A request for a longer
+chain resumes from the longest cached prefix, like the playground's
+``_StepCache``.
+
+Callers that read the matrix from a dataset pass a data key built from
+the dataset's content hash (computed once per loaded dataset) and the
+partition and selection they read, so a cache hit costs no pass over
+the data. Otherwise the full input matrix is hashed, so different
+partitions or sample subsets never share entries and identical content
+still hits. Entries are evicted LRU under a total byte budget (see
+``ArrayCache``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from .array_cache import ArrayCache, array_fingerprint
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Memory budget for cached chain outputs (bytes)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def canonical_step(step: dict[str, Any]) -> str:
+    """Canonical JSON form of a ``{"name", "params"}`` preprocessing step."""
+    return json.dumps(
+        {"name": step.get("name", ""), "params": step.get("params") or {}},
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+
+
+def chain_prefix_hashes(chain: list[dict[str, Any]]) -> list[str]:
+    """Hash of each prefix of ``chain`` (steps without a name are ignored)."""
+    hashes: list[str] = []
+    digest = hashlib.sha1()
+    for step in chain:
+        if not step.get("name"):
+            continue
+        digest.update(canonical_step(step).encode("utf-8"))
+        hashes.append(digest.copy().hexdigest())
+    return hashes
+
+
+class PreprocessingCache:
+    """Memoizes preprocessing-chain outputs with prefix reuse."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._arrays = ArrayCache(max_bytes=max_bytes)
+
+    def apply(
+        self,
+        X: Any,
+        chain: list[dict[str, Any]],
+        apply_step: Callable[[Any, dict[str, Any]], Any],
+        data_key: Hashable | None = None,
+    ) -> Any:
+        """Return ``chain`` applied to ``X``, computing only uncached steps.
+
+        ``apply_step(X, step)`` transforms the matrix for one step. The
+        result is a fresh array that callers may modify. ``data_key``
+        identifies the content of ``X`` when the caller already knows it;
+        by default ``X`` is fingerprinted.
+        """
+        import numpy as np
+
+        steps = [step for step in chain if step.get("name")]
+        if not steps:
+            return X
+
+        fingerprint = data_key if data_key is not None else array_fingerprint(X)
+        prefixes = chain_prefix_hashes(steps)
+
+        start = 0
+        for i in range(len(steps), 0, -1):
+            cached = self._arrays.get((fingerprint, prefixes[i - 1]))
+            if cached is not None:
+                X, start = cached, i
+                break
+
+        for i in range(start, len(steps)):
+            # Transformers only ever see copies, so neither the caller's
+            # input nor the shared cached arrays can be modified in place
+            X = np.asarray(apply_step(X.copy(), steps[i]))
+            self._arrays.put((fingerprint, prefixes[i]), X)
+
+        return X.copy()
+
+    def clear(self) -> None:
+        self._arrays.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._arrays.stats()
+
+
+# Module-level singleton shared by all routers
+preprocessing_cache = PreprocessingCache()
@@ -0,0 +1,327 @@
+"""
+Per-route request latency, event-loop time and response size.
+
+``RequestMetricsMiddleware`` wraps the whole application. For every HTTP
+request it records, under the matched route template (``GET
+/api/runs/{run_id}``, never the raw path, so the number of series stays
+bounded):
+
+- the wall-clock latency, from the first ASGI call to the last body chunk;
+- the time the request's own task held the event loop (``loop``), measured
+  by timing each step of its coroutine. The rest of the latency (``off_loop``)
+  was spent awaiting: thread-pool work (sync endpoints, ``run_in_threadpool``),
+  I/O, or other tasks hogging the loop;
+- the response body size and status code.
+
+A request slower than the slow-request threshold is kept in a bounded log
+with its route, path and query parameters and a sample of the stack it was
+awaiting on when the threshold elapsed. The middleware also times its own
+bookkeeping so its overhead is visible next to the numbers it produces.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+from .histogram import Histogram
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds (seconds) suited to HTTP handlers: sub-millisecond to a minute
+REQUEST_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# Upper bounds (bytes) of response bodies: 256 B to 64 MiB
+RESPONSE_SIZE_BUCKETS: tuple[float, ...] = tuple(float(256 * 4**i) for i in range(10))
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# Requests slower than this (ms) are kept in the slow-request log; 0 disables it
+DEFAULT_SLOW_REQUEST_MS = _env_number("NIRS4ALL_SLOW_REQUEST_MS", 1000.0)
+
+SLOW_LOG_SIZE = 50
+
+STACK_SAMPLE_DEPTH = 30
+
+# Label of requests that matched no route (404s), so unknown paths share one series
+UNMATCHED_ROUTE = "<unmatched>"
+
+_PARAM_PATTERN = re.compile(r"{([a-zA-Z_][a-zA-Z0-9_]*)(?::[a-zA-Z_][a-zA-Z0-9_]*)?}")
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RouteStats:
+    """Histograms and status counts of one route."""
+
+    def __init__(self) -> None:
+        self.latency = Histogram(REQUEST_LATENCY_BUCKETS)
+        self.loop = Histogram(REQUEST_LATENCY_BUCKETS)
+        self.off_loop = Histogram(REQUEST_LATENCY_BUCKETS)
+        self.response_size = Histogram(RESPONSE_SIZE_BUCKETS)
+        self.statuses: dict[int, int] = {}
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": sum(self.statuses.values()),
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "latency_seconds": self.latency.snapshot(),
+            "loop_seconds": self.loop.snapshot(),
+            "off_loop_seconds": self.off_loop.snapshot(),
+            "response_size_bytes": self.response_size.snapshot(),
+        }
+
+
+class RequestMetrics:
+    """Process-wide store of request metrics and the slow-request log."""
+
+    def __init__(self, slow_request_ms: float | None = DEFAULT_SLOW_REQUEST_MS, slow_log_size: int = SLOW_LOG_SIZE):
+        self.slow_request_ms = slow_request_ms if slow_request_ms and slow_request_ms > 0 else None
+        self._routes: dict[tuple[str, str], RouteStats] = {}
+        self._slow: deque[dict[str, Any]] = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+        self._started_at = datetime.now().isoformat()
+        self._overhead_seconds = 0.0
+        self._overhead_count = 0
+
+    def _route_stats(self, method: str, route: str) -> RouteStats:
+        key = (method, route)
+        stats = self._routes.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._routes.setdefault(key, RouteStats())
+        return stats
+
+    def record(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        latency: float,
+        loop_time: float,
+        response_size: int,
+    ) -> None:
+        stats = self._route_stats(method, route)
+        stats.latency.observe(latency)
+        stats.loop.observe(loop_time)
+        stats.off_loop.observe(latency - loop_time)
+        stats.response_size.observe(response_size)
+        with self._lock:
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def record_overhead(self, seconds: float) -> None:
+        self._overhead_seconds += seconds
+        self._overhead_count += 1
+
+    def record_slow(self, entry: dict[str, Any]) -> None:
+        self._slow.append(entry)
+        logger.warning(
+            "Slow request: %s %s took %.0f ms (%.0f ms on the event loop)",
+            entry["method"], entry["path"], entry["duration_ms"], entry["loop_ms"],
+        )
+
+    def slow_requests(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Most recent slow requests first."""
+        entries = list(reversed(self._slow))
+        return entries[:limit] if limit is not None else entries
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._slow.clear()
+            self._overhead_seconds = 0.0
+            self._overhead_count = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Per-route histograms, sorted by total time spent, plus the middleware's own cost."""
+        with self._lock:
+            items = list(self._routes.items())
+        routes = [{"method": method, "route": route, **stats.snapshot()} for (method, route), stats in items]
+        routes.sort(key=lambda r: r["latency_seconds"]["sum"], reverse=True)
+        count = self._overhead_count
+        return {
+            "since": self._started_at,
+            "slow_request_ms": self.slow_request_ms,
+            "overhead": {
+                "requests": count,
+                "mean_us": self._overhead_seconds / count * 1e6 if count else None,
+            },
+            "routes": routes,
+        }
+
+    def prometheus(self) -> str:
+        """The histograms and status counters in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._routes.items())
+        lines: list[str] = []
+        families = (
+            ("latency", "nirs4all_http_request_duration_seconds", "Request latency"),
+            ("loop", "nirs4all_http_request_loop_seconds", "Time the request held the event loop"),
+            ("off_loop", "nirs4all_http_request_off_loop_seconds", "Request latency spent awaiting off the event loop"),
+            ("response_size", "nirs4all_http_response_size_bytes", "Response body size"),
+        )
+        for attr, metric, help_text in families:
+            lines.append(f"# HELP {metric} {help_text}.")
+            lines.append(f"# TYPE {metric} histogram")
+            for (method, route), stats in items:
+                labels = f'method="{_escape(method)}",route="{_escape(route)}"'
+                snapshot = getattr(stats, attr).snapshot()
+                for bucket in snapshot["buckets"]:
+                    lines.append(f'{metric}_bucket{{{labels},le="{bucket["le"]}"}} {bucket["count"]}')
+                lines.append(f"{metric}_sum{{{labels}}} {snapshot['sum']}")
+                lines.append(f"{metric}_count{{{labels}}} {snapshot['count']}")
+
+        metric = "nirs4all_http_requests_total"
+        lines.append(f"# HELP {metric} Requests by route and status code.")
+        lines.append(f"# TYPE {metric} counter")
+        for (method, route), stats in items:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'{metric}{{method="{_escape(method)}",route="{_escape(route)}",status="{status}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def route_label(scope: dict[str, Any]) -> str:
+    """The template of the route that handled the request (set by the router), or ``UNMATCHED_ROUTE``."""
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    # Routes of an included router may not carry its prefix: recover it by
+    # rendering the template with the request's parameters and stripping it
+    # from the end of the actual path.
+    params = scope.get("path_params") or {}
+    rendered = _PARAM_PATTERN.sub(lambda m: str(params.get(m.group(1), m.group(0))), template)
+    path = scope.get("path", "")
+    if rendered and path.endswith(rendered):
+        return path[: len(path) - len(rendered)] + template
+    return template
+
+
+class _TimedCoroutine:
+    """Drive a coroutine and add up the time each of its steps ran on the event loop."""
+
+    __slots__ = ("coro", "busy")
+
+    def __init__(self, coro) -> None:
+        self.coro = coro
+        self.busy = 0.0
+
+    def __await__(self):
+        coro = self.coro
+        send, value, error = coro.send, None, None
+        while True:
+            started = time.perf_counter()
+            try:
+                yielded = send(value) if error is None else coro.throw(error)
+            except StopIteration as stop:
+                self.busy += time.perf_counter() - started
+                return stop.value
+            except BaseException:
+                self.busy += time.perf_counter() - started
+                raise
+            self.busy += time.perf_counter() - started
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as exc:
+                value, error = None, exc
+
+
+def await_stack(coro, depth: int = STACK_SAMPLE_DEPTH) -> list[str]:
+    """``file:line in function`` of each frame of the chain of awaits under ``coro``, outermost first."""
+    frames = []
+    current = coro
+    while current is not None and len(frames) < depth:
+        frame = getattr(current, "cr_frame", None) or getattr(current, "gi_frame", None)
+        if frame is not None:
+            frames.append(f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}")
+        current = getattr(current, "cr_await", None) or getattr(current, "gi_yieldfrom", None)
+    return frames
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware feeding a ``RequestMetrics`` store; add it last so it wraps every other middleware."""
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response = {"status": 500, "size": 0}
+
+        async def send_wrapper(message):
+            kind = message["type"]
+            if kind == "http.response.start":
+                response["status"] = message["status"]
+            elif kind == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        timed = _TimedCoroutine(self.app(scope, receive, send_wrapper))
+        sample: dict[str, Any] = {}
+        timer = None
+        slow_ms = self.metrics.slow_request_ms
+        if slow_ms is not None:
+            timer = asyncio.get_running_loop().call_later(
+                slow_ms / 1000, lambda: sample.setdefault("stack", await_stack(timed.coro))
+            )
+        try:
+            await timed
+        finally:
+            ended = time.perf_counter()
+            if timer is not None:
+                timer.cancel()
+            self._record(scope, response, ended - started, timed.busy, sample)
+            self.metrics.record_overhead(time.perf_counter() - ended)
+
+    def _record(self, scope, response, latency: float, loop_time: float, sample: dict[str, Any]) -> None:
+        try:
+            route = route_label(scope)
+            method = scope["method"]
+            self.metrics.record(method, route, response["status"], latency, loop_time, response["size"])
+            slow_ms = self.metrics.slow_request_ms
+            if slow_ms is not None and latency * 1000 >= slow_ms:
+                self.metrics.record_slow({
+                    "timestamp": datetime.now().isoformat(),
+                    "method": method,
+                    "route": route,
+                    "path": scope.get("path", ""),
+                    "path_params": {k: str(v) for k, v in (scope.get("path_params") or {}).items()},
+                    "query": scope.get("query_string", b"").decode("latin-1"),
+                    "status": response["status"],
+                    "duration_ms": latency * 1000,
+                    "loop_ms": loop_time * 1000,
+                    "response_size": response["size"],
+                    "stack": sample.get("stack", []),
+                })
+        except Exception as e:  # metrics must never break a request
+            logger.debug("Could not record request metrics: %s", e)
+
+
+request_metrics = RequestMetrics()
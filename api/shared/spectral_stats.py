@@ -0,0 +1,388 @@
+"""
+Streaming per-wavelength statistics for spectral matrices.
+
+Computes mean, variance, min and max for every wavelength in a single
+chunked pass (Chan/Welford merge of per-chunk moments) and maintains a
+mergeable KLL-style quantile sketch for the median and quartiles.
+Statistics for two partitions can be merged without touching the raw
+data again, and results are persisted to the app config folder keyed by
+the dataset content hash so repeat requests are O(1).
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Rows per chunk for the single-pass moment accumulation
+DEFAULT_CHUNK_ROWS = 4096
+
+# Rows kept per sketch level. Quantiles are exact while the total sample
+# count stays below this value; beyond it the rank error is ~1/capacity.
+DEFAULT_SKETCH_CAPACITY = 256
+
+_FORMAT_VERSION = 1
+
+
+class QuantileSketch:
+    """Mergeable column-wise quantile sketch (simplified KLL compactor).
+
+    Level ``i`` holds rows of weight ``2**i``. When a level exceeds its
+    capacity, each column is sorted independently and every other value
+    is promoted to the next level, halving the row count while doubling
+    the weight. All columns share the same level structure so the sketch
+    stays a handful of small dense arrays.
+    """
+
+    def __init__(self, n_features: int, capacity: int = DEFAULT_SKETCH_CAPACITY):
+        import numpy as np
+
+        self.n_features = n_features
+        self.capacity = max(int(capacity), 2)
+        self.levels: list[Any] = [np.empty((0, n_features), dtype=np.float64)]
+        self._parity = 0
+
+    @property
+    def is_exact(self) -> bool:
+        """True while every inserted row is still held at weight 1."""
+        return len(self.levels) == 1
+
+    def update(self, chunk) -> None:
+        """Insert a (n_rows, n_features) chunk."""
+        import numpy as np
+
+        if len(chunk) == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(chunk, dtype=np.float64)], axis=0)
+        self._compress()
+
+    def merge(self, other: QuantileSketch) -> QuantileSketch:
+        """Return a new sketch covering both inputs."""
+        import numpy as np
+
+        if other.n_features != self.n_features:
+            raise ValueError("Cannot merge sketches with different feature counts")
+        merged = QuantileSketch(self.n_features, max(self.capacity, other.capacity))
+        depth = max(len(self.levels), len(other.levels))
+        merged.levels = []
+        for level in range(depth):
+            parts = [s.levels[level] for s in (self, other) if level < len(s.levels)]
+            merged.levels.append(np.concatenate(parts, axis=0))
+        merged._compress()
+        return merged
+
+    def _compress(self) -> None:
+        import numpy as np
+
+        level = 0
+        while level < len(self.levels):
+            rows = self.levels[level]
+            if len(rows) <= self.capacity:
+                level += 1
+                continue
+            if len(rows) % 2:
+                # Keep one row back so the promoted half has an even pairing
+                keep, rows = rows[-1:], rows[:-1]
+            else:
+                keep = rows[:0]
+            ordered = np.sort(rows, axis=0)
+            promoted = ordered[self._parity::2]
+            self._parity ^= 1
+            self.levels[level] = keep
+            if level + 1 == len(self.levels):
+                self.levels.append(promoted)
+            else:
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted], axis=0)
+            level += 1
+
+    def quantiles(self, qs: list[float]):
+        """Return an array of shape (len(qs), n_features) of approximate quantiles."""
+        import numpy as np
+
+        if self.is_exact:
+            values = self.levels[0]
+            if len(values) == 0:
+                return np.full((len(qs), self.n_features), np.nan)
+            return np.percentile(values, [q * 100 for q in qs], axis=0)
+
+        values = np.concatenate(self.levels, axis=0)
+        weights = np.concatenate([
+            np.full(len(rows), float(2 ** level)) for level, rows in enumerate(self.levels)
+        ])
+        order = np.argsort(values, axis=0, kind="stable")
+        sorted_values = np.take_along_axis(values, order, axis=0)
+        cum_weights = np.cumsum(weights[order], axis=0)
+        total = cum_weights[-1]
+        out = np.empty((len(qs), self.n_features), dtype=np.float64)
+        for i, q in enumerate(qs):
+            rank_idx = np.sum(cum_weights < q * total, axis=0)
+            rank_idx = np.minimum(rank_idx, len(values) - 1)
+            out[i] = np.take_along_axis(sorted_values, rank_idx[None, :], axis=0)[0]
+        return out
+
+
+class SpectralStatistics:
+    """Per-wavelength moments and quantile sketch for one spectral matrix."""
+
+    def __init__(self, n_features: int, sketch_capacity: int = DEFAULT_SKETCH_CAPACITY):
+        import numpy as np
+
+        self.n_features = n_features
+        self.count = 0
+        self.mean = np.zeros(n_features, dtype=np.float64)
+        self.m2 = np.zeros(n_features, dtype=np.float64)
+        self.min = np.full(n_features, np.inf, dtype=np.float64)
+        self.max = np.full(n_features, -np.inf, dtype=np.float64)
+        self.sketch = QuantileSketch(n_features, sketch_capacity)
+
+    @classmethod
+    def from_matrix(
+        cls,
+        X,
+        *,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        sketch_capacity: int = DEFAULT_SKETCH_CAPACITY,
+    ) -> SpectralStatistics:
+        """Accumulate statistics over ``X`` in row chunks."""
+        stats = cls(X.shape[1], sketch_capacity)
+        for start in range(0, X.shape[0], max(int(chunk_rows), 1)):
+            stats.update(X[start:start + chunk_rows])
+        return stats
+
+    def update(self, chunk) -> None:
+        """Fold a (n_rows, n_features) chunk into the running statistics."""
+        import numpy as np
+
+        chunk = np.asarray(chunk, dtype=np.float64)
+        n_b = chunk.shape[0]
+        if n_b == 0:
+            return
+        mean_b = chunk.mean(axis=0)
+        m2_b = ((chunk - mean_b) ** 2).sum(axis=0)
+        self._combine_moments(n_b, mean_b, m2_b)
+        np.minimum(self.min, chunk.min(axis=0), out=self.min)
+        np.maximum(self.max, chunk.max(axis=0), out=self.max)
+        self.sketch.update(chunk)
+
+    def _combine_moments(self, n_b: int, mean_b, m2_b) -> None:
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (n_b / n)
+        self.m2 = self.m2 + m2_b + delta ** 2 * (n_a * n_b / n)
+        self.count = n
+
+    def merge(self, other: SpectralStatistics) -> SpectralStatistics:
+        """Return statistics covering both inputs without revisiting raw data."""
+        import numpy as np
+
+        if other.n_features != self.n_features:
+            raise ValueError(
+                f"Cannot merge statistics with {self.n_features} and {other.n_features} features"
+            )
+        merged = SpectralStatistics(self.n_features, self.sketch.capacity)
+        merged.count, merged.mean, merged.m2 = self.count, self.mean.copy(), self.m2.copy()
+        if other.count:
+            merged._combine_moments(other.count, other.mean, other.m2)
+        merged.min = np.minimum(self.min, other.min)
+        merged.max = np.maximum(self.max, other.max)
+        merged.sketch = self.sketch.merge(other.sketch)
+        return merged
+
+    @property
+    def variance(self):
+        import numpy as np
+
+        if self.count == 0:
+            return np.full(self.n_features, np.nan)
+        return self.m2 / self.count
+
+    def global_summary(self) -> dict[str, Any]:
+        """Whole-matrix mean/std/min/max derived from the per-column moments."""
+        return combined_global_summary([self])
+
+    def per_wavelength(self) -> dict[str, list[float]]:
+        """Per-wavelength mean/std/min/max/median/q1/q3 as JSON-ready lists."""
+        import numpy as np
+
+        q1, median, q3 = self.sketch.quantiles([0.25, 0.5, 0.75])
+        return {
+            "mean": self.mean.tolist(),
+            "std": np.sqrt(self.variance).tolist(),
+            "min": self.min.tolist(),
+            "max": self.max.tolist(),
+            "median": median.tolist(),
+            "q1": q1.tolist(),
+            "q3": q3.tolist(),
+        }
+
+    # ----- persistence -----
+
+    def save(self, path: Path, fingerprint: str) -> None:
+        """Write the statistics to an ``.npz`` file tagged with ``fingerprint``."""
+        import numpy as np
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "meta": np.array([_FORMAT_VERSION, self.count, self.n_features, self.sketch.capacity], dtype=np.int64),
+            "fingerprint": np.array(fingerprint),
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min,
+            "max": self.max,
+        }
+        for level, rows in enumerate(self.sketch.levels):
+            arrays[f"sketch_{level}"] = rows
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, **arrays)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> SpectralStatistics | None:
+        """Load statistics saved by :meth:`save`, or None if stale/unreadable."""
+        import numpy as np
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                version, count, n_features, capacity = (int(v) for v in data["meta"])
+                if version != _FORMAT_VERSION or str(data["fingerprint"]) != fingerprint:
+                    return None
+                stats = cls(n_features, capacity)
+                stats.count = count
+                stats.mean = data["mean"]
+                stats.m2 = data["m2"]
+                stats.min = data["min"]
+                stats.max = data["max"]
+                levels = sorted(
+                    (k for k in data.files if k.startswith("sketch_")),
+                    key=lambda k: int(k.split("_", 1)[1]),
+                )
+                stats.sketch.levels = [data[k] for k in levels] or stats.sketch.levels
+                return stats
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug("Ignoring unreadable statistics cache %s: %s", path, e)
+            return None
+
+
+def combined_global_summary(parts: list[SpectralStatistics]) -> dict[str, Any]:
+    """Global summary over statistics whose columns are laid side by side.
+
+    Used for multi-source datasets, where each source contributes its own
+    wavelength columns for the same samples.
+    """
+    import numpy as np
+
+    count = parts[0].count if parts else 0
+    n_features = sum(p.n_features for p in parts)
+    total = count * n_features
+    if total == 0:
+        return {
+            "global_mean": float("nan"),
+            "global_std": float("nan"),
+            "global_min": float("nan"),
+            "global_max": float("nan"),
+            "num_samples": count,
+            "num_features": n_features,
+        }
+    means = np.concatenate([p.mean for p in parts])
+    m2 = np.concatenate([p.m2 for p in parts])
+    global_mean = float(means.mean())
+    total_m2 = float(m2.sum() + count * np.sum((means - global_mean) ** 2))
+    return {
+        "global_mean": global_mean,
+        "global_std": float(np.sqrt(max(total_m2, 0.0) / total)),
+        "global_min": float(min(p.min.min() for p in parts)),
+        "global_max": float(max(p.max.max() for p in parts)),
+        "num_samples": count,
+        "num_features": n_features,
+    }
+
+
+class SpectralStatisticsCache:
+    """Process-wide statistics cache with on-disk persistence.
+
+    Entries are keyed by ``(dataset_id, source, partition)`` and validated
+    against a dataset fingerprint (the nirs4all content hash), so a
+    modified dataset is recomputed while an unchanged one is served from
+    memory or disk.
+    """
+
+    def __init__(self, cache_dir: Path | None = None):
+        self._cache_dir = cache_dir
+        self._entries: dict[tuple[str, int, str], tuple[str, SpectralStatistics]] = {}
+        self._lock = threading.Lock()
+
+    def set_cache_dir(self, cache_dir: Path | None) -> None:
+        """Persist to ``cache_dir`` (``<app config dir>/cache/spectral_stats`` when None) and drop memory entries."""
+        with self._lock:
+            self._cache_dir = cache_dir
+            self._entries.clear()
+
+    def _resolve_dir(self) -> Path | None:
+        if self._cache_dir is not None:
+            return self._cache_dir
+        try:
+            from ..app_config import app_config
+
+            return Path(app_config.config_dir) / "cache" / "spectral_stats"
+        except Exception:
+            return None
+
+    def _path_for(self, key: tuple[str, int, str]) -> Path | None:
+        import hashlib
+
+        cache_dir = self._resolve_dir()
+        if cache_dir is None:
+            return None
+        digest = hashlib.md5(f"{key[0]}:{key[1]}:{key[2]}".encode()).hexdigest()
+        return cache_dir / f"{digest}.npz"
+
+    def get_or_compute(
+        self,
+        dataset_id: str,
+        source: int,
+        partition: str,
+        fingerprint: str,
+        compute: Callable[[], SpectralStatistics | None],
+    ) -> SpectralStatistics | None:
+        """Return cached statistics for a partition, computing them on a miss."""
+        key = (dataset_id, source, partition)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+
+        path = self._path_for(key)
+        stats = SpectralStatistics.load(path, fingerprint) if path is not None else None
+        if stats is None:
+            stats = compute()
+            if stats is None:
+                return None
+            if path is not None:
+                try:
+                    stats.save(path, fingerprint)
+                except Exception as e:
+                    logger.debug("Could not persist spectral statistics to %s: %s", path, e)
+
+        with self._lock:
+            self._entries[key] = (fingerprint, stats)
+        return stats
+
+    def invalidate(self, dataset_id: str | None = None) -> None:
+        """Drop in-memory entries (persisted files are re-validated by fingerprint)."""
+        with self._lock:
+            if dataset_id is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == dataset_id]:
+                    del self._entries[key]
+
+
+spectral_stats_cache = SpectralStatisticsCache()
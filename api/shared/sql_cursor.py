@@ -0,0 +1,310 @@
+"""
+Server-side cursors for the read-only SQL query endpoint.
+
+Each query gets its own read-only connection to the workspace store
+(SQLite, or DuckDB for legacy workspaces) and is read a page at a time.
+A page token names the cursor and the offset of the next page, so pages
+must be requested in order and a replayed token is rejected instead of
+silently skipping or repeating rows.
+
+Every cursor carries a budget: the total number of rows it may return
+and the total time its query may spend executing across pages. When the
+time budget runs out the running statement is interrupted inside the
+database engine (SQLite progress handler, DuckDB ``interrupt()``), so a
+careless ``SELECT *`` cannot pin a worker. Idle cursors expire.
+"""
+
+from __future__ import annotations
+
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5_000
+# Idle seconds before an unfinished cursor is closed
+CURSOR_IDLE_TTL_SECONDS = 300.0
+MAX_OPEN_CURSORS = 16
+# SQLite virtual-machine instructions between deadline checks
+_SQLITE_PROGRESS_STEPS = 1_000
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        value = float(os.environ.get(name, default))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """Row and execution-time limits of one query."""
+
+    max_rows: int
+    timeout_seconds: float
+
+    @classmethod
+    def from_env(cls) -> QueryBudget:
+        """Server limits, overridable with NIRS4ALL_SQL_MAX_ROWS / NIRS4ALL_SQL_TIMEOUT_SECONDS."""
+        return cls(
+            max_rows=int(_env_number("NIRS4ALL_SQL_MAX_ROWS", 100_000)),
+            timeout_seconds=_env_number("NIRS4ALL_SQL_TIMEOUT_SECONDS", 15.0),
+        )
+
+    def narrowed(self, max_rows: int | None = None, timeout_seconds: float | None = None) -> QueryBudget:
+        """A budget a request asked for, never above the server limits."""
+        return QueryBudget(
+            max_rows=min(self.max_rows, max_rows) if max_rows else self.max_rows,
+            timeout_seconds=min(self.timeout_seconds, timeout_seconds) if timeout_seconds else self.timeout_seconds,
+        )
+
+
+class QueryTimeout(Exception):
+    """The query used up its time budget and was interrupted."""
+
+
+class CursorNotFound(Exception):
+    """Unknown, expired or already consumed page token."""
+
+
+@dataclass
+class Page:
+    """One page of a cursor's result."""
+
+    columns: list[str]
+    rows: list[tuple]
+    next_page_token: str | None
+    truncated: bool = False
+    timed_out: bool = False
+    elapsed_seconds: float = 0.0
+
+
+def store_database_path(workspace_path: Path) -> Path | None:
+    """The store database queried by the endpoint (SQLite preferred)."""
+    for name in ("store.sqlite", "store.duckdb"):
+        path = workspace_path / name
+        if path.exists():
+            return path
+    return None
+
+
+@dataclass
+class ServerCursor:
+    """An open read-only connection positioned inside a query result."""
+
+    cursor_id: str
+    db_path: Path
+    budget: QueryBudget
+    columns: list[str] = field(default_factory=list)
+    offset: int = 0
+    elapsed_seconds: float = 0.0
+    last_used: float = field(default_factory=time.monotonic)
+    _conn: Any = field(default=None, init=False, repr=False)
+    _cursor: Any = field(default=None, init=False, repr=False)
+    _lookahead: tuple | None = field(default=None, init=False, repr=False)
+    _deadline: float = field(default=0.0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @property
+    def is_duckdb(self) -> bool:
+        return self.db_path.suffix == ".duckdb"
+
+    @property
+    def page_token(self) -> str:
+        return f"{self.cursor_id}.{self.offset}"
+
+    def open(self, sql: str) -> None:
+        if self.is_duckdb:
+            import duckdb
+
+            self._conn = duckdb.connect(str(self.db_path), read_only=True)
+        else:
+            import sqlite3
+
+            self._conn = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA query_only=ON")
+            self._conn.set_progress_handler(self._past_deadline, _SQLITE_PROGRESS_STEPS)
+        self._run(lambda: self._execute(sql))
+
+    def _execute(self, sql: str) -> None:
+        self._cursor = self._conn.execute(sql)
+        self.columns = [desc[0] for desc in (self._cursor.description or [])]
+
+    def _past_deadline(self) -> int:
+        # Non-zero aborts the running SQLite statement
+        return 1 if time.monotonic() > self._deadline else 0
+
+    def _run(self, fn):
+        """Run ``fn`` against the remaining time budget, interrupting the engine on overrun."""
+        remaining = self.budget.timeout_seconds - self.elapsed_seconds
+        if remaining <= 0:
+            raise QueryTimeout()
+        started = time.monotonic()
+        self._deadline = started + remaining
+        timer = None
+        if self.is_duckdb:
+            timer = threading.Timer(remaining, self._conn.interrupt)
+            timer.daemon = True
+            timer.start()
+        try:
+            return fn()
+        except Exception as e:
+            if time.monotonic() >= self._deadline or "interrupt" in str(e).lower():
+                raise QueryTimeout() from e
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self.elapsed_seconds += time.monotonic() - started
+            self.last_used = time.monotonic()
+
+    def fetch(self, page_size: int) -> Page:
+        """Read the next page, applying the row and time budgets."""
+        limit = min(page_size, self.budget.max_rows - self.offset)
+        rows = [self._lookahead] if self._lookahead is not None else []
+        self._lookahead = None
+        timed_out = False
+        if self._cursor is not None and self._cursor.description is not None and limit > 0:
+            # One row past the page tells whether another page exists
+            wanted = limit + 1 - len(rows)
+            try:
+                rows.extend(self._run(lambda: self._cursor.fetchmany(wanted)))
+            except QueryTimeout:
+                timed_out = True
+        if len(rows) > limit:
+            self._lookahead = rows[limit]
+            rows = rows[:limit]
+        self.offset += len(rows)
+
+        has_more = self._lookahead is not None
+        truncated = timed_out or (has_more and self.offset >= self.budget.max_rows)
+        finished = truncated or not has_more
+        return Page(
+            columns=self.columns,
+            rows=rows,
+            next_page_token=None if finished else self.page_token,
+            truncated=truncated,
+            timed_out=timed_out,
+            elapsed_seconds=self.elapsed_seconds,
+        )
+
+    def close(self) -> None:
+        try:
+            if self._conn is not None:
+                self._conn.close()
+        except Exception as e:
+            logger.debug("Error closing query cursor %s: %s", self.cursor_id, e)
+        self._conn = None
+        self._cursor = None
+
+
+def iter_pages(db_path: Path, sql: str, budget: QueryBudget, page_size: int):
+    """Yield the pages of ``sql`` on a private cursor (for streamed responses).
+
+    The connection is closed when the generator finishes or is closed, e.g.
+    when the client disconnects mid-stream.
+    """
+    cursor = ServerCursor(cursor_id=secrets.token_urlsafe(9), db_path=db_path, budget=budget)
+    try:
+        try:
+            cursor.open(sql)
+        except QueryTimeout:
+            yield Page(columns=[], rows=[], next_page_token=None, truncated=True, timed_out=True,
+                       elapsed_seconds=cursor.elapsed_seconds)
+            return
+        while True:
+            page = cursor.fetch(page_size)
+            yield page
+            if page.next_page_token is None:
+                return
+    finally:
+        cursor.close()
+
+
+class CursorRegistry:
+    """Open server-side cursors, addressed by page token."""
+
+    def __init__(self, max_open: int = MAX_OPEN_CURSORS, idle_ttl: float = CURSOR_IDLE_TTL_SECONDS):
+        self._cursors: dict[str, ServerCursor] = {}
+        self._max_open = max_open
+        self._idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            stale = [c for c in self._cursors.values() if now - c.last_used > self._idle_ttl]
+            by_age = sorted(self._cursors.values(), key=lambda c: c.last_used)
+            stale += by_age[: max(0, len(self._cursors) - self._max_open + 1)]
+            for cursor in stale:
+                self._cursors.pop(cursor.cursor_id, None)
+        for cursor in stale:
+            cursor.close()
+
+    def open(self, db_path: Path, sql: str, budget: QueryBudget, page_size: int) -> Page:
+        """Execute ``sql`` and return its first page."""
+        self._evict()
+        cursor = ServerCursor(cursor_id=secrets.token_urlsafe(9), db_path=db_path, budget=budget)
+        try:
+            cursor.open(sql)
+        except QueryTimeout:
+            cursor.close()
+            return Page(columns=[], rows=[], next_page_token=None, truncated=True, timed_out=True,
+                        elapsed_seconds=cursor.elapsed_seconds)
+        except Exception:
+            cursor.close()
+            raise
+        with cursor._lock:
+            page = cursor.fetch(page_size)
+        if page.next_page_token is None:
+            cursor.close()
+        else:
+            with self._lock:
+                self._cursors[cursor.cursor_id] = cursor
+        return page
+
+    def fetch(self, page_token: str, page_size: int) -> Page:
+        """Return the page ``page_token`` points at; tokens are single-use."""
+        cursor_id, _, offset = page_token.partition(".")
+        with self._lock:
+            cursor = self._cursors.get(cursor_id)
+        if cursor is None:
+            raise CursorNotFound("Unknown or expired page token")
+        with cursor._lock:
+            if cursor._conn is None or str(cursor.offset) != offset:
+                raise CursorNotFound("Page token was already used")
+            page = cursor.fetch(page_size)
+        if page.next_page_token is None:
+            self.close(cursor_id)
+        return page
+
+    def close(self, cursor_id_or_token: str) -> bool:
+        """Close a cursor (cancelling the rest of its result)."""
+        cursor_id = cursor_id_or_token.partition(".")[0]
+        with self._lock:
+            cursor = self._cursors.pop(cursor_id, None)
+        if cursor is None:
+            return False
+        cursor.close()
+        return True
+
+    def close_all(self) -> None:
+        with self._lock:
+            cursors = list(self._cursors.values())
+            self._cursors.clear()
+        for cursor in cursors:
+            cursor.close()
+
+
+query_cursors = CursorRegistry()
@@ -0,0 +1,123 @@
+"""
+Memoized pipeline variant counting.
+
+Editor steps serialize independently (``editor_to_canonical`` concatenates
+per-step conversions) and nirs4all counts a step list as the product of its
+element counts, so the pipeline total is the product of per-step counts.
+Each step count is memoized under a hash of the editor step, which lets the
+editor re-count on every keystroke while only converting the step that
+changed.
+
+Requests may carry a ``client_id``/``sequence`` pair; once a newer sequence
+arrives for the same client, older in-flight counts stop between steps.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Maximum number of memoized per-step counts
+DEFAULT_MAX_ENTRIES = 4096
+
+# Clients whose latest request sequence is tracked; the least recently seen is dropped
+DEFAULT_MAX_CLIENTS = 256
+
+
+class VariantCountSuperseded(Exception):
+    """Raised when a newer count request from the same client arrived."""
+
+
+def step_hash(step: Any) -> str:
+    """Stable hash of an editor step (key order independent)."""
+    payload = json.dumps(step, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class VariantCounter:
+    """LRU-memoized per-step variant counter with request supersession."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_clients: int = DEFAULT_MAX_CLIENTS):
+        self._max_entries = max_entries
+        self._max_clients = max_clients
+        self._counts: OrderedDict[str, int] = OrderedDict()
+        self._latest_sequence: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def begin(self, client_id: str | None, sequence: int | None) -> None:
+        """Record a request so that older ones from the same client stop."""
+        if client_id is None or sequence is None:
+            return
+        with self._lock:
+            if sequence > self._latest_sequence.get(client_id, -1):
+                self._latest_sequence[client_id] = sequence
+            self._latest_sequence.move_to_end(client_id)
+            while len(self._latest_sequence) > self._max_clients:
+                self._latest_sequence.popitem(last=False)
+
+    def is_superseded(self, client_id: str | None, sequence: int | None) -> bool:
+        if client_id is None or sequence is None:
+            return False
+        with self._lock:
+            return self._latest_sequence.get(client_id, sequence) > sequence
+
+    def count_step(self, step: Any, count_fn: Callable[[Any], int]) -> int:
+        """Return the memoized variant count of a single editor step."""
+        key = step_hash(step)
+        with self._lock:
+            if key in self._counts:
+                self._counts.move_to_end(key)
+                self.hits += 1
+                return self._counts[key]
+            self.misses += 1
+
+        count = count_fn(step)
+
+        with self._lock:
+            self._counts[key] = count
+            self._counts.move_to_end(key)
+            while len(self._counts) > self._max_entries:
+                self._counts.popitem(last=False)
+        return count
+
+    def count_pipeline(
+        self,
+        steps: list[dict[str, Any]],
+        count_fn: Callable[[Any], int],
+        *,
+        client_id: str | None = None,
+        sequence: int | None = None,
+    ) -> tuple[int, list[int]]:
+        """Count a pipeline as the product of memoized per-step counts.
+
+        Returns ``(total, per_step_counts)``. Raises
+        :class:`VariantCountSuperseded` if a newer request from the same
+        client arrives while counting.
+        """
+        total = 1
+        per_step: list[int] = []
+        for step in steps:
+            if self.is_superseded(client_id, sequence):
+                raise VariantCountSuperseded()
+            count = self.count_step(step, count_fn)
+            per_step.append(count)
+            total *= count
+        return total, per_step
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+variant_counter = VariantCounter()
@@ -13,8 +13,17 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from .shared.decimation import (
+    DECIMATION_MODES,
+    DEFAULT_QUANTILES,
+    as_numeric_axis,
+    decimate_summary,
+    decimate_wavelengths,
+)
 from .shared.logger import get_logger
 from .shared.pipeline_service import instantiate_operator
+from .shared.preprocessing_cache import preprocessing_cache
+from .shared.spectral_stats import SpectralStatistics, spectral_stats_cache
 from .workspace_manager import workspace_manager
 
 logger = get_logger(__name__)
@@ -173,6 +182,7 @@ def _clear_dataset_cache(dataset_id: str | None = None):
         _dataset_cache.pop(dataset_id, None)
     else:
         _dataset_cache.clear()
+    spectral_stats_cache.invalidate(dataset_id)
 
 
 def _get_partition_arrays(dataset, partition: str, *, source: int = 0, want_y: bool = False, want_metadata: bool = False):
@@ -260,6 +270,51 @@ def _get_partition_arrays(dataset, partition: str, *, source: int = 0, want_y: b
     return X, y_out, meta_out
 
 
+def _get_partition_statistics(dataset_id: str, dataset, partition: str, *, source: int = 0) -> SpectralStatistics | None:
+    """Return cached per-wavelength statistics for a partition.
+
+    Train and test are computed (or loaded from disk) independently and
+    merged for partition="all", so switching partitions never re-reads
+    the spectra of a partition that is already summarized.
+    """
+    try:
+        fingerprint = dataset.content_hash()
+    except Exception:
+        fingerprint = None
+
+    parts = ("train", "test") if partition == "all" else (partition,)
+    merged: SpectralStatistics | None = None
+    for p in parts:
+        def compute(p=p):
+            X, _, _ = _get_partition_arrays(dataset, p, source=source)
+            return SpectralStatistics.from_matrix(X) if X is not None else None
+
+        if fingerprint:
+            stats = spectral_stats_cache.get_or_compute(dataset_id, source, p, fingerprint, compute)
+        else:
+            stats = compute()
+        if stats is None:
+            continue
+        merged = stats if merged is None else merged.merge(stats)
+    return merged
+
+
+def _partition_wavelength_indices(dataset_id: str, dataset, partition: str, source: int, X, axis, target: int, mode: str):
+    """Wavelength subset of a whole partition, identical for every page of it.
+
+    Decimates from the cached per-wavelength statistics of the partition;
+    falls back to the full matrix when they are unavailable.
+    """
+    stats = _get_partition_statistics(dataset_id, dataset, partition, source=source)
+    if stats is None or stats.n_features != X.shape[1]:
+        return decimate_wavelengths(axis, X, target, mode=mode)
+    if mode == "envelope":
+        return decimate_summary(axis, target, mode, lower=stats.min, upper=stats.max)
+    if mode == "quantiles" and stats.count > 1:
+        return decimate_summary(axis, target, mode, quantile_curves=stats.sketch.quantiles(list(DEFAULT_QUANTILES)))
+    return decimate_summary(axis, target, "mean", mean=stats.mean)
+
+
 @router.get("/spectra/{dataset_id}")
 async def get_spectra(
     dataset_id: str,
@@ -269,6 +324,8 @@ async def get_spectra(
     source: int = Query(0, ge=0, description="Source index for multi-source datasets"),
     include_y: bool = Query(False, description="Whether to include target (y) values"),
     include_metadata: bool = Query(False, description="Whether to include sample metadata"),
+    max_wavelengths: int | None = None,
+    decimation: str = "mean",
 ):
     """
     Get raw spectra data from a dataset.
@@ -276,6 +333,10 @@ async def get_spectra(
     Returns spectral data as a 2D array with wavelength headers.
     Optionally includes target (y) values when include_y=True.
     Optionally includes sample metadata when include_metadata=True.
+    When max_wavelengths (>= 3) is set, one wavelength subset is selected
+    from the statistics of the whole partition using the requested
+    decimation mode ('mean', 'envelope' or 'quantiles'), so every page
+    returns the same columns.
 
     The 'partition' query supports 'train', 'test', or 'all' (concatenated train+test).
     """
@@ -284,6 +345,10 @@ async def get_spectra(
         raise HTTPException(
             status_code=501, detail="nirs4all library not available for spectra access"
         )
+    if decimation not in DECIMATION_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown decimation mode '{decimation}'")
+    if max_wavelengths is not None and max_wavelengths < 3:
+        raise HTTPException(status_code=400, detail="max_wavelengths must be at least 3")
 
     dataset = _load_dataset(dataset_id)
     if not dataset:
@@ -332,6 +397,16 @@ async def get_spectra(
         except Exception:
             header_unit = "unknown"
 
+        num_features = X.shape[1]
+        wavelength_indices = None
+        if max_wavelengths and num_features > max_wavelengths and len(X_slice) > 0:
+            wavelength_indices = _partition_wavelength_indices(
+                dataset_id, dataset, partition, source, X,
+                as_numeric_axis(headers, num_features), max_wavelengths, decimation,
+            )
+            X_slice = X_slice[:, wavelength_indices]
+            headers = [headers[i] for i in wavelength_indices]
+
         # Build response
         response = {
             "dataset_id": dataset_id,
@@ -340,12 +415,14 @@ async def get_spectra(
             "start": start,
             "end": end,
             "total_samples": total_samples,
-            "num_features": X.shape[1],
+            "num_features": num_features,
             "spectra": X_slice.tolist(),
             "wavelengths": headers,
             "wavelength_unit": header_unit,
             "repetition_column": getattr(dataset, "repetition", None),
         }
+        if wavelength_indices is not None:
+            response["wavelength_indices"] = wavelength_indices.tolist()
 
         # Include y values if requested
         if include_y:
@@ -472,13 +549,16 @@ async def get_processed_spectra(dataset_id: str, request: SpectraRequest):
             )
 
         # Apply indices filter if provided
+        valid_indices = None
         if request.indices:
             valid_indices = [i for i in request.indices if 0 <= i < X.shape[0]]
             X = X[valid_indices]
 
         # Apply preprocessing chain
         if request.preprocessing_chain:
-            X = _apply_preprocessing_chain(X, request.preprocessing_chain)
+            rows = tuple(valid_indices) if valid_indices is not None else None
+            data_key = _dataset_data_key(dataset, request.partition, "source", 0, rows)
+            X = _apply_preprocessing_chain(X, request.preprocessing_chain, data_key)
 
         return {
             "dataset_id": dataset_id,
@@ -502,71 +582,66 @@ async def get_spectra_statistics(
     dataset_id: str,
     partition: str = Query("train", description="Partition: 'train', 'test', or 'all'"),
     source: int = Query(0, ge=0, description="Source index for multi-source datasets"),
+    max_wavelengths: int | None = None,
+    decimation: str = "envelope",
 ):
     """
     Compute statistics for spectra in a dataset.
 
     Returns mean, std, min, max, and percentiles for the spectral data.
+    Statistics are computed in one streaming pass and cached per dataset
+    content hash; quartiles are exact up to a few hundred samples and
+    sketch-approximated beyond. With max_wavelengths (>= 3), the statistic
+    curves are decimated together (the default "envelope" mode keeps the
+    min/max extremes).
     """
-    import numpy as np
     if not NIRS4ALL_AVAILABLE:
         raise HTTPException(
             status_code=501, detail="nirs4all library not available for spectra access"
         )
+    if decimation not in DECIMATION_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown decimation mode '{decimation}'")
+    if max_wavelengths is not None and max_wavelengths < 3:
+        raise HTTPException(status_code=400, detail="max_wavelengths must be at least 3")
 
     dataset = _load_dataset(dataset_id)
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found or could not be loaded")
 
     try:
-        X, _, _ = _get_partition_arrays(dataset, partition, source=source)
-        if X is None:
+        stats = _get_partition_statistics(dataset_id, dataset, partition, source=source)
+        if stats is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"No samples for partition '{partition}' (source={source})",
             )
 
-        # Compute statistics
-        mean = np.mean(X, axis=0).tolist()
-        std = np.std(X, axis=0).tolist()
-        min_vals = np.min(X, axis=0).tolist()
-        max_vals = np.max(X, axis=0).tolist()
-        median = np.median(X, axis=0).tolist()
-        q1 = np.percentile(X, 25, axis=0).tolist()
-        q3 = np.percentile(X, 75, axis=0).tolist()
-
         # Get wavelengths
         try:
             wavelengths = dataset.headers(source)
         except Exception:
-            wavelengths = [str(i) for i in range(X.shape[1])]
-
-        # Global statistics
-        global_stats = {
-            "global_mean": float(np.mean(X)),
-            "global_std": float(np.std(X)),
-            "global_min": float(np.min(X)),
-            "global_max": float(np.max(X)),
-            "num_samples": X.shape[0],
-            "num_features": X.shape[1],
-        }
+            wavelengths = [str(i) for i in range(stats.n_features)]
 
-        return {
+        per_wavelength = stats.per_wavelength()
+        response = {
             "dataset_id": dataset_id,
             "partition": partition,
             "source": source,
             "wavelengths": wavelengths,
-            "statistics": {
-                "mean": mean,
-                "std": std,
-                "min": min_vals,
-                "max": max_vals,
-                "median": median,
-                "q1": q1,
-                "q3": q3,
-            },
-            "global": global_stats,
+            "statistics": per_wavelength,
+            "global": stats.global_summary(),
         }
+        if max_wavelengths and stats.n_features > max_wavelengths:
+            import numpy as np
+
+            curves = np.array([per_wavelength[k] for k in ("mean", "min", "max", "q1", "median", "q3")])
+            indices = decimate_wavelengths(
+                as_numeric_axis(wavelengths, stats.n_features), curves, max_wavelengths, mode=decimation,
+            )
+            response["wavelengths"] = [wavelengths[i] for i in indices]
+            response["statistics"] = {k: [v[i] for i in indices] for k, v in per_wavelength.items()}
+            response["wavelength_indices"] = indices.tolist()
+        return response
 
     except HTTPException:
         raise
@@ -576,30 +651,47 @@ async def get_spectra_statistics(
         )
 
 
-def _apply_preprocessing_chain(X, chain: list[dict[str, Any]]):
+def _dataset_data_key(dataset, *read: Any) -> tuple | None:
+    """Preprocessing-cache key of a matrix read from ``dataset``.
+
+    The dataset's content hash (cached by the dataset itself) plus ``read``,
+    which must describe how the matrix was read (partition, source or
+    layout, selected rows). None when the dataset cannot be hashed.
+    """
+    try:
+        return ("dataset", dataset.content_hash(), *read)
+    except Exception:
+        return None
+
+
+def _apply_preprocessing_chain(X, chain: list[dict[str, Any]], data_key: Any = None):
     """Apply a chain of preprocessing steps to spectral data.
 
     Uses shared pipeline_service for operator resolution to avoid duplicating
-    the transformer mapping logic.
+    the transformer mapping logic. Results are memoized per chain prefix in
+    the shared preprocessing cache, so repeated requests on the same data
+    (e.g. one per Analysis chart) only fit the chain once. Pass
+    ``_dataset_data_key(...)`` as ``data_key`` when X comes from a dataset,
+    so the matrix is not hashed on every call.
     """
     if not NIRS4ALL_AVAILABLE:
         return X
 
-    for step in chain:
-        name = step.get("name", "")
-        params = step.get("params", {})
+    return preprocessing_cache.apply(X, chain, _apply_preprocessing_step, data_key=data_key)
 
-        if not name:
-            continue
 
-        try:
-            # Use shared pipeline service for operator resolution
-            transformer = instantiate_operator(name, params, operator_type="preprocessing")
-            if transformer is not None:
-                X = transformer.fit_transform(X)
-            else:
-                logger.warning("Unknown preprocessing step '%s', skipping", name)
-        except Exception as e:
-            logger.warning("Failed to apply preprocessing step '%s': %s", name, e)
+def _apply_preprocessing_step(X, step: dict[str, Any]):
+    """Fit and apply a single preprocessing step (skipped on failure)."""
+    name = step.get("name", "")
+    params = step.get("params", {})
+
+    try:
+        # Use shared pipeline service for operator resolution
+        transformer = instantiate_operator(name, params, operator_type="preprocessing")
+        if transformer is not None:
+            return transformer.fit_transform(X)
+        logger.warning("Unknown preprocessing step '%s', skipping", name)
+    except Exception as e:
+        logger.warning("Failed to apply preprocessing step '%s': %s", name, e)
 
     return X
@@ -15,6 +15,7 @@ from datetime import UTC, datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from .chain_summary_view import sync_chain_summary_view
 from .lazy_imports import get_cached, is_ml_ready
 
 STORE_AVAILABLE = True
@@ -772,6 +773,7 @@ class StoreAdapter:
             Dict with ``deleted_rows`` count and ``success`` flag.
         """
         total = self._store.delete_run(run_id, delete_artifacts=True)
+        sync_chain_summary_view(self._store)
         return {"success": True, "deleted_rows": total, "run_id": run_id}
 
     def _merge_prediction_deletion_summaries(self, summaries: list[dict[str, Any]]) -> dict[str, Any]:
@@ -872,6 +874,7 @@ class StoreAdapter:
     def delete_prediction(self, prediction_id: str) -> dict[str, Any]:
         """Delete one stored prediction row and clean up empty parents."""
         summary = self._store.delete_predictions_matching(prediction_ids=[prediction_id])
+        sync_chain_summary_view(self._store)
         return {
             "success": bool(summary.get("deleted_predictions")),
             "scope": "prediction",
@@ -882,6 +885,7 @@ class StoreAdapter:
     def delete_prediction_group(self, chain_id: str, fold_id: str) -> dict[str, Any]:
         """Delete all prediction rows for a displayed chain/fold group."""
         summary = self._store.delete_predictions_matching(chain_id=chain_id, fold_id=fold_id)
+        sync_chain_summary_view(self._store)
         return {
             "success": bool(summary.get("deleted_predictions")),
             "scope": "prediction_group",
@@ -903,6 +907,7 @@ class StoreAdapter:
             self._store.delete_predictions_matching(chain_id=resolved_chain_id)
             for resolved_chain_id in chain_ids
         ])
+        sync_chain_summary_view(self._store)
         return {
             "success": bool(summary.get("deleted_predictions")),
             "scope": "chain",
@@ -913,6 +918,7 @@ class StoreAdapter:
     def delete_dataset_predictions(self, dataset_name: str) -> dict[str, Any]:
         """Delete all predictions for a dataset across the workspace."""
         summary = self._store.delete_predictions_matching(dataset_name=dataset_name)
+        sync_chain_summary_view(self._store)
         return {
             "success": bool(summary.get("deleted_predictions")),
             "scope": "dataset",
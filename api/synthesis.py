@@ -7,7 +7,11 @@ using the nirs4all SyntheticDatasetBuilder API.
 
 from __future__ import annotations
 
+import asyncio
+import os
+import shutil
 import time
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -59,6 +63,7 @@ class PreviewRequest(BaseModel):
     config: SynthesisConfig
     preview_samples: int = Field(default=100, ge=10, le=500)
     include_statistics: bool = True
+    max_wavelengths: int | None = Field(default=None, ge=3, description="Decimate returned spectra to at most this many wavelengths")
 
 
 class PreviewStatistics(BaseModel):
@@ -109,6 +114,13 @@ class GenerateResponse(BaseModel):
     error: str | None = None
 
 
+class GenerateJobResponse(BaseModel):
+    """Response for background generation submission."""
+    job_id: str
+    status: str
+    message: str
+
+
 class ComponentInfo(BaseModel):
     """Information about a predefined component."""
     name: str
@@ -197,6 +209,206 @@ def build_from_config(config: SynthesisConfig):
     return builder
 
 
+# Rows written per chunk when streaming the CSV export
+EXPORT_CHUNK_ROWS = 5000
+
+# CSV layout of nirs4all's DatasetExporter "standard" format
+_EXPORT_SEPARATOR = ";"
+_EXPORT_FLOAT_FORMAT = "%.6f"
+
+
+def _target_type(config: SynthesisConfig) -> str:
+    """Return "classification" if a classification step is enabled."""
+    for step in config.steps:
+        if step.type == "classification" and step.enabled:
+            return "classification"
+    return "regression"
+
+
+def _generate_arrays(builder) -> tuple[Any, Any, Any]:
+    """Generate the synthetic data exactly once.
+
+    Returns (X, y, wavelengths); wavelengths is None for multi-source
+    configurations, mirroring ``SyntheticDatasetBuilder.export``.
+    """
+    X, y = builder.build_arrays()
+    wavelengths = None
+    if getattr(builder.state, "sources", None) is None:
+        wavelengths = getattr(builder.state, "_wavelengths", None)
+    return X, y, wavelengths
+
+
+def _write_csv_chunked(
+    file_path: Path,
+    matrix,
+    row_indices,
+    header: list[str],
+    on_rows: Callable[[int], bool],
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> bool:
+    """Write ``matrix[row_indices]`` to CSV in chunks.
+
+    Returns False if ``on_rows`` asked to stop (cancellation).
+    """
+    import numpy as np
+
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        f.write(_EXPORT_SEPARATOR.join(header) + os.linesep)
+        for start in range(0, len(row_indices), chunk_rows):
+            chunk = matrix[row_indices[start:start + chunk_rows]]
+            np.savetxt(f, chunk, fmt=_EXPORT_FLOAT_FORMAT, delimiter=_EXPORT_SEPARATOR, newline=os.linesep)
+            if not on_rows(len(chunk)):
+                return False
+    return True
+
+
+def _stream_export(
+    output_path: Path,
+    X,
+    y,
+    wavelengths,
+    *,
+    train_ratio: float,
+    seed: int | None,
+    progress_callback: Callable[[float, str], bool],
+    progress_range: tuple[float, float] = (40.0, 95.0),
+) -> bool:
+    """Export generated arrays to the Xcal/Ycal/Xval/Yval folder layout.
+
+    Produces the same files as ``DatasetExporter`` in "standard" format but
+    writes row chunks straight from the generated arrays instead of
+    materializing DataFrames. Returns False if cancelled.
+    """
+    import numpy as np
+
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    n_samples = X.shape[0]
+    n_train = int(n_samples * train_ratio)
+    indices = np.random.default_rng(seed).permutation(n_samples)
+    splits = (("cal", indices[:n_train]), ("val", indices[n_train:]))
+
+    if y.ndim == 1:
+        y = y.reshape(-1, 1)
+    x_header = (
+        [str(float(wl)) for wl in wavelengths] if wavelengths is not None
+        else [f"feature_{i}" for i in range(X.shape[1])]
+    )
+    y_header = ["target"] if y.shape[1] == 1 else [f"target_{i}" for i in range(y.shape[1])]
+
+    total_rows = 2 * n_samples
+    written = 0
+    low, high = progress_range
+
+    def on_rows(count: int) -> bool:
+        nonlocal written
+        written += count
+        pct = low + (high - low) * written / max(total_rows, 1)
+        return progress_callback(pct, f"Writing {min(written, total_rows)}/{total_rows} rows")
+
+    for suffix, rows in splits:
+        if len(rows) == 0:
+            continue
+        if not _write_csv_chunked(output_path / f"X{suffix}.csv", X, rows, x_header, on_rows):
+            return False
+        if not _write_csv_chunked(output_path / f"Y{suffix}.csv", y, rows, y_header, on_rows):
+            return False
+    return True
+
+
+def _run_generation(
+    request: GenerateRequest,
+    progress_callback: Callable[[float, str], bool],
+) -> dict[str, Any] | None:
+    """Generate, export and optionally link a synthetic dataset.
+
+    Shared by the synchronous endpoint and the background job. Data is
+    generated once; the shape comes from that single build. Returns None
+    when cancelled (partial output created by this call is removed).
+    """
+    start_time = time.time()
+    builder = build_from_config(request.config)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    dataset_name = request.dataset_name or request.config.name or f"synthetic_{timestamp}"
+
+    output_path: Path | None = None
+    if request.export_to_workspace:
+        if not WORKSPACE_AVAILABLE or workspace_manager is None:
+            raise HTTPException(status_code=503, detail="Workspace manager not available")
+        workspace = workspace_manager.get_current_workspace()
+        if not workspace:
+            raise HTTPException(status_code=409, detail="No workspace selected")
+        output_path = Path(workspace.path) / "datasets" / "synthetic" / dataset_name
+    elif request.export_to_csv:
+        output_path = Path(request.export_to_csv)
+
+    progress_callback(5, "Generating spectra...")
+    X, y, wavelengths = _generate_arrays(builder)
+    if not progress_callback(40, f"Generated {X.shape[0]} x {X.shape[1]} spectra"):
+        return None
+
+    export_path = None
+    dataset_id = None
+    linked = False
+    if output_path is not None:
+        created = not output_path.exists()
+        next_seed = getattr(builder, "_next_seed", None)
+        completed = _stream_export(
+            output_path, X, y, wavelengths,
+            train_ratio=getattr(builder.state, "train_ratio", 0.8),
+            seed=next_seed() if callable(next_seed) else request.config.random_state,
+            progress_callback=progress_callback,
+        )
+        if not completed:
+            if created:
+                shutil.rmtree(output_path, ignore_errors=True)
+            return None
+        export_path = str(output_path)
+
+    if request.export_to_workspace and export_path:
+        progress_callback(96, "Linking dataset to workspace...")
+        try:
+            link_config = {
+                "synthetic": True,
+                "generated_at": datetime.now().isoformat(),
+                "generation_params": {
+                    "n_samples": request.config.n_samples,
+                    "steps": [s.type for s in request.config.steps if s.enabled],
+                },
+                "targets": [{
+                    "column": "target",
+                    "type": _target_type(request.config),
+                    "is_default": True,
+                }],
+                "default_target": "target",
+            }
+            dataset_info = workspace_manager.link_dataset(export_path, config=link_config)
+            linked = True
+            dataset_id = dataset_info.get("id")
+        except Exception:
+            # Linking failed but dataset was still created
+            pass
+
+    return {
+        "dataset_id": dataset_id,
+        "dataset_name": dataset_name,
+        "export_path": export_path,
+        "shape": (int(X.shape[0]), int(X.shape[1])),
+        "execution_time_ms": (time.time() - start_time) * 1000,
+        "linked_to_workspace": linked,
+    }
+
+
+def _run_generation_task(job: Any, progress_callback: Callable[[float, str], bool]) -> dict[str, Any] | None:
+    """Background job wrapper around :func:`_run_generation`."""
+    request = GenerateRequest.model_validate(job.config)
+    result = _run_generation(request, progress_callback)
+    if result is None:
+        return None
+    return {**result, "shape": list(result["shape"])}
+
+
 # ============= Endpoints =============
 
 @router.post("/preview", response_model=PreviewResponse)
@@ -261,6 +473,13 @@ async def generate_preview(request: PreviewRequest):
                     str(int(u)): int(c) for u, c in zip(unique, counts)
                 }
 
+        if request.max_wavelengths and len(wavelengths) > request.max_wavelengths:
+            from .shared.decimation import decimate_wavelengths
+
+            indices = decimate_wavelengths(wavelengths, X, request.max_wavelengths, mode="envelope")
+            X = X[:, indices]
+            wavelengths = wavelengths[indices]
+
         execution_time = (time.time() - start_time) * 1000
 
         return PreviewResponse(
@@ -295,104 +514,79 @@ async def generate_dataset(request: GenerateRequest):
     """
     Generate full synthetic dataset.
     Optionally exports to workspace or custom CSV path.
+
+    Generation and the streamed export run off the event loop. For large
+    datasets prefer ``POST /synthesis/generate/job``, which reports
+    progress and can be cancelled.
     """
     require_nirs4all()
 
     start_time = time.time()
 
     try:
-        builder = build_from_config(request.config)
+        result = await asyncio.to_thread(_run_generation, request, lambda _p, _m="": True)
+        return GenerateResponse(success=True, **result)
 
-        # Generate dataset name
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        dataset_name = request.dataset_name or request.config.name or f"synthetic_{timestamp}"
+    except HTTPException:
+        raise
+    except Exception as e:
+        execution_time = (time.time() - start_time) * 1000
+        return GenerateResponse(
+            success=False,
+            shape=(0, 0),
+            execution_time_ms=execution_time,
+            error=str(e),
+        )
 
-        export_path = None
-        dataset_id = None
-        linked = False
 
-        # Handle export to workspace
-        if request.export_to_workspace:
-            if not WORKSPACE_AVAILABLE or workspace_manager is None:
-                raise HTTPException(status_code=503, detail="Workspace manager not available")
+@router.post("/generate/job", response_model=GenerateJobResponse)
+async def submit_generate_job(request: GenerateRequest):
+    """Start synthetic dataset generation as a cancellable background job.
 
-            workspace = workspace_manager.get_current_workspace()
-            if not workspace:
-                raise HTTPException(status_code=409, detail="No workspace selected")
+    Progress is reported through the job manager (and WebSocket job
+    notifications); poll ``GET /synthesis/jobs/{job_id}`` for the result.
+    """
+    require_nirs4all()
 
-            # Create output directory
-            workspace_path = Path(workspace.path)
-            datasets_dir = workspace_path / "datasets" / "synthetic"
-            datasets_dir.mkdir(parents=True, exist_ok=True)
-            output_path = datasets_dir / dataset_name
+    from .jobs import JobType, job_manager
 
-            # Export using builder
-            export_path = str(builder.export(str(output_path), format="standard"))
+    # Validate the builder configuration up front so bad steps fail fast
+    build_from_config(request.config)
 
-            # Link to workspace
-            try:
-                # Determine task type
-                target_type = "regression"
-                for step in request.config.steps:
-                    if step.type == "classification" and step.enabled:
-                        target_type = "classification"
-                        break
-
-                link_config = {
-                    "synthetic": True,
-                    "generated_at": datetime.now().isoformat(),
-                    "generation_params": {
-                        "n_samples": request.config.n_samples,
-                        "steps": [s.type for s in request.config.steps if s.enabled],
-                    },
-                    "targets": [{
-                        "column": "target",
-                        "type": target_type,
-                        "is_default": True,
-                    }],
-                    "default_target": "target",
-                }
+    job = job_manager.create_job(JobType.EXPORT, request.model_dump())
+    job_manager.submit_job(job, _run_generation_task)
+    return GenerateJobResponse(job_id=job.id, status="running", message="Synthetic generation started")
 
-                dataset_info = workspace_manager.link_dataset(
-                    export_path,
-                    config=link_config
-                )
-                linked = True
-                dataset_id = dataset_info.get("id")
-            except Exception as e:
-                # Linking failed but dataset was still created
-                pass
 
-        elif request.export_to_csv:
-            # Export to custom CSV path
-            export_path = str(builder.export(request.export_to_csv, format="standard"))
+@router.get("/jobs/{job_id}")
+async def get_generate_job(job_id: str):
+    """Get status, progress and result of a generation job."""
+    from .jobs import job_manager
 
-        # Build the dataset to get shape info
-        dataset = builder.build()
-        X = dataset.x({}, layout='2d')
+    job = job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job.to_dict()
 
-        execution_time = (time.time() - start_time) * 1000
 
-        return GenerateResponse(
-            success=True,
-            dataset_id=dataset_id,
-            dataset_name=dataset_name,
-            export_path=export_path,
-            shape=(X.shape[0], X.shape[1]),
-            execution_time_ms=execution_time,
-            linked_to_workspace=linked,
-        )
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_generate_job(job_id: str):
+    """Request cancellation of a generation job.
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        execution_time = (time.time() - start_time) * 1000
-        return GenerateResponse(
-            success=False,
-            shape=(0, 0),
-            execution_time_ms=execution_time,
-            error=str(e),
+    The export stops after the current chunk and removes partial output.
+    """
+    from .jobs import JobStatus, job_manager
+
+    job = job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if job.status not in (JobStatus.PENDING, JobStatus.RUNNING):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Job '{job_id}' is not running (status: {job.status.value})",
         )
+    job_manager.cancel_job(job_id)
+    return {"success": True, "job_id": job_id, "status": job.status.value}
 
 
 @router.get("/components", response_model=list[ComponentInfo])
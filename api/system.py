@@ -17,7 +17,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 
 from .node_registry_loader import load_editor_registry_reference
@@ -27,6 +27,7 @@ from .recommended_config import (
     _normalize_pkg_name,
 )
 from .shared.gpu_detection import detect_gpu_hardware
+from .shared.request_metrics import PROMETHEUS_CONTENT_TYPE, request_metrics
 from .venv_manager import venv_manager
 from .workspace_manager import workspace_manager
 
@@ -587,6 +588,45 @@ async def check_env_coherence() -> dict[str, Any]:
     return result
 
 
+# ============= Job Scheduler Endpoints =============
+
+@router.get("/system/job-scheduler")
+async def get_job_scheduler():
+    """Job pools: concurrency limits, running/queued jobs, wait and run-time histograms."""
+    from .jobs import job_manager
+
+    return job_manager.scheduler_stats()
+
+
+# ============= Request Diagnostics Endpoints =============
+
+@router.get("/system/diagnostics/requests")
+async def get_request_diagnostics(format: str = Query(default="json", pattern="^(json|prometheus)$")):
+    """Per-route latency, event-loop time and response size histograms.
+
+    ``format=prometheus`` returns the Prometheus text exposition format.
+    """
+    if format == "prometheus":
+        return PlainTextResponse(request_metrics.prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+    return request_metrics.snapshot()
+
+
+@router.get("/system/diagnostics/slow-requests")
+async def get_slow_requests(limit: int = Query(default=20, ge=1, le=200)):
+    """Most recent requests slower than the slow-request threshold, with a stack sample."""
+    return {
+        "threshold_ms": request_metrics.slow_request_ms,
+        "requests": request_metrics.slow_requests(limit),
+    }
+
+
+@router.delete("/system/diagnostics/requests")
+async def reset_request_diagnostics():
+    """Clear the request histograms and the slow-request log."""
+    request_metrics.reset()
+    return {"success": True}
+
+
 # ============= Error Log Endpoints =============
 
 @router.get("/system/errors")
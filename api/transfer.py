@@ -8,13 +8,20 @@ transfer potential using PCA-based metrics (Grassmann, CKA, RV, etc.).
 
 from __future__ import annotations
 
+import asyncio
+import multiprocessing
+import os
+import threading
 import time
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
+from .shared.array_cache import ArrayCache, array_fingerprint
 from .shared.logger import get_logger
 
 logger = get_logger(__name__)
@@ -23,6 +30,14 @@ from .lazy_imports import get_cached, is_ml_ready, require_ml_ready
 
 TRANSFER_AVAILABLE = True
 
+# Worker processes for (preprocessing, dataset) transforms; 0 disables the pool
+_TRANSFORM_WORKERS = int(os.environ.get("NIRS4ALL_TRANSFER_WORKERS", min(4, os.cpu_count() or 1)))
+_transform_pool: ProcessPoolExecutor | None = None
+_transform_pool_lock = threading.Lock()
+
+# Transformed matrices keyed by (dataset fingerprint, preprocessing name)
+_transform_cache = ArrayCache()
+
 router = APIRouter()
 
 
@@ -141,6 +156,14 @@ class TransferAnalysisResponse(BaseModel):
     preprocessings: list[str]
 
 
+class TransferJobResponse(BaseModel):
+    """Response for a submitted transfer analysis job."""
+
+    job_id: str
+    status: str
+    message: str
+
+
 class TransferPresetInfo(BaseModel):
     """Information about a transfer analysis preset."""
 
@@ -162,29 +185,18 @@ class PreprocessingOptionInfo(BaseModel):
 # ============= API Endpoints =============
 
 
-@router.post("/analysis/transfer", response_model=TransferAnalysisResponse)
-async def compute_transfer_analysis(request: TransferAnalysisRequest):
-    """
-    Compute comprehensive transfer analysis between multiple datasets.
+def _run_transfer_analysis(
+    request: TransferAnalysisRequest,
+    progress_callback: Callable[[float, str], bool],
+) -> TransferAnalysisResponse | None:
+    """Load datasets, transform them and fit the PCA evaluator.
 
-    Evaluates how different preprocessing methods affect inter-dataset distances
-    using PCA-based metrics (Grassmann distance, CKA, RV coefficient, etc.).
+    Shared by the synchronous endpoint and the background job. The
+    (preprocessing, dataset) transforms come from the transform cache or
+    run in the worker pool. Returns None when cancelled.
     """
-    if not TRANSFER_AVAILABLE:
-        raise HTTPException(
-            status_code=501,
-            detail="Transfer analysis not available. Ensure nirs4all is installed.",
-        )
-
     start_time = time.time()
 
-    # Validate datasets
-    if len(request.dataset_ids) < 2:
-        raise HTTPException(
-            status_code=400,
-            detail="At least 2 datasets are required for transfer analysis.",
-        )
-
     # Load datasets
     raw_data = {}
     dataset_infos = []
@@ -205,24 +217,22 @@ async def compute_transfer_analysis(request: TransferAnalysisRequest):
             raise HTTPException(
                 status_code=404, detail=f"Error loading dataset '{dataset_id}': {str(e)}"
             )
-
-    # Generate preprocessing pipelines
-    preprocessing_pipelines = _generate_preprocessing_pipelines(request.preprocessing)
+    if not progress_callback(5, f"Loaded {len(raw_data)} datasets"):
+        return None
 
     # Apply preprocessing to all datasets
-    pp_data = {}
-    for pp_name, pp_func in preprocessing_pipelines.items():
-        pp_data[pp_name] = {}
-        for dataset_id, X in raw_data.items():
-            try:
-                X_pp = pp_func(X.copy())
-                pp_data[pp_name][dataset_id] = X_pp
-            except Exception as e:
-                logger.warning("Preprocessing '%s' failed for '%s': %s", pp_name, dataset_id, e)
-                # Skip failed preprocessing for this dataset
-                continue
+    pp_names = _resolve_preprocessing_names(request.preprocessing)
+    pp_data = _transform_datasets(
+        pp_names,
+        raw_data,
+        lambda fraction, message: progress_callback(5 + 75 * fraction, message),
+    )
+    if pp_data is None:
+        return None
 
     # Run transfer analysis
+    if not progress_callback(80, "Fitting PCA evaluator..."):
+        return None
     evaluator = get_cached("PreprocPCAEvaluator")(r_components=request.n_components, knn=request.knn)
     evaluator.fit(raw_data, pp_data)
 
@@ -238,7 +248,7 @@ async def compute_transfer_analysis(request: TransferAnalysisRequest):
         best_preprocessing=best_pp,
         best_reduction_pct=best_reduction,
         n_datasets=len(request.dataset_ids),
-        n_preprocessings=len(preprocessing_pipelines),
+        n_preprocessings=len(pp_names),
         n_pairs=len(request.dataset_ids) * (len(request.dataset_ids) - 1) // 2,
     )
 
@@ -253,10 +263,98 @@ async def compute_transfer_analysis(request: TransferAnalysisRequest):
         metric_convergence=metric_convergence,
         summary=summary,
         datasets=dataset_infos,
-        preprocessings=list(preprocessing_pipelines.keys()),
+        preprocessings=pp_names,
     )
 
 
+def _run_transfer_analysis_task(job: Any, progress_callback: Callable[[float, str], bool]) -> dict[str, Any] | None:
+    """Background job wrapper around :func:`_run_transfer_analysis`."""
+    request = TransferAnalysisRequest.model_validate(job.config)
+    result = _run_transfer_analysis(request, progress_callback)
+    if result is None:
+        return None
+    return result.model_dump()
+
+
+@router.post("/analysis/transfer", response_model=TransferAnalysisResponse)
+async def compute_transfer_analysis(request: TransferAnalysisRequest):
+    """
+    Compute comprehensive transfer analysis between multiple datasets.
+
+    Evaluates how different preprocessing methods affect inter-dataset distances
+    using PCA-based metrics (Grassmann distance, CKA, RV coefficient, etc.).
+    Runs off the event loop; for many datasets or presets prefer
+    ``POST /analysis/transfer/job``, which reports progress and can be cancelled.
+    """
+    if not TRANSFER_AVAILABLE:
+        raise HTTPException(
+            status_code=501,
+            detail="Transfer analysis not available. Ensure nirs4all is installed.",
+        )
+
+    # Validate datasets
+    if len(request.dataset_ids) < 2:
+        raise HTTPException(
+            status_code=400,
+            detail="At least 2 datasets are required for transfer analysis.",
+        )
+
+    return await asyncio.to_thread(_run_transfer_analysis, request, lambda _p, _m="": True)
+
+
+@router.post("/analysis/transfer/job", response_model=TransferJobResponse)
+async def submit_transfer_analysis_job(request: TransferAnalysisRequest):
+    """Start a transfer analysis as a cancellable background job.
+
+    Progress is reported through the job manager (and WebSocket job
+    notifications); poll ``GET /analysis/transfer/jobs/{job_id}`` for the
+    result, which has the same shape as ``POST /analysis/transfer``.
+    """
+    if not TRANSFER_AVAILABLE:
+        raise HTTPException(
+            status_code=501,
+            detail="Transfer analysis not available. Ensure nirs4all is installed.",
+        )
+
+    from .jobs import JobType, job_manager
+
+    job = job_manager.create_job(JobType.ANALYSIS, {"analysis": "transfer", **request.model_dump()})
+    job_manager.submit_job(job, _run_transfer_analysis_task)
+    return TransferJobResponse(job_id=job.id, status="running", message="Transfer analysis started")
+
+
+@router.get("/analysis/transfer/jobs/{job_id}")
+async def get_transfer_analysis_job(job_id: str):
+    """Get status, progress and result of a transfer analysis job."""
+    from .jobs import job_manager
+
+    job = job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job.to_dict()
+
+
+@router.post("/analysis/transfer/jobs/{job_id}/cancel")
+async def cancel_transfer_analysis_job(job_id: str):
+    """Request cancellation of a transfer analysis job.
+
+    Pending transforms are dropped; transforms already running in worker
+    processes finish but their results are discarded.
+    """
+    from .jobs import JobStatus, job_manager
+
+    job = job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if job.status not in (JobStatus.PENDING, JobStatus.RUNNING):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Job '{job_id}' is not running (status: {job.status.value})",
+        )
+    job_manager.cancel_job(job_id)
+    return {"success": True, "job_id": job_id, "status": job.status.value}
+
+
 @router.get("/analysis/transfer/presets", response_model=list[TransferPresetInfo])
 async def get_transfer_presets():
     """Get available preset configurations for transfer analysis."""
@@ -374,10 +472,8 @@ def _load_dataset_data(dataset_id: str) -> tuple:
     return dataset, X, wavelengths
 
 
-def _generate_preprocessing_pipelines(config: PreprocessingConfig) -> dict[str, Any]:
-    """Generate preprocessing functions based on configuration."""
-    pipelines = {}
-
+def _resolve_preprocessing_names(config: PreprocessingConfig) -> list[str]:
+    """Preprocessing names to evaluate (those that cannot be built are dropped)."""
     if config.mode == "preset":
         # Generate standard preprocessing combinations based on preset
         preset_name = config.preset or "balanced"
@@ -395,16 +491,125 @@ def _generate_preprocessing_pipelines(config: PreprocessingConfig) -> dict[str,
         # Manual mode - use specified steps
         preprocessings = config.manual_steps or ["SNV", "MSC"]
 
-    # Build pipeline functions
-    for pp_name in preprocessings:
+    names = []
+    for pp_name in dict.fromkeys(preprocessings):
         try:
-            pp_func = _build_preprocessing_function(pp_name)
-            if pp_func:
-                pipelines[pp_name] = pp_func
+            if _build_preprocessing_function(pp_name):
+                names.append(pp_name)
         except Exception as e:
             logger.warning("Could not build preprocessing '%s': %s", pp_name, e)
+    return names
+
+
+def _apply_preprocessing(pp_name: str, X: Any) -> Any:
+    """Apply a named preprocessing to a copy of ``X``.
+
+    Module-level (and addressed by name rather than by closure) so that it
+    can be pickled into the transform worker processes.
+    """
+    return _build_preprocessing_function(pp_name)(X.copy())
+
+
+def _get_transform_pool() -> ProcessPoolExecutor | None:
+    """Lazily create the shared transform worker pool (None when disabled)."""
+    global _transform_pool
+    if _TRANSFORM_WORKERS < 1:
+        return None
+    with _transform_pool_lock:
+        if _transform_pool is None:
+            # Spawn rather than fork: the server process runs threads
+            _transform_pool = ProcessPoolExecutor(
+                max_workers=_TRANSFORM_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _transform_pool
+
+
+def _discard_transform_pool() -> None:
+    """Drop a broken pool so that the next analysis starts a fresh one."""
+    global _transform_pool
+    with _transform_pool_lock:
+        if _transform_pool is not None:
+            _transform_pool.shutdown(wait=False, cancel_futures=True)
+            _transform_pool = None
+
+
+def _transform_datasets(
+    pp_names: list[str],
+    raw_data: dict[str, Any],
+    progress_callback: Callable[[float, str], bool],
+) -> dict[str, dict[str, Any]] | None:
+    """Apply every preprocessing to every dataset.
+
+    Results are cached by (dataset fingerprint, preprocessing name), so
+    re-running an analysis with other ``n_components``/``knn`` values only
+    refits the evaluator. Missing transforms run in the worker pool, or
+    sequentially when there is a single one or the pool is unavailable.
+    A failed transform skips that (preprocessing, dataset) pair. Returns
+    None when ``progress_callback`` requests cancellation.
+    """
+    fingerprints = {dataset_id: array_fingerprint(X) for dataset_id, X in raw_data.items()}
+    pp_data: dict[str, dict[str, Any]] = {pp_name: {} for pp_name in pp_names}
+    pending: list[tuple[str, str]] = []
+    for pp_name in pp_names:
+        for dataset_id in raw_data:
+            cached = _transform_cache.get((fingerprints[dataset_id], pp_name))
+            if cached is not None:
+                pp_data[pp_name][dataset_id] = cached
+            else:
+                pending.append((pp_name, dataset_id))
+
+    total = len(pp_names) * len(raw_data)
+    done = total - len(pending)
+
+    def _store(pp_name: str, dataset_id: str, X_pp: Any) -> bool:
+        nonlocal done
+        pp_data[pp_name][dataset_id] = X_pp
+        _transform_cache.put((fingerprints[dataset_id], pp_name), X_pp)
+        done += 1
+        return progress_callback(done / total, f"Applied {pp_name} to {dataset_id}")
+
+    pool = _get_transform_pool() if len(pending) > 1 else None
+    if pool is not None:
+        try:
+            futures = {
+                pool.submit(_apply_preprocessing, pp_name, raw_data[dataset_id]): (pp_name, dataset_id)
+                for pp_name, dataset_id in pending
+            }
+        except (BrokenProcessPool, RuntimeError) as e:
+            logger.warning("Transform pool unavailable, applying preprocessing sequentially: %s", e)
+            _discard_transform_pool()
+            futures = {}
+
+        for future in as_completed(futures):
+            pp_name, dataset_id = futures[future]
+            try:
+                X_pp = future.result()
+            except BrokenProcessPool as e:
+                logger.warning("Transform pool failed, applying remaining preprocessing sequentially: %s", e)
+                _discard_transform_pool()
+                break
+            except Exception as e:
+                logger.warning("Preprocessing '%s' failed for '%s': %s", pp_name, dataset_id, e)
+                pending.remove((pp_name, dataset_id))
+                continue
+            pending.remove((pp_name, dataset_id))
+            if not _store(pp_name, dataset_id, X_pp):
+                for other in futures:
+                    other.cancel()
+                return None
+
+    for pp_name, dataset_id in pending:
+        try:
+            X_pp = _apply_preprocessing(pp_name, raw_data[dataset_id])
+        except Exception as e:
+            logger.warning("Preprocessing '%s' failed for '%s': %s", pp_name, dataset_id, e)
+            # Skip failed preprocessing for this dataset
+            continue
+        if not _store(pp_name, dataset_id, X_pp):
+            return None
 
-    return pipelines
+    return pp_data
 
 
 def _build_preprocessing_function(name: str):
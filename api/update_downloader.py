@@ -2,8 +2,9 @@
 Update download and extraction module.
 
 Provides functionality to:
-- Download update archives with progress tracking
-- Verify checksums
+- Download update archives off the event loop with progress tracking and
+  HTTP Range resume
+- Verify checksums (hashed inline while downloading)
 - Extract tar.gz (Linux/macOS) or zip (Windows) archives
 - Stage updates for the apply step
 
@@ -12,11 +13,14 @@ the update path works in any deployment mode (PyInstaller, Electron, dev).
 """
 
 import asyncio
+import hashlib
+import http.client
 import os
 import shutil
 import ssl
 import stat
 import tarfile
+import time
 import urllib.error
 import urllib.request
 import zipfile
@@ -25,12 +29,31 @@ from pathlib import Path
 
 from updater import calculate_sha256, get_executable_name, get_staging_dir, get_update_cache_dir
 
+# Network errors after which the transfer is resumed with a Range request
+_TRANSIENT_ERRORS = (urllib.error.URLError, http.client.HTTPException, ConnectionError, TimeoutError)
+
+
+class _UnexpectedResumeOffset(Exception):
+    """A 206 response does not continue the partial file from its current size."""
+
+
+def _content_range_start(content_range: str | None) -> int | None:
+    """First byte offset of a ``Content-Range: bytes start-end/total`` header."""
+    if not content_range or not content_range.startswith("bytes "):
+        return None
+    try:
+        return int(content_range[len("bytes "):].split("-", 1)[0])
+    except ValueError:
+        return None
+
 
 class UpdateDownloader:
     """Handles downloading and extracting webapp updates."""
 
     CHUNK_SIZE = 65536  # 64 KB chunks for progress updates
     CONNECT_TIMEOUT = 30  # seconds
+    MAX_RESUME_ATTEMPTS = 3  # automatic Range resumes after a dropped connection
+    RESUME_BACKOFF_SECONDS = 1.0
 
     def __init__(
         self,
@@ -54,6 +77,8 @@ class UpdateDownloader:
         self.expected_checksum = expected_checksum
         self.progress_callback = progress_callback
         self._cancelled = False
+        self._sha256: str | None = None
+        self._sha256_path: Path | None = None
 
     def cancel(self) -> None:
         """Cancel the download."""
@@ -76,71 +101,130 @@ class UpdateDownloader:
         """
         Download the update archive with resume support.
 
-        If a partial file exists from a previous attempt, the download resumes
-        from where it left off using an HTTP Range header. On cancellation or
-        network failure the partial file is kept so the next attempt can resume.
+        The transfer runs in a worker thread so large archives never block the
+        event loop, and the SHA-256 is updated as chunks arrive (see
+        ``verify_checksum``). If a partial file exists from a previous attempt,
+        the download resumes from where it left off using an HTTP Range
+        header; a connection dropped mid-transfer is resumed the same way, up
+        to ``MAX_RESUME_ATTEMPTS`` times. On cancellation or persistent network
+        failure the partial file is kept so the next attempt can resume.
 
         Returns:
             Tuple of (success, message, downloaded_file_path)
         """
+        return await asyncio.to_thread(self._download_blocking)
+
+    def _download_blocking(self) -> tuple[bool, str, Path | None]:
         cache_dir = get_update_cache_dir()
         filename = self.download_url.split("/")[-1]
         download_path = cache_dir / filename
+        self._sha256 = None
 
         # Check for partial download to resume
-        resume_offset = 0
-        if download_path.exists():
-            resume_offset = download_path.stat().st_size
-            # If size matches expected, treat as already complete
-            if self.expected_size and resume_offset >= self.expected_size:
-                self._report_progress(50, "Download already complete")
-                return True, "Download complete", download_path
+        resume_offset = download_path.stat().st_size if download_path.exists() else 0
+        digest = self._hash_existing(download_path) if resume_offset > 0 else hashlib.sha256()
 
-        try:
-            if resume_offset > 0:
-                self._report_progress(0, f"Resuming download from {resume_offset / 1024 / 1024:.1f} MB...")
-            else:
-                self._report_progress(0, "Connecting to server...")
+        # If size matches expected, treat as already complete
+        if self.expected_size and resume_offset >= self.expected_size:
+            self._finish(download_path, digest)
+            self._report_progress(50, "Download already complete")
+            return True, "Download complete", download_path
 
-            # Build request with optional Range header for resume
-            req = urllib.request.Request(self.download_url)
-            if resume_offset > 0:
-                req.add_header("Range", f"bytes={resume_offset}-")
+        attempt = 0
+        while True:
+            try:
+                complete, resume_offset, digest = self._transfer(download_path, resume_offset, digest)
+                if complete is None:
+                    # Keep partial file for future resume
+                    return False, "Download cancelled", None
+                if complete:
+                    self._finish(download_path, digest)
+                    self._report_progress(50, "Download complete")
+                    return True, "Download complete", download_path
+                reason = "connection closed before the transfer finished"
+            except urllib.error.HTTPError as e:
+                if e.code == 416:
+                    # Range not satisfiable — file might already be complete
+                    self._finish(download_path, digest)
+                    self._report_progress(50, "Download complete")
+                    return True, "Download complete", download_path
+                return False, f"Download failed with status {e.code}. Partial download saved for resume.", None
+            except _UnexpectedResumeOffset as e:
+                # The partial file cannot be continued: start over from byte 0
+                download_path.write_bytes(b"")
+                digest = hashlib.sha256()
+                reason = str(e)
+            except _TRANSIENT_ERRORS as e:
+                reason = str(e.reason) if hasattr(e, "reason") else str(e) or type(e).__name__
+            except Exception as e:
+                # Keep partial file for resume on next attempt
+                return False, f"Download error: {str(e)}. Partial download saved for resume.", None
+
+            resume_offset = download_path.stat().st_size if download_path.exists() else 0
+            attempt += 1
+            if attempt > self.MAX_RESUME_ATTEMPTS or self._cancelled:
+                # Keep partial file for resume on next attempt
+                return False, f"Download error: {reason}. Partial download saved for resume.", None
+            self._report_progress(
+                (resume_offset / (self.expected_size or resume_offset or 1)) * 50,
+                f"Connection interrupted, resuming from {resume_offset / 1024 / 1024:.1f} MB...",
+            )
+            time.sleep(self.RESUME_BACKOFF_SECONDS * attempt)
+
+    def _transfer(self, download_path: Path, resume_offset: int, digest):
+        """
+        Fetch the remaining bytes into ``download_path``, hashing them inline.
 
-            # Allow default SSL context (handles GitHub redirects)
-            ctx = ssl.create_default_context()
-            response = urllib.request.urlopen(req, timeout=self.CONNECT_TIMEOUT, context=ctx)
+        Returns:
+            Tuple of (complete, offset, digest): complete is True when the whole
+            file was received, False when the connection ended early and None
+            when the download was cancelled.
+        """
+        if resume_offset > 0:
+            self._report_progress(0, f"Resuming download from {resume_offset / 1024 / 1024:.1f} MB...")
+        else:
+            self._report_progress(0, "Connecting to server...")
+
+        # Build request with optional Range header for resume
+        req = urllib.request.Request(self.download_url)
+        if resume_offset > 0:
+            req.add_header("Range", f"bytes={resume_offset}-")
+
+        # Allow default SSL context (handles GitHub redirects)
+        ctx = ssl.create_default_context()
+        with urllib.request.urlopen(req, timeout=self.CONNECT_TIMEOUT, context=ctx) as response:
             status_code = response.status
 
             # 206 = Partial Content (resume worked), 200 = full response
-            if status_code == 200:
+            if status_code == 206 and _content_range_start(response.headers.get("Content-Range")) not in (
+                None,
+                resume_offset,
+            ):
+                raise _UnexpectedResumeOffset("server resumed from an unexpected offset")
+            if status_code == 200 and resume_offset > 0:
                 # Server doesn't support Range — restart from scratch
                 resume_offset = 0
+                digest = hashlib.sha256()
             elif status_code not in (200, 206):
-                return (
-                    False,
-                    f"Download failed with status {status_code}",
-                    None,
-                )
+                raise urllib.error.HTTPError(self.download_url, status_code, "Unexpected status", response.headers, None)
 
             content_length = int(response.headers.get("Content-Length", 0))
-            total_size = resume_offset + content_length if status_code == 206 else content_length
-            if total_size == 0:
-                total_size = self.expected_size or 1
+            expected_total = resume_offset + content_length if content_length else 0
+            total_size = expected_total or self.expected_size or 1
             downloaded = resume_offset
 
-            file_mode = "ab" if resume_offset > 0 and status_code == 206 else "wb"
+            file_mode = "ab" if resume_offset > 0 else "wb"
             with open(download_path, file_mode) as f:
                 while True:
                     if self._cancelled:
-                        # Keep partial file for future resume
-                        return False, "Download cancelled", None
+                        return None, downloaded, digest
 
                     chunk = response.read(self.CHUNK_SIZE)
                     if not chunk:
                         break
 
                     f.write(chunk)
+                    digest.update(chunk)
                     downloaded += len(chunk)
 
                     # Download is 0-50% of total progress
@@ -150,30 +234,30 @@ class UpdateDownloader:
                     message = f"Downloading: {mb_downloaded:.1f} MB / {mb_total:.1f} MB"
 
                     if not self._report_progress(progress, message):
-                        # Keep partial file for future resume
-                        return False, "Download cancelled", None
+                        return None, downloaded, digest
 
-            self._report_progress(50, "Download complete")
-            return True, "Download complete", download_path
+        complete = not expected_total or downloaded >= expected_total
+        return complete, downloaded, digest
 
-        except urllib.error.HTTPError as e:
-            if e.code == 416:
-                # Range not satisfiable — file might already be complete
-                self._report_progress(50, "Download complete")
-                return True, "Download complete", download_path
-            return False, f"Download failed with status {e.code}. Partial download saved for resume.", None
-        except (urllib.error.URLError, TimeoutError) as e:
-            # Keep partial file for resume on next attempt
-            reason = str(e.reason) if hasattr(e, "reason") else str(e)
-            return False, f"Download error: {reason}. Partial download saved for resume.", None
-        except Exception as e:
-            # Keep partial file for resume on next attempt
-            return False, f"Download error: {str(e)}. Partial download saved for resume.", None
+    def _hash_existing(self, path: Path):
+        """Hash the bytes already on disk so a resumed download keeps one digest."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest
+
+    def _finish(self, download_path: Path, digest) -> None:
+        self._sha256 = digest.hexdigest()
+        self._sha256_path = download_path
 
     def verify_checksum(self, file_path: Path) -> tuple[bool, str]:
         """
         Verify the downloaded file's checksum.
 
+        Uses the digest computed while downloading ``file_path``; other files
+        are hashed from disk.
+
         Returns:
             Tuple of (success, message)
         """
@@ -182,7 +266,10 @@ class UpdateDownloader:
 
         self._report_progress(52, "Verifying checksum...")
 
-        actual_checksum = calculate_sha256(file_path)
+        if self._sha256 is not None and self._sha256_path == file_path:
+            actual_checksum = self._sha256
+        else:
+            actual_checksum = calculate_sha256(file_path)
         if actual_checksum.lower() == self.expected_checksum.lower():
             self._report_progress(54, "Checksum verified")
             return True, "Checksum verified"
@@ -122,6 +122,16 @@ def invalidate_installed_packages_cache() -> None:
     _installed_packages_cache.clear()
 
 
+def _invalidate_operator_discovery() -> None:
+    """Drop cached operator discovery after the environment changed."""
+    try:
+        from .shared.operator_cache import operator_discovery_cache
+
+        operator_discovery_cache.invalidate()
+    except Exception as e:
+        logger.debug("Could not invalidate operator discovery cache: %s", e)
+
+
 class VenvManager:
     """
     Manages the Python environment for nirs4all dependencies.
@@ -458,6 +468,7 @@ class VenvManager:
         metadata["last_updated"] = datetime.now().isoformat()
         self._save_metadata(metadata)
         invalidate_installed_packages_cache()
+        _invalidate_operator_discovery()
 
         if progress_callback:
             progress_callback(100, f"Successfully installed {package}")
@@ -579,6 +590,7 @@ class VenvManager:
             progress_callback(100, f"Successfully uninstalled {package}")
 
         invalidate_installed_packages_cache()
+        _invalidate_operator_discovery()
         return True, f"Successfully uninstalled {package}"
 
     def get_outdated_packages(self) -> list[dict[str, str]]:
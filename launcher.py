@@ -60,4 +60,8 @@ def main():
 
 
 if __name__ == "__main__":
+    import multiprocessing
+
+    # Spawned worker processes re-enter the bundle executable
+    multiprocessing.freeze_support()
     main()
@@ -66,35 +66,20 @@ logger.info("STARTUP TIMING: Sentry init: %.2fs", _t3 - _t2)
 # Desktop mode detection - skip unnecessary middleware when running in pywebview
 DESKTOP_MODE = os.environ.get("NIRS4ALL_DESKTOP", "false").lower() == "true"
 
-from api.aggregated_predictions import router as aggregated_predictions_router
-from api.analysis import router as analysis_router
-from api.automl import router as automl_router
-from api.datasets import router as datasets_router
-from api.evaluation import router as evaluation_router
-from api.inspector import router as inspector_router
-from api.models import router as models_router
+# Only the routers needed by the first screen are imported eagerly; the
+# others are registered with lazy_routers below and imported on first use.
+from api.lazy_routers import LazyRouterRegistry
 from api.network_state import router as network_state_router
-from api.pipelines import router as pipelines_router
-from api.playground import router as playground_router
-from api.predict import router as predict_router
-from api.predictions import router as predictions_router
-from api.preprocessing import router as preprocessing_router
-from api.projects import router as projects_router
 from api.recommended_config import router as config_router
-from api.runs import router as runs_router
-from api.shap import router as shap_router
-from api.spectra import router as spectra_router
-from api.synthesis import router as synthesis_router
+from api.shared.request_metrics import RequestMetricsMiddleware, request_metrics
 from api.system import log_error
 from api.system import router as system_router
-from api.training import router as training_router
-from api.transfer import router as transfer_router
 from api.updates import router as updates_router
 from api.workspace import router as workspace_router
 from websocket import ws_manager
 
 _t4 = time.perf_counter()
-logger.info("STARTUP TIMING: All router imports: %.2fs (total so far: %.2fs)", _t4 - _t3, _t4 - _t0)
+logger.info("STARTUP TIMING: Eager router imports: %.2fs (total so far: %.2fs)", _t4 - _t3, _t4 - _t0)
 
 # Startup readiness flag — set to True once the startup event has completed.
 # Used by /api/health so Electron waits for full initialization before loading the UI.
@@ -250,6 +235,9 @@ async def lifespan(_app: FastAPI):
     # Monitor ML loading and restore workspace with nirs4all when ready
     _background_tasks.append(asyncio.create_task(_wait_for_ml_ready()))
 
+    # Mount the deferred routers off the critical path
+    _background_tasks.append(asyncio.create_task(lazy_routers.preload()))
+
     # Other background tasks
     _background_tasks.append(asyncio.create_task(cleanup_old_updates_background()))
 
@@ -329,30 +317,37 @@ app.add_middleware(
 
 # Include API routes
 app.include_router(workspace_router, prefix="/api", tags=["workspace"])
-app.include_router(datasets_router, prefix="/api", tags=["datasets"])
-app.include_router(pipelines_router, prefix="/api", tags=["pipelines"])
-app.include_router(aggregated_predictions_router, prefix="/api", tags=["aggregated-predictions"])
-app.include_router(predict_router, prefix="/api", tags=["predict"])
-app.include_router(predictions_router, prefix="/api", tags=["predictions"])
 app.include_router(system_router, prefix="/api", tags=["system"])
 app.include_router(network_state_router, prefix="/api", tags=["system"])
-app.include_router(spectra_router, prefix="/api", tags=["spectra"])
-app.include_router(preprocessing_router, prefix="/api", tags=["preprocessing"])
-app.include_router(training_router, prefix="/api", tags=["training"])
-app.include_router(models_router, prefix="/api", tags=["models"])
-app.include_router(analysis_router, prefix="/api", tags=["analysis"])
-app.include_router(evaluation_router, prefix="/api", tags=["evaluation"])
-app.include_router(automl_router, prefix="/api", tags=["automl"])
-app.include_router(runs_router, prefix="/api", tags=["runs"])
-app.include_router(playground_router, prefix="/api", tags=["playground"])
 app.include_router(updates_router, prefix="/api", tags=["updates"])
-app.include_router(synthesis_router, prefix="/api", tags=["synthesis"])
-app.include_router(transfer_router, prefix="/api", tags=["transfer"])
-app.include_router(shap_router, prefix="/api", tags=["shap"])
-app.include_router(projects_router, prefix="/api", tags=["projects"])
-app.include_router(inspector_router, prefix="/api", tags=["inspector"])
 app.include_router(config_router, prefix="/api", tags=["config"])
 
+# Deferred routers: (module, URL prefix under /api, tags)
+lazy_routers = LazyRouterRegistry(app, api_prefix="/api")
+lazy_routers.add("api.datasets", "/datasets", tags=["datasets"])
+lazy_routers.add("api.pipelines", "/pipelines", tags=["pipelines"])
+lazy_routers.add("api.aggregated_predictions", "/aggregated-predictions", tags=["aggregated-predictions"])
+lazy_routers.add("api.predict", "/predict", tags=["predict"])
+lazy_routers.add("api.predictions", "/predictions", tags=["predictions"])
+lazy_routers.add("api.spectra", "/spectra", tags=["spectra"])
+lazy_routers.add("api.preprocessing", "/preprocessing", tags=["preprocessing"])
+lazy_routers.add("api.training", "/training", tags=["training"])
+lazy_routers.add("api.models", "/models", tags=["models"])
+lazy_routers.add("api.analysis", "/analysis", tags=["analysis"])
+lazy_routers.add("api.evaluation", "/evaluation", tags=["evaluation"])
+lazy_routers.add("api.automl", "/automl", tags=["automl"])
+lazy_routers.add("api.runs", "/runs", tags=["runs"])
+lazy_routers.add("api.playground", "/playground", tags=["playground"])
+lazy_routers.add("api.synthesis", "/synthesis", tags=["synthesis"])
+lazy_routers.add("api.transfer", "/analysis", tags=["transfer"])
+lazy_routers.add("api.shap", "/analysis", tags=["shap"])
+lazy_routers.add("api.projects", "/projects", tags=["projects"])
+lazy_routers.add("api.inspector", "/inspector", tags=["inspector"])
+lazy_routers.install()
+
+# Added last so it is the outermost middleware and times the whole request
+app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
 
 async def _wait_for_ml_ready():
     """Poll until ML deps are loaded, then restore workspace with nirs4all."""
@@ -594,6 +589,10 @@ async def serve_spa_routes(full_path: str):
 
 if __name__ == "__main__":
     import argparse
+    import multiprocessing
+
+    # Worker pools (e.g. transfer analysis) spawn processes; required when frozen
+    multiprocessing.freeze_support()
 
     parser = argparse.ArgumentParser(description="nirs4all backend server")
     parser.add_argument(
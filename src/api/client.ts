@@ -2803,6 +2803,10 @@ export interface AggregatedSQLQueryResponse {
   columns: string[];
   rows: unknown[][];
   row_count: number;
+  next_page_token?: string | null;
+  truncated?: boolean;
+  timed_out?: boolean;
+  elapsed_ms?: number;
 }
 
 /**
@@ -51,6 +51,10 @@ export async function getInspectorData(
   }
   if (filters?.task_type) params.set('task_type', filters.task_type);
   if (filters?.metric) params.set('metric', filters.metric);
+  if (filters?.sort_by) params.set('sort_by', filters.sort_by);
+  if (filters?.sort_order) params.set('sort_order', filters.sort_order);
+  if (filters?.limit != null) params.set('limit', String(filters.limit));
+  if (filters?.offset) params.set('offset', String(filters.offset));
   const qs = params.toString();
   return api.get<InspectorDataResponse>(`/inspector/data${qs ? `?${qs}` : ''}`);
 }
@@ -27,6 +27,7 @@ interface CountVariantsResponse {
   breakdown: Record<string, { name: string; count: number }>;
   warning?: string;
   error?: string;
+  superseded?: boolean;
   nirs4all_format?: unknown[];
 }
 
@@ -62,6 +63,9 @@ export function useVariantCount(
   });
 
   const abortControllerRef = useRef<AbortController | null>(null);
+  // Lets the backend stop counting requests superseded by newer edits
+  const clientIdRef = useRef(`variant-count-${Math.random().toString(36).slice(2)}`);
+  const sequenceRef = useRef(0);
   const timeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
 
   const countVariants = useCallback(async (stepsToCount: PipelineStep[]) => {
@@ -85,12 +89,17 @@ export function useVariantCount(
     try {
       abortControllerRef.current = new AbortController();
 
+      sequenceRef.current += 1;
       const response = await api.post<CountVariantsResponse>(
         "/pipelines/count-variants",
-        { steps: stepsToCount },
+        { steps: stepsToCount, client_id: clientIdRef.current, sequence: sequenceRef.current },
         { signal: abortControllerRef.current.signal }
       );
 
+      if (response.superseded) {
+        return;
+      }
+
       setResult({
         count: response.count || 1,
         breakdown: response.breakdown || {},
@@ -53,6 +53,7 @@ import {
   downloadAggregatedDatasetParquet,
   runAggregatedPredictionsQuery,
   getChainPartitionDetail,
+  type AggregatedSQLQueryResponse,
 } from "@/api/client";
 import { useIsDeveloperMode } from "@/context/DeveloperModeContext";
 import { useMlReadiness } from "@/context/MlReadinessContext";
@@ -141,7 +142,7 @@ export default function AggregatedResults() {
   const [sql, setSql] = useState("SELECT dataset_name, COUNT(*) AS predictions FROM predictions GROUP BY 1 ORDER BY 2 DESC");
   const [sqlLoading, setSqlLoading] = useState(false);
   const [sqlError, setSqlError] = useState<string | null>(null);
-  const [sqlResult, setSqlResult] = useState<{ columns: string[]; rows: unknown[][]; row_count: number } | null>(null);
+  const [sqlResult, setSqlResult] = useState<AggregatedSQLQueryResponse | null>(null);
 
   // Load data
   const loadData = async () => {
@@ -553,6 +554,15 @@ export default function AggregatedResults() {
                       {sqlResult.row_count} rows
                     </span>
                   )}
+                  {sqlResult?.timed_out ? (
+                    <span className="text-xs text-amber-600">
+                      Query timed out, showing a partial result
+                    </span>
+                  ) : sqlResult?.truncated ? (
+                    <span className="text-xs text-amber-600">
+                      Result truncated at the server row limit
+                    </span>
+                  ) : null}
                 </div>
                 {sqlError && <p className="text-sm text-destructive">{sqlError}</p>}
                 {sqlResult && sqlResult.columns.length > 0 && (
@@ -65,7 +65,10 @@ export interface InspectorChainSummary {
 
 export interface InspectorDataResponse {
   chains: InspectorChainSummary[];
+  /** Number of matching chains before pagination */
   total: number;
+  offset: number;
+  limit: number | null;
   available_metrics: string[];
   available_models: string[];
   available_datasets: string[];
@@ -203,6 +206,12 @@ export interface InspectorDataFilters {
   preprocessings?: string[];
   task_type?: string;
   metric?: string;
+  /** Server-side sort column (default: chain_id) */
+  sort_by?: string;
+  sort_order?: 'asc' | 'desc';
+  /** Page size; omit to load every matching chain */
+  limit?: number;
+  offset?: number;
 }
 
 // ============= Filter Types (Phase 2) =============
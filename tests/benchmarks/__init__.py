@@ -0,0 +1 @@
+"""Opt-in backend performance benchmarks (run with ``pytest tests/benchmarks --benchmark``)."""
@@ -0,0 +1,167 @@
+"""
+Fixtures and reporting of the opt-in backend benchmark suite.
+
+Benchmarks are skipped unless pytest runs with ``--benchmark``. Each
+benchmark is parametrized by workload size (see ``workloads.SIZES``) and
+times its target with the ``bench`` fixture. At the end of the session
+the timings are written to a JSON report and, when a baseline report is
+given, compared against it; a regression fails the session.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("SENTRY_DSN", "")
+
+from .report import (  # noqa: E402
+    BenchmarkResult,
+    build_report,
+    compare,
+    format_comparisons,
+    load_report,
+    save_report,
+)
+from .workloads import SIZE_NAMES, SIZES, build_store_workspace  # noqa: E402
+
+BENCHMARK_DIR = Path(__file__).parent
+
+DEFAULT_REPORT = ".benchmarks/latest.json"
+
+_results_key = pytest.StashKey[list]()
+_comparisons_key = pytest.StashKey[list]()
+
+
+def _selected_sizes(config) -> set[str]:
+    sizes = {s.strip() for s in str(config.getoption("benchmark_sizes")).split(",") if s.strip()}
+    unknown = sizes - set(SIZE_NAMES)
+    if unknown:
+        raise pytest.UsageError(f"Unknown benchmark size(s): {', '.join(sorted(unknown))}")
+    return sizes
+
+
+def pytest_collection_modifyitems(config, items):
+    enabled = config.getoption("benchmark")
+    sizes = _selected_sizes(config) if enabled else set()
+    opt_in = pytest.mark.skip(reason="benchmarks are opt-in: pytest tests/benchmarks --benchmark")
+    for item in items:
+        if BENCHMARK_DIR not in item.path.parents:
+            continue
+        item.add_marker(pytest.mark.benchmark)
+        if not enabled:
+            item.add_marker(opt_in)
+            continue
+        size = getattr(item, "callspec", None) and item.callspec.params.get("size")
+        if size and size not in sizes:
+            item.add_marker(pytest.mark.skip(reason=f"size '{size}' not selected (--benchmark-sizes)"))
+        # Building the large workloads alone can exceed the default test timeout
+        item.add_marker(pytest.mark.timeout(1800))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _ml_deps(request):
+    if not request.config.getoption("benchmark"):
+        return
+    pytest.importorskip("nirs4all")
+    import api.shared  # noqa: F401  (initialise the shared package before lazy_imports)
+    from api.lazy_imports import _do_load_ml_deps, is_ml_ready
+
+    if not is_ml_ready():
+        _do_load_ml_deps()
+
+
+@pytest.fixture
+def bench(request):
+    """Time ``fn`` and record the result: ``bench(name, size, fn, repeat=5, warmup=1, **params)``.
+
+    Each repetition runs with the garbage collector paused, after a full
+    collection, like ``timeit``. Returns the last value ``fn`` returned.
+    """
+    results = request.config.stash.setdefault(_results_key, [])
+
+    def measure(name: str, size: str, fn, *, repeat: int = 5, warmup: int = 1, **params):
+        value = None
+        for _ in range(warmup):
+            value = fn()
+        times_ms = []
+        for _ in range(repeat):
+            gc.collect()
+            gc.disable()
+            try:
+                started = time.perf_counter()
+                value = fn()
+                times_ms.append((time.perf_counter() - started) * 1000)
+            finally:
+                gc.enable()
+        results.append(BenchmarkResult(name=name, size=size, times_ms=times_ms, params=params))
+        return value
+
+    return measure
+
+
+@pytest.fixture(scope="session")
+def store_workspace(tmp_path_factory):
+    """Return a function mapping a size name to a populated workspace (built once per size)."""
+    built: dict[str, tuple[Path, list[str]]] = {}
+
+    def get(size: str) -> tuple[Path, list[str]]:
+        if size not in built:
+            path = tmp_path_factory.mktemp(f"workspace-{size}")
+            built[size] = (path, build_store_workspace(path, SIZES[size]))
+        return built[size]
+
+    return get
+
+
+@pytest.fixture(scope="session")
+def api_client(_ml_deps):
+    """A test client of the full application, shared by the HTTP benchmarks."""
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = config.stash.get(_results_key, [])
+    if not results:
+        return
+    report = build_report(results)
+    save_report(report, Path(config.getoption("benchmark_report") or config.rootpath / DEFAULT_REPORT))
+
+    baseline = config.getoption("benchmark_baseline")
+    if baseline:
+        comparisons = compare(report, load_report(baseline), config.getoption("benchmark_threshold"))
+        config.stash[_comparisons_key] = comparisons
+        if any(c.regressed for c in comparisons) and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    results = config.stash.get(_results_key, [])
+    if not results:
+        return
+    terminalreporter.section("benchmarks (ms)")
+    width = max(len(r.key) for r in results)
+    terminalreporter.write_line(f"{'benchmark':<{width}}  {'median':>10}  {'min':>10}  {'max':>10}")
+    for result in results:
+        summary = result.to_dict()
+        terminalreporter.write_line(
+            f"{result.key:<{width}}  {summary['median_ms']:>10.2f}  {summary['min_ms']:>10.2f}  {summary['max_ms']:>10.2f}"
+        )
+    report_path = config.getoption("benchmark_report") or config.rootpath / DEFAULT_REPORT
+    terminalreporter.write_line(f"report written to {report_path}")
+
+    comparisons = config.stash.get(_comparisons_key, None)
+    if comparisons is not None:
+        terminalreporter.section("benchmark comparison")
+        for line in format_comparisons(comparisons, config.getoption("benchmark_threshold")).splitlines():
+            terminalreporter.write_line(line)
@@ -0,0 +1,190 @@
+"""
+JSON reports of the benchmark suite and their comparison.
+
+A report maps each benchmark key (``name[size]``) to its timing summary,
+alongside the environment it ran in. Two reports are compared on median
+time; a benchmark regresses when it got slower than the baseline by more
+than the relative threshold *and* by more than a small absolute floor, so
+sub-millisecond jitter never fails a comparison.
+
+Usage::
+
+    python tests/benchmarks/report.py compare .benchmarks/latest.json baseline.json --threshold 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+REPORT_VERSION = 1
+
+DEFAULT_THRESHOLD = 0.25
+
+# Slowdowns smaller than this never count as regressions
+MIN_DELTA_MS = 1.0
+
+_VERSIONED_PACKAGES = ("nirs4all", "numpy", "polars", "scikit-learn", "fastapi")
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark at one workload size."""
+
+    name: str
+    size: str
+    times_ms: list[float]
+    params: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+    def to_dict(self) -> dict[str, Any]:
+        times = self.times_ms
+        return {
+            "name": self.name,
+            "size": self.size,
+            "params": self.params,
+            "repeat": len(times),
+            "min_ms": min(times),
+            "median_ms": statistics.median(times),
+            "mean_ms": statistics.fmean(times),
+            "max_ms": max(times),
+            "stdev_ms": statistics.stdev(times) if len(times) > 1 else 0.0,
+        }
+
+
+def _package_version(name: str) -> str | None:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5, cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def environment() -> dict[str, Any]:
+    """Machine and package versions, so reports from different hosts are not mistaken for each other."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": _git_commit(),
+        "packages": {name: _package_version(name) for name in _VERSIONED_PACKAGES},
+    }
+
+
+def build_report(results: list[BenchmarkResult]) -> dict[str, Any]:
+    return {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now(UTC).isoformat(),
+        "environment": environment(),
+        "results": {result.key: result.to_dict() for result in results},
+    }
+
+
+def save_report(report: dict[str, Any], path: str | Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+    return path
+
+
+def load_report(path: str | Path) -> dict[str, Any]:
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    if report.get("version") != REPORT_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark report version {report.get('version')!r}")
+    return report
+
+
+@dataclass
+class Comparison:
+    """One benchmark's median time against the baseline."""
+
+    key: str
+    baseline_ms: float | None
+    current_ms: float | None
+    regressed: bool = False
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline_ms or self.current_ms is None:
+            return None
+        return self.current_ms / self.baseline_ms
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = MIN_DELTA_MS,
+) -> list[Comparison]:
+    """Compare two reports; benchmarks present in only one of them are listed but never regress."""
+    current_results = current.get("results", {})
+    baseline_results = baseline.get("results", {})
+    comparisons = []
+    for key in sorted(set(current_results) | set(baseline_results)):
+        now = current_results.get(key, {}).get("median_ms")
+        before = baseline_results.get(key, {}).get("median_ms")
+        regressed = (
+            now is not None
+            and before is not None
+            and now > before * (1 + threshold)
+            and now - before > min_delta_ms
+        )
+        comparisons.append(Comparison(key=key, baseline_ms=before, current_ms=now, regressed=regressed))
+    return comparisons
+
+
+def format_comparisons(comparisons: list[Comparison], threshold: float) -> str:
+    width = max([len(c.key) for c in comparisons] + [9])
+    lines = [f"{'benchmark':<{width}}  {'baseline':>10}  {'current':>10}  {'ratio':>6}"]
+    for c in comparisons:
+        before = f"{c.baseline_ms:.2f}" if c.baseline_ms is not None else "-"
+        now = f"{c.current_ms:.2f}" if c.current_ms is not None else "-"
+        ratio = f"{c.ratio:.2f}x" if c.ratio is not None else "new" if c.baseline_ms is None else "gone"
+        flag = "  REGRESSION" if c.regressed else ""
+        lines.append(f"{c.key:<{width}}  {before:>10}  {now:>10}  {ratio:>6}{flag}")
+    regressions = sum(c.regressed for c in comparisons)
+    lines.append(f"{regressions} regression(s) beyond +{threshold:.0%} (median ms)")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="report.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compare_cmd = commands.add_parser("compare", help="Compare a report against a baseline")
+    compare_cmd.add_argument("current")
+    compare_cmd.add_argument("baseline")
+    compare_cmd.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    comparisons = compare(load_report(args.current), load_report(args.baseline), args.threshold)
+    print(format_comparisons(comparisons, args.threshold))
+    return 1 if any(c.regressed for c in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
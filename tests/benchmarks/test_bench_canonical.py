@@ -0,0 +1,55 @@
+"""Canonical <-> editor pipeline conversion and validation, uncached and memoized."""
+
+from __future__ import annotations
+
+import pytest
+
+from .workloads import SIZE_NAMES
+
+# Copies of the concatenated preset pipelines per workload size
+PRESET_COPIES = {"small": 1, "medium": 4, "large": 16}
+
+
+def _preset_pipelines() -> list[list]:
+    from api.preset_loader import list_presets, load_preset
+
+    pipelines = []
+    for preset in list_presets():
+        for variant in preset.get("variants") or [None]:
+            try:
+                pipelines.append(load_preset(preset["id"], variant)["pipeline"])
+            except Exception:
+                continue
+    return pipelines
+
+
+@pytest.mark.parametrize("size", SIZE_NAMES)
+def test_canonical_conversion(bench, size):
+    from api.pipeline_canonical import (
+        _canonical_to_editor,
+        _editor_to_canonical,
+        canonical_to_editor,
+        conversion_cache,
+        editor_to_canonical,
+    )
+
+    payload = {"pipeline": [step for pipeline in _preset_pipelines() for step in pipeline] * PRESET_COPIES[size]}
+    params = {"n_steps": len(payload["pipeline"])}
+    conversion_cache.clear()
+
+    steps = bench("canonical.to_editor.uncached", size, lambda: _canonical_to_editor(payload), **params)
+    bench("canonical.to_editor.cached", size, lambda: canonical_to_editor(payload), **params)
+    canonical = bench("canonical.to_canonical.uncached", size, lambda: _editor_to_canonical(steps), **params)
+    assert bench("canonical.to_canonical.cached", size, lambda: editor_to_canonical(steps), **params) == canonical
+
+
+def test_canonical_validation(bench):
+    from api.pipeline_canonical import _validate_canonical, conversion_cache, validate_canonical
+
+    # Validation expands generators, so a single (the largest) preset is enough
+    largest = max(_preset_pipelines(), key=len)
+    params = {"n_steps": len(largest)}
+    conversion_cache.clear()
+
+    expected = bench("canonical.validate.uncached", "preset", lambda: _validate_canonical(largest), **params)
+    assert bench("canonical.validate.cached", "preset", lambda: validate_canonical(largest), **params) == expected
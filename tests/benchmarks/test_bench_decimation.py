@@ -0,0 +1,38 @@
+"""Wavelength decimation of long spectra (LTTB and the summary modes)."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from .workloads import SIZE_NAMES
+
+# Points per spectrum; decimation targets long, high-resolution spectra
+POINTS = {"small": 1_000, "medium": 10_000, "large": 50_000}
+
+N_SPECTRA = 50
+
+TARGET_POINTS = 1_000
+
+
+@pytest.mark.parametrize("size", SIZE_NAMES)
+def test_decimation(bench, size):
+    from api.shared.decimation import DECIMATION_MODES, decimate_wavelengths, lttb_decimate
+
+    n = POINTS[size]
+    x = np.linspace(900.0, 2500.0, n)
+    y = np.sin(x / 40.0) + np.exp(-(((x - 1940.0) / 30.0) ** 2))
+    spectra = np.vstack([y + np.random.default_rng(i).normal(scale=0.05, size=n) for i in range(N_SPECTRA)])
+    target = min(TARGET_POINTS, n // 2)
+
+    indices = bench("decimation.lttb", size, lambda: lttb_decimate(x, y, target), n_points=n, target=target)
+    assert len(indices) == target
+    for mode in DECIMATION_MODES:
+        bench(
+            f"decimation.{mode}",
+            size,
+            lambda m=mode: decimate_wavelengths(x, spectra, target, mode=m),
+            n_points=n,
+            n_spectra=N_SPECTRA,
+            target=target,
+        )
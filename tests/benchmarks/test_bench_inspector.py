@@ -0,0 +1,46 @@
+"""Inspector scatter and fold-stability endpoints on a populated store."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from .workloads import SIZE_NAMES, SIZES
+
+# Chains selected at once in the inspector
+SELECTED_CHAINS = 20
+
+
+@pytest.fixture
+def inspector_workspace(store_workspace):
+    """Point the inspector at the synthetic workspace of a size; yields its chain ids."""
+    import api.inspector
+
+    def select(size: str) -> list[str]:
+        workspace, chain_ids = store_workspace(size)
+        patcher.start().get_current_workspace.return_value = SimpleNamespace(path=str(workspace))
+        return chain_ids
+
+    patcher = patch.object(api.inspector, "workspace_manager")
+    yield select
+    patcher.stop()
+
+
+@pytest.mark.parametrize("size", SIZE_NAMES)
+@pytest.mark.parametrize("endpoint", ["scatter", "fold-stability"])
+def test_inspector_endpoint(bench, api_client, inspector_workspace, size, endpoint):
+    chain_ids = inspector_workspace(size)[:SELECTED_CHAINS]
+    body = {"chain_ids": chain_ids, "partition": "val"}
+
+    def post():
+        response = api_client.post(f"/api/inspector/{endpoint}", json=body)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    result = bench(f"inspector.{endpoint}", size, post, chains=len(chain_ids), n_folds=SIZES[size].n_folds)
+    if endpoint == "scatter":
+        assert len(result["points"]) == len(chain_ids)
+    else:
+        assert result["total_chains"] == len(chain_ids)
@@ -0,0 +1,40 @@
+"""Playground pipeline preview (``PlaygroundExecutor.execute``)."""
+
+from __future__ import annotations
+
+import pytest
+
+from .workloads import SIZE_NAMES, SIZES, synthetic_spectra
+
+PREVIEW_STEPS = [
+    {"id": "snv", "type": "preprocessing", "name": "StandardNormalVariate", "params": {}},
+    {"id": "sg", "type": "preprocessing", "name": "SavitzkyGolay", "params": {"window_length": 11, "polyorder": 2, "deriv": 1}},
+    {"id": "kfold", "type": "splitting", "name": "KFold", "params": {"n_splits": 5}},
+]
+
+
+@pytest.mark.parametrize("size", SIZE_NAMES)
+def test_playground_execute(bench, size):
+    from api.playground import PlaygroundData, PlaygroundExecutor, PlaygroundStep, SamplingOptions
+
+    workload = SIZES[size]
+    X, y, wavelengths = synthetic_spectra(workload.n_samples, workload.n_features)
+    steps = [PlaygroundStep(**step) for step in PREVIEW_STEPS]
+    executor = PlaygroundExecutor()
+
+    response = bench(
+        "playground.execute",
+        size,
+        lambda: executor.execute(
+            PlaygroundData(x=[]),
+            steps,
+            SamplingOptions(method="all"),
+            X_np=X,
+            y_np=y,
+            wavelengths_np=wavelengths.tolist(),
+        ),
+        n_samples=workload.n_samples,
+        n_features=workload.n_features,
+        steps=[step["name"] for step in PREVIEW_STEPS],
+    )
+    assert response.success
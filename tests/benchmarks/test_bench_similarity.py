@@ -0,0 +1,49 @@
+"""Playground sample similarity: full scan versus the cached neighbour index."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from .workloads import SIZE_NAMES, SIZES, synthetic_spectra
+
+TOP_K = 20
+
+# Reference samples queried per repetition
+N_QUERIES = 10
+
+
+def _full_scan(X, reference_idx: int):
+    distances = np.sqrt(np.sum((X - X[reference_idx]) ** 2, axis=1))
+    order = np.argsort(distances, kind="stable")
+    return order[order != reference_idx][:TOP_K]
+
+
+@pytest.mark.parametrize("size", SIZE_NAMES)
+def test_similar_samples(bench, size):
+    from api.shared.metrics_computer import MetricsComputer
+    from api.shared.neighbor_index import NeighborIndex, neighbor_index_cache
+
+    workload = SIZES[size]
+    X, _, _ = synthetic_spectra(workload.n_samples, workload.n_features)
+    references = [int(i) for i in np.random.default_rng(1).integers(0, len(X), size=N_QUERIES)]
+    params = {"n_samples": workload.n_samples, "n_features": workload.n_features, "queries": N_QUERIES, "top_k": TOP_K}
+
+    expected = bench("similarity.full_scan", size, lambda: [_full_scan(X, i) for i in references], **params)
+
+    neighbor_index_cache.clear()
+    index = bench("similarity.index_build", size, lambda: NeighborIndex(X, "euclidean"), repeat=3, warmup=0, **params)
+    found = bench("similarity.index_query", size, lambda: [index.query(i, TOP_K)[0] for i in references], **params)
+
+    # End to end, including the cache key of the matrix (brute force below the index threshold)
+    computer = MetricsComputer()
+    similar = bench(
+        "similarity.get_similar_samples",
+        size,
+        lambda: [computer.get_similar_samples(X, i, top_k=TOP_K)[0] for i in references],
+        **params,
+    )
+
+    for want, got, call in zip(expected, found, similar):
+        np.testing.assert_array_equal(got, want)
+        np.testing.assert_array_equal(call, want)
@@ -0,0 +1,51 @@
+"""Paging through a dataset with the ``/spectra`` endpoint."""
+
+from __future__ import annotations
+
+import pytest
+
+from .workloads import SIZE_NAMES, SIZES, build_spectro_dataset
+
+
+@pytest.fixture
+def spectra_dataset():
+    """Register an in-memory dataset of a size under a benchmark id."""
+    from api import spectra
+
+    registered: list[str] = []
+
+    def register(size: str) -> str:
+        dataset_id = f"benchmark-{size}"
+        spectra._dataset_cache[dataset_id] = build_spectro_dataset(SIZES[size])
+        registered.append(dataset_id)
+        return dataset_id
+
+    yield register
+    for dataset_id in registered:
+        spectra._clear_dataset_cache(dataset_id)
+
+
+@pytest.mark.parametrize("size", SIZE_NAMES)
+@pytest.mark.parametrize("max_wavelengths", [None, 256], ids=["full", "decimated"])
+def test_spectra_paging(bench, api_client, spectra_dataset, size, max_wavelengths):
+    dataset_id = spectra_dataset(size)
+    workload = SIZES[size]
+    n_train = int(workload.n_samples * 0.8)
+    params = {"partition": "train", "include_y": "true"}
+    if max_wavelengths:
+        params["max_wavelengths"] = max_wavelengths
+
+    def page_through():
+        rows = 0
+        for start in range(0, n_train, workload.page_size):
+            response = api_client.get(
+                f"/api/spectra/{dataset_id}", params={**params, "start": start, "end": start + workload.page_size}
+            )
+            assert response.status_code == 200, response.text
+            rows += len(response.json()["spectra"])
+        return rows
+
+    name = "spectra.page" if max_wavelengths is None else "spectra.page_decimated"
+    rows = bench(name, size, page_through, n_samples=n_train, page_size=workload.page_size,
+                 n_features=workload.n_features, max_wavelengths=max_wavelengths)
+    assert rows == n_train
@@ -0,0 +1,29 @@
+"""Run listing enrichment (``StoreAdapter.get_enriched_runs``)."""
+
+from __future__ import annotations
+
+import pytest
+
+from .workloads import SIZE_NAMES, SIZES
+
+
+@pytest.mark.parametrize("size", SIZE_NAMES)
+def test_store_get_enriched_runs(bench, store_workspace, size):
+    from api.store_adapter import StoreAdapter
+
+    workspace, _ = store_workspace(size)
+    workload = SIZES[size]
+
+    def enriched_runs():
+        with StoreAdapter(workspace) as adapter:
+            return adapter.get_enriched_runs(limit=50)
+
+    result = bench(
+        "store.get_enriched_runs",
+        size,
+        enriched_runs,
+        n_runs=workload.n_runs,
+        n_datasets=workload.n_datasets,
+        n_models=workload.n_models,
+    )
+    assert len(result["runs"]) == min(workload.n_runs, 50)
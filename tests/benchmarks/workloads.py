@@ -0,0 +1,135 @@
+"""
+Synthetic, seeded workloads for the benchmark suite.
+
+Every generator is deterministic for a given size, so two runs of the
+suite (on the same machine) time exactly the same work.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class WorkloadSize:
+    """Dimensions of the synthetic datasets and workspaces of one size."""
+
+    n_samples: int
+    n_features: int
+    n_runs: int
+    n_datasets: int
+    n_models: int
+    n_folds: int
+    page_size: int = 100
+
+
+SIZES: dict[str, WorkloadSize] = {
+    "small": WorkloadSize(n_samples=200, n_features=256, n_runs=4, n_datasets=2, n_models=4, n_folds=3),
+    "medium": WorkloadSize(n_samples=1_000, n_features=1_024, n_runs=20, n_datasets=4, n_models=8, n_folds=5),
+    "large": WorkloadSize(n_samples=5_000, n_features=2_048, n_runs=60, n_datasets=6, n_models=12, n_folds=5),
+}
+
+SIZE_NAMES = tuple(SIZES)
+
+PARTITIONS = ("train", "val", "test")
+
+
+def synthetic_spectra(n_samples: int, n_features: int, seed: int = 0):
+    """Smooth NIR-like spectra with a target linear in a few latent factors."""
+    rng = np.random.default_rng(seed)
+    wavelengths = np.linspace(900.0, 2500.0, n_features)
+    bands = np.stack([np.exp(-(((wavelengths - center) / 60.0) ** 2)) for center in (1200, 1450, 1730, 1940, 2300)])
+    latent = rng.normal(size=(n_samples, len(bands)))
+    baseline = rng.normal(scale=0.1, size=(n_samples, 1)) + np.outer(rng.normal(scale=1e-4, size=n_samples), wavelengths)
+    X = 1.0 + latent @ bands + baseline + rng.normal(scale=0.01, size=(n_samples, n_features))
+    y = latent @ np.array([2.0, -1.0, 0.5, 0.0, 1.5]) + rng.normal(scale=0.1, size=n_samples)
+    return X, y, wavelengths
+
+
+def build_spectro_dataset(size: WorkloadSize, seed: int = 0):
+    """An in-memory nirs4all dataset with an 80/20 train/test split."""
+    from nirs4all.data import SpectroDataset
+
+    X, y, wavelengths = synthetic_spectra(size.n_samples, size.n_features, seed)
+    headers = [f"{w:.2f}" for w in wavelengths]
+    n_train = int(size.n_samples * 0.8)
+    dataset = SpectroDataset("benchmark")
+    dataset.add_samples(X[:n_train], {"partition": "train"}, headers=headers, header_unit="nm")
+    dataset.add_samples(X[n_train:], {"partition": "test"}, headers=headers, header_unit="nm")
+    dataset.add_targets(y)
+    return dataset
+
+
+def build_store_workspace(path: Path, size: WorkloadSize, seed: int = 0) -> list[str]:
+    """Fill a workspace store with completed runs, chains, fold predictions and arrays.
+
+    Returns the chain ids, in creation order.
+    """
+    from nirs4all.pipeline.storage import WorkspaceStore
+
+    rng = np.random.default_rng(seed)
+    n_points = min(size.n_samples, 500)
+    store = WorkspaceStore(path)
+    chain_ids: list[str] = []
+    array_records: list[dict] = []
+    try:
+        for run_idx in range(size.n_runs):
+            datasets = [f"dataset_{d}" for d in range(size.n_datasets)]
+            run_id = store.begin_run(
+                f"run-{run_idx:03d}",
+                config={"n_pipelines": size.n_datasets},
+                datasets=[{"name": ds, "n_samples": n_points, "n_features": size.n_features} for ds in datasets],
+            )
+            for dataset in datasets:
+                pipeline_id = store.begin_pipeline(
+                    run_id,
+                    f"run-{run_idx:03d}-{dataset}",
+                    expanded_config=[{"class": "sklearn.preprocessing.StandardScaler"}, {"model": {"class": "PLSRegression"}}],
+                    generator_choices=[],
+                    dataset_name=dataset,
+                    dataset_hash=f"hash-{dataset}",
+                )
+                for model_idx in range(size.n_models):
+                    model_name = f"PLS({model_idx + 2})"
+                    chain_id = store.save_chain(
+                        pipeline_id, steps=[], model_step_idx=1, model_class="PLSRegression",
+                        preprocessings="SNV>SG", fold_strategy="per_fold", fold_artifacts={},
+                        shared_artifacts={}, dataset_name=dataset,
+                    )
+                    chain_ids.append(chain_id)
+                    for fold_idx in range(size.n_folds):
+                        for partition in PARTITIONS:
+                            score = float(0.1 + rng.random() * 0.5)
+                            prediction_id = store.save_prediction(
+                                pipeline_id, chain_id, dataset, model_name, "PLSRegression",
+                                fold_id=str(fold_idx), partition=partition,
+                                val_score=score, test_score=score * 1.1, train_score=score * 0.8,
+                                metric="rmse", task_type="regression", n_samples=n_points,
+                                n_features=size.n_features, scores={}, best_params={},
+                                branch_id=None, branch_name=None, exclusion_count=0, exclusion_rate=0.0,
+                                preprocessings="SNV>SG",
+                            )
+                            y_true = rng.normal(size=n_points)
+                            array_records.append({
+                                "prediction_id": prediction_id,
+                                "dataset_name": dataset,
+                                "model_name": model_name,
+                                "fold_id": str(fold_idx),
+                                "partition": partition,
+                                "metric": "rmse",
+                                "val_score": score,
+                                "task_type": "regression",
+                                "y_true": y_true,
+                                "y_pred": y_true + rng.normal(scale=score, size=n_points),
+                                "sample_indices": np.arange(n_points),
+                            })
+                    store.update_chain_summary(chain_id)
+                store.complete_pipeline(pipeline_id, best_val=0.1, best_test=0.1, metric="rmse", duration_ms=1)
+            store.complete_run(run_id, {})
+        store.array_store.save_batch(array_records)
+    finally:
+        store.close()
+    return chain_ids
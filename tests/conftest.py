@@ -67,11 +67,55 @@ def _guard_against_real_app_config():
         pass
 
 
+@pytest.fixture(autouse=True, scope="session")
+def _isolate_persistent_stores(tmp_path_factory):
+    """Point the global job registry and persistent caches at a session temp dir.
+
+    They default to the app config dir, which is the user's real one unless
+    a test redirects it; jobs and cache files written through the global
+    instances would otherwise accumulate in ``~/.nirs4all``.
+    """
+    try:
+        from api.jobs.manager import job_registry
+        from api.shared.embedding_cache import embedding_cache
+        from api.shared.operator_cache import operator_discovery_cache
+        from api.shared.spectral_stats import spectral_stats_cache
+    except Exception:
+        yield
+        return
+
+    root = tmp_path_factory.mktemp("app_data")
+    job_registry.set_root(root / "jobs")
+    embedding_cache.set_cache_dir(root / "cache" / "embeddings")
+    spectral_stats_cache.set_cache_dir(root / "cache" / "spectral_stats")
+    operator_discovery_cache.set_cache_file(root / "cache" / "operator_discovery.json")
+    yield
+    job_registry.set_root(None)
+    embedding_cache.set_cache_dir(None)
+    spectral_stats_cache.set_cache_dir(None)
+    operator_discovery_cache.set_cache_file(None)
+
+
 # ============================================================================
 # Pytest Hooks
 # ============================================================================
 
 
+def pytest_addoption(parser):
+    """Options of the opt-in benchmark suite (see tests/benchmarks/README.md)."""
+    group = parser.getgroup("benchmark", "backend performance benchmarks")
+    group.addoption("--benchmark", action="store_true", default=False,
+                    help="Run the benchmark suite in tests/benchmarks")
+    group.addoption("--benchmark-sizes", default="small,medium",
+                    help="Comma-separated workload sizes: small, medium, large (default: small,medium)")
+    group.addoption("--benchmark-report", default=None,
+                    help="Path of the JSON report (default: .benchmarks/latest.json)")
+    group.addoption("--benchmark-baseline", default=None,
+                    help="Baseline JSON report; regressions against it fail the session")
+    group.addoption("--benchmark-threshold", type=float, default=0.25,
+                    help="Relative slowdown of the median counted as a regression (default: 0.25)")
+
+
 def pytest_configure(config):
     """Register custom markers."""
     config.addinivalue_line(
@@ -90,6 +134,10 @@ def pytest_configure(config):
         "markers",
         "cross_platform: mark test as cross-platform path handling",
     )
+    config.addinivalue_line(
+        "markers",
+        "benchmark: mark test as part of the opt-in benchmark suite",
+    )
 
 
 def pytest_collection_modifyitems(config, items):
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from sklearn.linear_model import Ridge
+
+from api import automl
+from api.jobs.manager import JobManager, JobType
+from api.shared.automl_search import (
+    SuccessiveHalvingSearch,
+    TrialCandidate,
+    fold_budgets,
+    sample_candidates,
+)
+
+RIDGE_SPACE = [
+    {
+        "model_name": "Ridge",
+        "params": [{"name": "alpha", "type": "float", "low": 0.001, "high": 1000.0, "log": True}],
+    }
+]
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(90, 15))
+    y = X @ rng.normal(size=15) + rng.normal(scale=0.1, size=90)
+    return X, y
+
+
+def _ridge(candidate: TrialCandidate):
+    return Ridge(**candidate.params)
+
+
+def _always(_progress, _message=""):
+    return True
+
+
+def test_sampling_is_reproducible_distinct_and_balanced():
+    space = [
+        *RIDGE_SPACE,
+        {"model_name": "KNeighborsRegressor", "params": [{"name": "n_neighbors", "type": "int", "low": 1, "high": 30}]},
+        {"model_name": "PLSRegression", "params": []},
+    ]
+    first = sample_candidates(space, 12, random_state=1)
+    again = sample_candidates(space, 12, random_state=1)
+
+    assert [(c.model_name, c.params) for c in first] == [(c.model_name, c.params) for c in again]
+    assert [c.trial_id for c in first] == list(range(12))
+    assert len({repr((c.model_name, sorted(c.params.items()))) for c in first}) == 12
+    # The parameter-free model can only contribute one configuration
+    assert sum(c.model_name == "PLSRegression" for c in first) == 1
+    assert all(1 <= c.params["n_neighbors"] <= 30 for c in first if c.model_name == "KNeighborsRegressor")
+
+
+def test_fold_budgets():
+    assert fold_budgets(5, 3, early_stopping=True) == [1, 3, 5]
+    assert fold_budgets(10, 3, early_stopping=True) == [1, 3, 10]
+    assert fold_budgets(5, 2, early_stopping=True) == [1, 2, 5]
+    assert fold_budgets(5, 3, early_stopping=False) == [5]
+
+
+def test_successive_halving_prunes_and_streams_trials(data):
+    X, y = data
+    candidates = sample_candidates(RIDGE_SPACE, 9, random_state=0)
+    streamed: list[tuple[int, str]] = []
+    search = SuccessiveHalvingSearch(X, y, _ridge, metric="rmse", cv_folds=5, random_state=0, n_workers=3)
+    search.run(candidates, lambda c: streamed.append((c.trial_id, c.status)), _always)
+
+    statuses = [status for _, status in streamed]
+    assert sorted(trial_id for trial_id, _ in streamed) == list(range(9))
+    assert statuses.count("pruned") == 8 and statuses[-1] == "completed"
+    best = search.best(candidates)
+    assert len(best.fold_scores) == 5
+    assert best.duration_seconds > 0
+    # rmse: lower is better, so the 3 lowest one-fold errors reach the second rung
+    promoted = {c.trial_id for c in candidates if len(c.fold_scores) >= 3}
+    assert promoted == {c.trial_id for c in sorted(candidates, key=lambda c: c.fold_scores[0])[:3]}
+    assert search.ranked(candidates)[0] is best
+
+
+def test_failed_trials_are_reported_without_stopping_the_search(data):
+    X, y = data
+    candidates = [TrialCandidate(0, "Ridge", {"alpha": 1.0}), TrialCandidate(1, "Ridge", {"bogus": 1})]
+    streamed: list[TrialCandidate] = []
+    search = SuccessiveHalvingSearch(X, y, _ridge, cv_folds=3, early_stopping=False)
+    search.run(candidates, streamed.append, _always)
+
+    assert {c.trial_id: c.status for c in streamed} == {0: "completed", 1: "failed"}
+    assert "bogus" in candidates[1].error
+
+
+def test_cancellation_is_honoured_between_trials(data):
+    X, y = data
+    candidates = sample_candidates(RIDGE_SPACE, 6, random_state=0)
+    started: list[int] = []
+
+    def should_continue(_progress, _message):
+        started.append(len(started))
+        return len(started) <= 2
+
+    streamed: list[TrialCandidate] = []
+    search = SuccessiveHalvingSearch(X, y, _ridge, cv_folds=2, early_stopping=False, n_workers=1)
+    search.run(candidates, streamed.append, should_continue)
+
+    assert search.cancelled
+    assert [c.status for c in streamed] == ["completed", "completed"]
+    assert [c.status for c in candidates[2:]] == ["pending"] * 4
+
+
+class _Dataset:
+    def __init__(self, X, y):
+        self._X, self._y = X, y
+
+    def x(self, _selector, layout="2d"):
+        return self._X
+
+    def y(self, _selector):
+        return self._y.reshape(-1, 1)
+
+
+def test_automl_task_streams_trials_into_job_history(data, monkeypatch):
+    from api import spectra
+
+    X, y = data
+    manager = JobManager()
+    notifications: list[tuple[int, int]] = []
+    lock = threading.Lock()
+
+    def record(_job_id, _trial, trial_num, total):
+        with lock:
+            notifications.append((trial_num, total))
+
+    monkeypatch.setattr(automl, "job_manager", manager)
+    monkeypatch.setattr(automl, "_send_trial_notification", record)
+    monkeypatch.setattr(spectra, "_load_dataset", lambda _id: _Dataset(X, y))
+
+    job = manager.create_job(
+        JobType.AUTOML,
+        {"dataset_id": "ds", "n_trials": 6, "cv_folds": 3, "metric": "r2", "models": RIDGE_SPACE, "random_state": 0},
+    )
+    result = automl._run_automl_task(job, _always)
+    manager.shutdown()
+
+    assert result["total_trials"] == 6
+    assert result["completed_trials"] == 2 and result["pruned_trials"] == 4
+    assert result["best_model"] == "Ridge" and result["best_score"] > 0.9
+    assert result["trials"][0]["params"] == result["best_params"]
+    assert sorted(t["trial_id"] for t in job.history) == list(range(6))
+    assert notifications == [(i, 6) for i in range(1, 7)]
+    assert job.metrics["trials_completed"] == 6
+    assert all(t["duration_seconds"] > 0 for t in job.history)
+
+
+def test_training_data_concatenates_all_sources():
+    pytest.importorskip("nirs4all")
+    from nirs4all.data import SpectroDataset
+
+    rng = np.random.default_rng(0)
+    sources = [rng.normal(size=(20, 30)), rng.normal(size=(20, 12))]
+    dataset = SpectroDataset("multi")
+    dataset.add_samples(sources, {"partition": "train"})
+    dataset.add_targets(rng.normal(size=20))
+
+    X, y = automl._load_training_data(dataset, "train")
+
+    np.testing.assert_allclose(X, np.hstack(sources))
+    assert y.shape == (20,)
@@ -0,0 +1,59 @@
+"""Tests for the benchmark report comparison used by ``tests/benchmarks``."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# tests/ holds the benchmarks package; do not rely on pytest's rootdir insertion
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks.report import (  # noqa: E402
+    BenchmarkResult,
+    build_report,
+    compare,
+    format_comparisons,
+    load_report,
+    main,
+    save_report,
+)
+
+
+def _report(**medians):
+    return build_report([
+        BenchmarkResult(name=name, size="small", times_ms=[ms, ms, ms]) for name, ms in medians.items()
+    ])
+
+
+def test_regression_needs_relative_and_absolute_slowdown():
+    baseline = _report(fast=0.2, slow=100.0, steady=50.0, removed=5.0)
+    current = _report(fast=0.9, slow=140.0, steady=55.0, added=5.0)
+
+    by_key = {c.key: c for c in compare(current, baseline, threshold=0.25)}
+
+    # +350% but under the 1 ms floor
+    assert not by_key["fast[small]"].regressed
+    assert by_key["slow[small]"].regressed
+    assert by_key["slow[small]"].ratio == pytest.approx(1.4)
+    assert not by_key["steady[small]"].regressed
+    assert by_key["added[small]"].baseline_ms is None and not by_key["added[small]"].regressed
+    assert by_key["removed[small]"].current_ms is None and not by_key["removed[small]"].regressed
+
+    table = format_comparisons(list(by_key.values()), 0.25)
+    assert "1 regression(s) beyond +25%" in table
+    assert "new" in table and "gone" in table
+
+
+def test_reports_round_trip_and_cli_exit_code(tmp_path):
+    baseline = save_report(_report(step=10.0), tmp_path / "nested" / "baseline.json")
+    current = save_report(_report(step=20.0), tmp_path / "current.json")
+
+    assert load_report(baseline)["results"]["step[small]"]["median_ms"] == 10.0
+    assert main(["compare", str(current), str(baseline)]) == 1
+    assert main(["compare", str(current), str(baseline), "--threshold", "1.5"]) == 0
+
+    (tmp_path / "old.json").write_text('{"version": 0}')
+    with pytest.raises(ValueError, match="unsupported"):
+        load_report(tmp_path / "old.json")
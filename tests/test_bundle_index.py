@@ -0,0 +1,112 @@
+"""Tests for the bundle metadata index behind the trained-model listings."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+os.environ.setdefault("SENTRY_DSN", "")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.shared.bundle_index import BundleIndex  # noqa: E402
+
+
+class CountingLoader:
+    """Stand-in for nirs4all's BundleLoader that counts opened archives."""
+
+    opened: list[str] = []
+
+    def __init__(self, path: str):
+        CountingLoader.opened.append(path)
+        self.metadata = SimpleNamespace(
+            pipeline_uid=f"uid-{Path(path).stem}",
+            nirs4all_version="0.9.0",
+            preprocessing_chain="SNV > PLS",
+        )
+
+    def get_step_info(self):
+        return [{"class_name": "SNV"}, {"class_name": "PLSRegression", "is_model": True}]
+
+
+@pytest.fixture(autouse=True)
+def reset_loader():
+    CountingLoader.opened = []
+
+
+def _make_bundles(exports_dir: Path, count: int) -> list[Path]:
+    paths = []
+    for i in range(count):
+        dataset_dir = exports_dir / f"dataset_{i % 20}"
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        path = dataset_dir / f"model_{i}.n4a"
+        path.write_bytes(b"PK\x05\x06" + b"\x00" * 18)
+        paths.append(path)
+    return paths
+
+
+def test_warm_listing_of_2000_bundles_opens_no_archive(tmp_path):
+    import api.models
+
+    workspace = MagicMock()
+    workspace.path = str(tmp_path)
+    _make_bundles(tmp_path / "workspace" / "exports", 2000)
+
+    with (
+        patch.object(api.models, "workspace_manager") as mock_wm,
+        patch.object(api.models, "get_cached", side_effect=lambda name: CountingLoader if name == "BundleLoader" else None),
+    ):
+        mock_wm.get_current_workspace.return_value = workspace
+
+        cold = asyncio.run(api.models.list_trained_models())
+        assert cold["total"] == 2000
+        assert len(CountingLoader.opened) == 2000
+
+        CountingLoader.opened = []
+        warm = asyncio.run(api.models.list_trained_models())
+        assert CountingLoader.opened == []
+
+    assert warm["total"] == 2000
+    first = next(m for m in warm["models"] if m.id == "model_7")
+    assert first.pipeline_uid == "uid-model_7"
+    assert first.dataset_name == "dataset_7"
+    assert first.preprocessing_chain == "SNV > PLS"
+    assert (tmp_path / ".nirs4all" / "bundle_index.json").exists()
+
+
+def test_only_new_or_changed_bundles_are_reopened(tmp_path):
+    exports_dir = tmp_path / "exports"
+    paths = _make_bundles(exports_dir, 5)
+    index_file = tmp_path / "bundle_index.json"
+    BundleIndex(exports_dir, index_file).scan(CountingLoader)
+
+    paths[0].write_bytes(b"rewritten bundle with a different size")
+    paths[1].unlink()
+    new_bundle = exports_dir / "new.n4a"
+    new_bundle.write_bytes(b"new")
+    CountingLoader.opened = []
+
+    # A fresh index instance reads the persisted entries
+    entries = BundleIndex(exports_dir, index_file).scan(CountingLoader)
+
+    assert sorted(CountingLoader.opened) == sorted([str(paths[0]), str(new_bundle)])
+    assert {entry.path for entry in entries} == {paths[0], *paths[2:], new_bundle}
+    assert all(entry.fields["model_class"] == "PLSRegression" for entry in entries)
+
+
+def test_scan_without_loader_does_not_index_bundles(tmp_path):
+    exports_dir = tmp_path / "exports"
+    _make_bundles(exports_dir, 3)
+    index = BundleIndex(exports_dir, tmp_path / "bundle_index.json")
+
+    entries = index.scan(None)
+    assert [entry.fields for entry in entries] == [{}, {}, {}]
+
+    index.scan(CountingLoader)
+    assert len(CountingLoader.opened) == 3
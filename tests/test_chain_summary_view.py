@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("nirs4all")
+
+import api.shared  # noqa: F401  (initialise the shared package before lazy_imports)
+from api import chain_summary_view as csv_module
+from api.aggregated_predictions import _build_chain_summary_records
+from api.chain_summary_view import ChainSummaryView
+from api.inspector import _normalize_chain_records
+from api.lazy_imports import _do_load_ml_deps, is_ml_ready
+
+if not is_ml_ready():
+    _do_load_ml_deps()
+
+from nirs4all.pipeline.storage import WorkspaceStore  # noqa: E402
+
+
+def _add_run(store: WorkspaceStore, name: str, datasets: list[str], models: list[tuple[str, float]]) -> str:
+    run_id = store.begin_run(name, config={}, datasets=[{"name": ds} for ds in datasets])
+    for dataset in datasets:
+        pipeline_id = store.begin_pipeline(
+            run_id,
+            f"{name}-{dataset}",
+            expanded_config=[{"class": "sklearn.preprocessing.StandardScaler"}, {"model": {"class": "PLSRegression"}}],
+            generator_choices=[],
+            dataset_name=dataset,
+            dataset_hash=f"hash-{dataset}",
+        )
+        for model_class, base_score in models:
+            chain_id = store.save_chain(
+                pipeline_id,
+                steps=[],
+                model_step_idx=1,
+                model_class=model_class,
+                preprocessings="SNV>SG",
+                fold_strategy="per_fold",
+                fold_artifacts={},
+                shared_artifacts={},
+                dataset_name=dataset,
+            )
+            for fold_idx in range(2):
+                for partition, offset in (("train", -0.1), ("val", 0.0), ("test", 0.05)):
+                    store.save_prediction(
+                        pipeline_id, chain_id, dataset, model_class, model_class,
+                        fold_id=str(fold_idx), partition=partition,
+                        val_score=base_score + fold_idx * 0.01, test_score=base_score + offset,
+                        train_score=base_score - 0.1, metric="rmse", task_type="regression",
+                        n_samples=10, n_features=5, scores={}, best_params={},
+                        branch_id=None, branch_name=None, exclusion_count=0, exclusion_rate=0.0,
+                        preprocessings="SNV>SG",
+                    )
+            store.update_chain_summary(chain_id)
+        store.complete_pipeline(pipeline_id, best_val=base_score, best_test=base_score, metric="rmse", duration_ms=1)
+    store.complete_run(run_id, {})
+    return run_id
+
+
+@pytest.fixture
+def store(tmp_path):
+    csv_module._views.clear()
+    ws = WorkspaceStore(tmp_path)
+    _add_run(ws, "run-a", ["corn", "wheat"], [("PLSRegression", 0.4), ("Ridge", 0.3)])
+    _add_run(ws, "run-b", ["corn"], [("PLSRegression", 0.2)])
+    yield ws
+    ws.close()
+    csv_module._views.clear()
+
+
+def _direct_records(store):
+    df = store.query_chain_summaries()
+    return _build_chain_summary_records(store, [dict(row) for row in df.iter_rows(named=True)])
+
+
+def test_view_records_match_direct_enrichment(store):
+    view = csv_module.get_chain_summary_view(store)
+    assert view is not None
+    assert view.query(kind="aggregated") == _direct_records(store)
+
+    direct_inspector = _normalize_chain_records(store, store.query_chain_summaries(dataset_name="corn"))
+    assert view.query(kind="inspector", dataset_name="corn") == direct_inspector
+    assert view.distinct_values("dataset_name") == ["corn", "wheat"]
+    all_inspector = _normalize_chain_records(store, store.query_chain_summaries())
+    assert view.distinct_preprocessing_steps() == sorted(
+        {str(step) for record in all_inspector for step in record["preprocessing_steps"]}
+    )
+
+
+def test_sync_only_rematerializes_changed_runs(store, monkeypatch):
+    view = ChainSummaryView(store.workspace_path)
+    assert view.sync(store) == 2
+    assert view.sync(store) == 0
+
+    materialized: list[list[str]] = []
+    original = csv_module._materialize_runs
+
+    def tracking(store_, run_ids):
+        materialized.append(list(run_ids))
+        return original(store_, run_ids)
+
+    monkeypatch.setattr(csv_module, "_materialize_runs", tracking)
+    new_run = _add_run(store, "run-c", ["wheat"], [("Ridge", 0.1)])
+    assert view.sync(store) == 1
+    assert materialized == [[new_run]]
+    assert view.query(kind="aggregated") == _direct_records(store)
+
+
+def test_deleted_run_rows_are_removed(store):
+    view = csv_module.get_chain_summary_view(store)
+    run_id = view.distinct_values("run_id")[0]
+    store.delete_run(run_id)
+    csv_module.sync_chain_summary_view(store)
+    assert run_id not in view.distinct_values("run_id")
+    assert view.query(kind="aggregated") == _direct_records(store)
+
+
+def test_top_matches_store_ranking(store):
+    view = csv_module.get_chain_summary_view(store)
+    for kwargs in ({}, {"dataset_name": "corn"}, {"ascending": False}):
+        expected = [row["chain_id"] for row in store.query_top_chains(metric="rmse", n=3, **kwargs).iter_rows(named=True)]
+        got = [record["chain_id"] for record in view.top(metric="rmse", n=3, **kwargs)]
+        assert got == expected
+
+    with pytest.raises(ValueError):
+        view.top(metric="rmse", n=3, score_column="chain_id; DROP TABLE chain_summary")
+
+
+def test_non_sqlite_store_falls_back():
+    class _LegacyStore:
+        workspace_path = None
+
+    assert csv_module.query_chain_summary_records(_LegacyStore()) is None
+
+
+class _StoreProxy:
+    """Shares one open store across endpoint calls; hides the workspace for fallback."""
+
+    def __init__(self, store, workspace_path):
+        self._store = store
+        self.workspace_path = workspace_path
+
+    def __getattr__(self, name):
+        return getattr(self._store, name)
+
+    def close(self):
+        pass
+
+
+def _inspector_data(monkeypatch, store, *, use_view: bool, **params):
+    import asyncio
+
+    from api import inspector
+
+    proxy = _StoreProxy(store, store.workspace_path if use_view else None)
+    monkeypatch.setattr(inspector, "_get_store", lambda: proxy)
+    defaults = {
+        "run_id": None, "dataset_name": None, "model_class": None, "preprocessings": None,
+        "task_type": None, "metric": None, "sort_by": None, "sort_order": "asc", "limit": None, "offset": 0,
+    }
+    return asyncio.run(inspector.get_inspector_data(**{**defaults, **params}))
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"sort_by": "cv_val_score", "sort_order": "desc", "limit": 2, "offset": 1},
+    {"task_type": "regression", "preprocessings": ["SG"], "sort_by": "model_class"},
+    {"dataset_name": ["corn"], "task_type": "classification"},
+    {"preprocessings": ["missing-step"]},
+])
+def test_inspector_data_sql_path_matches_python_path(store, monkeypatch, params):
+    via_view = _inspector_data(monkeypatch, store, use_view=True, **params)
+    direct = _inspector_data(monkeypatch, store, use_view=False, **params)
+    assert [c["chain_id"] for c in via_view.chains] == [c["chain_id"] for c in direct.chains]
+    assert via_view.total == direct.total
+    assert via_view.available_models == direct.available_models
+    assert via_view.available_preprocessings == direct.available_preprocessings
+    assert via_view.available_runs == direct.available_runs
+
+
+def test_facets_are_cached_per_store_generation(store):
+    view = csv_module.get_chain_summary_view(store)
+    first = view.facets()
+    assert view.facets() is first
+
+    _add_run(store, "run-c", ["barley"], [("Ridge", 0.1)])
+    view.sync(store)
+    assert "barley" in view.facets()["datasets"]
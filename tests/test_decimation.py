@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from api.shared.decimation import (
+    DECIMATION_MODES,
+    as_numeric_axis,
+    decimate_summary,
+    decimate_wavelengths,
+    lttb_decimate,
+    lttb_decimate_batch,
+    minmax_decimate,
+    union_lttb,
+)
+
+
+def _reference_lttb(x, y, target_points):
+    """Straightforward per-bucket LTTB loop used as the correctness oracle."""
+    n = len(x)
+    if n <= target_points or target_points < 3:
+        return np.arange(n)
+    indices = np.empty(target_points, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    bucket_size = (n - 2) / (target_points - 2)
+    a_idx = 0
+    for i in range(1, target_points - 1):
+        start = int(1 + (i - 1) * bucket_size)
+        end = min(int(1 + i * bucket_size), n - 1)
+        next_start = end
+        next_end = min(int(1 + (i + 1) * bucket_size), n - 1)
+        if next_start >= next_end:
+            next_end = min(next_start + 1, n)
+        avg_x = np.mean(x[next_start:next_end])
+        avg_y = np.mean(y[next_start:next_end])
+        areas = np.abs(
+            (x[a_idx] - avg_x) * (y[start:end] - y[a_idx])
+            - (x[a_idx] - x[start:end]) * (avg_y - y[a_idx])
+        )
+        a_idx = start + int(np.argmax(areas))
+        indices[i] = a_idx
+    return indices
+
+
+def _spectrum(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(900.0, 2500.0, n)
+    y = np.sin(x / 40.0) + 0.3 * np.exp(-((x - 1700.0) / 8.0) ** 2) + rng.normal(scale=0.02, size=n)
+    return x, y
+
+
+@pytest.mark.parametrize("n,target", [(50, 10), (1000, 200), (1000, 999), (5000, 700), (20000, 120), (12345, 3)])
+def test_lttb_matches_reference(n, target):
+    x, y = _spectrum(n)
+    np.testing.assert_array_equal(lttb_decimate(x, y, target), _reference_lttb(x, y, target))
+
+
+def test_lttb_matches_reference_on_random_shapes():
+    rng = np.random.default_rng(7)
+    for _ in range(100):
+        n = int(rng.integers(5, 4000))
+        target = int(rng.integers(3, n + 3))
+        x = np.sort(rng.uniform(400, 2500, n))
+        y = rng.normal(size=n).cumsum()
+        np.testing.assert_array_equal(lttb_decimate(x, y, target), _reference_lttb(x, y, target))
+
+
+def test_batch_decimates_each_series_independently():
+    x, y = _spectrum(3000)
+    Y = np.vstack([y, -y, y ** 2])
+    batch = lttb_decimate_batch(x, Y, 250)
+    assert batch.shape == (3, 250)
+    for row, series in zip(batch, Y):
+        np.testing.assert_array_equal(row, _reference_lttb(x, series, 250))
+
+
+def test_no_decimation_when_under_target():
+    x, y = _spectrum(100)
+    np.testing.assert_array_equal(lttb_decimate(x, y, 200), np.arange(100))
+    np.testing.assert_array_equal(decimate_wavelengths(x, np.vstack([y, y]), 200, mode="envelope"), np.arange(100))
+
+
+def test_minmax_keeps_global_extremes():
+    rng = np.random.default_rng(1)
+    spectra = rng.normal(size=(30, 5000))
+    spectra[4, 1234] = 50.0
+    spectra[9, 4321] = -50.0
+    indices = minmax_decimate(spectra.min(axis=0), spectra.max(axis=0), 200)
+    assert len(indices) <= 200
+    assert {0, 1234, 4321, 4999} <= set(indices.tolist())
+
+
+def test_quantile_mode_keeps_features_absent_from_mean():
+    x = np.linspace(1000, 2000, 4000)
+    spectra = np.tile(np.sin(x / 50.0), (40, 1))
+    # A narrow band present in a quarter of the samples is washed out of the mean
+    spectra[:10, 2990:3010] += 5.0
+    mean_indices = decimate_wavelengths(x, spectra, 100, mode="mean")
+    quantile_indices = decimate_wavelengths(x, spectra, 100, mode="quantiles", quantiles=(0.5, 0.9))
+    assert len(quantile_indices) <= 100
+    assert np.any((quantile_indices >= 2990) & (quantile_indices < 3010))
+    assert len(set(quantile_indices) - set(mean_indices)) > 0
+
+
+def test_union_lttb_respects_budget():
+    x, y = _spectrum(10000)
+    indices = union_lttb(x, np.vstack([y, np.gradient(y), y[::-1]]), 300)
+    assert len(indices) <= 300
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_union_lttb_respects_a_budget_smaller_than_three_points_per_curve():
+    x, y = _spectrum(500)
+    curves = np.vstack([y + shift for shift in range(6)])
+    indices = union_lttb(x, curves, 6)
+    assert len(indices) <= 6
+    np.testing.assert_array_equal(indices, lttb_decimate(x, curves.mean(axis=0), 6))
+
+
+def test_decimate_summary_matches_full_matrix_decimation():
+    rng = np.random.default_rng(3)
+    x, y = _spectrum(2000)
+    spectra = y[None, :] + rng.normal(scale=0.05, size=(40, 2000))
+    np.testing.assert_array_equal(
+        decimate_summary(x, 150, "mean", mean=spectra.mean(axis=0)),
+        decimate_wavelengths(x, spectra, 150, mode="mean"),
+    )
+    np.testing.assert_array_equal(
+        decimate_summary(x, 150, "envelope", lower=spectra.min(axis=0), upper=spectra.max(axis=0)),
+        decimate_wavelengths(x, spectra, 150, mode="envelope"),
+    )
+
+
+@pytest.mark.parametrize("mode", DECIMATION_MODES)
+def test_spectra_pages_share_one_wavelength_subset(mode):
+    pytest.importorskip("nirs4all")
+    import api.shared  # noqa: F401  (initialise the shared package before lazy_imports)
+    from api.lazy_imports import _do_load_ml_deps, is_ml_ready
+
+    if not is_ml_ready():
+        _do_load_ml_deps()
+    from fastapi.testclient import TestClient
+    from nirs4all.data import SpectroDataset
+
+    from api import spectra
+    from main import app
+
+    rng = np.random.default_rng(0)
+    x, y = _spectrum(400)
+    # Pages differ a lot, so page-local decimation would pick different columns
+    X = y[None, :] * rng.uniform(0.1, 5.0, size=(300, 1)) + rng.normal(scale=0.2, size=(300, 400))
+    X[:100, 50:60] += 5.0
+    dataset = SpectroDataset("paging")
+    dataset.add_samples(X, {"partition": "train"}, headers=[f"{w:.2f}" for w in x], header_unit="nm")
+    spectra._dataset_cache["decimation-paging"] = dataset
+    try:
+        client = TestClient(app)
+        pages = [
+            client.get(
+                "/api/spectra/decimation-paging",
+                params={"start": start, "end": start + 100, "max_wavelengths": 40, "decimation": mode},
+            ).json()
+            for start in (0, 100, 200)
+        ]
+    finally:
+        spectra._clear_dataset_cache("decimation-paging")
+
+    indices = [page["wavelength_indices"] for page in pages]
+    assert indices[0] == indices[1] == indices[2]
+    assert 0 < len(indices[0]) <= 40
+    assert all(len(row) == len(indices[0]) for page in pages for row in page["spectra"])
+
+
+def test_decimate_wavelengths_rejects_unknown_mode():
+    with pytest.raises(ValueError, match="Unknown decimation mode"):
+        decimate_wavelengths(np.arange(10), np.ones((2, 10)), 5, mode="bogus")
+
+
+def test_quantile_curves_match_numpy():
+    from api.shared.decimation import _quantile_curves
+
+    spectra = np.random.default_rng(3).normal(size=(37, 500))
+    np.testing.assert_allclose(
+        _quantile_curves(spectra, (0.05, 0.5, 0.95)),
+        np.quantile(spectra, [0.05, 0.5, 0.95], axis=0),
+    )
+
+
+def test_as_numeric_axis_falls_back_for_labels():
+    np.testing.assert_array_equal(as_numeric_axis(["a", "b", "c"], 3), [0.0, 1.0, 2.0])
+    np.testing.assert_array_equal(as_numeric_axis(["1.5", "2.5"], 2), [1.5, 2.5])
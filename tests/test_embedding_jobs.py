@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+import api.shared  # noqa: F401  (initialise the shared package before lazy_imports)
+from api import analysis
+from api.lazy_imports import _do_load_ml_deps, is_ml_ready
+from api.shared.embedding_cache import EmbeddingCache
+
+if not is_ml_ready():
+    _do_load_ml_deps()
+
+X = np.random.default_rng(0).normal(size=(40, 12))
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = EmbeddingCache(cache_dir=tmp_path)
+    monkeypatch.setattr(analysis, "embedding_cache", cache)
+    monkeypatch.setattr(analysis, "_load_analysis_data", lambda *_args: (None, X, list(range(X.shape[1]))))
+    return cache
+
+
+@pytest.fixture
+def tsne_fits(monkeypatch):
+    fits: list[dict] = []
+    tsne_cls = analysis.get_cached("TSNE")
+
+    def recording(**params):
+        fits.append(params)
+        return tsne_cls(**params)
+
+    monkeypatch.setattr(analysis, "get_cached", lambda name: recording if name == "TSNE" else None)
+    return fits
+
+
+def _request(**kwargs) -> analysis.TSNERequest:
+    return analysis.TSNERequest(**{"dataset_id": "ds", "n_iter": 250, "perplexity": 5.0, **kwargs})
+
+
+def _always(_progress, _message=""):
+    return True
+
+
+def test_embedding_cache_persists_to_disk(tmp_path):
+    embedding = np.arange(20.0).reshape(10, 2)
+    EmbeddingCache(cache_dir=tmp_path).put("tsne", "fp", {"perplexity": 5}, embedding, {"n_iter": 250})
+
+    reloaded = EmbeddingCache(cache_dir=tmp_path)
+    cached, info = reloaded.get("tsne", "fp", {"perplexity": 5})
+    np.testing.assert_array_equal(cached, embedding)
+    assert info == {"n_iter": 250}
+    assert reloaded.get("tsne", "fp", {"perplexity": 6}) is None
+    np.testing.assert_array_equal(reloaded.latest("tsne", "fp", 2), embedding)
+    assert reloaded.latest("tsne", "fp", 3) is None
+
+
+def test_embedding_cache_can_move_to_another_directory(tmp_path):
+    embedding = np.arange(20.0).reshape(10, 2)
+    cache = EmbeddingCache(cache_dir=tmp_path / "first")
+    cache.put("tsne", "fp", {"perplexity": 5}, embedding)
+
+    cache.set_cache_dir(tmp_path / "second")
+    assert cache.get("tsne", "fp", {"perplexity": 5}) is None
+    cache.put("tsne", "fp", {"perplexity": 5}, embedding)
+    assert len(list((tmp_path / "second").glob("*.npz"))) == 2
+
+
+def test_repeated_tsne_is_served_from_cache(cache, tsne_fits):
+    first = analysis._run_tsne(_request(), _always)
+    second = analysis._run_tsne(_request(), _always)
+
+    assert len(tsne_fits) == 1
+    assert not first.cached and second.cached
+    assert second.embedding == first.embedding
+    assert second.kl_divergence == first.kl_divergence
+
+
+def test_warm_start_initializes_from_previous_embedding(cache, tsne_fits):
+    first = analysis._run_tsne(_request(), _always)
+    tweaked = analysis._run_tsne(_request(perplexity=8.0, warm_start=True), _always)
+
+    assert tweaked.warm_started
+    init = tsne_fits[1]["init"]
+    assert isinstance(init, np.ndarray)
+    np.testing.assert_allclose(init / init[0, 0], np.asarray(first.embedding) / first.embedding[0][0], rtol=1e-5)
+
+    cold = analysis._run_tsne(_request(perplexity=9.0), _always)
+    assert not cold.warm_started and tsne_fits[2]["init"] == "pca"
+
+
+def test_embedding_job_task_and_cancellation(cache, tsne_fits):
+    job = SimpleNamespace(config={"method": "tsne", **_request().model_dump()})
+    result = analysis._run_embedding_task(job, _always)
+    assert result["n_samples"] == X.shape[0]
+    assert len(result["embedding"][0]) == 2
+
+    cancelled = SimpleNamespace(config={"method": "tsne", **_request(perplexity=7.0).model_dump()})
+    assert analysis._run_embedding_task(cancelled, lambda _p, _m="": False) is None
+    assert len(tsne_fits) == 1
@@ -0,0 +1,171 @@
+"""Tests for the cached, parallel file detection behind the dataset wizard."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+os.environ.setdefault("SENTRY_DSN", "")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.shared import file_detection  # noqa: E402
+from api.shared.file_detection import FileDetectionCache  # noqa: E402
+
+
+class CountingDetector:
+    """Stand-in for detect_file_parameters that records every file it reads."""
+
+    def __init__(self, jitter: float = 0.0, fail_on: str | None = None):
+        self.calls: list[str] = []
+        self.threads: set[str] = set()
+        self._jitter = jitter
+        self._fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def __call__(self, path, known_params=None):
+        with self._lock:
+            self.calls.append(Path(path).name)
+            self.threads.add(threading.current_thread().name)
+        if self._jitter:
+            time.sleep(random.random() * self._jitter)
+        if self._fail_on and path.endswith(self._fail_on):
+            raise ValueError(f"cannot sniff {Path(path).name}")
+        n_rows = Path(path).read_text().count("\n")
+        return SimpleNamespace(n_rows=n_rows, n_columns=3, delimiter=(known_params or {}).get("delimiter", ";"))
+
+
+def _write_csvs(folder: Path, count: int) -> list[Path]:
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = folder / f"file_{i:03d}.csv"
+        path.write_text("a;b;c\n" + "1;2;3\n" * (i + 1))
+        paths.append(path)
+    return paths
+
+
+def test_second_detection_is_served_from_cache(tmp_path):
+    (path,) = _write_csvs(tmp_path, 1)
+    detector = CountingDetector()
+    cache = FileDetectionCache(detector=detector)
+
+    first = cache.detect(path)
+    second = cache.detect(str(path))
+
+    assert second is first
+    assert detector.calls == ["file_000.csv"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Known parameters are part of the key
+    cache.detect(path, known_params={"delimiter": ","})
+    assert len(detector.calls) == 2
+
+
+def test_touching_or_rewriting_a_file_invalidates_its_entry(tmp_path):
+    paths = _write_csvs(tmp_path, 2)
+    detector = CountingDetector()
+    cache = FileDetectionCache(detector=detector)
+    cache.detect_many(paths)
+
+    stat = paths[0].stat()
+    os.utime(paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    paths[1].write_text("a;b;c\n")
+    detector.calls = []
+    outcomes = cache.detect_many(paths)
+
+    assert detector.calls == ["file_000.csv", "file_001.csv"]
+    assert outcomes[1][0].n_rows == 1
+
+    detector.calls = []
+    cache.detect_many(paths)
+    assert detector.calls == []
+
+
+def test_parallel_and_serial_batches_give_identical_ordered_results(tmp_path):
+    paths = _write_csvs(tmp_path, 40)
+    batch = paths + [paths[3]]
+
+    serial_detector = CountingDetector()
+    serial = FileDetectionCache(detector=serial_detector).detect_many(batch, max_workers=1)
+    parallel_detector = CountingDetector(jitter=0.01)
+    parallel = FileDetectionCache(detector=parallel_detector).detect_many(batch, max_workers=8)
+
+    assert [r.n_rows for r, _ in parallel] == [r.n_rows for r, _ in serial] == [i + 2 for i in range(40)] + [5]
+    assert all(error is None for _, error in parallel)
+    # The duplicate path is detected once, and the pool was actually used
+    assert len(parallel_detector.calls) == 40
+    assert len(parallel_detector.threads) > 1
+    assert serial_detector.threads == {threading.current_thread().name}
+
+
+def test_failures_are_reported_per_path_and_not_cached(tmp_path):
+    paths = _write_csvs(tmp_path, 3)
+    detector = CountingDetector(fail_on="file_001.csv")
+    cache = FileDetectionCache(detector=detector)
+
+    outcomes = cache.detect_many(paths + [tmp_path / "missing.csv"])
+
+    assert [error is None for _, error in outcomes] == [True, False, True, False]
+    assert "cannot sniff" in str(outcomes[1][1])
+    assert isinstance(outcomes[3][1], OSError)
+
+    detector.calls = []
+    cache.detect_many(paths)
+    assert detector.calls == ["file_001.csv"]
+
+
+def test_cache_is_bounded(tmp_path):
+    paths = _write_csvs(tmp_path, 3)
+    detector = CountingDetector()
+    cache = FileDetectionCache(max_entries=2, detector=detector)
+    cache.detect_many(paths)
+    cache.detect(paths[0])
+    assert detector.calls.count("file_000.csv") == 2
+
+
+def _write_dataset(folder: Path, n_samples: int, n_features: int = 20) -> None:
+    folder.mkdir(parents=True)
+    header = ";".join(str(900 + 2 * j) for j in range(n_features))
+    rows = "\n".join(";".join(f"{(i * j) % 7 / 10:.2f}" for j in range(n_features)) for i in range(n_samples))
+    (folder / "Xcal.csv").write_text(f"{header}\n{rows}\n")
+    (folder / "Ycal.csv").write_text("y\n" + "\n".join(str(i) for i in range(n_samples)) + "\n")
+
+
+def test_scan_folder_reuses_detections_and_matches_serial_mode(tmp_path):
+    pytest.importorskip("nirs4all")
+    import api.datasets as datasets
+    from api.lazy_imports import _do_load_ml_deps, is_ml_ready
+
+    if not is_ml_ready():
+        _do_load_ml_deps()
+
+    for i in range(6):
+        _write_dataset(tmp_path / "group" / f"dataset_{i}", n_samples=10 + i)
+    request = datasets.ScanFolderRequest(path=str(tmp_path))
+    cache = FileDetectionCache()
+
+    with patch.object(datasets, "file_detection_cache", cache):
+        cold = asyncio.run(datasets.scan_folder(request))
+        misses = cache.misses
+        warm = asyncio.run(datasets.scan_folder(request))
+        assert cache.misses == misses
+
+        cache.clear()
+        with patch.object(file_detection, "DETECTION_WORKERS", 1):
+            serial = asyncio.run(datasets.scan_folder(request))
+
+    assert cold.model_dump() == warm.model_dump() == serial.model_dump()
+    assert [d.folder_name for d in cold.datasets] == [f"dataset_{i}" for i in range(6)]
+    x_rows = [next(f.num_rows for f in d.files if f.type == "X") for d in cold.datasets]
+    # Each dataset got its own file's detection, in scan order
+    assert [rows - x_rows[0] for rows in x_rows] == list(range(6))
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+pytest.importorskip("nirs4all")
+
+import api.shared  # noqa: F401  (initialise the shared package before lazy_imports)
+from api import inspector
+from api.lazy_imports import _do_load_ml_deps, is_ml_ready
+
+if not is_ml_ready():
+    _do_load_ml_deps()
+
+from nirs4all.pipeline.storage import WorkspaceStore  # noqa: E402
+
+N_SAMPLES = 12
+
+
+def _populate(store: WorkspaceStore, n_chains: int) -> list[str]:
+    rng = np.random.default_rng(0)
+    run_id = store.begin_run("bulk", config={}, datasets=[{"name": "corn"}])
+    pipeline_id = store.begin_pipeline(
+        run_id, "bulk-corn", expanded_config=[], generator_choices=[], dataset_name="corn", dataset_hash="h",
+    )
+    y_true = rng.normal(size=N_SAMPLES)
+    chain_ids: list[str] = []
+    array_records: list[dict] = []
+    for chain_idx in range(n_chains):
+        model_class = "PLSRegression" if chain_idx % 2 else "Ridge"
+        chain_id = store.save_chain(
+            pipeline_id, steps=[], model_step_idx=0, model_class=model_class, preprocessings="SNV",
+            fold_strategy="per_fold", fold_artifacts={}, shared_artifacts={}, dataset_name="corn",
+        )
+        chain_ids.append(chain_id)
+        for fold_idx in range(3):
+            val_idx = np.arange(fold_idx, N_SAMPLES, 3)
+            train_idx = np.setdiff1d(np.arange(N_SAMPLES), val_idx)
+            for partition, idx in (("train", train_idx), ("val", val_idx)):
+                y_pred = y_true[idx] + rng.normal(scale=0.1, size=len(idx))
+                score = float(np.sqrt(np.mean((y_pred - y_true[idx]) ** 2)))
+                prediction_id = store.save_prediction(
+                    pipeline_id, chain_id, "corn", model_class, model_class,
+                    fold_id=str(fold_idx), partition=partition,
+                    val_score=score if partition == "val" else None, test_score=None,
+                    train_score=score if partition == "train" else None,
+                    metric="rmse", task_type="regression", n_samples=len(idx), n_features=4,
+                    scores={}, best_params={}, branch_id=None, branch_name=None,
+                    exclusion_count=0, exclusion_rate=0.0, preprocessings="SNV",
+                )
+                array_records.append({
+                    "prediction_id": prediction_id, "dataset_name": "corn", "model_name": model_class,
+                    "fold_id": str(fold_idx), "partition": partition, "metric": "rmse", "val_score": score,
+                    "task_type": "regression", "y_true": y_true[idx], "y_pred": y_pred,
+                    "sample_indices": idx.astype(np.int32),
+                })
+        store.update_chain_summary(chain_id)
+    store.array_store.save_batch(array_records)
+    store.complete_pipeline(pipeline_id, best_val=0.1, best_test=0.1, metric="rmse", duration_ms=1)
+    store.complete_run(run_id, {})
+    return chain_ids
+
+
+class _SharedStore:
+    """Keeps the fixture store open across endpoint calls."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def __getattr__(self, name):
+        return getattr(self._store, name)
+
+    def close(self):
+        pass
+
+
+class _PerChainStore(_SharedStore):
+    """Hides the SQL/array-store fast paths so the loaders use per-chain calls."""
+
+    def __getattr__(self, name):
+        if name in ("workspace_path", "_fetch_pl", "array_store"):
+            raise AttributeError(name)
+        return getattr(self._store, name)
+
+
+@pytest.fixture
+def populated(tmp_path):
+    store = WorkspaceStore(tmp_path)
+    chain_ids = _populate(store, n_chains=6)
+    yield store, chain_ids
+    store.close()
+
+
+def _call(monkeypatch, store, endpoint, request):
+    if isinstance(store, WorkspaceStore):
+        store = _SharedStore(store)
+    monkeypatch.setattr(inspector, "_get_store", lambda: store)
+    return asyncio.run(endpoint(request)).model_dump()
+
+
+def test_bulk_frame_matches_per_chain_loading(populated):
+    store, chain_ids = populated
+    bulk = inspector._load_fold_predictions(store, chain_ids, ["val", "train"])
+    per_chain_store = _PerChainStore(store)
+    per_chain = inspector._load_fold_predictions(per_chain_store, chain_ids, ["val", "train"])
+
+    assert len(bulk) == len(chain_ids) * 6
+    key = ["chain_id", "partition", "fold_index"]
+    assert bulk.sort(key).to_dicts() == per_chain.sort(key).to_dicts()
+
+    bulk_arrays = inspector._load_prediction_arrays(store, bulk)
+    per_chain_arrays = inspector._load_prediction_arrays(per_chain_store, per_chain)
+    assert bulk_arrays.keys() == per_chain_arrays.keys()
+    for prediction_id, arrays in bulk_arrays.items():
+        np.testing.assert_allclose(arrays["y_pred"], per_chain_arrays[prediction_id]["y_pred"])
+
+
+@pytest.mark.parametrize(("endpoint", "request_factory"), [
+    (inspector.get_scatter_data, lambda ids: inspector.ScatterRequest(chain_ids=ids)),
+    (inspector.get_fold_stability, lambda ids: inspector.FoldStabilityRequest(chain_ids=ids)),
+    (inspector.get_robustness_data, lambda ids: inspector.RobustnessRequest(chain_ids=ids)),
+    (inspector.get_bias_variance, lambda ids: inspector.BiasVarianceRequest(chain_ids=ids)),
+])
+def test_analytics_agree_between_bulk_and_per_chain_paths(populated, monkeypatch, endpoint, request_factory):
+    store, chain_ids = populated
+    request = request_factory(chain_ids)
+    bulk = _call(monkeypatch, store, endpoint, request)
+    per_chain = _call(monkeypatch, _PerChainStore(store), endpoint, request)
+    assert _approx_equal(bulk, per_chain)
+
+
+def _approx_equal(left, right) -> bool:
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(_approx_equal(left[k], right[k]) for k in left)
+    if isinstance(left, list):
+        return len(left) == len(right) and all(_approx_equal(a, b) for a, b in zip(left, right))
+    if isinstance(left, float):
+        return right == pytest.approx(left, rel=1e-9, abs=1e-12)
+    return left == right
+
+
+def test_fold_stability_values(populated, monkeypatch):
+    store, chain_ids = populated
+    payload = _call(
+        monkeypatch, store, inspector.get_fold_stability, inspector.FoldStabilityRequest(chain_ids=chain_ids[:2]),
+    )
+    assert payload["total_chains"] == 2
+    assert payload["fold_ids"] == ["0", "1", "2"]
+    expected = {
+        (row["chain_id"], row["fold_id"]): round(row["val_score"], 6)
+        for chain_id in chain_ids[:2]
+        for row in store.get_chain_predictions(chain_id=chain_id, partition="val").iter_rows(named=True)
+    }
+    assert {(e["chain_id"], e["fold_id"]): e["score"] for e in payload["entries"]} == expected
+
+
+def test_learning_curve_uses_first_train_fold_size(populated, monkeypatch):
+    store, _chain_ids = populated
+    payload = _call(
+        monkeypatch, store, inspector.get_learning_curve, inspector.LearningCurveRequest(),
+    )
+    assert [point["train_size"] for point in payload["points"]] == [N_SAMPLES - N_SAMPLES // 3]
+    assert payload["points"][0]["count"] == 6
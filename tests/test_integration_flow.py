@@ -36,8 +36,8 @@ from main import app
 
 
 @pytest.fixture
-def client(tmp_path):
-    """Create a test client for the FastAPI app with isolated config."""
+def client(tmp_path, monkeypatch):
+    """Create a test client for the FastAPI app with isolated config and workspace."""
     import os
     config_dir = tmp_path / "app_config"
     config_dir.mkdir()
@@ -49,6 +49,10 @@ def client(tmp_path):
         from api.workspace_manager import workspace_manager
         workspace_manager.app_config = app_config
         workspace_manager.app_data_dir = app_config.config_dir
+        # The default workspace lives under the working directory; keep the
+        # pipelines created by these tests out of the repository checkout.
+        monkeypatch.setattr(workspace_manager, "_get_default_workspace_path", lambda: tmp_path / "workspace")
+        monkeypatch.setattr(workspace_manager, "_active_workspace_override", workspace_manager.ensure_default_workspace())
         with TestClient(app) as c:
             yield c
     finally:
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import pytest
+
+from api.jobs.manager import JobManager, JobStatus, JobType
+from api.jobs.registry import INTERRUPTED_ERROR, REGISTRY_FILENAME, JobRegistry
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    managers: list[JobManager] = []
+
+    def make(**kwargs) -> JobManager:
+        manager = JobManager(max_workers=1, registry=JobRegistry(tmp_path), **kwargs)
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.shutdown(wait=True)
+
+
+def _run(manager: JobManager, task, job_type: JobType = JobType.AUTOML, **config):
+    job = manager.create_job(job_type, config)
+    done = threading.Event()
+    manager.register_callback(job.id, lambda j: done.set() if j.completed_at else None)
+    manager.submit_job(job, task)
+    assert done.wait(10)
+    return job
+
+
+def test_finished_job_is_reloaded_by_a_new_manager(make_manager):
+    manager = make_manager()
+
+    def trials(job, progress_callback):
+        for trial in range(3):
+            manager.update_job_metrics(job.id, {"score": trial / 10})
+            progress_callback((trial + 1) * 30, f"trial {trial}")
+        return {"best_score": 0.2, "trials": 3}
+
+    job = _run(manager, trials, metric="r2")
+
+    reloaded = make_manager().get_job(job.id)
+    assert reloaded is not None
+    assert reloaded.status == JobStatus.COMPLETED
+    assert reloaded.type == JobType.AUTOML
+    assert reloaded.config == {"metric": "r2"}
+    assert reloaded.result == {"best_score": 0.2, "trials": 3}
+    assert [entry["score"] for entry in reloaded.history] == [0.0, 0.1, 0.2]
+    assert reloaded.to_dict()["duration_seconds"] is not None
+
+
+def test_failed_job_keeps_its_error(make_manager):
+    def failing(_job, _progress_callback):
+        raise ValueError("bad config")
+
+    job = _run(make_manager(), failing)
+    reloaded = make_manager().get_job(job.id)
+    assert reloaded.status == JobStatus.FAILED
+    assert reloaded.error == "bad config"
+
+
+def test_interrupted_jobs_are_marked_failed_on_open(tmp_path):
+    registry = JobRegistry(tmp_path)
+    manager = JobManager(max_workers=1, registry=registry)
+    job = manager.create_job(JobType.TRAINING, {})
+    registry.append_history(job.id, {"epoch": 1})
+    manager.shutdown()
+
+    # Pretend the row belongs to a backend that has since exited
+    with sqlite3.connect(tmp_path / REGISTRY_FILENAME) as conn:
+        conn.execute("UPDATE jobs SET status = 'running', owner_pid = ? WHERE id = ?", (2**22 + 1, job.id))
+
+    recovered = JobManager(max_workers=1, registry=JobRegistry(tmp_path))
+    reloaded = recovered.get_job(job.id)
+    recovered.shutdown()
+    assert reloaded.status == JobStatus.FAILED
+    assert reloaded.error == INTERRUPTED_ERROR
+    assert reloaded.completed_at is not None
+    assert reloaded.history == [{"epoch": 1}]
+
+
+def test_history_tolerates_a_torn_last_line(tmp_path):
+    registry = JobRegistry(tmp_path)
+    registry.append_history("job", {"trial": 0})
+    with open(tmp_path / "job.history.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"trial": ')
+    assert registry.load_history("job") == [{"trial": 0}]
+
+
+def test_finished_jobs_are_evicted_from_memory_but_still_listed(make_manager):
+    manager = make_manager(max_resident_finished=2)
+    jobs = [_run(manager, lambda _job, _cb: {"ok": True}, JobType.EXPORT, index=i) for i in range(4)]
+    manager.shutdown(wait=True)
+
+    assert set(manager._jobs) == {jobs[2].id, jobs[3].id}
+    assert manager.get_job(jobs[0].id).result == {"ok": True}
+
+    listed = manager.list_jobs(job_type=JobType.EXPORT)
+    assert [job.id for job in listed] == [job.id for job in reversed(jobs)]
+    assert manager.list_jobs(job_type=JobType.EXPORT, limit=3)[-1].id == jobs[1].id
+    assert manager.list_jobs(job_type=JobType.TRAINING) == []
+
+
+def test_cleanup_removes_old_jobs_from_the_registry(make_manager, tmp_path):
+    manager = make_manager(max_resident_finished=0)
+    job = _run(manager, lambda _job, _cb: {"ok": True}, JobType.EXPORT)
+    assert (tmp_path / f"{job.id}.result.json").exists()
+
+    assert manager.cleanup_old_jobs(max_age_hours=-1) == 1
+    assert manager.get_job(job.id) is None
+    assert not (tmp_path / f"{job.id}.result.json").exists()
+
+
+def test_unavailable_registry_falls_back_to_memory(tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    manager = JobManager(max_workers=1, registry=JobRegistry(blocker / "jobs"))
+    job = manager.create_job(JobType.ANALYSIS, {})
+    assert manager.get_job(job.id) is job
+    assert [j.id for j in manager.list_jobs()] == [job.id]
+    assert manager._registry.get(job.id) is None
+    manager.shutdown()
+
+
+def test_registry_can_be_moved_to_another_directory(tmp_path):
+    registry = JobRegistry(tmp_path / "first")
+    manager = JobManager(max_workers=1, registry=registry)
+    first = manager.create_job(JobType.ANALYSIS, {})
+
+    registry.set_root(tmp_path / "second")
+    second = manager.create_job(JobType.ANALYSIS, {})
+
+    assert (tmp_path / "second" / REGISTRY_FILENAME).exists()
+    assert registry.get(first.id) is None and registry.get(second.id) is not None
+    manager.shutdown()
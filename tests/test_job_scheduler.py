@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from api.jobs.manager import PRIORITY_HIGH, JobManager, JobStatus, JobType
+from api.jobs.scheduler import PoolConfig
+from api.shared.histogram import Histogram
+
+POOLS = {
+    "compute": PoolConfig("compute", 1),
+    "interactive": PoolConfig("interactive", 2),
+    "io": PoolConfig("io", 1),
+    "maintenance": PoolConfig("maintenance", 1),
+}
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(pools=POOLS)
+    yield manager
+    manager.shutdown(wait=True)
+
+
+def _blocking_task(gate: threading.Event, started: list[str]):
+    def task(job, _progress_callback):
+        started.append(job.id)
+        assert gate.wait(10)
+        return {"ok": True}
+
+    return task
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_heavy_jobs_do_not_block_other_pools(manager):
+    gate = threading.Event()
+    started: list[str] = []
+    training = manager.submit_job(manager.create_job(JobType.TRAINING, {}), _blocking_task(gate, started))
+    automl = manager.submit_job(manager.create_job(JobType.AUTOML, {}), _blocking_task(gate, started))
+    analysis = manager.submit_job(manager.create_job(JobType.ANALYSIS, {}), lambda _job, _cb: {"done": True})
+
+    _wait_for(lambda: analysis.status == JobStatus.COMPLETED)
+    assert training.status == JobStatus.RUNNING
+    assert automl.status == JobStatus.PENDING
+    assert automl.queue_position == 1 and manager.queue_position(automl.id) == 1
+    assert automl.to_dict()["pool"] == "compute"
+
+    gate.set()
+    _wait_for(lambda: automl.status == JobStatus.COMPLETED)
+    assert started == [training.id, automl.id]
+    assert automl.queue_position is None
+
+
+def test_default_pools_run_training_and_evaluation_beside_automl(monkeypatch):
+    for name in ("COMPUTE", "INTERACTIVE"):
+        monkeypatch.delenv(f"NIRS4ALL_{name}_JOBS", raising=False)
+    manager = JobManager()
+    gate = threading.Event()
+    started: list[str] = []
+    try:
+        automl = manager.submit_job(manager.create_job(JobType.AUTOML, {}), _blocking_task(gate, started))
+        training = manager.submit_job(manager.create_job(JobType.TRAINING, {}), _blocking_task(gate, started))
+        evaluation = manager.submit_job(manager.create_job(JobType.EVALUATION, {}), _blocking_task(gate, started))
+
+        _wait_for(lambda: len(started) == 3)
+        assert {automl.pool, training.pool, evaluation.pool} == {"compute", "interactive"}
+        assert evaluation.pool == "interactive"
+    finally:
+        gate.set()
+        manager.shutdown(wait=True)
+
+
+def test_queued_jobs_start_by_priority(manager):
+    gate = threading.Event()
+    started: list[str] = []
+    blocker = manager.submit_job(manager.create_job(JobType.TRAINING, {}), _blocking_task(gate, started))
+    _wait_for(lambda: blocker.status == JobStatus.RUNNING)
+
+    automl = manager.submit_job(manager.create_job(JobType.AUTOML, {}), _blocking_task(gate, started))
+    training = manager.submit_job(manager.create_job(JobType.TRAINING, {}), _blocking_task(gate, started))
+    urgent = manager.submit_job(
+        manager.create_job(JobType.TRAINING, {}), _blocking_task(gate, started), priority=PRIORITY_HIGH
+    )
+    assert [manager.queue_position(j.id) for j in (urgent, training, automl)] == [1, 2, 3]
+
+    gate.set()
+    _wait_for(lambda: automl.status == JobStatus.COMPLETED)
+    assert started == [blocker.id, urgent.id, training.id, automl.id]
+
+
+def test_cancelling_a_queued_job_frees_its_position(manager):
+    gate = threading.Event()
+    started: list[str] = []
+    blocker = manager.submit_job(manager.create_job(JobType.TRAINING, {}), _blocking_task(gate, started))
+    first = manager.submit_job(manager.create_job(JobType.TRAINING, {}), _blocking_task(gate, started))
+    second = manager.submit_job(manager.create_job(JobType.TRAINING, {}), _blocking_task(gate, started))
+    _wait_for(lambda: blocker.status == JobStatus.RUNNING)
+
+    assert manager.cancel_job(first.id)
+    assert first.status == JobStatus.CANCELLED
+    assert second.queue_position == 1
+
+    gate.set()
+    _wait_for(lambda: second.status == JobStatus.COMPLETED)
+    assert first.id not in started
+
+
+def test_scheduler_stats_report_histograms(manager):
+    job = manager.submit_job(manager.create_job(JobType.EXPORT, {}), lambda _job, _cb: {"ok": True})
+    _wait_for(lambda: job.status == JobStatus.COMPLETED)
+    _wait_for(lambda: manager.scheduler_stats()["pools"]["interactive"]["run_time_seconds"]["count"] == 1)
+
+    interactive = manager.scheduler_stats()["pools"]["interactive"]
+    assert interactive["max_concurrent"] == 2
+    assert interactive["queue_wait_seconds"]["count"] == 1
+    assert interactive["running"] == [] and interactive["queued"] == []
+
+
+def test_histogram_quantiles():
+    histogram = Histogram(buckets=(1.0, 10.0))
+    for value in (0.5, 0.5, 2.0, 20.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4 and snapshot["max"] == 20.0
+    assert [b["count"] for b in snapshot["buckets"]] == [2, 3, 4]
+    assert snapshot["p50"] == pytest.approx(1.0)
+    assert 10.0 < snapshot["p95"] <= 20.0
+    assert Histogram().snapshot()["p50"] is None
+
+
+def _isolated_task(job, progress_callback):
+    progress_callback(50, "halfway")
+    if job.config.get("fail"):
+        raise ValueError("isolated failure")
+    return {"doubled": job.config["value"] * 2}
+
+
+def test_isolated_jobs_run_in_a_separate_process(manager):
+    progress: list[float] = []
+    job = manager.create_job(JobType.TRAINING, {"value": 21})
+    manager.register_callback(job.id, lambda j: progress.append(j.progress))
+    manager.submit_job(job, _isolated_task, isolate=True)
+    failing = manager.submit_job(manager.create_job(JobType.TRAINING, {"fail": True}), _isolated_task, isolate=True)
+
+    _wait_for(lambda: failing.completed_at is not None, timeout=60)
+    assert job.status == JobStatus.COMPLETED
+    assert job.result == {"doubled": 42}
+    assert 50 in progress
+    assert failing.status == JobStatus.FAILED
+    assert failing.error == "isolated failure"
+    assert "ValueError" in failing.error_traceback
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import sys
+import types
+
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from api.lazy_routers import LazyRouterRegistry
+
+
+def _fake_module(monkeypatch, name: str, router: APIRouter) -> None:
+    module = types.ModuleType(name)
+    module.router = router
+    monkeypatch.setitem(sys.modules, name, module)
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv("NIRS4ALL_LAZY_ROUTERS", "1")
+    analysis = APIRouter()
+    shap = APIRouter()
+    runs = APIRouter(prefix="/runs")
+
+    @analysis.get("/analysis/{method}")
+    async def analysis_method(method: str):
+        return {"module": "analysis", "method": method}
+
+    @shap.get("/analysis/shap")
+    async def shap_status():
+        return {"module": "shap"}
+
+    @runs.get("/{run_id}")
+    async def get_run(run_id: str):
+        return {"module": "runs", "run_id": run_id}
+
+    _fake_module(monkeypatch, "fake_routers.analysis", analysis)
+    _fake_module(monkeypatch, "fake_routers.shap", shap)
+    _fake_module(monkeypatch, "fake_routers.runs", runs)
+
+    app = FastAPI()
+
+    @app.get("/api/health")
+    async def health():
+        return {"ok": True}
+
+    registry = LazyRouterRegistry(app)
+    registry.add("fake_routers.analysis", "/analysis")
+    registry.add("fake_routers.shap", "/analysis")
+    registry.add("fake_routers.runs", "/runs")
+    registry.install()
+    app.state.registry = registry
+
+    @app.get("/{full_path:path}")
+    async def spa(full_path: str):
+        if full_path.startswith("api/"):
+            raise HTTPException(status_code=404, detail="Not found")
+        return {"module": "spa"}
+
+    return app
+
+
+def test_routers_mount_on_first_request_under_their_prefix(app):
+    registry = app.state.registry
+    client = TestClient(app)
+
+    assert client.get("/api/health").json() == {"ok": True}
+    assert registry.pending == ["fake_routers.analysis", "fake_routers.shap", "fake_routers.runs"]
+
+    # Mounted ahead of the SPA catch-all, with the eager precedence between modules
+    assert client.get("/api/analysis/shap").json() == {"module": "analysis", "method": "shap"}
+    assert registry.pending == ["fake_routers.runs"]
+    assert set(registry.import_times) == {"fake_routers.analysis", "fake_routers.shap"}
+
+    assert client.get("/api/runs/42").json() == {"module": "runs", "run_id": "42"}
+    assert client.get("/api/runsx").status_code == 404
+    assert client.get("/somewhere").json() == {"module": "spa"}
+
+
+def test_openapi_mounts_everything(app):
+    client = TestClient(app)
+    paths = client.get("/openapi.json").json()["paths"]
+    assert {"/api/analysis/{method}", "/api/analysis/shap", "/api/runs/{run_id}"} <= set(paths)
+    assert app.state.registry.pending == []
+
+
+def test_lazy_loading_can_be_disabled(monkeypatch):
+    _fake_module(monkeypatch, "fake_routers.eager", APIRouter())
+    monkeypatch.setenv("NIRS4ALL_LAZY_ROUTERS", "0")
+    registry = LazyRouterRegistry(FastAPI())
+    registry.add("fake_routers.eager", "/eager")
+    registry.install()
+    assert registry.pending == []
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sklearn.neighbors import LocalOutlierFactor
+
+from api.shared import metrics_computer
+from api.shared.metrics_computer import MetricsComputer
+from api.shared.neighbor_index import NeighborIndex, NeighborIndexCache, neighbor_index_cache, neighbor_index_for
+
+
+def _spectra(n_samples: int, n_features: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=(n_samples, 6)) * [6.0, 4.0, 3.0, 2.0, 1.0, 0.5]
+    return latent @ rng.normal(size=(6, n_features)) + rng.normal(scale=0.2, size=(n_samples, n_features)) + 1.0
+
+
+def _brute_force(X, reference_idx, metric):
+    """Distances as computed by the original full scan."""
+    reference = X[reference_idx]
+    if metric == "euclidean":
+        return np.sqrt(np.sum((X - reference) ** 2, axis=1))
+    if metric == "correlation":
+        X = X - X.mean(axis=1, keepdims=True)
+        reference = reference - reference.mean()
+    return 1 - X @ reference / (np.linalg.norm(X, axis=1) * np.linalg.norm(reference))
+
+
+@pytest.fixture
+def X():
+    return _spectra(1_200, 150)
+
+
+@pytest.mark.parametrize("metric", ["euclidean", "cosine", "correlation"])
+def test_top_k_matches_brute_force(X, metric):
+    index = NeighborIndex(X, metric)
+    for reference_idx in (0, 17, 600, 1_199):
+        distances = _brute_force(X, reference_idx, metric)
+        distances[reference_idx] = np.inf
+        expected = np.argsort(distances, kind="stable")[:25]
+
+        indices, found = index.query(reference_idx, 25)
+
+        np.testing.assert_array_equal(indices, expected)
+        np.testing.assert_allclose(found, distances[expected], rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("metric", ["euclidean", "cosine", "correlation"])
+def test_radius_matches_brute_force(X, metric):
+    index = NeighborIndex(X, metric)
+    distances = _brute_force(X, 42, metric)
+    threshold = float(np.quantile(distances, 0.05))
+    expected = np.where((distances <= threshold) & (np.arange(len(X)) != 42))[0]
+
+    indices, found = index.query_radius(42, threshold)
+
+    np.testing.assert_array_equal(indices, expected)
+    np.testing.assert_allclose(found, distances[expected], rtol=1e-9, atol=1e-12)
+
+
+def test_similar_samples_reuse_index_per_fingerprint(X):
+    neighbor_index_cache.clear()
+    computer = MetricsComputer()
+    misses = neighbor_index_cache.misses
+
+    first, _ = computer.get_similar_samples(X, 3, top_k=10)
+    second, _ = computer.get_similar_samples(X.copy(), 900, top_k=10)
+    assert neighbor_index_cache.misses == misses + 1
+    assert len(first) == len(second) == 10
+
+    # A different pipeline prefix yields different data, hence a new index
+    computer.get_similar_samples(X * 2.0, 3, top_k=10)
+    assert neighbor_index_cache.misses == misses + 2
+
+
+def test_changes_that_keep_row_and_column_sums_get_a_new_index():
+    neighbor_index_cache.clear()
+    X = np.round(_spectra(600, 50) * 100)
+    computer = MetricsComputer()
+    computer.get_similar_samples(X, 0, top_k=5)
+
+    # +/-300 over a 2x2 block leaves every row and column sum unchanged
+    changed = X.copy()
+    changed[0:2, 0:2] += [[300.0, -300.0], [-300.0, 300.0]]
+    misses = neighbor_index_cache.misses
+    indices, distances = computer.get_similar_samples(changed, 0, top_k=5)
+
+    assert neighbor_index_cache.misses == misses + 1
+    expected = _brute_force(changed, 0, "euclidean")
+    expected[0] = np.inf
+    np.testing.assert_array_equal(indices, np.argsort(expected, kind="stable")[:5])
+    np.testing.assert_allclose(distances, np.sort(expected)[:5])
+
+
+def test_similar_samples_fall_back_to_scan_with_nan(X):
+    X = X.copy()
+    X[5, 10] = np.nan
+    indices, distances = MetricsComputer().get_similar_samples(X, 0, top_k=5)
+
+    expected = np.sqrt(np.nansum((X - X[0]) ** 2, axis=1))
+    expected[0] = np.inf
+    np.testing.assert_array_equal(indices, np.argsort(expected)[:5])
+    np.testing.assert_allclose(distances, np.sort(expected)[:5])
+
+
+def test_cache_is_bounded():
+    cache = NeighborIndexCache(max_entries=2)
+    for seed in range(3):
+        cache.get(_spectra(50, 20, seed), "euclidean")
+    cache.get(_spectra(50, 20, 0), "euclidean")
+    assert cache.misses == 4
+
+
+def test_lof_matches_sklearn_on_index_space(X):
+    index = NeighborIndex(X, "euclidean")
+    reference = LocalOutlierFactor(n_neighbors=20).fit(index._pca.scores)
+
+    np.testing.assert_allclose(index.local_outlier_factor(20), -reference.negative_outlier_factor_, rtol=1e-9)
+
+
+@pytest.mark.parametrize("method", ["hotelling_t2", "q_residual", "lof", "distance"])
+def test_outlier_mask_flags_scores_above_quantile(X, method):
+    X = X.copy()
+    X[7] += 25.0
+    mask, info = MetricsComputer(n_pca_components=5).get_outlier_mask(X, method=method, threshold=0.99)
+
+    assert mask.shape == (len(X),)
+    assert (~mask).sum() == pytest.approx(0.01 * len(X), abs=2)
+    assert not mask[7] or method == "q_residual"
+    assert info["cutoff"] == pytest.approx(np.quantile(info["scores"], 0.99))
+
+
+def test_pairwise_mahalanobis_reuses_fitted_precision():
+    X_ref = _spectra(80, 12, seed=1)
+    X_final = X_ref + np.random.default_rng(2).normal(scale=0.1, size=X_ref.shape)
+    computer = MetricsComputer()
+    hits = metrics_computer._distance_models.hits
+
+    first = computer.compute_pairwise_distances(X_ref, X_final, "mahalanobis")
+    second = computer.compute_pairwise_distances(X_ref, X_final, "mahalanobis")
+
+    np.testing.assert_array_equal(first, second)
+    assert metrics_computer._distance_models.hits == hits + 1
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pytest
+
+from api.shared import operator_cache
+from api.shared.operator_cache import OperatorDiscoveryCache
+
+
+@pytest.fixture(autouse=True)
+def ml_ready(monkeypatch):
+    import api.lazy_imports as lazy_imports
+
+    monkeypatch.setattr(lazy_imports, "_ml_ready", True)
+    monkeypatch.setattr(operator_cache, "_custom_nodes_mtime", lambda: None)
+
+
+def _counting(payload):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return payload
+
+    return compute, calls
+
+
+def test_cache_hits_memory_and_disk(tmp_path):
+    cache_file = tmp_path / "operators.json"
+    compute, calls = _counting({"operators": [{"name": "SNV", "params": {"window": (3, 5)}}]})
+
+    first = OperatorDiscoveryCache(cache_file).get_or_compute("pipelines", compute)
+    assert first == {"operators": [{"name": "SNV", "params": {"window": [3, 5]}}]}
+
+    cache = OperatorDiscoveryCache(cache_file)
+    assert cache.get_or_compute("pipelines", compute) == first
+    assert cache.get_or_compute("pipelines", compute) == first
+    assert len(calls) == 1
+
+
+def test_cache_can_move_to_another_file(tmp_path):
+    compute, calls = _counting({"operators": []})
+    cache = OperatorDiscoveryCache(tmp_path / "first.json")
+    cache.get_or_compute("pipelines", compute)
+
+    cache.set_cache_file(tmp_path / "second.json")
+    cache.get_or_compute("pipelines", compute)
+    assert len(calls) == 2
+    assert (tmp_path / "second.json").exists()
+
+
+def test_package_version_change_invalidates(tmp_path, monkeypatch):
+    cache_file = tmp_path / "operators.json"
+    compute, calls = _counting({"total": 1})
+    OperatorDiscoveryCache(cache_file).get_or_compute("playground", compute)
+
+    monkeypatch.setattr(operator_cache, "_package_version", lambda name: "99.0")
+    OperatorDiscoveryCache(cache_file).get_or_compute("playground", compute)
+    assert len(calls) == 2
+
+
+def test_custom_nodes_change_and_invalidate(tmp_path, monkeypatch):
+    cache = OperatorDiscoveryCache(tmp_path / "operators.json")
+    compute, calls = _counting({"total": 1})
+    cache.get_or_compute("preprocessing", compute)
+
+    monkeypatch.setattr(operator_cache, "_custom_nodes_mtime", lambda: 123)
+    cache.get_or_compute("preprocessing", compute)
+    cache.get_or_compute("preprocessing", compute)
+    assert len(calls) == 2
+
+    cache.invalidate()
+    assert not (tmp_path / "operators.json").exists()
+    cache.get_or_compute("preprocessing", compute)
+    assert len(calls) == 3
+
+
+def test_nothing_cached_before_ml_ready(tmp_path, monkeypatch):
+    import api.lazy_imports as lazy_imports
+
+    monkeypatch.setattr(lazy_imports, "_ml_ready", False)
+    cache = OperatorDiscoveryCache(tmp_path / "operators.json")
+    compute, calls = _counting({"total": 0})
+    cache.get_or_compute("pipelines", compute)
+    cache.get_or_compute("pipelines", compute)
+    assert len(calls) == 2
+    assert not (tmp_path / "operators.json").exists()
@@ -0,0 +1,139 @@
+"""
+Tests for the filtered per-dataset parquet export.
+
+The export is a lazy scan with the filters pushed down to the parquet
+reader, streamed to the client row group by row group.
+
+Run with: pytest tests/test_parquet_export_streaming.py -v
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+os.environ.setdefault("SENTRY_DSN", "")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pl = pytest.importorskip("polars")
+np = pytest.importorskip("numpy")
+
+WEBAPP_ROOT = Path(__file__).parent.parent
+
+# Peak RSS growth allowed while exporting the synthetic table; an eager
+# read + filter + write of it needs well over twice as much.
+EXPORT_RSS_CEILING_MB = 128
+SYNTHETIC_ROWS = 3_000_000
+
+
+def _write_predictions(path: Path, n_rows: int) -> None:
+    rng = np.random.default_rng(0)
+    pl.DataFrame(
+        {
+            "partition": rng.choice(["train", "val", "test"], n_rows),
+            "model_name": rng.choice(["PLS", "RF", "SVR", "Ridge"], n_rows),
+            "sample_index": np.arange(n_rows),
+            "y_true": rng.random(n_rows),
+            "y_pred": rng.random(n_rows),
+        }
+    ).write_parquet(path, row_group_size=100_000)
+
+
+@pytest.fixture()
+def workspace_with_arrays(tmp_path):
+    arrays_dir = tmp_path / "arrays"
+    arrays_dir.mkdir()
+    return tmp_path
+
+
+@pytest.fixture()
+def client(workspace_with_arrays):
+    from fastapi.testclient import TestClient
+
+    import api.aggregated_predictions as aggregated_predictions
+    from main import app
+
+    with (
+        patch.object(aggregated_predictions, "_get_workspace_path", return_value=workspace_with_arrays),
+        TestClient(app) as c,
+    ):
+        yield c
+
+
+def test_filtered_export_streams_matching_rows(client, workspace_with_arrays):
+    _write_predictions(workspace_with_arrays / "arrays" / "corn.parquet", 50_000)
+
+    resp = client.get("/api/aggregated-predictions/export/corn.parquet?partition=test&model_name=PLS")
+
+    assert resp.status_code == 200
+    assert 'filename="corn.parquet"' in resp.headers["content-disposition"]
+    exported = pl.read_parquet(io.BytesIO(resp.content))
+    expected = pl.read_parquet(workspace_with_arrays / "arrays" / "corn.parquet").filter(
+        (pl.col("partition") == "test") & (pl.col("model_name") == "PLS")
+    )
+    assert exported.height == expected.height > 0
+    assert exported["sample_index"].to_list() == expected["sample_index"].to_list()
+
+
+def test_filtered_export_rejects_missing_column(client, workspace_with_arrays):
+    pl.DataFrame({"y_true": [1.0, 2.0]}).write_parquet(workspace_with_arrays / "arrays" / "plain.parquet")
+
+    resp = client.get("/api/aggregated-predictions/export/plain.parquet?partition=test")
+
+    assert resp.status_code == 400
+    assert "partition" in resp.json()["detail"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="resource.getrusage is POSIX-only")
+def test_filtered_export_of_large_table_stays_under_rss_ceiling(tmp_path):
+    (tmp_path / "arrays").mkdir()
+    source = tmp_path / "arrays" / "big.parquet"
+    _write_predictions(source, SYNTHETIC_ROWS)
+    output = tmp_path / "exported.parquet"
+
+    # Measured in a fresh interpreter so this process's allocations do not count
+    script = textwrap.dedent(
+        f"""
+        import asyncio, json, os, resource, sys
+        from pathlib import Path
+        from unittest.mock import patch
+
+        os.environ.setdefault("SENTRY_DSN", "")
+        sys.path.insert(0, {str(WEBAPP_ROOT)!r})
+        import api.aggregated_predictions as aggregated_predictions
+
+        async def export():
+            with patch.object(aggregated_predictions, "_get_workspace_path", return_value=Path({str(tmp_path)!r})):
+                response = await aggregated_predictions.export_dataset_parquet(
+                    "big", partition="test", model_name=None
+                )
+            with open({str(output)!r}, "wb") as f:
+                async for chunk in response.body_iterator:
+                    f.write(chunk)
+
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        asyncio.run(export())
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        scale = 1 if sys.platform == "darwin" else 1024  # bytes on macOS, KiB on Linux
+        print(json.dumps({{"growth_mb": (peak - baseline) * scale / 1024 / 1024}}))
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, timeout=300, cwd=str(WEBAPP_ROOT)
+    )
+    assert result.returncode == 0, result.stderr
+    growth_mb = json.loads(result.stdout.strip().splitlines()[-1])["growth_mb"]
+
+    exported_rows = pl.scan_parquet(output).select(pl.len()).collect().item()
+    expected_rows = pl.scan_parquet(source).filter(pl.col("partition") == "test").select(pl.len()).collect().item()
+    assert exported_rows == expected_rows
+    assert growth_mb < EXPORT_RSS_CEILING_MB, f"export grew RSS by {growth_mb:.0f} MB"
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sklearn.decomposition import PCA
+
+from api.shared import pca_projection
+from api.shared.pca_projection import PCAProjectionService, fit_decomposition
+
+
+@pytest.fixture
+def X():
+    rng = np.random.default_rng(0)
+    latent = rng.normal(size=(120, 4)) * [5.0, 3.0, 2.0, 1.0]
+    return latent @ rng.normal(size=(4, 80)) + rng.normal(scale=0.05, size=(120, 80))
+
+
+@pytest.mark.parametrize("scale", [False, True])
+def test_full_solver_matches_sklearn(X, scale):
+    Z = (X - X.mean(axis=0)) / (X.std(axis=0) if scale else 1)
+    reference = PCA(n_components=6, svd_solver="full").fit(Z)
+    pca = fit_decomposition(X, 6, scale=scale)
+
+    assert pca.solver == "full"
+    np.testing.assert_allclose(pca.components, reference.components_, atol=1e-8)
+    np.testing.assert_allclose(pca.explained_variance, reference.explained_variance_)
+    np.testing.assert_allclose(pca.explained_variance_ratio, reference.explained_variance_ratio_)
+    np.testing.assert_allclose(pca.scores, reference.transform(Z), atol=1e-8)
+    np.testing.assert_allclose(pca.transform(X[:5]), pca.scores[:5], atol=1e-8)
+
+
+@pytest.mark.parametrize("solver", ["randomized", "incremental"])
+def test_approximate_solvers_agree_with_full(X, solver, monkeypatch):
+    monkeypatch.setattr(pca_projection, "INCREMENTAL_BATCH_ROWS", 50)
+    exact = fit_decomposition(X, 4, solver="full")
+    approx = fit_decomposition(X, 4, solver=solver)
+
+    assert approx.solver == solver
+    assert approx.scores.shape == exact.scores.shape
+    np.testing.assert_allclose(approx.explained_variance_ratio, exact.explained_variance_ratio, rtol=1e-3)
+    np.testing.assert_allclose(np.abs(approx.components), np.abs(exact.components), atol=1e-3)
+    np.testing.assert_allclose(np.abs(approx.scores), np.abs(exact.scores), rtol=1e-3, atol=1e-3)
+
+
+def test_solver_is_chosen_from_matrix_size(monkeypatch):
+    monkeypatch.setattr(pca_projection, "RANDOMIZED_MIN_ELEMENTS", 100)
+    monkeypatch.setattr(pca_projection, "INCREMENTAL_MIN_ELEMENTS", 1000)
+    assert pca_projection._choose_solver(10, 10) == "full"
+    assert pca_projection._choose_solver(20, 10) == "randomized"
+    assert pca_projection._choose_solver(200, 10) == "incremental"
+
+
+def test_service_reuses_larger_fit(X, monkeypatch):
+    fits = []
+    original = pca_projection.fit_decomposition
+
+    def counting(*args, **kwargs):
+        fits.append(args[1])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(pca_projection, "fit_decomposition", counting)
+    service = PCAProjectionService()
+    full = service.fit(X, 10)
+    fewer = service.fit(X.copy(), 3)
+    scaled = service.fit(X, 3, scale=True)
+    more = service.fit(X, 12)
+
+    assert fits == [10, 3, 12]
+    np.testing.assert_array_equal(fewer.components, full.components[:3])
+    assert scaled.scale is not None
+    assert service.fit(X, 11).n_components == 11
+    assert more.n_components == 12
+
+
+def test_chemometric_statistics_match_outlier_filter(X):
+    pytest.importorskip("nirs4all")
+    from nirs4all.operators.filters import XOutlierFilter
+
+    pca = fit_decomposition(X, 5)
+    leverage = XOutlierFilter(method="pca_leverage", n_components=5).fit(X)
+    residual = XOutlierFilter(method="pca_residual", n_components=5).fit(X)
+
+    np.testing.assert_allclose(pca.hotelling_t2(), leverage._distances_, rtol=1e-6)
+    np.testing.assert_allclose(pca.q_residuals(X), residual._distances_, rtol=1e-6, atol=1e-10)
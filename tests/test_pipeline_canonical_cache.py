@@ -0,0 +1,142 @@
+"""Memoized canonical <-> editor conversions return what an uncached run would."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("nirs4all")
+
+import api.shared  # noqa: F401  (initialise the shared package before lazy_imports)
+from api import pipeline_canonical
+from api.pipeline_canonical import (
+    ConversionCache,
+    _canonical_to_editor,
+    _editor_to_canonical,
+    _validate_canonical,
+    canonical_to_editor,
+    conversion_cache,
+    editor_to_canonical,
+    validate_canonical,
+)
+from api.preset_loader import list_presets, load_preset
+
+
+def _preset_pipelines():
+    for preset in list_presets():
+        for variant in preset.get("variants") or [None]:
+            try:
+                loaded = load_preset(preset["id"], variant)
+            except Exception:
+                continue
+            yield f"{preset['id']}/{variant}", {"name": loaded.get("name", ""), "pipeline": loaded["pipeline"]}
+
+
+def _step_ids(value, found=None):
+    found = [] if found is None else found
+    if isinstance(value, dict):
+        for key, child in value.items():
+            if key == "id" and isinstance(child, str) and child.startswith("step-"):
+                found.append(child)
+            else:
+                _step_ids(child, found)
+    elif isinstance(value, list):
+        for child in value:
+            _step_ids(child, found)
+    return found
+
+
+def _without_ids(value):
+    """Replace generated step ids by their order of appearance."""
+    order = {step_id: f"#{i}" for i, step_id in enumerate(_step_ids(value))}
+    return pipeline_canonical._copy_json(value, order)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    conversion_cache.clear()
+    yield
+    conversion_cache.clear()
+
+
+def test_cached_conversions_match_uncached_for_every_preset():
+    checked = 0
+    for preset_id, payload in _preset_pipelines():
+        uncached_editor = _canonical_to_editor(payload)
+        for _ in range(2):
+            editor_steps = canonical_to_editor(payload)
+            assert _without_ids(editor_steps) == _without_ids(uncached_editor), preset_id
+
+            canonical = editor_to_canonical(editor_steps)
+            assert canonical == _editor_to_canonical(editor_steps), preset_id
+
+            assert validate_canonical(canonical) == _validate_canonical(canonical), preset_id
+        # Round trip through the cache is stable as well
+        assert editor_to_canonical(canonical_to_editor(canonical)) == canonical, preset_id
+        checked += 1
+    assert checked > 0
+    assert conversion_cache.hits > 0
+
+
+def test_repeated_import_gets_fresh_step_ids():
+    _, payload = next(_preset_pipelines())
+    misses = conversion_cache.misses
+
+    first = canonical_to_editor(payload)
+    second = canonical_to_editor(payload)
+
+    assert conversion_cache.misses == misses + 1
+    first_ids, second_ids = _step_ids(first), _step_ids(second)
+    assert len(set(second_ids)) == len(second_ids) == len(first_ids) > 0
+    assert not set(first_ids) & set(second_ids)
+    assert _without_ids(first) == _without_ids(second)
+
+
+def test_returned_results_are_defensive_copies():
+    _, payload = next(_preset_pipelines())
+    steps = canonical_to_editor(payload)
+    canonical = editor_to_canonical(steps)
+    expected = pipeline_canonical._copy_json(canonical)
+
+    canonical.append({"injected": True})
+    steps[0]["name"] = "Mutated"
+    payload["pipeline"].append({"class": "sklearn.preprocessing.StandardScaler"})
+
+    assert editor_to_canonical(canonical_to_editor(payload)[:-1]) == expected
+    assert editor_to_canonical(_canonical_to_editor(payload)) != expected
+
+
+def test_key_order_and_non_json_payloads():
+    cache = ConversionCache(max_entries=2)
+    assert cache.input_hash({"a": 1, "b": 2}) != cache.input_hash({"b": 2, "a": 1})
+    assert cache.input_hash([object()]) is None
+
+    calls = []
+    cache.call(lambda p: calls.append(p) or p, [object()])
+    for payload in ([1], [2], [3], [1]):
+        cache.call(_record(calls), payload)
+    # Unhashable input bypasses the cache; [1] was evicted by [3]
+    assert len(calls) == 5
+    assert cache.misses == 4
+
+
+def test_both_cached_forms_rename_step_ids_alike():
+    def convert(payload):
+        step_id = pipeline_canonical._step_id()
+        return {"id": step_id, "refs": [step_id], "by_id": {step_id: payload}, "shape": payload}
+
+    cache = ConversionCache()
+    # A tuple has no exact JSON form, so the second result is kept as objects
+    for payload in ([1, 2], [(3, 4)]):
+        cache.call(convert, payload)
+        result = cache.call(convert, payload)
+        step_id = result["id"]
+        assert result["refs"] == [step_id] and list(result["by_id"]) == [step_id]
+        assert result["shape"] == payload
+
+
+def _record(calls):
+    def recorded(payload):
+        calls.append(payload)
+        return list(payload)
+
+    return recorded
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from api.shared.preprocessing_cache import PreprocessingCache, chain_prefix_hashes
+
+SNV = {"name": "SNV", "params": {}}
+SG = {"name": "SavitzkyGolay", "params": {"window_length": 11, "polyorder": 2}}
+DETREND = {"name": "Detrend", "params": {}}
+
+
+@pytest.fixture
+def X():
+    return np.random.default_rng(0).normal(size=(20, 40))
+
+
+class _CountingStep:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def __call__(self, X, step):
+        self.calls.append(step["name"])
+        return X + len(self.calls)
+
+
+def test_repeated_chain_is_computed_once(X):
+    cache = PreprocessingCache()
+    apply_step = _CountingStep()
+    first = cache.apply(X, [SNV, SG], apply_step)
+    second = cache.apply(X.copy(), [SNV, SG], apply_step)
+
+    assert apply_step.calls == ["SNV", "SavitzkyGolay"]
+    np.testing.assert_array_equal(first, second)
+    first[:] = 0
+    np.testing.assert_array_equal(cache.apply(X, [SNV, SG], apply_step), second)
+
+
+def test_longer_chain_resumes_from_cached_prefix(X):
+    cache = PreprocessingCache()
+    apply_step = _CountingStep()
+    cache.apply(X, [SNV, SG], apply_step)
+    cache.apply(X, [SNV, SG, DETREND], apply_step)
+    cache.apply(X, [SNV], apply_step)
+
+    assert apply_step.calls == ["SNV", "SavitzkyGolay", "Detrend"]
+
+
+def test_other_data_or_params_miss(X):
+    cache = PreprocessingCache()
+    apply_step = _CountingStep()
+    cache.apply(X, [SNV], apply_step)
+    cache.apply(X[:10], [SNV], apply_step)
+    cache.apply(X, [{"name": "SNV", "params": {"with_std": False}}], apply_step)
+
+    assert len(apply_step.calls) == 3
+
+
+def test_step_hash_ignores_param_order_and_unnamed_steps():
+    reordered = {"name": "SavitzkyGolay", "params": {"polyorder": 2, "window_length": 11}}
+    assert chain_prefix_hashes([SNV, SG]) == chain_prefix_hashes([SNV, {"name": ""}, reordered])
+
+
+def test_budget_evicts_least_recently_used(X):
+    cache = PreprocessingCache(max_bytes=2 * X.nbytes)
+    apply_step = _CountingStep()
+    cache.apply(X, [SNV], apply_step)
+    cache.apply(X, [SG], apply_step)
+    cache.apply(X, [SNV], apply_step)
+    cache.apply(X, [DETREND], apply_step)
+
+    assert cache.stats()["bytes"] <= 2 * X.nbytes
+    cache.apply(X, [SNV], apply_step)
+    cache.apply(X, [SG], apply_step)
+    assert apply_step.calls == ["SNV", "SavitzkyGolay", "Detrend", "SavitzkyGolay"]
+
+
+def test_transformer_never_mutates_cached_arrays(X):
+    cache = PreprocessingCache()
+
+    def in_place(X_, step):
+        X_ += 1
+        return X_
+
+    original = X.copy()
+    once = cache.apply(X, [SNV, SG], in_place)
+    np.testing.assert_array_equal(X, original)
+    np.testing.assert_allclose(once, original + 2)
+    np.testing.assert_array_equal(cache.apply(original, [SNV, SG, DETREND], in_place), once + 1)
+
+
+def test_data_key_replaces_the_fingerprint(X, monkeypatch):
+    from api.shared import preprocessing_cache
+
+    cache = PreprocessingCache()
+    apply_step = _CountingStep()
+    cache.apply(X, [SNV], apply_step, data_key=("dataset", "hash-a", "train"))
+
+    monkeypatch.setattr(preprocessing_cache, "array_fingerprint", lambda _X: pytest.fail("matrix was hashed"))
+    cache.apply(X.copy(), [SNV], apply_step, data_key=("dataset", "hash-a", "train"))
+    cache.apply(X, [SNV], apply_step, data_key=("dataset", "hash-a", "test"))
+    assert apply_step.calls == ["SNV", "SNV"]
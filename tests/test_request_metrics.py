@@ -0,0 +1,208 @@
+"""Tests for the per-route request metrics middleware and its diagnostics endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("SENTRY_DSN", "")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.shared.request_metrics import (  # noqa: E402
+    UNMATCHED_ROUTE,
+    RequestMetrics,
+    RequestMetricsMiddleware,
+)
+
+# Per-request cost of the middleware on a trivial ASGI app, slow-request timer included
+OVERHEAD_BUDGET_US = 150
+
+
+def _build_app(metrics: RequestMetrics) -> FastAPI:
+    router = APIRouter()
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: int, verbose: bool = False):
+        return {"item_id": item_id, "payload": "x" * 1000}
+
+    @router.get("/blocking")
+    async def blocking():
+        # Holds the event loop
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return {}
+
+    @router.get("/threaded")
+    def threaded():
+        # Sync endpoints run in the thread pool, off the loop
+        time.sleep(0.05)
+        return {}
+
+    @router.get("/waiting")
+    async def waiting():
+        await asyncio.sleep(0.1)
+        return {}
+
+    @router.get("/missing")
+    async def missing():
+        raise HTTPException(status_code=404, detail="nope")
+
+    @router.get("/crash")
+    async def crash():
+        raise RuntimeError("boom")
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics)
+    return app
+
+
+def _routes(metrics: RequestMetrics) -> dict[str, dict]:
+    return {f"{r['method']} {r['route']}": r for r in metrics.snapshot()["routes"]}
+
+
+def test_routes_are_labelled_by_template_with_sizes_and_statuses():
+    metrics = RequestMetrics(slow_request_ms=None)
+    client = TestClient(_build_app(metrics), raise_server_exceptions=False)
+
+    for item_id in (1, 2, 3):
+        client.get(f"/api/items/{item_id}", params={"verbose": "true"})
+    client.get("/api/missing")
+    client.get("/api/crash")
+    client.get("/not/a/route")
+
+    routes = _routes(metrics)
+    assert set(routes) == {
+        "GET /api/items/{item_id}",
+        "GET /api/missing",
+        "GET /api/crash",
+        f"GET {UNMATCHED_ROUTE}",
+    }
+    items = routes["GET /api/items/{item_id}"]
+    assert items["count"] == 3 and items["statuses"] == {"200": 3}
+    assert items["response_size_bytes"]["sum"] == 3 * len(client.get("/api/items/1").content)
+    assert routes["GET /api/missing"]["statuses"] == {"404": 1}
+    assert routes["GET /api/crash"]["statuses"] == {"500": 1}
+    assert metrics.snapshot()["overhead"]["requests"] == 7
+
+
+def test_event_loop_time_is_separated_from_off_loop_work():
+    metrics = RequestMetrics(slow_request_ms=None)
+    client = TestClient(_build_app(metrics))
+    client.get("/api/blocking")
+    client.get("/api/threaded")
+    client.get("/api/waiting")
+
+    routes = _routes(metrics)
+    blocking = routes["GET /api/blocking"]
+    assert blocking["loop_seconds"]["sum"] >= 0.05
+    assert blocking["off_loop_seconds"]["sum"] < 0.02
+    for name in ("GET /api/threaded", "GET /api/waiting"):
+        assert routes[name]["latency_seconds"]["sum"] >= 0.05
+        assert routes[name]["loop_seconds"]["sum"] < 0.02, name
+
+
+def test_slow_requests_are_logged_with_params_and_stack_sample():
+    metrics = RequestMetrics(slow_request_ms=30)
+    client = TestClient(_build_app(metrics))
+    client.get("/api/items/7", params={"verbose": "true"})
+    client.get("/api/waiting", params={"q": "spectra"})
+
+    (entry,) = metrics.slow_requests()
+    assert entry["route"] == "/api/waiting"
+    assert entry["query"] == "q=spectra"
+    assert entry["status"] == 200
+    assert entry["duration_ms"] >= 100 > entry["loop_ms"]
+    # Sampled while the endpoint was awaiting asyncio.sleep
+    assert any(frame.endswith(" in waiting") for frame in entry["stack"])
+
+    client.get("/api/items/8")
+    metrics.record_slow({**entry, "path": "/api/items/8", "path_params": {"item_id": "8"}})
+    assert [e["path"] for e in metrics.slow_requests(limit=1)] == ["/api/items/8"]
+
+
+def test_prometheus_exposition_format():
+    metrics = RequestMetrics(slow_request_ms=None)
+    metrics.record("GET", '/api/odd"route', 200, 0.003, 0.001, 2048)
+    metrics.record("GET", '/api/odd"route', 503, 0.2, 0.001, 10)
+
+    text = metrics.prometheus()
+    lines = text.splitlines()
+    labels = 'method="GET",route="/api/odd\\"route"'
+    assert "# TYPE nirs4all_http_request_duration_seconds histogram" in lines
+    assert f'nirs4all_http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in lines
+    assert f'nirs4all_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+    assert f"nirs4all_http_request_duration_seconds_count{{{labels}}} 2" in lines
+    assert f"nirs4all_http_response_size_bytes_sum{{{labels}}} 2058.0" in lines
+    assert f'nirs4all_http_requests_total{{{labels},status="503"}} 1' in lines
+    assert text.endswith("\n")
+
+
+async def _trivial_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _drive(app, n: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/ping", "query_string": b""}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - started
+
+
+def test_overhead_stays_within_budget():
+    n = 2000
+    wrapped = RequestMetricsMiddleware(_trivial_app, RequestMetrics(slow_request_ms=1000))
+
+    async def measure():
+        await _drive(wrapped, 100)
+        rounds = [(await _drive(_trivial_app, n), await _drive(wrapped, n)) for _ in range(5)]
+        return min(w - b for b, w in rounds) / n * 1e6
+
+    overhead_us = asyncio.run(measure())
+    print(f"\nrequest metrics overhead: {overhead_us:.1f} us/request")
+    assert overhead_us < OVERHEAD_BUDGET_US
+    assert wrapped.metrics.snapshot()["overhead"]["mean_us"] < OVERHEAD_BUDGET_US
+
+
+def test_diagnostics_endpoints():
+    from main import app
+
+    client = TestClient(app)
+    assert client.delete("/api/system/diagnostics/requests").json() == {"success": True}
+    client.get("/api/health")
+    client.get("/api/health")
+
+    snapshot = client.get("/api/system/diagnostics/requests").json()
+    health = next(r for r in snapshot["routes"] if r["route"] == "/api/health")
+    assert health["count"] == 2 and health["method"] == "GET"
+
+    response = client.get("/api/system/diagnostics/requests", params={"format": "prometheus"})
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'nirs4all_http_requests_total{method="GET",route="/api/health",status="200"} 2' in response.text
+    assert client.get("/api/system/diagnostics/requests", params={"format": "xml"}).status_code == 422
+
+    slow = client.get("/api/system/diagnostics/slow-requests").json()
+    assert set(slow) == {"threshold_ms", "requests"}
+
+
+@pytest.mark.parametrize("threshold", [0, -1, None])
+def test_non_positive_threshold_disables_slow_log(threshold):
+    assert RequestMetrics(slow_request_ms=threshold).slow_request_ms is None
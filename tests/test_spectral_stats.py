@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from api.shared.spectral_stats import (
+    SpectralStatistics,
+    SpectralStatisticsCache,
+    combined_global_summary,
+)
+
+
+@pytest.fixture
+def spectra():
+    rng = np.random.default_rng(0)
+    return rng.normal(loc=1.0, scale=0.3, size=(3000, 40)).cumsum(axis=1)
+
+
+def test_moments_match_numpy_across_chunk_sizes(spectra):
+    for chunk_rows in (1, 7, 512, 10_000):
+        stats = SpectralStatistics.from_matrix(spectra[:300], chunk_rows=chunk_rows)
+        np.testing.assert_allclose(stats.mean, spectra[:300].mean(axis=0))
+        np.testing.assert_allclose(np.sqrt(stats.variance), spectra[:300].std(axis=0))
+        np.testing.assert_array_equal(stats.min, spectra[:300].min(axis=0))
+        np.testing.assert_array_equal(stats.max, spectra[:300].max(axis=0))
+
+
+def test_quantiles_exact_below_sketch_capacity(spectra):
+    X = spectra[:200]
+    per_wl = SpectralStatistics.from_matrix(X, sketch_capacity=256).per_wavelength()
+
+    np.testing.assert_allclose(per_wl["median"], np.median(X, axis=0))
+    np.testing.assert_allclose(per_wl["q1"], np.percentile(X, 25, axis=0))
+    np.testing.assert_allclose(per_wl["q3"], np.percentile(X, 75, axis=0))
+
+
+def test_sketch_quantiles_within_rank_error(spectra):
+    stats = SpectralStatistics.from_matrix(spectra, chunk_rows=250, sketch_capacity=128)
+    assert not stats.sketch.is_exact
+
+    per_wl = stats.per_wavelength()
+    for key, q in (("q1", 0.25), ("median", 0.5), ("q3", 0.75)):
+        ranks = (spectra <= np.asarray(per_wl[key])).mean(axis=0)
+        assert np.all(np.abs(ranks - q) < 0.05), key
+
+
+def test_merge_equals_single_pass(spectra):
+    train, test = spectra[:2000], spectra[2000:]
+    merged = SpectralStatistics.from_matrix(train).merge(SpectralStatistics.from_matrix(test))
+
+    assert merged.count == len(spectra)
+    np.testing.assert_allclose(merged.mean, spectra.mean(axis=0))
+    np.testing.assert_allclose(np.sqrt(merged.variance), spectra.std(axis=0))
+    np.testing.assert_array_equal(merged.max, spectra.max(axis=0))
+
+    summary = merged.global_summary()
+    assert summary["global_mean"] == pytest.approx(float(spectra.mean()))
+    assert summary["global_std"] == pytest.approx(float(spectra.std()))
+    assert summary["global_min"] == pytest.approx(float(spectra.min()))
+
+
+def test_combined_global_summary_spans_sources(spectra):
+    left, right = spectra[:, :15], spectra[:, 15:]
+    summary = combined_global_summary([
+        SpectralStatistics.from_matrix(left),
+        SpectralStatistics.from_matrix(right),
+    ])
+    assert summary["num_features"] == spectra.shape[1]
+    assert summary["global_mean"] == pytest.approx(float(spectra.mean()))
+    assert summary["global_std"] == pytest.approx(float(spectra.std()))
+
+
+def test_cache_persists_and_revalidates_by_fingerprint(tmp_path, spectra):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return SpectralStatistics.from_matrix(spectra)
+
+    cache = SpectralStatisticsCache(tmp_path)
+    first = cache.get_or_compute("ds", 0, "train", "hash-a", compute)
+    assert cache.get_or_compute("ds", 0, "train", "hash-a", compute) is first
+
+    # A fresh process-level cache loads the persisted file instead of recomputing
+    reloaded = SpectralStatisticsCache(tmp_path).get_or_compute("ds", 0, "train", "hash-a", compute)
+    assert len(calls) == 1
+    np.testing.assert_allclose(reloaded.mean, first.mean)
+    assert reloaded.per_wavelength()["median"] == first.per_wavelength()["median"]
+
+    SpectralStatisticsCache(tmp_path).get_or_compute("ds", 0, "train", "hash-b", compute)
+    assert len(calls) == 2
+
+
+def test_cache_can_move_to_another_directory(tmp_path, spectra):
+    cache = SpectralStatisticsCache(tmp_path / "first")
+    cache.get_or_compute("ds", 0, "train", "hash-a", lambda: SpectralStatistics.from_matrix(spectra))
+
+    cache.set_cache_dir(tmp_path / "second")
+    calls = []
+    cache.get_or_compute("ds", 0, "train", "hash-a", lambda: calls.append(1) or SpectralStatistics.from_matrix(spectra))
+    assert calls == [1]
+    assert len(list((tmp_path / "second").glob("*.npz"))) == 1
+
+
+def test_dataset_stats_describe_the_first_source():
+    pytest.importorskip("nirs4all")
+    import api.shared  # noqa: F401  (initialise the shared package before lazy_imports)
+    from api.lazy_imports import _do_load_ml_deps, is_ml_ready
+
+    if not is_ml_ready():
+        _do_load_ml_deps()
+    from fastapi.testclient import TestClient
+    from nirs4all.data import SpectroDataset
+
+    from api import spectra
+    from main import app
+
+    rng = np.random.default_rng(0)
+    first, second = rng.normal(size=(50, 20)), rng.normal(loc=10.0, size=(50, 8))
+    dataset = SpectroDataset("two-sources")
+    dataset.add_samples([first, second], {"partition": "train"})
+    spectra._dataset_cache["stats-two-sources"] = dataset
+    try:
+        response = TestClient(app).get("/api/datasets/stats-two-sources/stats")
+    finally:
+        spectra._clear_dataset_cache("stats-two-sources")
+
+    summary = response.json()["global"]
+    assert summary["num_samples"] == 50
+    assert summary["num_features"] == 20
+    assert summary["global_mean"] == pytest.approx(float(first.mean()))
+    assert summary["global_max"] == pytest.approx(float(first.max()))
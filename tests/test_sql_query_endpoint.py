@@ -0,0 +1,159 @@
+"""
+Tests for the paged, budgeted read-only SQL query endpoint.
+
+Run with: pytest tests/test_sql_query_endpoint.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+os.environ.setdefault("SENTRY_DSN", "")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+ENDLESS_SQL = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT count(*) FROM c"
+
+
+@pytest.fixture()
+def workspace(tmp_path):
+    conn = sqlite3.connect(tmp_path / "store.sqlite")
+    conn.execute("CREATE TABLE predictions (prediction_id INTEGER PRIMARY KEY, model_name TEXT, test_score REAL)")
+    conn.executemany(
+        "INSERT INTO predictions VALUES (?, ?, ?)",
+        [(i, f"model_{i % 7}", i / 10) for i in range(2_500)],
+    )
+    conn.commit()
+    conn.close()
+    return tmp_path
+
+
+@pytest.fixture()
+def client(workspace):
+    from fastapi.testclient import TestClient
+
+    import api.aggregated_predictions as aggregated_predictions
+    from main import app
+
+    with (
+        patch.object(aggregated_predictions, "_get_workspace_path", return_value=workspace),
+        TestClient(app) as c,
+    ):
+        yield c
+    aggregated_predictions.query_cursors.close_all()
+
+
+def _query(client, **body):
+    return client.post("/api/aggregated-predictions/query", json=body)
+
+
+def test_page_tokens_walk_the_result_in_order(client):
+    first = _query(client, sql="SELECT prediction_id FROM predictions ORDER BY prediction_id", page_size=1000)
+    assert first.status_code == 200
+    pages = [first.json()]
+    while pages[-1]["next_page_token"]:
+        resp = client.post(
+            "/api/aggregated-predictions/query/page",
+            json={"page_token": pages[-1]["next_page_token"], "page_size": 1000},
+        )
+        assert resp.status_code == 200
+        pages.append(resp.json())
+
+    assert [page["row_count"] for page in pages] == [1000, 1000, 500]
+    ids = [row[0] for page in pages for row in page["rows"]]
+    assert ids == list(range(2_500))
+    assert not any(page["truncated"] for page in pages)
+
+    # Tokens are single-use: replaying one cannot repeat or skip rows
+    replay = client.post(
+        "/api/aggregated-predictions/query/page", json={"page_token": pages[0]["next_page_token"]}
+    )
+    assert replay.status_code == 410
+
+
+def test_without_page_size_the_whole_budgeted_result_is_returned(client):
+    payload = _query(client, sql="SELECT prediction_id FROM predictions ORDER BY prediction_id").json()
+    assert payload["row_count"] == 2_500
+    assert [row[0] for row in payload["rows"]] == list(range(2_500))
+    assert payload["next_page_token"] is None
+    assert payload["truncated"] is False
+
+    capped = _query(client, sql="SELECT prediction_id FROM predictions", max_rows=1_200).json()
+    assert capped["row_count"] == 1_200
+    assert capped["truncated"] is True
+    assert capped["next_page_token"] is None
+
+
+def test_row_budget_sets_truncation_flag(client):
+    first = _query(client, sql="SELECT * FROM predictions", page_size=500, max_rows=1200)
+    token = first.json()["next_page_token"]
+    counts, last = [first.json()["row_count"]], first.json()
+    while token:
+        last = client.post("/api/aggregated-predictions/query/page", json={"page_token": token, "page_size": 500}).json()
+        counts.append(last["row_count"])
+        token = last["next_page_token"]
+
+    assert counts == [500, 500, 200]
+    assert last["truncated"] is True
+    assert last["timed_out"] is False
+
+    exact = _query(client, sql="SELECT * FROM predictions WHERE prediction_id < 100", page_size=500, max_rows=100)
+    assert exact.json()["row_count"] == 100
+    assert exact.json()["truncated"] is False
+    assert exact.json()["next_page_token"] is None
+
+
+def test_time_budget_interrupts_the_query(client):
+    started = time.monotonic()
+    resp = _query(client, sql=ENDLESS_SQL, timeout_seconds=0.3)
+    elapsed = time.monotonic() - started
+
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["timed_out"] is True
+    assert payload["truncated"] is True
+    assert payload["next_page_token"] is None
+    assert elapsed < 5
+
+
+def test_closed_cursor_rejects_its_page_token(client):
+    token = _query(client, sql="SELECT * FROM predictions", page_size=10).json()["next_page_token"]
+
+    assert client.delete(f"/api/aggregated-predictions/query/{token}").status_code == 200
+    resp = client.post("/api/aggregated-predictions/query/page", json={"page_token": token})
+    assert resp.status_code == 410
+
+
+def test_write_statements_are_rejected(client):
+    resp = _query(client, sql="DELETE FROM predictions")
+    assert resp.status_code == 400
+
+
+def test_ndjson_stream_applies_row_budget(client):
+    resp = _query(client, sql="SELECT prediction_id, model_name FROM predictions", format="ndjson", page_size=100, max_rows=250)
+
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines[0] == {"columns": ["prediction_id", "model_name"]}
+    assert [row[0] for row in lines[1:-1]] == list(range(250))
+    assert lines[-1] == {"row_count": 250, "truncated": True, "timed_out": False}
+
+
+def test_arrow_stream_has_one_batch_per_page(client):
+    pa = pytest.importorskip("pyarrow")
+    resp = _query(client, sql="SELECT prediction_id, test_score FROM predictions", format="arrow", page_size=1000)
+
+    assert resp.status_code == 200
+    reader = pa.ipc.open_stream(resp.content)
+    batches = list(reader)
+    assert [batch.num_rows for batch in batches] == [1000, 1000, 500]
+    table = pa.Table.from_batches(batches)
+    assert table.column("prediction_id").to_pylist() == list(range(2_500))
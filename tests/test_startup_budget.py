@@ -0,0 +1,86 @@
+"""Startup budget: the backend must answer /api/health quickly on a cold start.
+
+Runs the app in a fresh interpreter with ``-X importtime``, measures the time
+from the first line of the script to the first successful health response,
+and checks that no lazily registered router was imported on the way. The
+budget can be tuned with NIRS4ALL_STARTUP_BUDGET_SECONDS (slow CI runners).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_BUDGET_SECONDS = 3.0
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+from fastapi.testclient import TestClient
+response = TestClient(main.app).get("/api/health")
+elapsed = time.perf_counter() - started
+lazy = [entry.module for entry in main.lazy_routers._entries]
+print(json.dumps({
+    "seconds": elapsed,
+    "status": response.status_code,
+    "lazy_imported": [name for name in lazy if name in sys.modules],
+}))
+"""
+
+
+def _parse_importtime(stderr: str) -> dict[str, float]:
+    """Cumulative import time in seconds per module from ``-X importtime`` output."""
+    times: dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+            times[name] = int(cumulative_us) / 1e6
+        except ValueError:
+            continue
+    return times
+
+
+def _slowest(times: dict[str, float], prefixes: tuple[str, ...] = ("api", "websocket", "main")) -> str:
+    ours = {name: t for name, t in times.items() if name.split(".")[0] in prefixes}
+    ranked = sorted(ours.items(), key=lambda kv: kv[1], reverse=True)[:15]
+    return "\n".join(f"  {t:6.2f}s  {name}" for name, t in ranked)
+
+
+@pytest.mark.timeout(300)
+def test_time_to_first_health_within_budget():
+    budget = float(os.environ.get("NIRS4ALL_STARTUP_BUDGET_SECONDS", DEFAULT_BUDGET_SECONDS))
+    env = {**os.environ, "SENTRY_DSN": "", "NIRS4ALL_LAZY_ROUTERS": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=240,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    import_times = _parse_importtime(proc.stderr)
+
+    print(f"time to first health: {report['seconds']:.2f}s (budget {budget:.2f}s)")
+    print(_slowest(import_times))
+
+    assert report["status"] == 200
+    assert report["lazy_imported"] == [], (
+        "Routers registered as lazy were imported before the first health check:\n"
+        f"{report['lazy_imported']}\nSlowest imports:\n{_slowest(import_times)}"
+    )
+    assert report["seconds"] <= budget, (
+        f"Time to first health {report['seconds']:.2f}s exceeds budget {budget:.2f}s.\n"
+        f"Slowest imports:\n{_slowest(import_times)}"
+    )
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("nirs4all")
+
+import api.shared  # noqa: F401  (initialise the shared package before lazy_imports)
+from api import synthesis
+from api.lazy_imports import _do_load_ml_deps, is_ml_ready
+from api.synthesis import GenerateRequest, SynthesisConfig, SynthesisStep
+
+if not is_ml_ready():
+    _do_load_ml_deps()
+
+
+def _config(n_samples=240):
+    return SynthesisConfig(
+        n_samples=n_samples,
+        random_state=11,
+        steps=[SynthesisStep(id="p", type="partitions", method="with_partitions", params={"train_ratio": 0.75})],
+    )
+
+
+def test_streamed_export_matches_builder_export(tmp_path, monkeypatch):
+    monkeypatch.setattr(synthesis, "EXPORT_CHUNK_ROWS", 7)
+    request = GenerateRequest(config=_config(), export_to_csv=str(tmp_path / "streamed"))
+
+    build_calls = []
+    original = synthesis.build_from_config
+
+    def counting_build(config):
+        builder = original(config)
+        original_build_arrays = builder.build_arrays
+
+        def build_arrays():
+            build_calls.append(1)
+            return original_build_arrays()
+
+        builder.build_arrays = build_arrays
+        return builder
+
+    monkeypatch.setattr(synthesis, "build_from_config", counting_build)
+    result = synthesis._run_generation(request, lambda _p, _m="": True)
+
+    assert len(build_calls) == 1
+    assert result["shape"][0] == 240
+
+    original(_config()).export(str(tmp_path / "reference"), format="standard")
+    for name in ("Xcal.csv", "Ycal.csv", "Xval.csv", "Yval.csv"):
+        assert (tmp_path / "streamed" / name).read_text() == (tmp_path / "reference" / name).read_text(), name
+
+
+def test_cancelled_export_removes_partial_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(synthesis, "EXPORT_CHUNK_ROWS", 10)
+    output = tmp_path / "cancelled"
+    request = GenerateRequest(config=_config(), export_to_csv=str(output))
+    progress = []
+
+    def callback(pct, _msg=""):
+        progress.append(pct)
+        return pct < 60
+
+    assert synthesis._run_generation(request, callback) is None
+    assert not output.exists()
+    assert progress == sorted(progress)
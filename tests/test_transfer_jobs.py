@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("nirs4all")
+
+import api.shared  # noqa: F401  (initialise the shared package before lazy_imports)
+from api import transfer
+from api.lazy_imports import _cache, _do_load_ml_deps, is_ml_ready
+from api.shared.array_cache import ArrayCache
+from api.transfer import PreprocessingConfig, TransferAnalysisRequest
+
+if not is_ml_ready():
+    _do_load_ml_deps()
+
+
+def _spectra(seed: int, n_samples: int = 30, n_features: int = 60) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    base = np.sin(np.linspace(0, 3, n_features)) + seed * 0.1
+    return base + rng.normal(scale=0.05, size=(n_samples, n_features))
+
+
+DATASETS = {"a": _spectra(1), "b": _spectra(2), "c": _spectra(3)}
+
+
+@pytest.fixture
+def sequential(monkeypatch):
+    """No worker pool, fresh cache and in-memory datasets."""
+    monkeypatch.setattr(transfer, "_TRANSFORM_WORKERS", 0)
+    monkeypatch.setattr(transfer, "_transform_cache", ArrayCache())
+    monkeypatch.setattr(transfer, "_load_dataset_data", lambda dataset_id: (None, DATASETS[dataset_id], None))
+
+
+def _request(**kwargs) -> TransferAnalysisRequest:
+    return TransferAnalysisRequest(
+        dataset_ids=list(DATASETS),
+        preprocessing=PreprocessingConfig(mode="manual", manual_steps=["SNV", "MSC+SG", "FirstDeriv"]),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def applied(monkeypatch):
+    calls: list[str] = []
+    original = transfer._apply_preprocessing
+
+    def counting(pp_name, X):
+        calls.append(pp_name)
+        return original(pp_name, X)
+
+    monkeypatch.setattr(transfer, "_apply_preprocessing", counting)
+    return calls
+
+
+def test_transforms_are_cached_per_dataset_content(sequential, applied):
+    names = ["SNV", "MSC+SG"]
+    first = transfer._transform_datasets(names, DATASETS, lambda _p, _m="": True)
+    assert len(applied) == 2 * len(DATASETS)
+
+    # Same content under other ids hits the cache; only the new preprocessing runs
+    renamed = {f"copy-{k}": v.copy() for k, v in DATASETS.items()}
+    second = transfer._transform_datasets([*names, "FirstDeriv"], renamed, lambda _p, _m="": True)
+    assert len(applied) == 3 * len(DATASETS)
+    np.testing.assert_array_equal(second["SNV"]["copy-a"], first["SNV"]["a"])
+
+
+def test_changing_evaluator_params_reuses_cached_transforms(sequential, applied):
+    if "PreprocPCAEvaluator" not in _cache:
+        pytest.skip("nirs4all transfer evaluator not available")
+
+    first = transfer._run_transfer_analysis(_request(n_components=5, knn=5), lambda _p, _m="": True)
+    assert len(applied) == 3 * len(DATASETS)
+
+    second = transfer._run_transfer_analysis(_request(n_components=3, knn=4), lambda _p, _m="": True)
+    assert len(applied) == 3 * len(DATASETS)
+    assert first.preprocessings == second.preprocessings == ["SNV", "MSC+SG", "FirstDeriv"]
+    assert transfer._transform_cache.stats()["hits"] == 3 * len(DATASETS)
+
+
+def test_pool_transforms_match_sequential(monkeypatch):
+    monkeypatch.setattr(transfer, "_transform_cache", ArrayCache())
+    monkeypatch.setattr(transfer, "_TRANSFORM_WORKERS", 2)
+    transfer._discard_transform_pool()
+    pool = transfer._get_transform_pool()
+    submitted = []
+    real_submit = pool.submit
+
+    def spy_submit(fn, *args, **kwargs):
+        submitted.append(args[0] if args else None)
+        return real_submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(pool, "submit", spy_submit)
+    names = ["SNV", "MSC+SG", "Detrend+SNV"]
+    try:
+        pooled = transfer._transform_datasets(names, DATASETS, lambda _p, _m="": True)
+
+        # Every transform went to the pool, which ran in other processes and is still alive
+        assert sorted(submitted) == sorted(name for name in names for _ in DATASETS)
+        assert transfer._transform_pool is pool
+        assert real_submit(os.getpid).result() != os.getpid()
+        for pp_name in names:
+            for dataset_id, X in DATASETS.items():
+                expected = transfer._build_preprocessing_function(pp_name)(X.copy())
+                np.testing.assert_allclose(pooled[pp_name][dataset_id], expected)
+    finally:
+        transfer._discard_transform_pool()
+
+
+def test_cancelled_analysis_returns_none(sequential):
+    calls = []
+
+    def cancel_after_two(progress, message=""):
+        calls.append(progress)
+        return len(calls) < 3
+
+    assert transfer._run_transfer_analysis(_request(), cancel_after_two) is None
+    assert len(transfer._transform_cache) == 2
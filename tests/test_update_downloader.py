@@ -1,8 +1,13 @@
-"""Tests for ZIP extraction behavior in the update downloader."""
+"""Tests for downloading, verification and ZIP extraction in the update downloader."""
 
 import asyncio
+import hashlib
+import io
 import os
+import threading
+import time
 import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
@@ -103,3 +108,213 @@ def test_extract_zip_resolves_wrapped_nested_app_root(monkeypatch, tmp_path):
     assert content_dir == staging_dir / "wrapper" / "nirs4all Studio"
     assert (content_dir / "nirs4all Studio").exists()
     assert (content_dir / "resources" / "backend" / "python-runtime" / "RUNTIME_READY.json").exists()
+
+
+# ----- Download (in-process HTTP fixture) -----
+
+
+def _synthetic_archive() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        archive.writestr("nirs4all Studio/nirs4all Studio", "#!/bin/sh\nexit 0\n")
+        archive.writestr("nirs4all Studio/payload.bin", os.urandom(300_000))
+    return buffer.getvalue()
+
+
+class _ArchiveServer:
+    """Serves one archive with Range support and scripted failures."""
+
+    def __init__(self, payload: bytes):
+        self.payload = payload
+        self.drop_first_after: int | None = None
+        self.honour_range = True
+        self.misreport_range_once = False
+        self.chunk_delay = 0.0
+        self.requests: list[str | None] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                range_header = self.headers.get("Range")
+                server.requests.append(range_header)
+                start = 0
+                if range_header and server.honour_range:
+                    start = int(range_header.split("=", 1)[1].split("-", 1)[0])
+                body = server.payload[start:]
+
+                self.send_response(206 if start else 200)
+                self.send_header("Content-Length", str(len(body)))
+                if start:
+                    reported = start
+                    if server.misreport_range_once:
+                        server.misreport_range_once = False
+                        reported = start + 1
+                    self.send_header("Content-Range", f"bytes {reported}-{len(server.payload) - 1}/{len(server.payload)}")
+                self.end_headers()
+
+                if server.drop_first_after is not None and len(server.requests) == 1:
+                    # Promise the whole body, send part of it, then hang up
+                    self.wfile.write(body[: server.drop_first_after])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                for offset in range(0, len(body), 65536):
+                    if server.chunk_delay:
+                        time.sleep(server.chunk_delay)
+                    self.wfile.write(body[offset : offset + 65536])
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}/nirs4all-studio-update.zip"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def update_dirs(monkeypatch, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr(update_downloader, "get_update_cache_dir", lambda: cache_dir)
+    monkeypatch.setattr(update_downloader, "get_staging_dir", lambda: tmp_path / "staging")
+    monkeypatch.setattr(update_downloader.UpdateDownloader, "RESUME_BACKOFF_SECONDS", 0.0)
+    return cache_dir
+
+
+def _no_rehash(path):
+    raise AssertionError(f"checksum should come from the download stream, not a re-read of {path}")
+
+
+def test_download_hashes_inline_and_stages_update(monkeypatch, update_dirs):
+    payload = _synthetic_archive()
+    monkeypatch.setattr(update_downloader, "calculate_sha256", _no_rehash)
+
+    with _ArchiveServer(payload) as server:
+        success, message, content_dir = asyncio.run(
+            update_downloader.download_and_stage_update(
+                server.url, len(payload), hashlib.sha256(payload).hexdigest()
+            )
+        )
+
+    assert success is True, message
+    assert (content_dir / "payload.bin").exists()
+    assert server.requests == [None]
+    # Archive is removed once staged
+    assert not any(update_dirs.iterdir())
+
+
+def test_download_resumes_with_range_after_dropped_connection(monkeypatch, update_dirs):
+    payload = _synthetic_archive()
+    monkeypatch.setattr(update_downloader, "calculate_sha256", _no_rehash)
+
+    with _ArchiveServer(payload) as server:
+        server.drop_first_after = 100_000
+        downloader = update_downloader.UpdateDownloader(
+            server.url, len(payload), hashlib.sha256(payload).hexdigest()
+        )
+        success, message, path = asyncio.run(downloader.download())
+
+    assert success is True, message
+    assert path.read_bytes() == payload
+    assert server.requests == [None, "bytes=100000-"]
+    assert downloader.verify_checksum(path) == (True, "Checksum verified")
+
+
+def test_download_resumes_partial_file_from_previous_attempt(update_dirs):
+    payload = _synthetic_archive()
+
+    with _ArchiveServer(payload) as server:
+        server.drop_first_after = 70_000
+        first = update_downloader.UpdateDownloader(server.url, len(payload))
+        first.MAX_RESUME_ATTEMPTS = 0
+        success, message, _ = asyncio.run(first.download())
+        assert success is False
+        assert "saved for resume" in message
+
+        partial = update_dirs / "nirs4all-studio-update.zip"
+        assert partial.read_bytes() == payload[:70_000]
+
+        second = update_downloader.UpdateDownloader(
+            server.url, len(payload), hashlib.sha256(payload).hexdigest()
+        )
+        success, _message, path = asyncio.run(second.download())
+
+    assert success is True
+    assert server.requests == [None, "bytes=70000-"]
+    assert second.verify_checksum(path)[0] is True
+
+
+def test_download_restarts_when_server_ignores_range(update_dirs):
+    payload = _synthetic_archive()
+    (update_dirs / "nirs4all-studio-update.zip").write_bytes(b"stale partial bytes")
+
+    with _ArchiveServer(payload) as server:
+        server.honour_range = False
+        downloader = update_downloader.UpdateDownloader(
+            server.url, len(payload), hashlib.sha256(payload).hexdigest()
+        )
+        success, _message, path = asyncio.run(downloader.download())
+
+    assert success is True
+    assert path.read_bytes() == payload
+    assert downloader.verify_checksum(path)[0] is True
+
+
+def test_download_restarts_from_scratch_when_server_resumes_elsewhere(update_dirs):
+    payload = _synthetic_archive()
+    (update_dirs / "nirs4all-studio-update.zip").write_bytes(payload[:70_000])
+
+    with _ArchiveServer(payload) as server:
+        server.misreport_range_once = True
+        downloader = update_downloader.UpdateDownloader(
+            server.url, len(payload), hashlib.sha256(payload).hexdigest()
+        )
+        success, _message, path = asyncio.run(downloader.download())
+
+    assert success is True
+    # One mismatched resume, then a single full download from byte 0
+    assert server.requests == ["bytes=70000-", None]
+    assert path.read_bytes() == payload
+    assert downloader.verify_checksum(path)[0] is True
+
+
+def test_checksum_mismatch_fails_and_discards_archive(update_dirs):
+    payload = _synthetic_archive()
+
+    with _ArchiveServer(payload) as server:
+        success, message, content_dir = asyncio.run(
+            update_downloader.download_and_stage_update(server.url, len(payload), "0" * 64)
+        )
+
+    assert success is False
+    assert message.startswith("Checksum mismatch")
+    assert content_dir is None
+    assert not (update_dirs / "nirs4all-studio-update.zip").exists()
+
+
+def test_download_does_not_block_event_loop(update_dirs):
+    payload = _synthetic_archive()
+
+    async def download_with_ticker(downloader):
+        ticks = 0
+        task = asyncio.ensure_future(downloader.download())
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0.005)
+        return await task, ticks
+
+    with _ArchiveServer(payload) as server:
+        server.chunk_delay = 0.03
+        downloader = update_downloader.UpdateDownloader(server.url, len(payload))
+        (success, _message, _path), ticks = asyncio.run(download_with_ticker(downloader))
+
+    assert success is True
+    assert ticks >= 5
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("nirs4all")
+
+import api.shared  # noqa: F401  (initialise the shared package before lazy_imports)
+from api.lazy_imports import _do_load_ml_deps, is_ml_ready
+from api.pipeline_canonical import canonical_to_editor, count_runtime_variants, editor_steps_to_runtime_canonical
+from api.pipelines import PipelineCountRequest, _count_variants_impl
+from api.preset_loader import list_presets, load_preset
+from api.shared.variant_counter import VariantCounter, VariantCountSuperseded
+
+if not is_ml_ready():
+    _do_load_ml_deps()
+
+
+def _preset_editor_steps():
+    for preset in list_presets():
+        for variant in preset.get("variants") or [None]:
+            try:
+                loaded = load_preset(preset["id"], variant)
+            except Exception:
+                continue
+            yield preset["id"], canonical_to_editor(loaded["pipeline"])
+
+
+def test_product_of_step_counts_matches_whole_pipeline_count():
+    checked = 0
+    swept = 0
+    for preset_id, steps in _preset_editor_steps():
+        expected = count_runtime_variants(editor_steps_to_runtime_canonical(steps))
+        result = asyncio.run(_count_variants_impl(PipelineCountRequest(steps=steps)))
+        assert result["count"] == expected, preset_id
+        checked += 1
+        swept += expected > 1
+    assert checked > 0 and swept > 0
+
+
+def test_unchanged_steps_reuse_memoized_counts():
+    counter = VariantCounter()
+    calls = []
+
+    def count_fn(step):
+        calls.append(step["id"])
+        return len(step["params"].get("choices", [1]))
+
+    steps = [
+        {"id": "a", "params": {"choices": [1, 2, 3]}},
+        {"id": "b", "params": {"choices": [1, 2]}},
+    ]
+    assert counter.count_pipeline(steps, count_fn) == (6, [3, 2])
+
+    steps[1] = {"id": "b", "params": {"choices": [1, 2, 3, 4]}}
+    assert counter.count_pipeline(steps, count_fn) == (12, [3, 4])
+    assert calls == ["a", "b", "b"]
+
+
+def test_newer_request_supersedes_older():
+    counter = VariantCounter()
+    counter.begin("editor", 1)
+    counter.begin("editor", 2)
+
+    with pytest.raises(VariantCountSuperseded):
+        counter.count_pipeline([{"id": "a"}], lambda step: 1, client_id="editor", sequence=1)
+    assert counter.count_pipeline([{"id": "a"}], lambda step: 1, client_id="editor", sequence=2) == (1, [1])
+
+
+def test_tracked_clients_are_bounded():
+    counter = VariantCounter(max_clients=2)
+    counter.begin("editor", 5)
+    for i in range(10):
+        counter.begin(f"tab-{i}", 1)
+        counter.begin("editor", 5)  # keeps the active client recent
+
+    assert len(counter._latest_sequence) == 2
+    assert counter.is_superseded("editor", 4)
+    assert not counter.is_superseded("tab-0", 0)